@@ -0,0 +1,33 @@
+"""add sort indexes
+
+Revision ID: c5e8a2d47f19
+Revises: b4d2f3a18c75
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a2d47f19'
+down_revision: Union[str, Sequence[str], None] = 'b4d2f3a18c75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination seeks into these; the rowid makes (column, id) unique
+    op.create_index('ix_books_title', 'books', ['title'])
+    op.create_index('ix_books_author', 'books', ['author'])
+    op.create_index('ix_books_created_at', 'books', ['created_at'])
+    op.create_index('ix_reviews_updated_at', 'reviews', ['updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_updated_at', table_name='reviews')
+    op.drop_index('ix_books_created_at', table_name='books')
+    op.drop_index('ix_books_author', table_name='books')
+    op.drop_index('ix_books_title', table_name='books')
@@ -0,0 +1,27 @@
+"""add shelf date_added index
+
+Revision ID: d7f3b9c25e61
+Revises: c5e8a2d47f19
+Create Date: 2026-10-19 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b9c25e61'
+down_revision: Union[str, Sequence[str], None] = 'c5e8a2d47f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A shelf's books newest first, the default shelf page, read straight off the index
+    op.create_index('ix_shelf_books_shelf_id_date_added', 'shelf_books', ['shelf_id', 'date_added'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_shelf_books_shelf_id_date_added', table_name='shelf_books')
@@ -0,0 +1,49 @@
+"""add tag counts
+
+Revision ID: e2a6c8f04b93
+Revises: d7f3b9c25e61
+Create Date: 2026-10-19 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c8f04b93'
+down_revision: Union[str, Sequence[str], None] = 'd7f3b9c25e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = {
+    'book_tags_count_insert': """CREATE TRIGGER book_tags_count_insert AFTER INSERT ON book_tags BEGIN
+    UPDATE tags SET book_count = book_count + 1 WHERE id = NEW.tag_id;
+END""",
+    'book_tags_count_delete': """CREATE TRIGGER book_tags_count_delete AFTER DELETE ON book_tags BEGIN
+    UPDATE tags SET book_count = book_count - 1 WHERE id = OLD.tag_id;
+END""",
+    'book_tags_count_update': """CREATE TRIGGER book_tags_count_update AFTER UPDATE OF tag_id ON book_tags BEGIN
+    UPDATE tags SET book_count = book_count - 1 WHERE id = OLD.tag_id;
+    UPDATE tags SET book_count = book_count + 1 WHERE id = NEW.tag_id;
+END""",
+}
+
+
+def upgrade() -> None:
+    op.add_column('tags', sa.Column('book_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute('UPDATE tags SET book_count = (SELECT count(*) FROM book_tags WHERE book_tags.tag_id = tags.id)')
+    op.create_index('ix_tags_book_count', 'tags', ['book_count'])
+    op.create_index('ix_tags_name_lower', 'tags', [sa.text('lower(name)')])
+    for trigger in TRIGGERS.values():
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f'DROP TRIGGER {name}')
+    op.drop_index('ix_tags_name_lower', table_name='tags')
+    op.drop_index('ix_tags_book_count', table_name='tags')
+    with op.batch_alter_table('tags') as batch_op:
+        batch_op.drop_column('book_count')
@@ -0,0 +1,47 @@
+"""add shelf counts
+
+Revision ID: f4b8d1a7c352
+Revises: e2a6c8f04b93
+Create Date: 2026-10-19 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d1a7c352'
+down_revision: Union[str, Sequence[str], None] = 'e2a6c8f04b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = {
+    'shelf_books_count_insert': """CREATE TRIGGER shelf_books_count_insert AFTER INSERT ON shelf_books BEGIN
+    UPDATE shelves SET book_count = book_count + 1 WHERE id = NEW.shelf_id;
+END""",
+    'shelf_books_count_delete': """CREATE TRIGGER shelf_books_count_delete AFTER DELETE ON shelf_books BEGIN
+    UPDATE shelves SET book_count = book_count - 1 WHERE id = OLD.shelf_id;
+END""",
+    'shelf_books_count_update': """CREATE TRIGGER shelf_books_count_update AFTER UPDATE OF shelf_id ON shelf_books BEGIN
+    UPDATE shelves SET book_count = book_count - 1 WHERE id = OLD.shelf_id;
+    UPDATE shelves SET book_count = book_count + 1 WHERE id = NEW.shelf_id;
+END""",
+}
+
+
+def upgrade() -> None:
+    op.add_column('shelves', sa.Column('book_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        'UPDATE shelves SET book_count = (SELECT count(*) FROM shelf_books WHERE shelf_books.shelf_id = shelves.id)'
+    )
+    for trigger in TRIGGERS.values():
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f'DROP TRIGGER {name}')
+    with op.batch_alter_table('shelves') as batch_op:
+        batch_op.drop_column('book_count')
@@ -0,0 +1,75 @@
+"""add book sort keys
+
+Revision ID: a9c3e5f71d28
+Revises: f4b8d1a7c352
+Create Date: 2026-10-19 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e5f71d28'
+down_revision: Union[str, Sequence[str], None] = 'f4b8d1a7c352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = {
+    'reviews_rating_insert': """CREATE TRIGGER reviews_rating_insert AFTER INSERT ON reviews BEGIN
+    UPDATE books SET rating = NEW.rating WHERE id = NEW.book_id;
+END""",
+    'reviews_rating_update': """CREATE TRIGGER reviews_rating_update AFTER UPDATE OF rating ON reviews BEGIN
+    UPDATE books SET rating = NEW.rating WHERE id = NEW.book_id;
+END""",
+    'reviews_rating_delete': """CREATE TRIGGER reviews_rating_delete AFTER DELETE ON reviews BEGIN
+    UPDATE books SET rating = NULL WHERE id = OLD.book_id;
+END""",
+    'readings_finished_insert': """CREATE TRIGGER readings_finished_insert AFTER INSERT ON readings WHEN NEW.finished_at IS NOT NULL BEGIN
+    UPDATE books SET last_finished_at = (SELECT max(finished_at) FROM readings WHERE book_id = NEW.book_id)
+    WHERE id = NEW.book_id;
+END""",
+    'readings_finished_update': """CREATE TRIGGER readings_finished_update AFTER UPDATE OF finished_at ON readings BEGIN
+    UPDATE books SET last_finished_at = (SELECT max(finished_at) FROM readings WHERE book_id = NEW.book_id)
+    WHERE id = NEW.book_id;
+END""",
+    'readings_finished_delete': """CREATE TRIGGER readings_finished_delete AFTER DELETE ON readings WHEN OLD.finished_at IS NOT NULL BEGIN
+    UPDATE books SET last_finished_at = (SELECT max(finished_at) FROM readings WHERE book_id = OLD.book_id)
+    WHERE id = OLD.book_id;
+END""",
+}
+
+# Expression indexes; queries must spell the expressions the same way to use them
+INDEXES = {
+    'ix_books_rating': 'coalesce(rating, -1)',
+    'ix_books_year_published': 'coalesce(year_published, -1)',
+    'ix_books_page_count': 'coalesce(page_count, -1)',
+    'ix_books_last_finished_at': "coalesce(last_finished_at, '0001-01-01')",
+    'ix_books_author_nocase': 'author COLLATE NOCASE',
+}
+
+
+def upgrade() -> None:
+    op.add_column('books', sa.Column('rating', sa.Float(), nullable=True))
+    op.add_column('books', sa.Column('last_finished_at', sa.Date(), nullable=True))
+    op.execute(
+        'UPDATE books SET'
+        ' rating = (SELECT rating FROM reviews WHERE reviews.book_id = books.id),'
+        ' last_finished_at = (SELECT max(finished_at) FROM readings WHERE readings.book_id = books.id)'
+    )
+    for name, expression in INDEXES.items():
+        op.create_index(name, 'books', [sa.text(expression)])
+    for trigger in TRIGGERS.values():
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f'DROP TRIGGER {name}')
+    for name in INDEXES:
+        op.drop_index(name, table_name='books')
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.drop_column('last_finished_at')
+        batch_op.drop_column('rating')
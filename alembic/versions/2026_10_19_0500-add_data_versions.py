@@ -0,0 +1,43 @@
+"""add data versions
+
+Revision ID: b5d7f9a13c46
+Revises: a9c3e5f71d28
+Create Date: 2026-10-19 05:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d7f9a13c46'
+down_revision: Union[str, Sequence[str], None] = 'a9c3e5f71d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('books', 'book_tags', 'tags', 'shelves', 'shelf_books', 'reviews', 'readings', 'reading_progress')
+OPERATIONS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def upgrade() -> None:
+    versions = op.create_table(
+        'data_versions',
+        sa.Column('table_name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+    op.bulk_insert(versions, [{'table_name': table, 'version': 0} for table in TABLES])
+    for table in TABLES:
+        for operation in OPERATIONS:
+            op.execute(f"""CREATE TRIGGER {table}_version_{operation.lower()} AFTER {operation} ON {table} BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}';
+END""")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for operation in OPERATIONS:
+            op.execute(f'DROP TRIGGER {table}_version_{operation.lower()}')
+    op.drop_table('data_versions')
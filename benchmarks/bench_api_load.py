@@ -0,0 +1,230 @@
+"""Weighted load against the HTTP API, with latency and query counts per route.
+
+Builds a synthetic library with `benchmarks.library` (or reuses one with
+--db), then runs a fixed number of requests from a weighted mix of the
+real API routes with C concurrent workers. By default it targets the app
+in-process over ASGI, which also counts the SQL statements each request
+issues. With --url it targets a running server, e.g.
+`uvicorn shelflife.app:app`, pointed at the same database; query counts
+are not available then.
+
+Per route it reports requests, throughput, p50/p99 latency, mean queries
+per request and errors.
+
+    python -m benchmarks.bench_api_load --books 10000 --requests 2000 --concurrency 8
+    python -m benchmarks.library --db /tmp/big.db --books 100000 --tags 20000 --progress 1000000
+    python -m benchmarks.bench_api_load --db /tmp/big.db --requests 2000
+    python -m benchmarks.bench_api_load --db /tmp/big.db --url http://127.0.0.1:8000
+    python -m benchmarks.bench_api_load --update-baseline
+
+Results go to benchmarks/results/api_load.json and are compared against
+benchmarks/baselines/api_load.json.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from benchmarks.common import finish, metadata, summarize
+from benchmarks.library import LibrarySample, LibrarySpec
+
+# The current request's statement counter; set per request by the worker
+_queries: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar("queries", default=None)
+
+Request = tuple[str, str, dict]
+
+
+def _routes(lib: LibrarySample) -> list[tuple[str, int, Callable[[random.Random], Request]]]:
+    """(route, weight, request factory). Weights approximate an assistant plus a UI browsing a big library."""
+
+    def book(rng):
+        return rng.choice(lib.books)
+
+    def refs(rng, n):
+        return [{"title": t, "author": a} for _, t, a in rng.sample(lib.books, min(n, len(lib.books)))]
+
+    return [
+        ("GET /api/books", 20, lambda rng: ("GET", "/api/books", {"params": {
+            "limit": 50, "offset": rng.randrange(0, 2000, 50), "sort": rng.choice(["title", "author", "created_at"]),
+        }})),
+        ("GET /api/books?sort=key", 6, lambda rng: ("GET", "/api/books", {"params": {
+            "limit": 50, "sort": rng.choice(["rating", "year_published", "page_count", "finished_at"]), "order": "desc",
+        }})),
+        ("GET /api/books?ranges", 4, lambda rng: ("GET", "/api/books", {"params": {"limit": 50, **rng.choice([
+            {"sort": "rating", "order": "desc", "min_rating": 4},
+            {"sort": "year_published", "min_year": rng.randrange(1850, 2020)},
+            {"min_year": 1950, "max_pages": 400},
+        ])}})),
+        ("GET /api/books?author", 6, lambda rng: ("GET", "/api/books", {"params": {"author": rng.choice(lib.authors)}})),
+        ("GET /api/books?author_match", 4, lambda rng: ("GET", "/api/books", {"params": {
+            "author": rng.choice(lib.authors)[:3], "author_match": "prefix",
+        }})),
+        ("GET /api/books?tag", 6, lambda rng: ("GET", "/api/books", {"params": {"tag": rng.choice(lib.tags)[1]}})),
+        ("GET /api/books?q", 6, lambda rng: ("GET", "/api/books", {"params": {"q": book(rng)[1].split()[1]}})),
+        ("GET /api/books/facets", 4, lambda rng: ("GET", "/api/books/facets", {"params": rng.choice([
+            {}, {"shelf": rng.choice(lib.shelves)[1]}, {"min_rating": 4}, {"tags_any": [rng.choice(lib.tags)[1]]},
+        ])})),
+        ("GET /api/books/search", 4, lambda rng: ("GET", "/api/books/search", {"params": {"title": book(rng)[1]}})),
+        ("GET /api/books/{id}", 15, lambda rng: ("GET", f"/api/books/{book(rng)[0]}", {})),
+        ("GET /api/shelves", 3, lambda rng: ("GET", "/api/shelves", {})),
+        ("GET /api/shelves/{id}", 3, lambda rng: ("GET", f"/api/shelves/{rng.choice(lib.shelves)[0]}", {})),
+        ("GET /api/reviews", 8, lambda rng: ("GET", "/api/reviews", {"params": {
+            "limit": 50, "offset": rng.randrange(0, 1000, 50), **({"min_rating": 4} if rng.random() < 0.5 else {}),
+        }})),
+        ("POST /api/books/bulk-readings", 8, lambda rng: ("POST", "/api/books/bulk-readings", {"json": {
+            "books": refs(rng, 10),
+        }})),
+        ("GET /api/books/{id}/reading/progress", 6, lambda rng: (
+            "GET", f"/api/books/{rng.choice(lib.reading_books)}/reading/progress", {},
+        )),
+        ("GET /api/tags", 2, lambda rng: ("GET", "/api/tags", {})),
+        ("GET /api/tags/{id}/books", 8, lambda rng: ("GET", f"/api/tags/{rng.choice(lib.tags)[0]}/books", {})),
+        ("GET /api/profile", 4, lambda rng: ("GET", "/api/profile", {})),
+        ("PUT /api/books/{id}/review", 3, lambda rng: ("PUT", f"/api/books/{book(rng)[0]}/review", {"json": {
+            "rating": float(rng.randrange(1, 6)),
+        }})),
+    ]
+
+
+async def _worker(http, routes, weights, rng: random.Random, n: int, samples: dict, queries: dict, errors: dict):
+    for _ in range(n):
+        name, _, make = rng.choices(routes, weights)[0]
+        method, path, kwargs = make(rng)
+        counter = [0]
+        _queries.set(counter)
+        start = time.perf_counter()
+        resp = await http.request(method, path, **kwargs)
+        samples.setdefault(name, []).append(time.perf_counter() - start)
+        queries.setdefault(name, []).append(counter[0])
+        if resp.status_code >= 400:
+            errors[name] = errors.get(name, 0) + 1
+
+
+async def run(db_path: Path, url: str | None, requests: int, concurrency: int, seed: int) -> dict:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from benchmarks.library import sample
+    from shelflife.app import create_app
+    from shelflife.database import get_session
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with Session() as session:
+        lib = await sample(session, seed=seed)
+
+    if url:
+        http = AsyncClient(base_url=url, timeout=60)
+    else:
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            counter = _queries.get()
+            if counter is not None:
+                counter[0] += 1
+
+        app = create_app(mount_mcp=False)
+
+        async def override_session():
+            async with Session() as s:
+                yield s
+
+        app.dependency_overrides[get_session] = override_session
+        http = AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+
+    routes = _routes(lib)
+    weights = [w for _, w, _ in routes]
+    samples: dict[str, list[float]] = {}
+    queries: dict[str, list[int]] = {}
+    errors: dict[str, int] = {}
+    per_worker, extra = divmod(requests, concurrency)
+    async with http:
+        # Warm up caches and connections with one of each route
+        rng = random.Random(seed)
+        for _, _, make in routes:
+            method, path, kwargs = make(rng)
+            await http.request(method, path, **kwargs)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _worker(http, routes, weights, random.Random(seed + 1 + w), per_worker + (w < extra),
+                    samples, queries, errors)
+            for w in range(concurrency)
+        ))
+        wall = time.perf_counter() - start
+    await engine.dispose()
+
+    def stats(name: str) -> dict:
+        out = {
+            "requests": len(samples[name]),
+            "per_s": round(len(samples[name]) / wall, 1),
+            "errors": errors.get(name, 0),
+            **summarize(samples[name]),
+        }
+        if not url:
+            out["queries_mean"] = round(statistics.fmean(queries[name]), 2)
+            out["queries_max"] = max(queries[name])
+        return out
+
+    return {
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(requests / wall, 1),
+        "errors": sum(errors.values()),
+        "all": summarize([s for per_route in samples.values() for s in per_route]),
+        "routes": {name: stats(name) for name in sorted(samples)},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, help="Existing library to use; generated into a temp dir if omitted")
+    parser.add_argument("--url", help="Target a running server instead of the in-process ASGI app")
+    parser.add_argument("--books", type=int, default=LibrarySpec.books)
+    parser.add_argument("--tags", type=int, default=LibrarySpec.tags)
+    parser.add_argument("--progress", type=int, default=LibrarySpec.progress)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing")
+    args = parser.parse_args()
+
+    from benchmarks.library import build
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before shelflife.config is first imported
+        os.environ.setdefault("SHELFLIFE_DB_PATH", str(Path(tmp) / "unused.db"))
+        db_path = args.db
+        spec = None
+        if db_path is None:
+            db_path = Path(tmp) / "library.db"
+            spec = LibrarySpec(books=args.books, tags=args.tags, progress=args.progress)
+            start = time.perf_counter()
+            counts = asyncio.run(build(db_path, spec))
+            print(", ".join(f"{n} {t}" for t, n in counts.items()) + f" in {time.perf_counter() - start:.1f}s")
+        results = asyncio.run(run(db_path, args.url, args.requests, args.concurrency, args.seed))
+
+    print(f"\n{results['requests_per_s']} req/s overall, {results['errors']} errors")
+    print(f"{'route':<38} {'n':>5} {'req/s':>7} {'p50':>9} {'p99':>9} {'queries':>8} {'errors':>7}")
+    for name, r in results["routes"].items():
+        print(f"{name:<38} {r['requests']:>5} {r['per_s']:>7} {r['p50_ms']:7.2f}ms {r['p99_ms']:7.2f}ms "
+              f"{r.get('queries_mean', '-'):>8} {r['errors']:>7}")
+
+    label = {"db": str(args.db)} if args.db else {"books": args.books, "tags": args.tags, "progress": args.progress}
+    report = {
+        "meta": metadata(**label, requests=args.requests, concurrency=args.concurrency, target=args.url or "asgi"),
+        "results": results,
+    }
+    return finish("api_load", report, args.update_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
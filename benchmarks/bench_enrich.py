@@ -0,0 +1,128 @@
+"""End-to-end enrichment and import benchmarks against the Open Library stub.
+
+Runs, for each synthetic library size:
+
+- import_then_enrich: `import_goodreads_rows` followed by `enrich_books_batch`
+  (the sequential path)
+- import_with_enrich: the pipelined `import_and_enrich`
+- search_candidates: per-call latency of the lookup search
+
+    python -m benchmarks.bench_enrich --sizes 1000 10000 --latency 5 --jitter 2
+    python -m benchmarks.bench_enrich --update-baseline
+
+Results go to benchmarks/results/enrich.json and are compared against
+benchmarks/baselines/enrich.json.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import finish, metadata, summarize
+from benchmarks.olstub import StubConfig, StubServer
+from benchmarks.synthetic import goodreads_csv
+
+
+async def _fresh_session_factory(db_path: Path):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    import shelflife.models  # noqa: F401
+    from shelflife.database import Base
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def bench_size(n_books: int, workdir: Path, search_calls: int) -> dict:
+    from shelflife.services.enrich_service import enrich_books_batch
+    from shelflife.services.goodreads import parse_goodreads_csv
+    from shelflife.services.import_service import import_goodreads_rows
+    from shelflife.services.openlibrary import search_candidates
+    from shelflife.services.pipeline import import_and_enrich
+
+    rows = parse_goodreads_csv(goodreads_csv(n_books))
+    out: dict = {}
+
+    engine, Session = await _fresh_session_factory(workdir / f"sequential-{n_books}.db")
+    async with Session() as session:
+        start = time.perf_counter()
+        await import_goodreads_rows(session, rows)
+        import_s = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = await enrich_books_batch(session, only_unenriched=True)
+        enrich_s = time.perf_counter() - start
+    await engine.dispose()
+    out["import_then_enrich"] = {
+        "import_s": round(import_s, 3),
+        "enrich_s": round(enrich_s, 3),
+        "wall_s": round(import_s + enrich_s, 3),
+        "enrich_books_per_s": round(batch.total / enrich_s, 2) if enrich_s else None,
+        "enriched": batch.enriched,
+        "failed": batch.failed,
+    }
+
+    engine, Session = await _fresh_session_factory(workdir / f"pipelined-{n_books}.db")
+    async with Session() as session:
+        start = time.perf_counter()
+        result = await import_and_enrich(session, rows)
+        wall_s = time.perf_counter() - start
+    await engine.dispose()
+    out["import_with_enrich"] = {
+        "wall_s": round(wall_s, 3),
+        "books_per_s": round(len(rows) / wall_s, 2),
+        "enriched": result.enrichment.enriched,
+        "failed": result.enrichment.failed,
+        "peak_queue_depth": result.peak_queue_depth,
+    }
+
+    samples = []
+    for row in rows[:search_calls]:
+        start = time.perf_counter()
+        await search_candidates(row.title, row.author)
+        samples.append(time.perf_counter() - start)
+    out["search_candidates"] = summarize(samples)
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--latency", type=float, default=5.0, help="Stub latency in ms")
+    parser.add_argument("--jitter", type=float, default=2.0, help="Stub jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--search-calls", type=int, default=200)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing")
+    args = parser.parse_args()
+
+    stub_config = StubConfig(latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate)
+    with StubServer(stub_config) as stub, tempfile.TemporaryDirectory() as tmp:
+        # Must be set before shelflife.config is first imported
+        os.environ["SHELFLIFE_OL_BASE_URL"] = stub.url
+        os.environ["SHELFLIFE_METADATA_PROVIDERS"] = "openlibrary"
+        os.environ["SHELFLIFE_DB_PATH"] = str(Path(tmp) / "unused.db")
+
+        results = {}
+        for n in args.sizes:
+            print(f"enrich benchmark: {n} books ...", flush=True)
+            results[str(n)] = asyncio.run(bench_size(n, Path(tmp), args.search_calls))
+            print(f"  {results[str(n)]}", flush=True)
+
+        report = {
+            "meta": metadata(
+                stub={"latency_ms": args.latency, "jitter_ms": args.jitter, "error_rate": args.error_rate},
+                stub_requests=stub.stats.requests,
+            ),
+            "results": results,
+        }
+    return finish("enrich", report, args.update_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
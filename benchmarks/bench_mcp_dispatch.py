@@ -0,0 +1,131 @@
+"""Per-tool latency of the MCP tools over ASGI vs direct service dispatch.
+
+Seeds a synthetic library into a temporary database, then calls each MCP
+tool function repeatedly through:
+
+- asgi: ShelflifeClient over httpx ASGITransport into the FastAPI app
+  (the MCP server's previous default)
+- direct: DirectClient calling the service layer in-process
+
+    python -m benchmarks.bench_mcp_dispatch --books 1000 --iterations 200
+    python -m benchmarks.bench_mcp_dispatch --update-baseline
+
+Results go to benchmarks/results/mcp_dispatch.json and are compared against
+benchmarks/baselines/mcp_dispatch.json.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import finish, metadata, summarize
+from benchmarks.synthetic import goodreads_csv
+
+
+def _tool_calls(rows):
+    """(name, coroutine factory) pairs; each factory takes a client."""
+    from shelflife.mcp.tools.discovery import get_books, search_books
+    from shelflife.mcp.tools.profile import reading_profile
+    from shelflife.mcp.tools.reading import get_reading_history
+    from shelflife.mcp.tools.reviews import get_reviews, review_book
+    from shelflife.mcp.tools.shelves import browse_shelf
+    from shelflife.mcp.tools.tags import browse_tag, tag_books
+    from shelflife.mcp.tools.types import BookRef
+
+    refs = [BookRef(title=r.title, author=r.author) for r in rows[:5]]
+    first = rows[0]
+    return [
+        ("search_books", lambda c, i: search_books(c, query="The", limit=20)),
+        ("get_books", lambda c, i: get_books(c, books=refs)),
+        ("browse_shelf_list", lambda c, i: browse_shelf(c)),
+        ("browse_shelf_favorites", lambda c, i: browse_shelf(c, shelf_name="favorites")),
+        ("browse_tag_list", lambda c, i: browse_tag(c)),
+        ("get_reviews", lambda c, i: get_reviews(c, limit=50)),
+        ("reading_profile", lambda c, i: reading_profile(c)),
+        ("get_reading_history", lambda c, i: get_reading_history(c, books=refs)),
+        ("review_book", lambda c, i: review_book(c, first.title, first.author, rating=i % 5 + 1)),
+        ("tag_books", lambda c, i: tag_books(c, tag=f"bench-{i % 10}", books=refs)),
+    ]
+
+
+async def run(n_books: int, iterations: int, db_path: Path) -> dict:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    import shelflife.models  # noqa: F401
+    from shelflife.app import create_app
+    from shelflife.database import Base, get_session
+    from shelflife.mcp.client import ShelflifeClient
+    from shelflife.mcp.direct import DirectClient
+    from shelflife.services.goodreads import parse_goodreads_csv
+    from shelflife.services.import_service import import_goodreads_rows
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    rows = parse_goodreads_csv(goodreads_csv(n_books))
+    async with Session() as session:
+        await import_goodreads_rows(session, rows)
+
+    app = create_app()
+
+    async def override_session():
+        async with Session() as s:
+            yield s
+
+    app.dependency_overrides[get_session] = override_session
+    http = AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+    clients = {"asgi": ShelflifeClient(http), "direct": DirectClient(Session)}
+
+    out: dict = {mode: {} for mode in clients}
+    for name, call in _tool_calls(rows):
+        for mode, client in clients.items():
+            for i in range(5):  # warm up caches and lazily built validators
+                await call(client, i)
+            samples = []
+            for i in range(iterations):
+                start = time.perf_counter()
+                await call(client, i)
+                samples.append(time.perf_counter() - start)
+            out[mode][name] = summarize(samples)
+    await http.aclose()
+    await engine.dispose()
+
+    out["speedup_p50"] = {
+        name: round(out["asgi"][name]["p50_ms"] / out["direct"][name]["p50_ms"], 2)
+        for name in out["asgi"]
+    }
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before shelflife.config is first imported
+        os.environ["SHELFLIFE_DB_PATH"] = str(Path(tmp) / "unused.db")
+        results = asyncio.run(run(args.books, args.iterations, Path(tmp) / "bench.db"))
+
+    width = max(len(name) for name in results["speedup_p50"])
+    print(f"{'tool':<{width}}  asgi p50   direct p50  speedup")
+    for name, speedup in results["speedup_p50"].items():
+        asgi, direct = results["asgi"][name]["p50_ms"], results["direct"][name]["p50_ms"]
+        print(f"{name:<{width}}  {asgi:7.2f}ms  {direct:8.2f}ms  {speedup:5.2f}x")
+
+    report = {"meta": metadata(books=args.books, iterations=args.iterations), "results": results}
+    return finish("mcp_dispatch", report, args.update_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
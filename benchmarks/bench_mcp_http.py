@@ -0,0 +1,140 @@
+"""Many concurrent MCP clients against one streamable-HTTP server process.
+
+Seeds a synthetic library into a temporary database, serves the MCP server
+over streamable HTTP with uvicorn, then opens N client sessions at once and
+has each make a fixed number of tool calls from a read-heavy mix. Reports
+latency per tool and overall, and total throughput, for each client count.
+
+    python -m benchmarks.bench_mcp_http --books 1000 --clients 1 8 32 --calls 20
+    python -m benchmarks.bench_mcp_http --update-baseline
+
+Results go to benchmarks/results/mcp_http.json and are compared against
+benchmarks/baselines/mcp_http.json.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import finish, metadata, summarize
+from benchmarks.synthetic import goodreads_csv
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _tool_mix(rows) -> list[tuple[str, dict]]:
+    refs = [{"title": r.title, "author": r.author} for r in rows[:5]]
+    first = rows[0]
+    return [
+        ("search_books", {"query": "The", "limit": 20}),
+        ("get_books", {"books": refs}),
+        ("browse_shelf", {}),
+        ("reading_profile", {}),
+        ("get_reviews", {"limit": 50}),
+        ("browse_tag", {}),
+        ("get_reading_history", {"books": refs}),
+        ("review_book", {"title": first.title, "author": first.author, "rating": 4}),
+    ]
+
+
+async def _client_session(url: str, mix, calls: int, offset: int, samples: dict, errors: list) -> None:
+    from fastmcp import Client
+
+    async with Client(url) as client:
+        for i in range(calls):
+            name, args = mix[(offset + i) % len(mix)]
+            start = time.perf_counter()
+            result = await client.call_tool(name, args, raise_on_error=False)
+            samples.setdefault(name, []).append(time.perf_counter() - start)
+            if result.is_error:
+                errors.append(name)
+
+
+async def run(n_books: int, client_counts: list[int], calls: int, db_path: Path) -> dict:
+    import uvicorn
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    import shelflife.models  # noqa: F401
+    from shelflife.database import Base
+    from shelflife.mcp.direct import DirectClient
+    from shelflife.mcp.server import create_mcp_server
+    from shelflife.services.goodreads import parse_goodreads_csv
+    from shelflife.services.import_service import import_goodreads_rows
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    rows = parse_goodreads_csv(goodreads_csv(n_books))
+    async with Session() as session:
+        await import_goodreads_rows(session, rows)
+
+    port = _free_port()
+    app = create_mcp_server(DirectClient(Session)).http_app(path="/mcp")
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    url = f"http://127.0.0.1:{port}/mcp"
+    mix = _tool_mix(rows)
+
+    out: dict = {}
+    try:
+        await _client_session(url, mix, len(mix), 0, {}, [])  # warm up
+        for n in client_counts:
+            samples: dict[str, list[float]] = {}
+            errors: list[str] = []
+            start = time.perf_counter()
+            await asyncio.gather(*(_client_session(url, mix, calls, c, samples, errors) for c in range(n)))
+            elapsed = time.perf_counter() - start
+            out[f"clients_{n}"] = {
+                "wall_s": round(elapsed, 3),
+                "calls_per_s": round(n * calls / elapsed, 1),
+                "errors": len(errors),
+                "all": summarize([s for per_tool in samples.values() for s in per_tool]),
+                "tools": {name: summarize(per_tool) for name, per_tool in samples.items()},
+            }
+    finally:
+        server.should_exit = True
+        await serving
+        await engine.dispose()
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=20, help="Tool calls per client session")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before shelflife.config is first imported
+        os.environ["SHELFLIFE_DB_PATH"] = str(Path(tmp) / "unused.db")
+        results = asyncio.run(run(args.books, args.clients, args.calls, Path(tmp) / "bench.db"))
+
+    print("clients  calls/s   p50       p95       errors")
+    for key, r in results.items():
+        n = key.removeprefix("clients_")
+        print(f"{n:>7}  {r['calls_per_s']:7.1f}  {r['all']['p50_ms']:7.2f}ms  {r['all']['p95_ms']:7.2f}ms  {r['errors']}")
+
+    report = {"meta": metadata(books=args.books, calls=args.calls), "results": results}
+    failed = finish("mcp_http", report, args.update_baseline, args.tolerance)
+    return failed or int(any(r["errors"] for r in results.values()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Bytes per MCP tool result under each book view, and the API's `fields=` projection.
+
+Seeds a synthetic library into a temporary database, gives every book a
+Goodreads-length description and a cover URL, then serializes the results of
+search_books, browse_shelf and browse_tag as the MCP server would send them:
+
+- full: every BookResponse field (the previous behaviour)
+- compact: title, author, year, pages and a truncated description (the default)
+- compact_table: compact, encoded as {"columns", "rows"}
+- minimal: title and author
+
+Also reports response bytes and latency of the API's book list endpoints
+(`GET /api/books`, `/api/books/search`, a tag's books and a shelf) with the
+default columns, every column including descriptions (`fields=` with all
+of them), and `fields=title,author,cover_url`.
+
+    python -m benchmarks.bench_mcp_payload --books 1000 --limit 50
+    python -m benchmarks.bench_mcp_payload --update-baseline
+
+Results go to benchmarks/results/mcp_payload.json and are compared against
+benchmarks/baselines/mcp_payload.json.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import finish, metadata, summarize
+from benchmarks.synthetic import goodreads_csv
+
+VIEWS = {
+    "full": {"view": "full"},
+    "compact": {"view": "compact"},
+    "compact_table": {"view": "compact", "table": True},
+    "minimal": {"view": "minimal"},
+}
+WORDS = "the of a in to and was his her that with as for on by at from their which into".split()
+
+
+def _description(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randrange(150, 400))).capitalize() + "."
+
+
+async def run(n_books: int, limit: int, iterations: int, db_path: Path) -> dict:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    import shelflife.models  # noqa: F401
+    from shelflife.app import create_app
+    from shelflife.database import Base, get_session
+    from shelflife.mcp.direct import DirectClient
+    from shelflife.mcp.tools.discovery import search_books
+    from shelflife.mcp.tools.shelves import browse_shelf
+    from shelflife.mcp.tools.tags import browse_tag, tag_books
+    from shelflife.mcp.tools.types import BookRef
+    from shelflife.models import Book
+    from shelflife.schemas.book import BookResponse
+    from shelflife.services.goodreads import parse_goodreads_csv
+    from shelflife.services.import_service import import_goodreads_rows
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    rows = parse_goodreads_csv(goodreads_csv(n_books))
+    async with Session() as session:
+        await import_goodreads_rows(session, rows)
+        rng = random.Random(7)
+        for book in (await session.execute(select(Book))).scalars():
+            book.description = _description(rng)
+            book.cover_url = f"https://covers.openlibrary.org/b/id/{rng.randrange(10**8)}-L.jpg"
+        await session.commit()
+
+    client = DirectClient(Session)
+    await tag_books(client, tag="bench", books=[BookRef(title=r.title, author=r.author) for r in rows[:limit]])
+    tools = {
+        "search_books": lambda **kw: search_books(client, limit=limit, **kw),
+        "browse_shelf": lambda **kw: browse_shelf(client, shelf_name="read", **kw),
+        "browse_tag": lambda **kw: browse_tag(client, tag_name="bench", **kw),
+    }
+
+    out: dict = {}
+    for tool, call in tools.items():
+        out[tool] = {}
+        for view, kwargs in VIEWS.items():
+            result = await call(**kwargs)
+            # browse_shelf nests books in the shelf; lists with more pages come as {"books", "next_cursor"}
+            books = result["books"] if isinstance(result, dict) and "books" in result else result
+            n = len(books["rows"]) if isinstance(books, dict) else len(books)
+            size = len(json.dumps(result, ensure_ascii=False).encode())
+            out[tool][view] = {"books": n, "result_bytes": size, "per_book_bytes": round(size / max(n, 1), 1)}
+
+    app = create_app(mount_mcp=False)
+
+    async def override_session():
+        async with Session() as s:
+            yield s
+
+    app.dependency_overrides[get_session] = override_session
+    endpoints = {
+        "api_list_books": ("/api/books", {"limit": limit}),
+        "api_search_books": ("/api/books/search", {"title": "the", "limit": limit}),
+        "api_tag_books": ("/api/tags/by-name/bench/books", {"limit": limit}),
+        "api_shelf": ("/api/shelves/by-name/read", {}),
+    }
+    variants = {
+        "default": {},
+        "all_fields": {"fields": ",".join(BookResponse.model_fields)},
+        "title_author_cover": {"fields": "title,author,cover_url"},
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as http:
+        for endpoint, (path, base) in endpoints.items():
+            out[endpoint] = {}
+            for name, params in variants.items():
+                samples = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    resp = await http.get(path, params={**base, **params})
+                    samples.append(time.perf_counter() - start)
+                out[endpoint][name] = {"response_bytes": len(resp.content), **summarize(samples)}
+
+    await engine.dispose()
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=50, help="Books per search_books call and tagged for browse_tag")
+    parser.add_argument("--iterations", type=int, default=100, help="API calls timed per variant")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before shelflife.config is first imported
+        os.environ["SHELFLIFE_DB_PATH"] = str(Path(tmp) / "unused.db")
+        results = asyncio.run(run(args.books, args.limit, args.iterations, Path(tmp) / "bench.db"))
+
+    print(f"{'tool':<14} {'view':<14} {'books':>5} {'bytes':>8} {'per book':>9}")
+    for tool in ("search_books", "browse_shelf", "browse_tag"):
+        for view, r in results[tool].items():
+            print(f"{tool:<14} {view:<14} {r['books']:>5} {r['result_bytes']:>8} {r['per_book_bytes']:>9}")
+    for endpoint in ("api_list_books", "api_search_books", "api_tag_books", "api_shelf"):
+        for name, r in results[endpoint].items():
+            print(f"{endpoint:<17} {name:<19} {r['response_bytes']:>8} bytes  p50 {r['p50_ms']:6.2f}ms")
+
+    report = {"meta": metadata(books=args.books, limit=args.limit, iterations=args.iterations), "results": results}
+    return finish("mcp_payload", report, args.update_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
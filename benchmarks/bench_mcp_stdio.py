@@ -0,0 +1,195 @@
+"""End-to-end MCP tool latency over stdio, as an assistant sees it.
+
+For each library size, seeds a synthetic library into a migrated database,
+launches `python -m shelflife.mcp` as a subprocess over stdio and drives
+scripted sessions through it: JSON-RPC over the pipe, tool dispatch (direct
+services or the in-process ASGI API), SQLite and back. Reports:
+
+- startup: spawn to initialized session, and to the first tool result
+- per-tool p50/p95/p99 across all sessions
+- server RSS after the run and its peak (VmRSS/VmHWM, Linux only)
+
+Sessions mimic how an assistant uses the tools: orienting itself (profile,
+shelves, a search), looking books up, recording reviews and tags, and
+logging reading progress.
+
+    python -m benchmarks.bench_mcp_stdio --sizes 1000 10000 --rounds 20
+    python -m benchmarks.bench_mcp_stdio --sizes 100000 --dispatch direct
+    python -m benchmarks.bench_mcp_stdio --update-baseline
+
+Results go to benchmarks/results/mcp_stdio.json and are compared against
+benchmarks/baselines/mcp_stdio.json.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import finish, metadata, summarize
+from benchmarks.synthetic import goodreads_csv
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _env(db_path: Path, dispatch: str) -> dict:
+    return {
+        **os.environ,
+        "SHELFLIFE_DB_PATH": str(db_path),
+        "SHELFLIFE_MCP_DISPATCH": dispatch,
+        "PYTHONPATH": str(ROOT),
+    }
+
+
+def _sessions(rows, round_: int) -> list[list[tuple[str, dict]]]:
+    """Tool-call sequences for one round; `round_` varies the books and values touched."""
+    n = len(rows)
+    pick = [rows[(round_ * 7 + k * 13) % n] for k in range(5)]
+    refs = [{"title": r.title, "author": r.author} for r in pick]
+    first, second = pick[0], pick[1]
+    word = first.title.split()[1]
+    return [
+        [  # orient: what's in the library?
+            ("reading_profile", {}),
+            ("browse_shelf", {}),
+            ("browse_shelf", {"shelf_name": "currently-reading"}),
+            ("search_books", {"query": word, "limit": 20}),
+            ("get_books", {"books": refs[:3]}),
+        ],
+        [  # look a book up, then record an opinion about it
+            ("search_books", {"author": first.author}),
+            ("get_books", {"books": refs[:1]}),
+            ("review_book", {"title": first.title, "author": first.author, "rating": round_ % 5 + 1}),
+            ("tag_books", {"tag": f"bench-{round_ % 5}", "books": refs}),
+            ("browse_tag", {"tag_name": f"bench-{round_ % 5}"}),
+            ("get_reviews", {"limit": 20}),
+        ],
+        [  # reading progress on a book
+            ("shelve_book", {"title": second.title, "author": second.author, "shelf": "currently-reading"}),
+            ("start_reading", {"title": second.title, "author": second.author}),
+            ("log_reading_progress", {"title": second.title, "author": second.author, "pages_read": 20}),
+            ("finish_reading", {"title": second.title, "author": second.author}),
+            ("get_reading_history", {"books": refs[1:2]}),
+            ("shelve_book", {"title": second.title, "author": second.author, "shelf": "read"}),
+        ],
+    ]
+
+
+def _server_pid() -> int | None:
+    """The most recently started child of this process: the stdio server."""
+    me = str(os.getpid())
+    children = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if fields[1] == me:
+            children.append(int(stat.parent.name))
+    return max(children) if children else None
+
+
+def _memory_mb(pid: int | None) -> dict:
+    if pid is None:
+        return {}
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return {}
+    kb = {line.split(":")[0]: int(line.split()[1]) for line in status.splitlines() if line.startswith(("VmRSS", "VmHWM"))}
+    return {"rss_mb": round(kb.get("VmRSS", 0) / 1024, 1), "peak_rss_mb": round(kb.get("VmHWM", 0) / 1024, 1)}
+
+
+def _seed(n_books: int, db_path: Path) -> list:
+    subprocess.run(
+        [sys.executable, "-m", "shelflife.migrations"], env=_env(db_path, "direct"), cwd=ROOT, check=True
+    )
+
+    async def load():
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+        from shelflife.services.goodreads import parse_goodreads_csv
+        from shelflife.services.import_service import import_goodreads_rows
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        rows = parse_goodreads_csv(goodreads_csv(n_books))
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            await import_goodreads_rows(session, rows)
+        await engine.dispose()
+        return rows
+
+    return asyncio.run(load())
+
+
+async def _drive(db_path: Path, dispatch: str, rows, rounds: int) -> dict:
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    transport = StdioTransport(
+        command=sys.executable, args=["-m", "shelflife.mcp"], env=_env(db_path, dispatch), cwd=str(ROOT)
+    )
+    samples: dict[str, list[float]] = {}
+    errors: list[str] = []
+    start = time.perf_counter()
+    async with Client(transport) as client:
+        initialized = time.perf_counter() - start
+        await client.call_tool("reading_profile", {})
+        first_tool = time.perf_counter() - start
+        pid = _server_pid()
+        for round_ in range(rounds):
+            for session in _sessions(rows, round_):
+                for name, args in session:
+                    t = time.perf_counter()
+                    result = await client.call_tool(name, args, raise_on_error=False)
+                    samples.setdefault(name, []).append(time.perf_counter() - t)
+                    if result.is_error:
+                        errors.append(name)
+        memory = _memory_mb(pid)
+
+    return {
+        "startup": {"initialize_s": round(initialized, 3), "first_tool_s": round(first_tool, 3)},
+        "memory": memory,
+        "errors": len(errors),
+        "all": summarize([s for per_tool in samples.values() for s in per_tool]),
+        "tools": {name: summarize(per_tool) for name, per_tool in sorted(samples.items())},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--dispatch", nargs="+", choices=["direct", "asgi"], default=["direct", "asgi"])
+    parser.add_argument("--rounds", type=int, default=20, help="Times each scripted session is replayed")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing")
+    args = parser.parse_args()
+
+    results: dict = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            db_path = Path(tmp) / f"books-{n}" / "shelflife.db"
+            start = time.perf_counter()
+            rows = _seed(n, db_path)
+            print(f"seeded {n} books in {time.perf_counter() - start:.1f}s")
+            for dispatch in args.dispatch:
+                results[f"books_{n}_{dispatch}"] = asyncio.run(_drive(db_path, dispatch, rows, args.rounds))
+
+    for key, r in results.items():
+        print(f"\n{key}: startup {r['startup']['first_tool_s']:.2f}s to first tool, "
+              f"rss {r['memory'].get('rss_mb', '?')} MB (peak {r['memory'].get('peak_rss_mb', '?')} MB), "
+              f"{r['errors']} errors")
+        print(f"  {'tool':<22} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for name, s in [("(all)", r["all"]), *r["tools"].items()]:
+            print(f"  {name:<22} {s['p50_ms']:7.2f}ms {s['p95_ms']:7.2f}ms {s['p99_ms']:7.2f}ms")
+
+    report = {"meta": metadata(sizes=args.sizes, rounds=args.rounds), "results": results}
+    failed = finish("mcp_stdio", report, args.update_baseline, args.tolerance)
+    return failed or int(any(r["errors"] for r in results.values()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Micro-benchmarks for pure-Python functions on hot paths.
+
+Each case runs a fixed, seeded fixture through one function with timeit
+and reports the best of several repeats as microseconds per operation
+(per id, per CSV row, per date string, per match, per book), so numbers
+are comparable across fixture sizes.
+
+- make_id: title+author ids, the same few ids repeatedly (shelf names,
+  by-name lookups), and the batched form used by imports and bulk lookups
+- normalize: the per-part normalization inside make_id
+- parse_goodreads_csv: a 2,000-row export
+- extract_year: Open Library / Google Books publish dates
+- pick_best_match: scoring a page of 50 search results
+- book_detail: building a BookDetail from a loaded Book, and dumping it to JSON
+- autocomplete: prefix lookups in a 100,000-title index, and adding a title to it
+
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --update-baseline
+
+Results go to benchmarks/results/micro.json and are compared against
+benchmarks/baselines/micro.json.
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from benchmarks.common import finish, metadata
+from benchmarks.synthetic import author_name, book_title, goodreads_csv
+
+UNICODE_TITLES = [
+    ("Cien años de soledad", "Gabriel García Márquez"),
+    ("Les Misérables", "Victor Hugo"),
+    ("Война и мир", "Лев Толстой"),
+    ("ノルウェイの森", "村上春樹"),
+    ("Der Zauberberg", "Thomas Mann"),
+]
+PUBLISH_DATES = [
+    "1965", "August 1, 1965", "2005-08-02", "c1999", "Sept. 1987", "[1923?]", "2019-05", None, "", "n.d.",
+]
+
+
+def _pairs(n: int) -> list[tuple[str, str]]:
+    rng = random.Random(1)
+    pairs = [(book_title(rng, i), author_name(rng, max(1, n // 4))) for i in range(n)]
+    return pairs + UNICODE_TITLES
+
+
+def _docs(title: str, author: str, n: int) -> list[dict]:
+    rng = random.Random(2)
+    docs = []
+    for i in range(n):
+        variant = rng.choice([title, f"{title}: A Novel", f"The {i} Things", title.upper(), "Unrelated"])
+        docs.append({
+            "title": variant,
+            "author_name": [rng.choice([author, "Someone Else", author.split()[-1]])] + ["Editor"] * (i % 2),
+            "cover_i": rng.choice([None, 12345]),
+            "number_of_pages_median": rng.choice([None, 320]),
+        })
+    return docs
+
+
+def _book():
+    from shelflife.models import Book, Review, Shelf, ShelfBook, Tag
+
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    book = Book(
+        id=1, title="Dune", author="Frank Herbert", isbn13="9780441172719", publisher="Ace", page_count=688,
+        year_published=1965, description="Spice. " * 100, cover_url="https://covers.example/1.jpg",
+        goodreads_id="234225", open_library_key="/works/OL893415W", created_at=now, updated_at=now,
+    )
+    book.tags = [Tag(id=i, name=f"tag-{i}", book_count=1) for i in range(8)]
+    book.shelf_links = [
+        ShelfBook(id=i, shelf_id=i, book_id=1, date_added=now,
+                  shelf=Shelf(id=i, name=f"shelf-{i}", is_exclusive=i == 0, book_count=1, created_at=now))
+        for i in range(3)
+    ]
+    book.review = Review(id=1, book_id=1, rating=4.5, review_text="Great.", created_at=now, updated_at=now)
+    return book
+
+
+def _cases() -> list[tuple[str, Callable[[], object], int]]:
+    """(name, callable, operations per call)."""
+    from shelflife import id as ids
+    from shelflife.services.books import to_detail
+    from shelflife.services.goodreads import parse_goodreads_csv
+    from shelflife.services.openlibrary import _extract_year, _pick_best_match
+
+    pairs = _pairs(1000)
+    repeated = pairs[:20] * 50
+    parts = [part for pair in pairs for part in pair]
+    csv_content = goodreads_csv(2000)
+    docs = _docs("The Silent River 7", "Ada Abbott 3", 50)
+    book = _book()
+    detail = to_detail(book)
+
+    clear = getattr(ids.make_id, "cache_clear", lambda: None)
+
+    def make_id_unique():
+        clear()  # distinct ids every time, so memoization can't help
+        for title, author in pairs:
+            ids.make_id(title, author)
+
+    def make_id_repeated():
+        for title, author in repeated:
+            ids.make_id(title, author)
+
+    def normalize():
+        for part in parts:
+            ids._normalize(part)
+
+    def extract_year():
+        for value in PUBLISH_DATES:
+            _extract_year(value)
+
+    cases = [
+        ("make_id_unique", make_id_unique, len(pairs)),
+        ("make_id_repeated", make_id_repeated, len(repeated)),
+        ("normalize", normalize, len(parts)),
+        ("parse_goodreads_csv", lambda: parse_goodreads_csv(csv_content), 2000),
+        ("extract_year", extract_year, len(PUBLISH_DATES)),
+        ("pick_best_match", lambda: _pick_best_match(docs, "The Silent River 7", "Ada Abbott 3"), 1),
+        ("book_detail_build", lambda: to_detail(book), 1),
+        ("book_detail_dump", lambda: detail.model_dump(mode="json"), 1),
+    ]
+    try:
+        from shelflife.services.autocomplete import _Names
+    except ImportError:
+        _Names = None
+    if _Names is not None:
+        rng = random.Random(3)
+        titles = _Names()
+        titles.load({i: book_title(rng, i) for i in range(100_000)}, words=True)
+        prefixes = ["t", "the s", "silent riv", "river 12", "zz"] * 4
+
+        def autocomplete_search():
+            for prefix in prefixes:
+                titles.search(prefix, 10)
+
+        def autocomplete_add():
+            titles.add(-1, "The Silent River of Time", words=True)
+            titles.remove(-1)
+
+        cases += [
+            ("autocomplete_search", autocomplete_search, len(prefixes)),
+            ("autocomplete_add", autocomplete_add, 1),
+        ]
+    if hasattr(ids, "make_ids"):
+        def make_ids_batch():
+            clear()
+            ids.make_ids(pairs)
+
+        cases.insert(2, ("make_ids_batch", make_ids_batch, len(pairs)))
+    return cases
+
+
+def measure(fn: Callable[[], object], ops: int, repeat: int, min_time: float) -> float:
+    """Best-of-`repeat` microseconds per operation, each repeat running at least `min_time` seconds."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number / ops * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat")
+    parser.add_argument("--only", nargs="+", help="Run only these cases")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing")
+    args = parser.parse_args()
+
+    results = {}
+    for name, fn, ops in _cases():
+        if args.only and name not in args.only:
+            continue
+        results[name] = {"per_op_us": round(measure(fn, ops, args.repeat, args.min_time), 4)}
+        print(f"{name:<22} {results[name]['per_op_us']:10.3f} us/op")
+
+    report = {"meta": metadata(repeat=args.repeat), "results": results}
+    return finish("micro", report, args.update_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Cold-start latency of the MCP and API entry points.
+
+Each sample launches a fresh interpreter, as an assistant session or a
+container start would:
+
+- mcp_first_tool: `python -m shelflife.mcp` over stdio until the first tool
+  call (reading_profile) returns
+- http_first_response: `python -m shelflife.migrations && uvicorn ...`
+  until the first `GET /api/books/stats` answers
+- alembic_at_head: `alembic upgrade head` on an up-to-date database, the
+  per-launch cost the schema-version fast path skips
+
+`fresh` starts from an empty data directory (migrations run); `at_head`
+reuses a migrated database, the common case.
+
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --update-baseline
+
+Results go to benchmarks/results/startup.json and are compared against
+benchmarks/baselines/startup.json.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import finish, metadata, summarize
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _env(db_path: Path) -> dict:
+    return {**os.environ, "SHELFLIFE_DB_PATH": str(db_path), "PYTHONPATH": str(ROOT)}
+
+
+async def _mcp_first_tool(db_path: Path) -> float:
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    transport = StdioTransport(command=sys.executable, args=["-m", "shelflife.mcp"], env=_env(db_path), cwd=str(ROOT))
+    start = time.perf_counter()
+    async with Client(transport) as client:
+        result = await client.call_tool("reading_profile", {})
+        elapsed = time.perf_counter() - start
+    assert not result.is_error, result
+    return elapsed
+
+
+async def _http_first_response(db_path: Path) -> float:
+    import httpx
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    cmd = f"{sys.executable} -m shelflife.migrations && exec {sys.executable} -m uvicorn shelflife.app:app --port {port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        ["sh", "-c", cmd], env=_env(db_path), cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        async with httpx.AsyncClient() as client:
+            while True:
+                try:
+                    resp = await client.get(f"http://127.0.0.1:{port}/api/books/stats")
+                    if resp.status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None:
+                    raise RuntimeError("API process exited before answering")
+                await asyncio.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _alembic_at_head(db_path: Path) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        env=_env(db_path), cwd=ROOT, check=True, capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+async def run(runs: int, tmp: Path) -> dict:
+    out: dict = {}
+    for name, probe in (("mcp_first_tool", _mcp_first_tool), ("http_first_response", _http_first_response)):
+        fresh, at_head = [], []
+        for i in range(runs):
+            db_path = tmp / f"{name}-{i}" / "shelflife.db"
+            fresh.append(await probe(db_path))
+            at_head.append(await probe(db_path))
+        out[name] = {"fresh": summarize(fresh), "at_head": summarize(at_head)}
+
+    db_path = tmp / "mcp_first_tool-0" / "shelflife.db"
+    out["alembic_at_head"] = summarize([_alembic_at_head(db_path) for _ in range(runs)])
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(args.runs, Path(tmp)))
+
+    for name in ("mcp_first_tool", "http_first_response"):
+        for state in ("fresh", "at_head"):
+            print(f"{name:<20} {state:<8} p50 {results[name][state]['p50_ms']:8.1f}ms")
+    print(f"{'alembic_at_head':<29} p50 {results['alembic_at_head']['p50_ms']:8.1f}ms  (skipped when at head)")
+
+    report = {"meta": metadata(runs=args.runs), "results": results}
+    return finish("startup", report, args.update_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
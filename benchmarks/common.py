@@ -0,0 +1,110 @@
+"""Shared helpers for the benchmark scripts: timing stats and baseline files."""
+
+import json
+import platform
+import statistics
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Metrics where larger is better; everything else is treated as a duration/size.
+HIGHER_IS_BETTER = ("per_s", "throughput")
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+
+    def q(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": q(0.50),
+        "p95_ms": q(0.95),
+        "p99_ms": q(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def metadata(**extra) -> dict:
+    return {
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def _flatten(data: dict, prefix: str = "") -> dict[str, float]:
+    out = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            out[name] = float(value)
+    return out
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return human-readable regressions of `current` against `baseline`.
+
+    Only timing/size metrics (`*_ms`, `*_us`, `*_s`, `*_bytes`) and throughput
+    metrics (`*per_s`) present in both are compared. `max_ms` is a single
+    sample and too noisy to gate on.
+    """
+    cur = _flatten(current)
+    base = _flatten(baseline)
+    regressions = []
+    for name, base_value in sorted(base.items()):
+        if name not in cur or base_value == 0:
+            continue
+        leaf = name.rsplit(".", 1)[-1]
+        if leaf == "max_ms":
+            continue
+        if leaf.endswith(HIGHER_IS_BETTER):
+            change = (base_value - cur[name]) / base_value
+        elif leaf.endswith(("_ms", "_us", "_s", "_bytes")):
+            change = (cur[name] - base_value) / base_value
+        else:
+            continue
+        if change > tolerance:
+            regressions.append(f"{name}: {base_value:g} -> {cur[name]:g} ({change:+.0%})")
+    return regressions
+
+
+def finish(name: str, results: dict, update_baseline: bool, tolerance: float) -> int:
+    """Write results, optionally update the baseline, and report regressions.
+
+    Returns a process exit code: 1 if any metric regressed beyond tolerance.
+    """
+    write_json(RESULTS_DIR / f"{name}.json", results)
+    baseline_path = BASELINES_DIR / f"{name}.json"
+    if update_baseline:
+        write_json(baseline_path, results)
+        print(f"baseline updated: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --update-baseline to create one")
+        return 0
+    baseline = json.loads(baseline_path.read_text())
+    regressions = compare(results.get("results", {}), baseline.get("results", {}), tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {tolerance:.0%} vs {baseline_path.name}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"no regressions beyond {tolerance:.0%} vs {baseline_path.name}")
+    return 0
@@ -0,0 +1,218 @@
+"""Deterministic synthetic libraries written straight into a database.
+
+`synthetic.goodreads_csv` exercises the importer; this module is for
+libraries far larger than anyone would import. It bulk-inserts every table
+through the ORM models (books, shelves, tags, reviews, readings and
+progress) in chunks, with the ids the services would assign, so the API
+sees exactly what it would after years of use. The same spec and seed
+always produce the same rows.
+
+Tag popularity and books per tag are skewed like real libraries: a few
+tags cover much of the library and most tags have a handful of books.
+Every book sits on one exclusive shelf and up to two others. Books on
+"read" have a finished reading, and books on "currently-reading" have an
+open one. Progress rows are spread across those readings, one per day.
+
+    python -m benchmarks.library --db /tmp/bench.db --books 100000 --tags 20000 --progress 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from benchmarks.synthetic import EXCLUSIVE, SHELVES, WORDS, author_name, book_title
+
+CHUNK = 5000
+TAG_WORDS = [
+    "classic", "modern", "epic", "cozy", "dark", "literary", "historical", "political", "space", "urban",
+    "gothic", "coming-of-age", "mystery", "romance", "war", "nature", "science", "philosophy", "travel", "memoir",
+]
+
+
+@dataclass(frozen=True)
+class LibrarySpec:
+    books: int = 10_000
+    tags: int = 2_000
+    progress: int = 100_000
+    seed: int = 42
+    max_tags_per_book: int = 6
+    review_fraction: float = 0.4
+
+
+@dataclass(frozen=True)
+class LibrarySample:
+    """Ids and names a load driver can address, read back from the database."""
+
+    books: list[tuple[int, str, str]]
+    shelves: list[tuple[int, str]]
+    tags: list[tuple[int, str]]
+    reading_books: list[int]  # books with an open reading
+    authors: list[str]
+
+
+def tag_name(k: int) -> str:
+    return f"{TAG_WORDS[k % len(TAG_WORDS)]}-{WORDS[(k // len(TAG_WORDS)) % len(WORDS)].lower()}-{k}"
+
+
+def _skewed(rng: random.Random, n: int) -> int:
+    """An index in [0, n) where low indexes are much more likely."""
+    return min(n - 1, int(n * rng.random() ** 3))
+
+
+async def _insert(session, model, rows: list[dict]) -> None:
+    from sqlalchemy import insert
+
+    for start in range(0, len(rows), CHUNK):
+        await session.execute(insert(model), rows[start:start + CHUNK])
+
+
+async def generate(session, spec: LibrarySpec) -> dict[str, int]:
+    """Insert a library described by `spec` into an empty, migrated database. Returns row counts."""
+    from shelflife.id import make_id
+    from shelflife.models import Book, BookTag, Reading, ReadingProgress, Review, Shelf, ShelfBook, Tag
+
+    rng = random.Random(spec.seed)
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    n_authors = max(1, spec.books // 4)
+
+    shelf_ids = {name: make_id(name) for name in ["read", "to-read", "currently-reading", *SHELVES]}
+    await _insert(session, Shelf, [
+        {"id": shelf_id, "name": name, "is_exclusive": name in EXCLUSIVE, "created_at": now}
+        for name, shelf_id in shelf_ids.items()
+    ])
+    tag_ids = [make_id(tag_name(k)) for k in range(spec.tags)]
+    await _insert(session, Tag, [{"id": tag_id, "name": tag_name(k)} for k, tag_id in enumerate(tag_ids)])
+
+    books, links, book_tags, reviews, readings = [], [], [], [], []
+    for i in range(spec.books):
+        title, author = book_title(rng, i), author_name(rng, n_authors)
+        book_id = make_id(title, author)
+        added = now - timedelta(days=rng.randrange(3650), seconds=rng.randrange(86400))
+        books.append({
+            "id": book_id,
+            "title": title,
+            "author": author,
+            "isbn13": f"978{i:010d}" if rng.random() < 0.6 else None,
+            "publisher": f"Publisher {rng.randrange(200)}",
+            "page_count": rng.randrange(80, 900),
+            "year_published": rng.randrange(1850, 2026),
+            "description": " ".join(rng.choice(WORDS).lower() for _ in range(rng.randrange(20, 60))),
+            "created_at": added,
+            "updated_at": added,
+        })
+
+        exclusive = rng.choice(EXCLUSIVE)
+        for name in [exclusive, *rng.sample(SHELVES, rng.randrange(0, 3))]:
+            links.append({
+                "id": make_id(shelf_ids[name], book_id), "shelf_id": shelf_ids[name], "book_id": book_id,
+                "date_added": added,
+            })
+        if spec.tags:
+            for tag_index in {_skewed(rng, spec.tags) for _ in range(rng.randrange(spec.max_tags_per_book + 1))}:
+                book_tags.append({"book_id": book_id, "tag_id": tag_ids[tag_index]})
+        if rng.random() < spec.review_fraction:
+            reviews.append({
+                "id": make_id(book_id), "book_id": book_id, "rating": float(rng.randrange(1, 6)),
+                "review_text": "Loved it." if rng.random() < 0.3 else None, "created_at": added, "updated_at": added,
+            })
+        if exclusive in ("read", "currently-reading"):
+            started = added.date() + timedelta(days=rng.randrange(1, 60))
+            finished = started + timedelta(days=rng.randrange(3, 90)) if exclusive == "read" else None
+            readings.append({
+                "id": make_id(book_id, str(started)), "book_id": book_id, "started_at": started,
+                "finished_at": finished, "created_at": added, "updated_at": added,
+            })
+
+    await _insert(session, Book, books)
+    await _insert(session, ShelfBook, links)
+    await _insert(session, BookTag, book_tags)
+    await _insert(session, Review, reviews)
+    await _insert(session, Reading, readings)
+
+    n_progress = 0
+    if readings and spec.progress:
+        per_reading, extra = divmod(spec.progress, len(readings))
+        progress = []
+        for k, reading in enumerate(readings):
+            page = 0
+            for day in range(per_reading + (k < extra)):
+                progress_date = reading["started_at"] + timedelta(days=day)
+                page += rng.randrange(5, 40)
+                progress.append({
+                    "id": make_id(reading["id"], str(progress_date)), "reading_id": reading["id"], "page": page,
+                    "date": progress_date, "created_at": now,
+                })
+            if len(progress) >= CHUNK * 4:
+                await _insert(session, ReadingProgress, progress)
+                n_progress += len(progress)
+                progress = []
+        await _insert(session, ReadingProgress, progress)
+        n_progress += len(progress)
+
+    await session.commit()
+    return {
+        "books": len(books), "shelves": len(shelf_ids), "shelf_books": len(links), "tags": spec.tags,
+        "book_tags": len(book_tags), "reviews": len(reviews), "readings": len(readings), "progress": n_progress,
+    }
+
+
+async def sample(session, size: int = 200, seed: int = 0) -> LibrarySample:
+    """Pick ids to address from whatever library is in the database; the same seed picks the same rows."""
+    from sqlalchemy import select
+
+    from shelflife.models import Book, Reading, Shelf, Tag
+
+    rng = random.Random(seed)
+
+    async def pick(stmt) -> list:
+        rows = [tuple(row) for row in (await session.execute(stmt)).all()]
+        return rng.sample(rows, min(size, len(rows)))
+
+    books = await pick(select(Book.id, Book.title, Book.author).order_by(Book.id))
+    tags = await pick(select(Tag.id, Tag.name).order_by(Tag.id))
+    reading_books = await pick(select(Reading.book_id).where(Reading.finished_at.is_(None)).order_by(Reading.id))
+    shelves = [tuple(row) for row in (await session.execute(select(Shelf.id, Shelf.name).order_by(Shelf.id))).all()]
+    return LibrarySample(
+        books=books, shelves=shelves, tags=tags, reading_books=[book_id for (book_id,) in reading_books],
+        authors=sorted({author for _, _, author in books}),
+    )
+
+
+async def build(db_path: Path, spec: LibrarySpec) -> dict[str, int]:
+    """Migrate a fresh database at `db_path` and fill it."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from shelflife import migrations
+
+    migrations.upgrade(db_path)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            return await generate(session, spec)
+    finally:
+        await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, required=True, help="Database file to create; must not exist")
+    for field, default in asdict(LibrarySpec()).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+    if args.db.exists():
+        parser.error(f"{args.db} already exists")
+
+    spec = LibrarySpec(**{field: getattr(args, field) for field in asdict(LibrarySpec())})
+    start = time.perf_counter()
+    counts = asyncio.run(build(args.db, spec))
+    print(", ".join(f"{n} {table}" for table, n in counts.items()) + f" in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""Record/replay stub of the Open Library API.
+
+Serves the three endpoints Shelflife uses (`/isbn/{isbn}.json`,
+`/works/{key}.json`, `/search.json`) from recorded fixtures, with
+configurable latency, jitter and error injection. Requests that have no
+recorded fixture get a deterministic synthesized response, so synthetic
+libraries of any size can be enriched.
+
+Point Shelflife at it with SHELFLIFE_OL_BASE_URL:
+
+    python -m benchmarks.olstub --port 8765 --latency 40 --jitter 20 --error-rate 0.01
+    SHELFLIFE_OL_BASE_URL=http://127.0.0.1:8765 uv run uvicorn shelflife.app:app
+
+With --record, misses are proxied to the real Open Library and the
+responses are appended to the fixture file.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "openlibrary.json"
+UPSTREAM_URL = "https://openlibrary.org"
+
+SUBJECTS = [
+    "Fiction", "Science Fiction", "Fantasy", "History", "Biography", "Mystery",
+    "Romance", "Philosophy", "Poetry", "Travel", "Science", "Adventure",
+]
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    not_found_rate: float = 0.0
+    synthesize: bool = True
+    record: bool = False
+    seed: int = 0
+    fixtures_path: Path = FIXTURES_PATH
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    replayed: int = 0
+    synthesized: int = 0
+    recorded: int = 0
+    errors_injected: int = 0
+    not_found: int = 0
+    by_endpoint: dict[str, int] = field(default_factory=dict)
+
+
+def load_fixtures(path: Path = FIXTURES_PATH) -> dict:
+    if path.exists():
+        data = json.loads(path.read_text())
+    else:
+        data = {}
+    for section in ("editions", "works", "search"):
+        data.setdefault(section, {})
+    return data
+
+
+def search_key(params) -> str:
+    return f"{(params.get('title') or '').lower()}|{(params.get('author') or '').lower()}"
+
+
+def _digest(*parts: str) -> int:
+    return int(hashlib.sha256(":".join(parts).encode()).hexdigest()[:12], 16)
+
+
+def synth_work_key(*parts: str) -> str:
+    return f"OL{_digest(*parts) % 10_000_000}W"
+
+
+def synth_edition(isbn: str) -> dict:
+    h = _digest("isbn", isbn)
+    return {
+        "number_of_pages": 120 + h % 900,
+        "publishers": [f"Publisher {h % 97}"],
+        "publish_date": str(1900 + h % 125),
+        "works": [{"key": f"/works/{synth_work_key('isbn', isbn)}"}],
+    }
+
+
+def synth_work(key: str) -> dict:
+    h = _digest("work", key)
+    return {
+        "key": f"/works/{key}",
+        "description": f"Synthesized description for {key}. " * (1 + h % 8),
+        "subjects": [SUBJECTS[(h >> i) % len(SUBJECTS)] for i in range(1 + h % 6)],
+    }
+
+
+def synth_search(title: str, author: str, limit: int) -> dict:
+    if not title:
+        return {"numFound": 0, "docs": []}
+    h = _digest("search", title.lower(), author.lower())
+    docs = []
+    for i in range(min(limit, 1 + h % 3)):
+        docs.append({
+            "key": synth_work_key(title.lower(), author.lower(), str(i)),
+            "title": title if i == 0 else f"{title}: Volume {i + 1}",
+            "author_name": [author] if author else ["Unknown"],
+            "cover_i": h % 1_000_000 + i,
+            "number_of_pages_median": 120 + (h + i) % 900,
+            "publisher": [f"Publisher {h % 97}"],
+            "first_publish_year": 1900 + h % 125,
+            "isbn": [f"978{(h + i) % 10**10:010d}", f"{(h + i) % 10**10:010d}"],
+            "subject": [SUBJECTS[(h >> j) % len(SUBJECTS)] for j in range(1 + h % 6)],
+        })
+    return {"numFound": len(docs), "docs": docs}
+
+
+def create_stub_app(config: StubConfig | None = None) -> FastAPI:
+    config = config or StubConfig()
+    fixtures = load_fixtures(config.fixtures_path)
+    rng = random.Random(config.seed)
+    stats = StubStats()
+    app = FastAPI(title="Open Library stub")
+    app.state.config = config
+    app.state.stats = stats
+    app.state.fixtures = fixtures
+
+    async def _record(section: str, key: str, url: str, params: dict | None = None) -> dict | None:
+        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as upstream:
+            resp = await upstream.get(url, params=params)
+        if resp.status_code != 200:
+            return None
+        data = resp.json()
+        fixtures[section][key] = data
+        config.fixtures_path.parent.mkdir(parents=True, exist_ok=True)
+        config.fixtures_path.write_text(json.dumps(fixtures, indent=2, sort_keys=True))
+        stats.recorded += 1
+        return data
+
+    async def _respond(endpoint: str, section: str, key: str, synth, upstream_url: str, params=None):
+        stats.requests += 1
+        stats.by_endpoint[endpoint] = stats.by_endpoint.get(endpoint, 0) + 1
+
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if config.error_rate and rng.random() < config.error_rate:
+            stats.errors_injected += 1
+            return JSONResponse({"error": "injected failure"}, status_code=503)
+        if config.not_found_rate and rng.random() < config.not_found_rate:
+            stats.not_found += 1
+            return JSONResponse({"error": "notfound"}, status_code=404)
+
+        if key in fixtures[section]:
+            stats.replayed += 1
+            return fixtures[section][key]
+        if config.record:
+            data = await _record(section, key, upstream_url, params)
+            if data is not None:
+                return data
+        if config.synthesize:
+            stats.synthesized += 1
+            return synth()
+        stats.not_found += 1
+        return JSONResponse({"error": "notfound"}, status_code=404)
+
+    @app.get("/isbn/{isbn}.json")
+    async def edition(isbn: str):
+        return await _respond(
+            "isbn", "editions", isbn, lambda: synth_edition(isbn), f"{UPSTREAM_URL}/isbn/{isbn}.json"
+        )
+
+    @app.get("/works/{key}.json")
+    async def work(key: str):
+        return await _respond(
+            "works", "works", key, lambda: synth_work(key), f"{UPSTREAM_URL}/works/{key}.json"
+        )
+
+    @app.get("/search.json")
+    async def search(request: Request):
+        params = dict(request.query_params)
+        limit = int(params.get("limit", 5))
+        return await _respond(
+            "search",
+            "search",
+            search_key(params),
+            lambda: synth_search(params.get("title", ""), params.get("author", ""), limit),
+            f"{UPSTREAM_URL}/search.json",
+            params,
+        )
+
+    @app.get("/_stub/stats")
+    async def stub_stats():
+        return stats.__dict__
+
+    return app
+
+
+class StubServer:
+    """Run the stub with uvicorn on a background thread."""
+
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.app = create_stub_app(config)
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> StubStats:
+        return self.app.state.stats
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="Fraction of requests answered with 404")
+    parser.add_argument("--no-synthesize", action="store_true", help="404 on fixture misses instead of synthesizing")
+    parser.add_argument("--record", action="store_true", help="Proxy misses to openlibrary.org and record them")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        not_found_rate=args.not_found_rate,
+        synthesize=not args.no_synthesize,
+        record=args.record,
+        seed=args.seed,
+        fixtures_path=args.fixtures,
+    )
+    uvicorn.run(create_stub_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Deterministic synthetic libraries for benchmarks."""
+
+import csv
+import io
+import random
+from datetime import date, timedelta
+
+FIRST = ["Ada", "Ben", "Clara", "Dmitri", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas", "Kira", "Luis"]
+LAST = ["Abbott", "Baptiste", "Chen", "Diaz", "Eriksen", "Fischer", "Garcia", "Haddad", "Ivanova", "Jensen"]
+WORDS = [
+    "Silent", "River", "Empire", "Garden", "Shadow", "Winter", "Machine", "Letters", "Distant", "Harbor",
+    "Glass", "Orchard", "Signal", "Atlas", "Ember", "Lantern", "Tide", "Cathedral", "Meridian", "Fable",
+]
+SHELVES = ["fiction", "non-fiction", "favorites", "book-club", "classics", "sci-fi", "history"]
+EXCLUSIVE = ["read", "read", "read", "to-read", "currently-reading"]
+
+GOODREADS_HEADER = [
+    "Book Id", "Title", "Author", "Author l-f", "Additional Authors", "ISBN", "ISBN13", "My Rating",
+    "Average Rating", "Publisher", "Binding", "Number of Pages", "Year Published", "Original Publication Year",
+    "Date Read", "Date Added", "Bookshelves", "Bookshelves with positions", "Exclusive Shelf", "My Review",
+    "Spoiler", "Private Notes", "Read Count", "Owned Copies",
+]
+
+
+def book_title(rng: random.Random, i: int) -> str:
+    return f"The {rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+
+
+def author_name(rng: random.Random, n_authors: int) -> str:
+    k = rng.randrange(n_authors)
+    return f"{FIRST[k % len(FIRST)]} {LAST[(k // len(FIRST)) % len(LAST)]} {k}"
+
+
+def goodreads_csv(n_books: int, seed: int = 42, isbn_fraction: float = 0.6) -> str:
+    """A Goodreads export with n_books rows. The same seed always yields the same CSV."""
+    rng = random.Random(seed)
+    n_authors = max(1, n_books // 4)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(GOODREADS_HEADER)
+    start = date(2015, 1, 1)
+    for i in range(n_books):
+        title = book_title(rng, i)
+        author = author_name(rng, n_authors)
+        isbn13 = f'="978{rng.randrange(10**10):010d}"' if rng.random() < isbn_fraction else '=""'
+        exclusive = rng.choice(EXCLUSIVE)
+        added = start + timedelta(days=rng.randrange(3000))
+        read = added + timedelta(days=rng.randrange(1, 200)) if exclusive == "read" else None
+        shelves = rng.sample(SHELVES, rng.randrange(0, 3))
+        writer.writerow([
+            100000 + i, title, author, "", "", '=""', isbn13,
+            rng.choice([0, 0, 3, 4, 5]), "4.0", f"Publisher {rng.randrange(50)}", "Paperback",
+            rng.randrange(80, 900), rng.randrange(1900, 2025), "",
+            read.strftime("%Y/%m/%d") if read else "", added.strftime("%Y/%m/%d"),
+            ", ".join(shelves), "", exclusive, "", "", "", 1 if read else 0, 0,
+        ])
+    return out.getvalue()
@@ -1,10 +1,39 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
-from shelflife.routers import books, hash, import_export, reading, reviews, shelves, tags
+from shelflife.config import MCP_PATH, MOUNT_MCP
+from shelflife.routers import (
+    autocomplete,
+    books,
+    changes,
+    counts,
+    hash,
+    import_export,
+    metadata,
+    profile,
+    reading,
+    reviews,
+    shelves,
+    tags,
+)
+from shelflife.services.errors import ServiceError
 
 
-def create_app() -> FastAPI:
-    app = FastAPI(title="Shelflife", version="0.1.0")
+async def service_error_handler(request: Request, exc: ServiceError) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+
+def create_app(mount_mcp: bool = MOUNT_MCP) -> FastAPI:
+    mcp_app = None
+    if mount_mcp:
+        from shelflife.mcp.direct import DirectClient
+        from shelflife.mcp.server import create_mcp_server
+
+        # Streamable HTTP MCP endpoint sharing this process's engine and caches
+        mcp_app = create_mcp_server(DirectClient()).http_app(path=MCP_PATH)
+
+    app = FastAPI(title="Shelflife", version="0.1.0", lifespan=mcp_app.lifespan if mcp_app else None)
+    app.add_exception_handler(ServiceError, service_error_handler)
     app.include_router(books.router)
     app.include_router(shelves.router)
     app.include_router(reviews.router)
@@ -12,6 +41,13 @@ def create_app() -> FastAPI:
     app.include_router(reading.router)
     app.include_router(import_export.router)
     app.include_router(hash.router)
+    app.include_router(metadata.router)
+    app.include_router(profile.router)
+    app.include_router(counts.router)
+    app.include_router(autocomplete.router)
+    app.include_router(changes.router)
+    if mcp_app is not None:
+        app.mount("/", mcp_app)  # after the routers, so it only sees MCP_PATH
     return app
 
 
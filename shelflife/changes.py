@@ -0,0 +1,36 @@
+"""Data change counters, kept in the database.
+
+The `data_versions` table holds a counter per table, bumped by triggers on
+every row inserted, updated or deleted. Writes made by any process sharing
+the file, or by plain SQL, are counted. Counters only go up, so caches
+shared across requests key themselves on them, and watchers poll them.
+"""
+
+from sqlalchemy import Connection, column, func, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# shelflife.models.DataVersion, without importing the models here
+_data_versions = table("data_versions", column("table_name"), column("version"))
+_ALL = select(_data_versions.c.table_name, _data_versions.c.version)
+
+
+async def data_version(session: AsyncSession, *tables: str) -> int:
+    """The database's change counter, overall or for the given tables.
+
+    The sum of each table's counter, so it changes whenever one of those
+    tables does.
+    """
+    query = select(func.coalesce(func.sum(_data_versions.c.version), 0))
+    if tables:
+        query = query.where(_data_versions.c.table_name.in_(tables))
+    return (await session.execute(query)).scalar_one()
+
+
+async def data_versions(session: AsyncSession) -> dict[str, int]:
+    """Every table's change counter."""
+    return dict((await session.execute(_ALL)).all())
+
+
+def read_versions(connection: Connection) -> dict[str, int]:
+    """Every table's change counter, from session event hooks, which run on the sync connection."""
+    return dict(connection.execute(_ALL).all())
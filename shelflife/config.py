@@ -8,3 +8,51 @@ DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
 OPENLIBRARY_BASE_URL = os.environ.get("SHELFLIFE_OL_BASE_URL", "https://openlibrary.org")
 OPENLIBRARY_COVERS_URL = os.environ.get("SHELFLIFE_OL_COVERS_URL", "https://covers.openlibrary.org")
 OPENLIBRARY_TIMEOUT = float(os.environ.get("SHELFLIFE_OL_TIMEOUT", "10.0"))
+
+# Metadata providers, in priority order. Later providers are hedged behind earlier ones.
+# Google Books is opt-in: "openlibrary,googlebooks"
+METADATA_PROVIDERS = [
+    p.strip() for p in os.environ.get("SHELFLIFE_METADATA_PROVIDERS", "openlibrary").split(",") if p.strip()
+]
+GOOGLE_BOOKS_BASE_URL = os.environ.get("SHELFLIFE_GOOGLE_BOOKS_BASE_URL", "https://www.googleapis.com")
+GOOGLE_BOOKS_API_KEY = os.environ.get("SHELFLIFE_GOOGLE_BOOKS_API_KEY")
+GOOGLE_BOOKS_TIMEOUT = float(os.environ.get("SHELFLIFE_GOOGLE_BOOKS_TIMEOUT", "10.0"))
+
+# Hedged requests: fire the next provider once the current one exceeds its latency quantile
+HEDGE_QUANTILE = float(os.environ.get("SHELFLIFE_HEDGE_QUANTILE", "0.95"))
+HEDGE_DEFAULT_DELAY = float(os.environ.get("SHELFLIFE_HEDGE_DEFAULT_DELAY", "2.0"))
+HEDGE_MIN_DELAY = float(os.environ.get("SHELFLIFE_HEDGE_MIN_DELAY", "0.05"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("SHELFLIFE_HEDGE_MIN_SAMPLES", "20"))
+
+# Import -> enrich pipeline
+IMPORT_CHUNK_SIZE = int(os.environ.get("SHELFLIFE_IMPORT_CHUNK_SIZE", "200"))
+ENRICH_CONCURRENCY = int(os.environ.get("SHELFLIFE_ENRICH_CONCURRENCY", "4"))
+ENRICH_QUEUE_SIZE = int(os.environ.get("SHELFLIFE_ENRICH_QUEUE_SIZE", "64"))
+ENRICH_APPLY_BATCH_SIZE = int(os.environ.get("SHELFLIFE_ENRICH_APPLY_BATCH_SIZE", "25"))
+
+# Autocomplete prefix index: memory it may use before it stops indexing names by their later words
+AUTOCOMPLETE_MEMORY_MB = int(os.environ.get("SHELFLIFE_AUTOCOMPLETE_MEMORY_MB", "128"))
+
+# MCP server dispatch: "direct" calls the service layer in-process, "asgi" goes
+# through the FastAPI app. Setting SHELFLIFE_API_URL talks to a remote API over HTTP.
+MCP_DISPATCH = os.environ.get("SHELFLIFE_MCP_DISPATCH", "direct")
+MCP_API_URL = os.environ.get("SHELFLIFE_API_URL")
+
+# MCP transport: "stdio" serves one client per process; "http" serves many
+# clients over streamable HTTP from one process, sharing the engine and caches.
+MCP_TRANSPORT = os.environ.get("SHELFLIFE_MCP_TRANSPORT", "stdio")
+MCP_HOST = os.environ.get("SHELFLIFE_MCP_HOST", "127.0.0.1")
+MCP_PORT = int(os.environ.get("SHELFLIFE_MCP_PORT", "8001"))
+MCP_PATH = os.environ.get("SHELFLIFE_MCP_PATH", "/mcp")
+# Tool calls allowed in flight per MCP session; further calls wait their turn
+MCP_SESSION_CONCURRENCY = int(os.environ.get("SHELFLIFE_MCP_SESSION_CONCURRENCY", "4"))
+# Also serve the MCP endpoint from the API process, at MCP_PATH
+MOUNT_MCP = os.environ.get("SHELFLIFE_MOUNT_MCP", "").lower() in ("1", "true", "yes")
+
+# MCP tool results that list books: which fields to include by default
+# ("minimal", "compact" or "full") and how much of a description "compact" keeps
+MCP_BOOK_VIEW = os.environ.get("SHELFLIFE_MCP_BOOK_VIEW", "compact")
+MCP_DESCRIPTION_CHARS = int(os.environ.get("SHELFLIFE_MCP_DESCRIPTION_CHARS", "200"))
+
+# How often MCP resources check the database's change counters while a session is watching them
+MCP_RESOURCE_POLL_SECONDS = float(os.environ.get("SHELFLIFE_MCP_RESOURCE_POLL_SECONDS", "1.0"))
@@ -1,15 +1,34 @@
+"""Deterministic ids derived from natural keys (title+author, shelf name, ...).
+
+An id is the first 60 bits of the SHA-256 of the normalized parts joined
+with ":". Parts are normalized by lowercasing, dropping everything but
+ASCII letters and digits, and keeping the first 50 characters. Ids are
+stored, so this must never change its output.
+"""
+
+import functools
 import hashlib
 import re
+from collections.abc import Iterable
+
+_strip_non_alnum = functools.partial(re.compile(r"[^a-z0-9]").sub, "")
 
 
 def _normalize(value: str | int) -> str:
-    s = str(value).lower()
-    s = re.sub(r"[^a-z0-9]", "", s)
-    if len(s) > 50:
-        s = s[:50]
-    return s
+    return _strip_non_alnum(str(value).lower())[:50]
+
 
+def _hash(key: str) -> int:
+    # The first 15 hex digits of the digest: its top 60 bits
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8]) >> 4
 
+
+@functools.lru_cache(maxsize=65536, typed=True)
 def make_id(*parts: str | int) -> int:
-    key = ":".join(_normalize(p) for p in parts)
-    return int(hashlib.sha256(key.encode()).hexdigest()[:15], 16)
+    return _hash(":".join(_normalize(p) for p in parts))
+
+
+def make_ids(keys: Iterable[tuple[str | int, ...]]) -> list[int]:
+    """`make_id(*key)` for each key, for imports and bulk lookups."""
+    normalize, hash_ = _normalize, _hash
+    return [hash_(":".join([normalize(p) for p in key])) for key in keys]
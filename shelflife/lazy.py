@@ -0,0 +1,25 @@
+"""Deferred module imports for startup-sensitive code paths."""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return module `name`, executing it on first attribute access rather than now.
+
+    Lets a module keep a plain `httpx.AsyncClient(...)` style reference (and
+    tests keep patching it there) without paying for the import at startup
+    when the code path that uses it may never run.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -1,38 +1,49 @@
-import os
-import subprocess
-import sys
-from pathlib import Path
-
-from httpx import ASGITransport, AsyncClient
-
-from shelflife.app import create_app
-from shelflife.mcp.client import ShelflifeClient
+from shelflife import migrations
+from shelflife.config import MCP_API_URL, MCP_DISPATCH, MCP_HOST, MCP_PATH, MCP_PORT, MCP_TRANSPORT
 from shelflife.mcp.server import create_mcp_server
 
 
 def run_migrations():
-    """Run Alembic migrations before starting the MCP server."""
-    # Ensure the database directory exists
-    db_path = os.environ.get("SHELFLIFE_DB_PATH", "shelflife.db")
-    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    """Bring the schema to head before starting the MCP server; a no-op when it's already there."""
+    migrations.upgrade()
+
+
+def create_client():
+    """Pick how tools reach the API: a remote server, the in-process ASGI app, or the services directly.
+
+    Each mode imports only what it needs; the FastAPI app in particular is
+    a large share of startup time and the default mode doesn't use it.
+    """
+    if MCP_API_URL:
+        from httpx import AsyncClient
+
+        from shelflife.mcp.client import ShelflifeClient
+
+        return ShelflifeClient(AsyncClient(base_url=MCP_API_URL))
+    if MCP_DISPATCH == "asgi":
+        from httpx import ASGITransport, AsyncClient
+
+        from shelflife.app import create_app
+        from shelflife.mcp.client import ShelflifeClient
+
+        transport = ASGITransport(app=create_app())
+        return ShelflifeClient(AsyncClient(transport=transport, base_url="http://localhost"))
+    from shelflife.mcp.direct import DirectClient
 
-    result = subprocess.run(
-        [sys.executable, "-m", "alembic", "upgrade", "head"],
-        capture_output=False,
-    )
-    if result.returncode != 0:
-        sys.exit(1)
+    return DirectClient()
 
 
 def main():
-    run_migrations()
+    if not MCP_API_URL:
+        run_migrations()
+    client = create_client()
 
-    app = create_app()
-    transport = ASGITransport(app=app)
-    http = AsyncClient(transport=transport, base_url="http://localhost")
-    client = ShelflifeClient(http)
     mcp = create_mcp_server(client)
-    mcp.run(transport="stdio")
+    if MCP_TRANSPORT == "http":
+        # One process, engine and set of caches for every connected client
+        mcp.run(transport="http", host=MCP_HOST, port=MCP_PORT, path=MCP_PATH)
+    else:
+        mcp.run(transport="stdio")
 
 
 if __name__ == "__main__":
@@ -1,17 +1,27 @@
-from httpx import AsyncClient, Response
+from typing import TYPE_CHECKING
+
+from shelflife.services.pagination import NEXT_CURSOR_HEADER
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient, Response
 
 
 class ShelflifeClient:
     """Thin wrapper around httpx.AsyncClient that translates HTTP responses
     into dicts suitable for MCP tool returns."""
 
-    def __init__(self, http: AsyncClient) -> None:
+    def __init__(self, http: "AsyncClient") -> None:
         self.http = http
 
     async def get(self, path: str, **kwargs) -> dict | list:
         resp = await self.http.get(path, **kwargs)
         return self._handle(resp)
 
+    async def get_page(self, path: str, **kwargs) -> tuple[dict | list, str | None]:
+        """A paginated list and the cursor for the page after it (None on the last page)."""
+        resp = await self.http.get(path, **kwargs)
+        return self._handle(resp), resp.headers.get(NEXT_CURSOR_HEADER)
+
     async def post(self, path: str, **kwargs) -> dict | list:
         resp = await self.http.post(path, **kwargs)
         return self._handle(resp)
@@ -28,7 +38,7 @@ class ShelflifeClient:
         resp = await self.http.post(path, files=files, **kwargs)
         return self._handle(resp)
 
-    def _handle(self, resp: Response) -> dict | list:
+    def _handle(self, resp: "Response") -> dict | list:
         if resp.status_code == 204:
             return {"ok": True}
         if resp.status_code >= 500:
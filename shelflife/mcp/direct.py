@@ -0,0 +1,574 @@
+"""In-process MCP client that calls the service layer directly.
+
+DirectClient has the same get/post/put/delete/upload interface and return
+conventions as ShelflifeClient, so the MCP tools run unchanged. Instead of
+encoding a request, running it through the ASGI app and decoding the JSON
+response, each call matches the API path against a table of handlers, opens
+a session and calls the service function.
+
+Query parameters are validated against the service function's annotations,
+which carry the same bounds as the routes (shelflife.schemas.params), and
+ones it doesn't take are ignored, as the app does. Validation errors are
+located and shaped like the app's 422 responses.
+"""
+
+import re
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any, get_type_hints
+from urllib.parse import unquote
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shelflife.changes import data_versions
+from shelflife.database import async_session
+from shelflife.id import make_id, make_ids
+from shelflife.schemas.batch import BookBatchRequest, ProgressBatchRequest, ReviewBatchRequest, ShelveBatchRequest
+from shelflife.schemas.book import (
+    BatchEnrichRequest,
+    BookCreate,
+    BookDetail,
+    BookResponse,
+    BookUpdate,
+    BulkBookRequest,
+    MoveBookRequest,
+    ResolveRequest,
+)
+from shelflife.schemas.hash import HashBatchRequest, HashBatchResponse, HashResponse
+from shelflife.schemas.reading import (
+    FinishReadingRequest,
+    ReadingDetail,
+    ReadingProgressCreate,
+    ReadingProgressResponse,
+    ReadingResponse,
+    ReadingUpdate,
+    StartReadingRequest,
+)
+from shelflife.schemas.review import RatingUpdate, ReviewCreate, ReviewResponse, ReviewUpdate
+from shelflife.schemas.shelf import ShelfCreate, ShelfMembership, ShelfResponse, ShelfUpdate
+from shelflife.schemas.tag import BulkBookTagCreate, BulkTagCreate, TagCreate, TagResponse
+from shelflife.services import books, importing, reading, reviews, shelves, tags
+from shelflife.services.errors import ServiceError
+from shelflife.services.pagination import Page
+from shelflife.services.profile import get_profile
+from shelflife.services.providers import get_fetcher
+
+_INT = TypeAdapter(int)
+
+
+@dataclass
+class Call:
+    """Arguments of one client call, as the handlers see them."""
+
+    path_args: dict[str, str]
+    params: dict[str, Any] = field(default_factory=dict)
+    json: Any = None
+    files: dict | None = None
+
+    def id(self, name: str) -> int:
+        with _located(name, "path", name):
+            return _INT.validate_python(self.path_args[name])
+
+    def query(self, fn: Callable) -> dict[str, Any]:
+        """Query params as arguments to `fn`, validated against its annotations. Others are ignored."""
+        adapters = _param_adapters(fn)
+        args, errors = {}, []
+        for name, value in self.params.items():
+            if name not in adapters:
+                continue
+            try:
+                args[name] = adapters[name].validate_python(value)
+            except ValidationError as e:
+                errors.extend(_errors(e, "query", name))
+        if errors:
+            raise ValidationError.from_exception_data(fn.__name__, errors)
+        return args
+
+    def body(self, model: type[BaseModel]) -> Any:
+        with _located(model.__name__, "body"):
+            return model.model_validate(self.json if self.json is not None else {})
+
+
+def _errors(e: ValidationError, *loc: str) -> list[dict]:
+    """e's errors, with `loc` put in front of their locations as FastAPI does ("query", "limit")."""
+    return [
+        {"type": err["type"], "loc": (*loc, *err["loc"]), "input": err["input"], "ctx": err.get("ctx", {})}
+        for err in e.errors()
+    ]
+
+
+@contextmanager
+def _located(title: str, *loc: str) -> Iterator[None]:
+    try:
+        yield
+    except ValidationError as e:
+        raise ValidationError.from_exception_data(title, _errors(e, *loc)) from None
+
+
+Handler = Callable[[AsyncSession, Call], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class _Route:
+    method: str
+    pattern: re.Pattern
+    handler: Handler
+
+
+_routes: list[_Route] = []
+
+
+def route(method: str, path: str) -> Callable[[Handler], Handler]:
+    """Register a handler for an API path. `{name}` segments become path args; `{name:path}` may contain `/`.
+
+    Routes are matched in registration order, so literal paths must be
+    registered before parameterized ones that would also match.
+    """
+    pattern = re.sub(r"\{(\w+):path\}", r"(?P<\1>.+)", path)
+    pattern = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern) + "$")
+
+    def register(handler: Handler) -> Handler:
+        _routes.append(_Route(method, pattern, handler))
+        return handler
+
+    return register
+
+
+@cache
+def _param_adapters(fn: Callable) -> dict[str, TypeAdapter]:
+    hints = get_type_hints(fn, include_extras=True)
+    return {name: TypeAdapter(hint) for name, hint in hints.items() if name not in ("session", "return")}
+
+
+def _dump(model: type[BaseModel], obj: Any) -> dict:
+    return model.model_validate(obj).model_dump(mode="json")
+
+
+@cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def _dump_all(model: type[BaseModel], objs: list) -> list[dict]:
+    adapter = _list_adapter(model)
+    return adapter.dump_python(adapter.validate_python(objs, from_attributes=True), mode="json")
+
+
+def _dump_books(books: list[dict]) -> list[dict]:
+    """Book lists are projected rows, so they only need their dates made JSON."""
+    return _keep_cursor(books, to_jsonable_python(books))
+
+
+def _keep_cursor(page: list, dumped: list) -> list:
+    """Carry a service Page's next cursor over to its JSON form, for `get_page`."""
+    return Page(dumped, page.next_cursor) if isinstance(page, Page) else dumped
+
+
+def _dump_shelf(shelf: dict) -> dict:
+    return to_jsonable_python(shelf)
+
+
+class DirectClient:
+    """Drop-in replacement for ShelflifeClient that skips HTTP entirely."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = async_session) -> None:
+        self.session_factory = session_factory
+
+    async def get(self, path: str, **kwargs) -> dict | list:
+        return await self._dispatch("GET", path, **kwargs)
+
+    async def get_page(self, path: str, **kwargs) -> tuple[dict | list, str | None]:
+        result = await self._dispatch("GET", path, **kwargs)
+        return result, getattr(result, "next_cursor", None)
+
+    async def post(self, path: str, **kwargs) -> dict | list:
+        return await self._dispatch("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> dict | list:
+        return await self._dispatch("PUT", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> dict | list:
+        return await self._dispatch("DELETE", path, **kwargs)
+
+    async def upload(self, path: str, files: dict, **kwargs) -> dict | list:
+        return await self._dispatch("POST", path, files=files, **kwargs)
+
+    async def _dispatch(
+        self, method: str, path: str, params: dict | None = None, json: Any = None, files: dict | None = None
+    ) -> dict | list:
+        path_matched = False
+        for r in _routes:
+            match = r.pattern.match(path)
+            if match is None:
+                continue
+            path_matched = True
+            if r.method != method:
+                continue
+            # Path args arrive percent-encoded, as they would in a URL, and are decoded like the app does
+            path_args = {k: unquote(v) for k, v in match.groupdict().items()}
+            call = Call(path_args=path_args, params=params or {}, json=json, files=files)
+            try:
+                async with self.session_factory() as session:
+                    result = await r.handler(session, call)
+            except ServiceError as e:
+                return {"error": True, "status": e.status_code, "detail": e.detail}
+            except ValidationError as e:
+                # JSON-shaped like the app's response, so locations are lists
+                detail = to_jsonable_python(e.errors(include_url=False, include_context=False))
+                return {"error": True, "status": 422, "detail": detail}
+            return {"ok": True} if result is None else result
+        if path_matched:
+            return {"error": True, "status": 405, "detail": "Method Not Allowed"}
+        return {"error": True, "status": 404, "detail": "Not Found"}
+
+
+# --- books ---
+
+@route("GET", "/api/books/stats")
+async def _book_stats(session, call):
+    return await books.book_stats(session)
+
+
+@route("GET", "/api/books/search")
+async def _search_books(session, call):
+    return _dump_books(await books.search_books(session, **call.query(books.search_books)))
+
+
+@route("GET", "/api/books/lookup")
+async def _lookup_book(session, call):
+    results = await books.lookup_book(**call.query(books.lookup_book))
+    return [r.model_dump(mode="json") for r in results]
+
+
+@route("POST", "/api/books/bulk")
+async def _get_books_bulk(session, call):
+    refs = call.body(BulkBookRequest).books
+    return _dump_all(BookDetail, await books.get_books_bulk(session, refs))
+
+
+@route("POST", "/api/books/resolve")
+async def _resolve_books(session, call):
+    return (await books.resolve_books(session, call.body(ResolveRequest).books)).model_dump(mode="json")
+
+
+@route("POST", "/api/books/batch")
+async def _create_books(session, call):
+    data = call.body(BookBatchRequest)
+    result = await books.create_books(session, data.books, **call.query(books.create_books))
+    return result.model_dump(mode="json")
+
+
+@route("POST", "/api/books/bulk-readings")
+async def _get_bulk_readings(session, call):
+    refs = call.body(BulkBookRequest).books
+    return [r.model_dump(mode="json") for r in await reading.get_bulk_readings(session, refs)]
+
+
+@route("GET", "/api/books/by-name/{title}/{author}")
+async def _get_book_by_name(session, call):
+    book_id = make_id(call.path_args["title"], call.path_args["author"])
+    return (await books.get_book(session, book_id)).model_dump(mode="json")
+
+
+@route("GET", "/api/books")
+async def _list_books(session, call):
+    return _dump_books(await books.list_books(session, **call.query(books.list_books)))
+
+
+@route("POST", "/api/books")
+async def _create_book(session, call):
+    data = call.body(BookCreate)
+    book = await books.create_book(session, data, **call.query(books.create_book))
+    return _dump(BookResponse, book)
+
+
+@route("GET", "/api/books/{book_id}")
+async def _get_book(session, call):
+    return (await books.get_book(session, call.id("book_id"))).model_dump(mode="json")
+
+
+@route("PUT", "/api/books/{book_id}")
+async def _update_book(session, call):
+    book = await books.update_book(session, call.id("book_id"), call.body(BookUpdate))
+    return _dump(BookResponse, book)
+
+
+@route("DELETE", "/api/books/{book_id}")
+async def _delete_book(session, call):
+    await books.delete_book(session, call.id("book_id"))
+
+
+@route("POST", "/api/books/{book_id}/enrich")
+async def _enrich_book(session, call):
+    result = await books.enrich_book(session, call.id("book_id"), **call.query(books.enrich_book))
+    return result.model_dump(mode="json")
+
+
+# --- shelves ---
+
+@route("GET", "/api/shelves")
+async def _list_shelves(session, call):
+    return _dump_all(ShelfResponse, await shelves.list_shelves(session))
+
+
+@route("POST", "/api/shelves")
+async def _create_shelf(session, call):
+    return _dump(ShelfResponse, await shelves.create_shelf(session, call.body(ShelfCreate)))
+
+
+@route("GET", "/api/shelves/by-name/{shelf_name}")
+async def _get_shelf_by_name(session, call):
+    shelf = await shelves.get_shelf(session, make_id(call.path_args["shelf_name"]), **call.query(shelves.get_shelf))
+    return _dump_shelf(shelf)
+
+
+@route("POST", "/api/shelves/move-book/{book_id}")
+async def _move_book(session, call):
+    return await shelves.move_book(session, call.id("book_id"), call.body(MoveBookRequest))
+
+
+@route("GET", "/api/shelves/by-name/{shelf_name:path}/books/{book_id}")
+async def _get_membership_by_name(session, call):
+    link = await shelves.get_membership(session, make_id(call.path_args["shelf_name"]), call.id("book_id"))
+    return _dump(ShelfMembership, link)
+
+
+@route("PUT", "/api/shelves/by-name/{shelf_name:path}/books/{book_id}")
+async def _shelve_book(session, call):
+    result = await shelves.shelve_book(session, call.path_args["shelf_name"], call.id("book_id"))
+    return result.model_dump(mode="json")
+
+
+@route("POST", "/api/shelves/books/batch")
+async def _shelve_books(session, call):
+    return (await shelves.shelve_books(session, call.body(ShelveBatchRequest).items)).model_dump(mode="json")
+
+
+@route("GET", "/api/shelves/{shelf_id}")
+async def _get_shelf(session, call):
+    return _dump_shelf(await shelves.get_shelf(session, call.id("shelf_id"), **call.query(shelves.get_shelf)))
+
+
+@route("PUT", "/api/shelves/{shelf_id}")
+async def _update_shelf(session, call):
+    shelf = await shelves.update_shelf(session, call.id("shelf_id"), call.body(ShelfUpdate))
+    return _dump(ShelfResponse, shelf)
+
+
+@route("DELETE", "/api/shelves/{shelf_id}")
+async def _delete_shelf(session, call):
+    await shelves.delete_shelf(session, call.id("shelf_id"))
+
+
+@route("GET", "/api/shelves/{shelf_id}/books/{book_id}")
+async def _get_membership(session, call):
+    return _dump(ShelfMembership, await shelves.get_membership(session, call.id("shelf_id"), call.id("book_id")))
+
+
+@route("POST", "/api/shelves/{shelf_id}/books/{book_id}")
+async def _add_book_to_shelf(session, call):
+    return await shelves.add_book_to_shelf(session, call.id("shelf_id"), call.id("book_id"))
+
+
+@route("DELETE", "/api/shelves/{shelf_id}/books/{book_id}")
+async def _remove_book_from_shelf(session, call):
+    await shelves.remove_book_from_shelf(session, call.id("shelf_id"), call.id("book_id"))
+
+
+# --- reviews ---
+
+@route("GET", "/api/reviews")
+async def _list_reviews(session, call):
+    results = await reviews.list_all_reviews(session, **call.query(reviews.list_all_reviews))
+    return _keep_cursor(results, [r.model_dump(mode="json") for r in results])
+
+
+@route("POST", "/api/reviews/batch")
+async def _review_books(session, call):
+    return (await reviews.review_books(session, call.body(ReviewBatchRequest).items)).model_dump(mode="json")
+
+
+@route("PUT", "/api/reviews/{review_id}")
+async def _update_review(session, call):
+    review = await reviews.update_review(session, call.id("review_id"), call.body(ReviewUpdate))
+    return _dump(ReviewResponse, review)
+
+
+@route("DELETE", "/api/reviews/{review_id}")
+async def _delete_review(session, call):
+    await reviews.delete_review(session, call.id("review_id"))
+
+
+@route("GET", "/api/books/{book_id}/review")
+async def _get_review(session, call):
+    return _dump(ReviewResponse, await reviews.get_review(session, call.id("book_id")))
+
+
+@route("PUT", "/api/books/{book_id}/review")
+async def _upsert_review(session, call):
+    review = await reviews.upsert_review(session, call.id("book_id"), call.body(ReviewUpdate))
+    return _dump(ReviewResponse, review)
+
+
+@route("POST", "/api/books/{book_id}/reviews")
+async def _create_review(session, call):
+    review = await reviews.create_review(session, call.id("book_id"), call.body(ReviewCreate))
+    return _dump(ReviewResponse, review)
+
+
+@route("PUT", "/api/books/{book_id}/rating")
+async def _quick_rate(session, call):
+    review = await reviews.quick_rate(session, call.id("book_id"), call.body(RatingUpdate))
+    return _dump(ReviewResponse, review)
+
+
+# --- tags ---
+
+@route("GET", "/api/tags")
+async def _list_tags(session, call):
+    found = await tags.list_tags(session, **call.query(tags.list_tags))
+    return _keep_cursor(found, _dump_all(TagResponse, found))
+
+
+@route("POST", "/api/tags/books/batch")
+async def _bulk_tag_books(session, call):
+    return (await tags.bulk_tag_books(session, call.body(BulkBookTagCreate))).model_dump(mode="json")
+
+
+@route("GET", "/api/tags/by-name/{tag_name}/books")
+async def _get_books_by_tag_name(session, call):
+    tag_id = make_id(call.path_args["tag_name"])
+    return _dump_books(await tags.get_books_by_tag(session, tag_id, **call.query(tags.get_books_by_tag)))
+
+
+@route("GET", "/api/tags/{tag_id}/books")
+async def _get_books_by_tag(session, call):
+    found = await tags.get_books_by_tag(session, call.id("tag_id"), **call.query(tags.get_books_by_tag))
+    return _dump_books(found)
+
+
+@route("POST", "/api/books/{book_id}/tags")
+async def _tag_book(session, call):
+    return _dump(TagResponse, await tags.tag_book(session, call.id("book_id"), call.body(TagCreate)))
+
+
+@route("POST", "/api/books/{book_id}/tags/batch")
+async def _bulk_tag_book(session, call):
+    result = await tags.bulk_tag_book(session, call.id("book_id"), call.body(BulkTagCreate))
+    return result.model_dump(mode="json")
+
+
+@route("DELETE", "/api/books/{book_id}/tags/{tag_id}")
+async def _untag_book(session, call):
+    await tags.untag_book(session, call.id("book_id"), call.id("tag_id"))
+
+
+# --- reading ---
+
+@route("POST", "/api/books/{book_id}/start-reading")
+async def _start_reading(session, call):
+    data = call.body(StartReadingRequest) if call.json is not None else None
+    return _dump(ReadingResponse, await reading.start_reading(session, call.id("book_id"), data))
+
+
+@route("PUT", "/api/books/{book_id}/finish-reading")
+async def _finish_reading(session, call):
+    data = call.body(FinishReadingRequest) if call.json is not None else None
+    return _dump(ReadingResponse, await reading.finish_reading(session, call.id("book_id"), data))
+
+
+@route("GET", "/api/books/{book_id}/readings")
+async def _list_readings(session, call):
+    return _dump_all(ReadingResponse, await reading.list_readings(session, call.id("book_id")))
+
+
+@route("GET", "/api/books/{book_id}/readings/{reading_id}")
+async def _get_reading(session, call):
+    found = await reading.get_reading(session, call.id("book_id"), call.id("reading_id"))
+    return _dump(ReadingDetail, found)
+
+
+@route("PUT", "/api/books/{book_id}/readings/{reading_id}")
+async def _update_reading(session, call):
+    updated = await reading.update_reading(
+        session, call.id("book_id"), call.id("reading_id"), call.body(ReadingUpdate)
+    )
+    return _dump(ReadingResponse, updated)
+
+
+@route("DELETE", "/api/books/{book_id}/readings/{reading_id}")
+async def _delete_reading(session, call):
+    await reading.delete_reading(session, call.id("book_id"), call.id("reading_id"))
+
+
+@route("POST", "/api/books/{book_id}/reading/progress")
+async def _log_progress(session, call):
+    progress = await reading.log_progress(session, call.id("book_id"), call.body(ReadingProgressCreate))
+    return _dump(ReadingProgressResponse, progress)
+
+
+@route("GET", "/api/books/{book_id}/reading/progress")
+async def _get_active_progress(session, call):
+    return _dump_all(ReadingProgressResponse, await reading.get_active_progress(session, call.id("book_id")))
+
+
+@route("POST", "/api/reading/progress/batch")
+async def _log_progress_batch(session, call):
+    result = await reading.log_progress_batch(session, call.body(ProgressBatchRequest).items)
+    return result.model_dump(mode="json")
+
+
+@route("DELETE", "/api/reading/progress/{progress_id}")
+async def _delete_progress(session, call):
+    await reading.delete_progress(session, call.id("progress_id"))
+
+
+# --- import, profile, misc ---
+
+@route("POST", "/api/import/goodreads")
+async def _import_goodreads(session, call):
+    upload = (call.files or {}).get("file")
+    if upload is None:
+        return {"error": True, "status": 422, "detail": "Missing file upload"}
+    content = upload[1] if isinstance(upload, tuple) else upload
+    if hasattr(content, "read"):
+        content = content.read()
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    return await importing.import_goodreads_csv(session, content, **call.query(importing.import_goodreads_csv))
+
+
+@route("POST", "/api/import/enrich")
+async def _batch_enrich(session, call):
+    return (await importing.batch_enrich(session, call.body(BatchEnrichRequest))).model_dump(mode="json")
+
+
+@route("GET", "/api/profile")
+async def _profile(session, call):
+    return (await get_profile(session, **call.query(get_profile))).model_dump(mode="json")
+
+
+@route("GET", "/api/changes")
+async def _changes(session, call):
+    return await data_versions(session)
+
+
+@route("GET", "/api/hash")
+async def _hash(session, call):
+    parts = call.params.get("parts", [])
+    parts = [parts] if isinstance(parts, str) else list(parts)
+    return HashResponse(id=make_id(*parts), parts=parts).model_dump(mode="json")
+
+
+@route("POST", "/api/hash/batch")
+async def _hash_batch(session, call):
+    return HashBatchResponse(ids=make_ids(call.body(HashBatchRequest).keys)).model_dump(mode="json")
+
+
+@route("GET", "/api/metadata/providers")
+async def _providers(session, call):
+    return get_fetcher().stats()
@@ -0,0 +1,41 @@
+"""Per-session limits for MCP servers that serve many clients from one process."""
+
+import asyncio
+from typing import Any
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+
+class SessionConcurrencyLimit(Middleware):
+    """Cap concurrent tool calls per MCP session.
+
+    Calls beyond the cap wait for a slot instead of failing, so one chatty
+    client queues behind itself rather than starving the others of database
+    connections. A session's semaphore is dropped once it has no calls in
+    flight or waiting.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._users: dict[str, int] = {}
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        session_id = _session_id(context)
+        semaphore = self._slots.setdefault(session_id, asyncio.Semaphore(self.limit))
+        self._users[session_id] = self._users.get(session_id, 0) + 1
+        try:
+            async with semaphore:
+                return await call_next(context)
+        finally:
+            self._users[session_id] -= 1
+            if not self._users[session_id]:
+                del self._users[session_id]
+                del self._slots[session_id]
+
+
+def _session_id(context: MiddlewareContext) -> str:
+    ctx = context.fastmcp_context
+    if ctx is None or ctx.request_context is None:
+        return "default"
+    return ctx.session_id
@@ -0,0 +1,285 @@
+"""The library as MCP resources, with notifications when their contents change.
+
+Resources let an assistant cache state it would otherwise re-fetch with
+browse_shelf, browse_tag and reading_profile:
+
+    shelflife://profile              reading profile
+    shelflife://shelves              all shelves
+    shelflife://shelves/{name}       a shelf and its newest books (compact view)
+    shelflife://tags                 the most-used tags
+    shelflife://tags/{name}          books with a tag (compact view)
+    shelflife://books/{book_id}      one book with its tags, shelves and review
+
+A session is told `notifications/resources/updated` for a URI it has read
+or subscribed to once the content behind it actually changes, and
+`notifications/resources/list_changed` once shelves or tags are added or
+removed. While any session is watching, the database's per-table change
+counters (`GET /api/changes`) are polled every MCP_RESOURCE_POLL_SECONDS.
+When a table a resource reads from has changed, the resource is re-read and
+compared with what was last served, so writes that leave it the same stay
+silent. The counters are bumped by triggers, so writes made by any process
+sharing the database, or through a remote API, are noticed.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import weakref
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
+from functools import partial
+from typing import Any
+from urllib.parse import quote, unquote
+
+import anyio
+from fastmcp import FastMCP
+from fastmcp.exceptions import ResourceError
+from fastmcp.resources import FunctionResource
+from fastmcp.resources.template import match_uri_template
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from pydantic import AnyUrl
+
+from shelflife.config import MCP_RESOURCE_POLL_SECONDS
+from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.tools.profile import reading_profile
+from shelflife.mcp.tools.shelves import browse_shelf
+from shelflife.mcp.tools.tags import browse_tag
+
+logger = logging.getLogger(__name__)
+
+SCHEME = "shelflife://"
+
+# Tables each resource is built from; a commit touching none of them can't change it
+PROFILE_TABLES = frozenset({"books", "reviews", "shelves", "shelf_books", "tags", "book_tags"})
+SHELF_TABLES = frozenset({"shelves", "shelf_books", "books"})
+TAG_TABLES = frozenset({"tags", "book_tags", "books"})
+BOOK_TABLES = frozenset({"books", "book_tags", "tags", "shelf_books", "shelves", "reviews"})
+SHELF_LIST_TABLES = frozenset({"shelves", "shelf_books"})  # for the book counts
+TAG_LIST_TABLES = frozenset({"tags", "book_tags"})
+LISTING_TABLES = frozenset({"shelves", "tags"})
+
+
+def _digest(content: Any) -> str:
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _checked(result: Any) -> Any:
+    if isinstance(result, dict) and result.get("error"):
+        raise ResourceError(str(result.get("detail", "Not found")))
+    return result
+
+
+class LibraryResources(Middleware):
+    """Serve library resources and notify sessions when the ones they've seen change.
+
+    Registered as middleware so it can see which session read, listed or
+    subscribed to what. Sessions are held weakly and forgotten once a
+    notification to them fails.
+    """
+
+    def __init__(self, client: ShelflifeClient) -> None:
+        self.client = client
+        self.templates: list[tuple[str, frozenset[str], Callable[..., Awaitable[Any]]]] = [
+            (f"{SCHEME}profile", PROFILE_TABLES, self.profile),
+            (f"{SCHEME}shelves", SHELF_LIST_TABLES, self.shelves),
+            (f"{SCHEME}shelves/{{name}}", SHELF_TABLES, self.shelf),
+            (f"{SCHEME}tags", TAG_LIST_TABLES, self.tags),
+            (f"{SCHEME}tags/{{name}}", TAG_TABLES, self.tag),
+            (f"{SCHEME}books/{{book_id}}", BOOK_TABLES, self.book),
+        ]
+        self._digests: dict[str, str] = {}
+        self._watched: weakref.WeakKeyDictionary[Any, set[str]] = weakref.WeakKeyDictionary()
+        self._listers: weakref.WeakSet[Any] = weakref.WeakSet()
+        self._listing: frozenset[str] | None = None
+        self._polling: asyncio.Task | None = None
+        self._sessions = 0
+        self._wake = asyncio.Event()
+
+    # --- Resource contents ---
+
+    async def profile(self) -> dict:
+        """Reading profile: totals, shelves with counts, top tags, ratings and recent books."""
+        return self._served(f"{SCHEME}profile", _checked(await reading_profile(self.client)))
+
+    async def shelves(self) -> list:
+        """All shelves, with their book counts."""
+        return self._served(f"{SCHEME}shelves", _checked(await browse_shelf(self.client)))
+
+    async def shelf(self, name: str) -> dict:
+        """A shelf, its book count and its most recently added books, in the compact book view."""
+        shelf = await browse_shelf(self.client, shelf_name=name)
+        return self._served(f"{SCHEME}shelves/{quote(name, safe='')}", _checked(shelf))
+
+    async def tags(self) -> dict:
+        """The most-used tags, with their book counts, and the cursor for the rest."""
+        return self._served(f"{SCHEME}tags", _checked(await browse_tag(self.client)))
+
+    async def tag(self, name: str) -> dict:
+        """Books with a tag, in the compact book view, and the cursor for the rest."""
+        books = await browse_tag(self.client, tag_name=name)
+        return self._served(f"{SCHEME}tags/{quote(name, safe='')}", _checked(books))
+
+    async def book(self, book_id: int) -> dict:
+        """A book with its tags, shelves and review."""
+        return self._served(f"{SCHEME}books/{book_id}", _checked(await self.client.get(f"/api/books/{book_id}")))
+
+    def _served(self, uri: str, content: Any) -> Any:
+        self._digests[uri] = _digest(content)
+        return content
+
+    def register(self, mcp: FastMCP) -> None:
+        for uri, _, read in self.templates:
+            mcp.resource(uri, mime_type="application/json")(read)
+        mcp.add_middleware(self)
+
+        # Let clients subscribe explicitly as well as by reading
+        server = mcp._mcp_server
+
+        @server.subscribe_resource()
+        async def subscribe(uri: AnyUrl) -> None:
+            try:
+                await self.read(str(uri))  # what later reads are compared with
+            except ResourceError:
+                pass  # doesn't exist yet; notified once it does
+            self._watched.setdefault(server.request_context.session, set()).add(str(uri))
+            self._poll()
+
+        @server.unsubscribe_resource()
+        async def unsubscribe(uri: AnyUrl) -> None:
+            self._watched.get(server.request_context.session, set()).discard(str(uri))
+
+        get_capabilities = server.get_capabilities
+
+        def with_subscribe(*args, **kwargs):
+            capabilities = get_capabilities(*args, **kwargs)
+            if capabilities.resources is not None:
+                capabilities.resources.subscribe = True
+            return capabilities
+
+        server.get_capabilities = with_subscribe
+
+        # The low-level server enters its lifespan once per session. Polling stops when the last
+        # session ends, rather than whenever the session objects happen to be collected.
+        lifespan = server.lifespan
+
+        @asynccontextmanager
+        async def counted(app):
+            self._sessions += 1
+            try:
+                async with lifespan(app) as context:
+                    yield context
+            finally:
+                self._sessions -= 1
+                if not self._sessions and self._polling is not None:
+                    # Wake the poller so it stops, and let a round in flight finish rather than cancel its query
+                    self._wake.set()
+                    with anyio.CancelScope(shield=True):
+                        await self._polling
+                    self._wake.clear()
+
+        server.lifespan = counted
+
+    async def read(self, uri: str) -> Any:
+        for template, _, read in self.templates:
+            params = match_uri_template(uri, template)
+            if params is not None:
+                return await read(**params)
+        raise ResourceError(f"Unknown resource: {uri}")
+
+    def _tables(self, uri: str) -> frozenset[str]:
+        for template, tables, _ in self.templates:
+            if match_uri_template(uri, template) is not None:
+                return tables
+        return frozenset()
+
+    # --- Listing ---
+
+    async def _concrete(self) -> list[str]:
+        """A URI per shelf and per tag, so clients can discover them without the templates."""
+        shelves = await browse_shelf(self.client)
+        # Just the first page of tags: a resource per tag doesn't scale past that
+        tags = (await browse_tag(self.client))["tags"]
+        return [f"{SCHEME}shelves/{quote(s['name'], safe='')}" for s in shelves if isinstance(s, dict)] + [
+            f"{SCHEME}tags/{quote(t['name'], safe='')}" for t in tags if isinstance(t, dict)
+        ]
+
+    async def on_list_resources(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        resources = list(await call_next(context))
+        uris = await self._concrete()
+        self._listing = frozenset(uris)
+        if context.fastmcp_context is not None and context.fastmcp_context.request_context is not None:
+            self._listers.add(context.fastmcp_context.session)
+            self._poll()
+        for uri in uris:
+            kind, _, name = uri.removeprefix(SCHEME).partition("/")
+            read = self.shelf if kind == "shelves" else self.tag
+            resources.append(FunctionResource.from_function(
+                partial(read, unquote(name)), uri=uri, name=f"{kind[:-1]}: {unquote(name)}", mime_type="application/json"
+            ))
+        return resources
+
+    # --- Notifications ---
+
+    async def on_read_resource(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        result = await call_next(context)
+        if context.fastmcp_context is not None and context.fastmcp_context.request_context is not None:
+            self._watched.setdefault(context.fastmcp_context.session, set()).add(str(context.message.uri))
+            self._poll()
+        return result
+
+    def _poll(self) -> None:
+        """Start polling the change counters, unless already polling."""
+        if self._polling is None or self._polling.done():
+            self._polling = asyncio.get_running_loop().create_task(self._watch())
+
+    async def _watch(self) -> None:
+        # Ends once no session is watching, or none is connected; the next read, subscription or
+        # listing starts it again.
+        # The first round counts every table as changed, which catches writes that landed between
+        # serving a resource and reading the counters, and notifies only if the content differs.
+        versions: dict[str, int] = {}
+        while self._sessions and (self._watched or self._listers):
+            try:
+                current = await self.client.get("/api/changes")
+                if isinstance(current, dict) and not current.get("error"):
+                    tables = {table for table, version in current.items() if versions.get(table) != version}
+                    versions = current
+                    if tables:
+                        await self._notify(tables)
+            except Exception:
+                # e.g. the database briefly locked, or the remote API down; the next round retries
+                logger.warning("Checking for resource changes failed", exc_info=True)
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), MCP_RESOURCE_POLL_SECONDS)
+
+    async def _notify(self, tables: set[str]) -> None:
+        candidates = {uri for uris in self._watched.values() for uri in uris if self._tables(uri) & tables}
+        updated = set()
+        for uri in candidates:
+            before = self._digests.get(uri)
+            try:
+                await self.read(uri)
+            except ResourceError:
+                self._digests.pop(uri, None)  # gone, e.g. a deleted shelf
+            if self._digests.get(uri) != before:
+                updated.add(uri)
+
+        for session, uris in list(self._watched.items()):
+            for uri in uris & updated:
+                await self._send(session, session.send_resource_updated, AnyUrl(uri))
+
+        if tables & LISTING_TABLES and self._listers and self._listing is not None:
+            listing = frozenset(await self._concrete())
+            if listing != self._listing:
+                self._listing = listing
+                for session in list(self._listers):
+                    await self._send(session, session.send_resource_list_changed)
+
+    async def _send(self, session: Any, send: Callable[..., Awaitable[None]], *args: Any) -> None:
+        try:
+            await send(*args)
+        except Exception:
+            # The session has gone away
+            self._watched.pop(session, None)
+            self._listers.discard(session)
@@ -1,26 +1,56 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastmcp import FastMCP
 from pydantic import Field
 
+from shelflife.config import MCP_BOOK_VIEW, MCP_SESSION_CONCURRENCY
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.limits import SessionConcurrencyLimit
+from shelflife.mcp.resources import LibraryResources
 from shelflife.mcp.tools.discovery import search_books as _search_books, get_books as _get_books
-from shelflife.mcp.tools.types import BookRef
-from shelflife.mcp.tools.library import add_book as _add_book, resolve_book as _resolve_book
-from shelflife.mcp.tools.shelves import shelve_book as _shelve_book, browse_shelf as _browse_shelf
-from shelflife.mcp.tools.reviews import review_book as _review_book, get_reviews as _get_reviews
+from shelflife.mcp.tools.compact import BookView
+from shelflife.mcp.tools.types import BookRef, BookReview, BookToAdd, ProgressEntry
+from shelflife.mcp.tools.library import add_book as _add_book, add_books as _add_books, resolve_book as _resolve_book
+from shelflife.mcp.tools.shelves import (
+    shelve_book as _shelve_book,
+    shelve_books as _shelve_books,
+    browse_shelf as _browse_shelf,
+    ShelfSort,
+)
+from shelflife.mcp.tools.reviews import review_book as _review_book, review_books as _review_books, get_reviews as _get_reviews
 from shelflife.mcp.tools.tags import tag_books as _tag_books, browse_tag as _browse_tag
 from shelflife.mcp.tools.profile import reading_profile as _reading_profile
 from shelflife.mcp.tools.reading import (
     start_reading as _start_reading,
     finish_reading as _finish_reading,
     log_reading_progress as _log_reading_progress,
+    log_progress_batch as _log_progress_batch,
     get_reading_history as _get_reading_history,
 )
 from shelflife.mcp.tools.importing import import_goodreads as _import_goodreads, import_goodreads_csv as _import_goodreads_csv
+from shelflife.schemas.batch import MAX_BATCH_ITEMS
+
 
+ViewParam = Annotated[
+    BookView,
+    Field(description="Book fields to return: 'minimal' (title, author), 'compact' (adds year, pages and a "
+          "trimmed description) or 'full' (every field)"),
+]
+FieldsParam = Annotated[
+    list[str] | None,
+    Field(description="Exact book fields to return instead of a view, e.g. ['title', 'author', 'isbn13']"),
+]
+CursorParam = Annotated[
+    str | None,
+    Field(description="next_cursor from the previous result, to get the page after it"),
+]
+TableParam = Annotated[
+    bool,
+    Field(description="Return books as {'columns': [...], 'rows': [[...], ...]} instead of one object per book"),
+]
 
-def create_mcp_server(client: ShelflifeClient) -> FastMCP:
+
+def create_mcp_server(client: ShelflifeClient, session_concurrency: int = MCP_SESSION_CONCURRENCY) -> FastMCP:
     mcp = FastMCP(
         name="shelflife",
         instructions=(
@@ -29,34 +59,61 @@ def create_mcp_server(client: ShelflifeClient) -> FastMCP:
             "understand reading interests. Books are identified by title and author."
         ),
     )
+    mcp.add_middleware(SessionConcurrencyLimit(session_concurrency))
+    LibraryResources(client).register(mcp)
 
     @mcp.tool()
     async def search_books(
         query: str | None = None,
         author: str | None = None,
         tag: str | None = None,
+        tags_all: Annotated[list[str] | None, Field(description="Only books with every one of these tags")] = None,
+        tags_any: Annotated[list[str] | None, Field(description="Only books with at least one of these tags")] = None,
+        tags_none: Annotated[list[str] | None, Field(description="Leave out books with any of these tags")] = None,
+        shelf: Annotated[str | None, Field(description="Only books on this shelf")] = None,
+        min_rating: Annotated[float | None, Field(description="Only books rated at least this (0-5)")] = None,
+        unread: Annotated[bool | None, Field(description="true for books never finished, false for finished ones")] = None,
         started_after: Annotated[str | None, Field(description="Return only books with a reading started on or after this date (YYYY-MM-DD)")] = None,
         started_before: Annotated[str | None, Field(description="Return only books with a reading started on or before this date (YYYY-MM-DD)")] = None,
         finished_after: Annotated[str | None, Field(description="Return only books with a reading finished on or after this date (YYYY-MM-DD)")] = None,
         finished_before: Annotated[str | None, Field(description="Return only books with a reading finished on or before this date (YYYY-MM-DD)")] = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> list[dict]:
+        cursor: CursorParam = None,
+        view: ViewParam = MCP_BOOK_VIEW,
+        fields: FieldsParam = None,
+        table: TableParam = False,
+    ) -> dict:
         """Search your book library by title, author, tag, or free text query.
+        Combine tags with tags_all, tags_any and tags_none, and narrow to a
+        shelf, a minimum rating or unread books.
         Optionally filter by reading dates using started_after, started_before,
         finished_after, finished_before (all in YYYY-MM-DD format).
-        Supports pagination via limit and offset."""
+        Returns {"books": [...], "next_cursor": ...} with up to `limit` books;
+        next_cursor is null on the last page, and otherwise passing it as
+        cursor (with the same filters) continues the list. Returns compact
+        books by default; use get_books for full details of specific books."""
         return await _search_books(
             client,
             query=query,
             author=author,
             tag=tag,
+            tags_all=tags_all,
+            tags_any=tags_any,
+            tags_none=tags_none,
+            shelf=shelf,
+            min_rating=min_rating,
+            unread=unread,
             started_after=started_after,
             started_before=started_before,
             finished_after=finished_after,
             finished_before=finished_before,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            view=view,
+            fields=fields,
+            table=table,
         )
 
     @mcp.tool()
@@ -77,6 +134,21 @@ def create_mcp_server(client: ShelflifeClient) -> FastMCP:
         on a shelf (created if it doesn't exist)."""
         return await _add_book(client, title=title, author=author, shelf=shelf)
 
+    @mcp.tool()
+    async def add_books(
+        books: Annotated[
+            list[BookToAdd],
+            Field(
+                description="Books to add, each with 'title', 'author' and an optional 'shelf'",
+                max_length=MAX_BATCH_ITEMS,
+            ),
+        ],
+    ) -> dict:
+        """Add several books at once, resolved and enriched like add_book, in a
+        single transaction. Reports a status per book: created, or conflict if
+        it is already in the library."""
+        return await _add_books(client, books=books)
+
     @mcp.tool()
     async def resolve_book(title: str, author: str) -> dict:
         """Enrich an existing book by matching it against Open Library for
@@ -90,9 +162,37 @@ def create_mcp_server(client: ShelflifeClient) -> FastMCP:
         return await _shelve_book(client, title=title, author=author, shelf=shelf)
 
     @mcp.tool()
-    async def browse_shelf(shelf_name: str | None = None) -> dict | list:
-        """List all shelves (no argument) or get books on a specific shelf."""
-        return await _browse_shelf(client, shelf_name=shelf_name)
+    async def shelve_books(
+        shelf: str,
+        books: Annotated[
+            list[BookRef],
+            Field(
+                description="Books to put on the shelf, each with 'title' and 'author'",
+                max_length=MAX_BATCH_ITEMS,
+            ),
+        ],
+    ) -> dict:
+        """Put several books on a shelf in one go, creating the shelf if needed.
+        Reports a status per book: created, unchanged, or not_found."""
+        return await _shelve_books(client, shelf=shelf, books=books)
+
+    @mcp.tool()
+    async def browse_shelf(
+        shelf_name: str | None = None,
+        sort: Annotated[
+            ShelfSort, Field(description="Order books by when they were added or read (newest first), or by title")
+        ] = "date_added",
+        cursor: CursorParam = None,
+        view: ViewParam = MCP_BOOK_VIEW,
+        fields: FieldsParam = None,
+        table: TableParam = False,
+    ) -> dict | list:
+        """List all shelves with their book counts (no argument), or get a
+        shelf's book_count and books, 50 at a time; pass next_cursor as
+        cursor for the next page."""
+        return await _browse_shelf(
+            client, shelf_name=shelf_name, sort=sort, cursor=cursor, view=view, fields=fields, table=table
+        )
 
     @mcp.tool()
     async def review_book(
@@ -105,15 +205,31 @@ def create_mcp_server(client: ShelflifeClient) -> FastMCP:
         Rating is 0.0-5.0."""
         return await _review_book(client, title=title, author=author, rating=rating, review_text=review_text)
 
+    @mcp.tool()
+    async def review_books(
+        reviews: Annotated[
+            list[BookReview],
+            Field(
+                description="Reviews to save, each with 'title', 'author', and 'rating' and/or 'review_text'",
+                max_length=MAX_BATCH_ITEMS,
+            ),
+        ],
+    ) -> dict:
+        """Rate and/or review several books at once. Creates or updates each review.
+        Reports a status per book: created, updated, or not_found."""
+        return await _review_books(client, reviews=reviews)
+
     @mcp.tool()
     async def get_reviews(
         min_rating: Annotated[float | None, Field(description="Minimum star rating to include (0.0-5.0)")] = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> list[dict]:
-        """List book reviews, optionally filtered by minimum rating.
-        Supports pagination via limit and offset."""
-        return await _get_reviews(client, min_rating=min_rating, limit=limit, offset=offset)
+        cursor: CursorParam = None,
+    ) -> dict:
+        """List book reviews, most recently updated first, optionally filtered
+        by minimum rating. Returns {"reviews": [...], "next_cursor": ...};
+        while next_cursor isn't null, pass it as cursor to continue."""
+        return await _get_reviews(client, min_rating=min_rating, limit=limit, offset=offset, cursor=cursor)
 
     @mcp.tool()
     async def tag_books(
@@ -128,9 +244,26 @@ def create_mcp_server(client: ShelflifeClient) -> FastMCP:
         return await _tag_books(client, tag=tag, books=books)
 
     @mcp.tool()
-    async def browse_tag(tag_name: str | None = None) -> list[dict]:
-        """List all tags (no argument) or get books with a specific tag."""
-        return await _browse_tag(client, tag_name=tag_name)
+    async def browse_tag(
+        tag_name: str | None = None,
+        prefix: Annotated[str | None, Field(description="Without tag_name: only tags starting with this")] = None,
+        min_count: Annotated[int, Field(description="Without tag_name: only tags on at least this many books")] = 0,
+        sort: Annotated[
+            Literal["name", "count"], Field(description="Without tag_name: most-used tags first, or by name")
+        ] = "count",
+        cursor: CursorParam = None,
+        view: ViewParam = MCP_BOOK_VIEW,
+        fields: FieldsParam = None,
+        table: TableParam = False,
+    ) -> dict:
+        """List tags with their book counts, 100 at a time (no tag_name), or
+        get books with a specific tag, 50 at a time. Returns {"tags" or
+        "books": [...], "next_cursor": ...}; while next_cursor isn't null,
+        passing it as cursor continues."""
+        return await _browse_tag(
+            client, tag_name=tag_name, prefix=prefix, min_count=min_count, sort=sort, cursor=cursor, view=view,
+            fields=fields, table=table,
+        )
 
     @mcp.tool()
     async def reading_profile() -> dict:
@@ -178,6 +311,19 @@ def create_mcp_server(client: ShelflifeClient) -> FastMCP:
             progress_date=progress_date,
         )
 
+    @mcp.tool()
+    async def log_progress_batch(
+        entries: Annotated[
+            list[ProgressEntry],
+            Field(description="Progress entries, each with 'title', 'author', one of page / pages_read / "
+                  "start_page+end_page, and an optional 'progress_date' (YYYY-MM-DD)", max_length=MAX_BATCH_ITEMS),
+        ],
+    ) -> dict:
+        """Log reading progress for several books at once, in order. Reports a
+        status per entry: created, not_found (no book or no active reading), or
+        conflict (progress already logged for that date)."""
+        return await _log_progress_batch(client, entries=entries)
+
     @mcp.tool()
     async def get_reading_history(
         books: Annotated[
@@ -0,0 +1,61 @@
+"""Token-efficient book payloads for MCP tool results.
+
+Tools that list books ask the API for just the fields of a view, trim long
+descriptions, and can return a table (column names once, then one row of
+values per book) instead of repeating every key for every book.
+"""
+
+from typing import Literal
+
+from shelflife.config import MCP_DESCRIPTION_CHARS
+from shelflife.schemas.book import BookResponse
+
+BookView = Literal["minimal", "compact", "full"]
+
+VIEWS: dict[str, tuple[str, ...]] = {
+    "minimal": ("title", "author"),
+    "compact": ("title", "author", "year_published", "page_count", "description"),
+    # Every field, descriptions untrimmed; named explicitly since API lists leave out descriptions by default
+    "full": tuple(BookResponse.model_fields),
+}
+
+
+def _keep(view: BookView, fields: list[str] | None) -> tuple[str, ...]:
+    return tuple(fields) if fields else VIEWS[view]
+
+
+def fields_param(view: BookView, fields: list[str] | None = None) -> str:
+    """The API `fields=` value for a view."""
+    return ",".join(_keep(view, fields))
+
+
+def truncate(text: str | None, limit: int = MCP_DESCRIPTION_CHARS) -> str | None:
+    if text is None or len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + "…"
+
+
+def shape_books(
+    books: list[dict], view: BookView, fields: list[str] | None = None, table: bool = False
+) -> list[dict] | dict:
+    """Project, trim and optionally tabulate books returned by the API."""
+    keep = _keep(view, fields)
+    books = [{name: book.get(name) for name in keep} for book in books]
+    if view != "full":
+        for book in books:
+            if "description" in book:
+                book["description"] = truncate(book["description"])
+    if not table:
+        return books
+    columns = list(keep)
+    return {"columns": columns, "rows": [[book.get(c) for c in columns] for book in books]}
+
+
+def with_cursor(result: list[dict] | dict, next_cursor: str | None, key: str) -> dict:
+    """A page with the cursor for the next one, or None on the last: {key: list, "next_cursor": ...}.
+
+    A table already is a dict, and gets "next_cursor" next to its columns and rows.
+    """
+    if isinstance(result, dict):
+        return {**result, "next_cursor": next_cursor}
+    return {key: result, "next_cursor": next_cursor}
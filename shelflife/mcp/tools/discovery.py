@@ -1,4 +1,6 @@
+from shelflife.config import MCP_BOOK_VIEW
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.tools.compact import BookView, fields_param, shape_books, with_cursor
 from shelflife.mcp.tools.types import BookRef
 
 
@@ -7,20 +9,38 @@ async def search_books(
     query: str | None = None,
     author: str | None = None,
     tag: str | None = None,
+    tags_all: list[str] | None = None,
+    tags_any: list[str] | None = None,
+    tags_none: list[str] | None = None,
+    shelf: str | None = None,
+    min_rating: float | None = None,
+    unread: bool | None = None,
     started_after: str | None = None,
     started_before: str | None = None,
     finished_after: str | None = None,
     finished_before: str | None = None,
     limit: int = 50,
     offset: int = 0,
-) -> list[dict]:
-    params = {"limit": limit, "offset": offset}
+    cursor: str | None = None,
+    view: BookView = MCP_BOOK_VIEW,
+    fields: list[str] | None = None,
+    table: bool = False,
+) -> dict:
+    params = {"limit": limit, "cursor": cursor} if cursor else {"limit": limit, "offset": offset}
+    params["fields"] = fields_param(view, fields)
     if query:
         params["q"] = query
     if author:
         params["author"] = author
     if tag:
         params["tag"] = tag
+    for name, value in [("tags_all", tags_all), ("tags_any", tags_any), ("tags_none", tags_none), ("shelf", shelf)]:
+        if value:
+            params[name] = value
+    if min_rating is not None:
+        params["min_rating"] = min_rating
+    if unread is not None:
+        params["unread"] = unread
     if started_after:
         params["started_after"] = started_after
     if started_before:
@@ -29,10 +49,10 @@ async def search_books(
         params["finished_after"] = finished_after
     if finished_before:
         params["finished_before"] = finished_before
-    result = await client.get("/api/books", params=params)
+    result, next_cursor = await client.get_page("/api/books", params=params)
     if isinstance(result, dict) and result.get("error"):
-        return []
-    return result
+        result, next_cursor = [], None
+    return with_cursor(shape_books(result, view, fields, table), next_cursor, "books")
 
 
 async def get_books(
@@ -1,5 +1,6 @@
 from shelflife.id import make_id
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.tools.types import BookToAdd, label_results
 
 
 async def add_book(
@@ -7,27 +8,24 @@ async def add_book(
     title: str,
     author: str,
     shelf: str | None = None,
+) -> dict:
+    params = {"resolve": "true", "enrich": "true"}
+    if shelf:
+        # Shelved in the same transaction; the shelf is created if it doesn't exist
+        params["shelf"] = shelf
+    return await client.post("/api/books", params=params, json={"title": title, "author": author})
+
+
+async def add_books(
+    client: ShelflifeClient,
+    books: list[BookToAdd],
 ) -> dict:
     result = await client.post(
-        "/api/books",
+        "/api/books/batch",
         params={"resolve": "true", "enrich": "true"},
-        json={"title": title, "author": author},
+        json={"books": [b.model_dump(exclude_none=True) for b in books]},
     )
-    if isinstance(result, dict) and result.get("error"):
-        return result
-
-    book_id = result["id"]
-
-    if shelf:
-        # Create shelf if it doesn't exist
-        shelf_id = make_id(shelf)
-        shelf_resp = await client.get(f"/api/shelves/{shelf_id}")
-        if isinstance(shelf_resp, dict) and shelf_resp.get("error"):
-            await client.post("/api/shelves", json={"name": shelf})
-            shelf_id = make_id(shelf)
-        await client.post(f"/api/shelves/{shelf_id}/books/{book_id}")
-
-    return result
+    return label_results(result, books)
 
 
 async def resolve_book(
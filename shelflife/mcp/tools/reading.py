@@ -2,7 +2,7 @@ from datetime import date
 
 from shelflife.id import make_id
 from shelflife.mcp.client import ShelflifeClient
-from shelflife.mcp.tools.types import BookRef
+from shelflife.mcp.tools.types import BookRef, ProgressEntry, label_results
 
 
 async def start_reading(
@@ -56,6 +56,21 @@ async def log_reading_progress(
     return await client.post(f"/api/books/{book_id}/reading/progress", json=body)
 
 
+async def log_progress_batch(
+    client: ShelflifeClient,
+    entries: list[ProgressEntry],
+) -> dict:
+    items = []
+    for e in entries:
+        item = {"book_id": make_id(e.title, e.author)}
+        item.update(e.model_dump(include={"page", "pages_read", "start_page", "end_page"}, exclude_none=True))
+        if e.progress_date is not None:
+            item["date"] = e.progress_date
+        items.append(item)
+    result = await client.post("/api/reading/progress/batch", json={"items": items})
+    return label_results(result, entries)
+
+
 async def get_reading_history(
     client: ShelflifeClient,
     books: list[BookRef],
@@ -1,5 +1,7 @@
 from shelflife.id import make_id
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.tools.compact import with_cursor
+from shelflife.mcp.tools.types import BookReview, label_results
 
 
 async def review_book(
@@ -17,15 +19,20 @@ async def review_book(
     if review_text is not None:
         body["review_text"] = review_text
 
-    # Try to create a new review
-    result = await client.post(f"/api/books/{book_id}/reviews", json=body)
+    # Creates the review or updates only the fields given
+    return await client.put(f"/api/books/{book_id}/review", json=body)
 
-    # If 409 (already exists), update instead
-    if isinstance(result, dict) and result.get("status") == 409:
-        review_id = make_id(book_id)
-        result = await client.put(f"/api/reviews/{review_id}", json=body)
 
-    return result
+async def review_books(
+    client: ShelflifeClient,
+    reviews: list[BookReview],
+) -> dict:
+    items = [
+        {"book_id": make_id(r.title, r.author), **r.model_dump(include={"rating", "review_text"}, exclude_none=True)}
+        for r in reviews
+    ]
+    result = await client.post("/api/reviews/batch", json={"items": items})
+    return label_results(result, reviews)
 
 
 async def get_reviews(
@@ -33,11 +40,12 @@ async def get_reviews(
     min_rating: int | None = None,
     limit: int = 50,
     offset: int = 0,
-) -> list[dict]:
-    params = {"limit": limit, "offset": offset}
+    cursor: str | None = None,
+) -> dict:
+    params = {"limit": limit, "cursor": cursor} if cursor else {"limit": limit, "offset": offset}
     if min_rating is not None:
         params["min_rating"] = min_rating
-    result = await client.get("/api/reviews", params=params)
+    result, next_cursor = await client.get_page("/api/reviews", params=params)
     if isinstance(result, dict) and result.get("error"):
-        return []
-    return result
+        result, next_cursor = [], None
+    return with_cursor(result, next_cursor, "reviews")
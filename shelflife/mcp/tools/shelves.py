@@ -1,8 +1,13 @@
+from typing import Literal
+from urllib.parse import quote
+
 from shelflife.id import make_id
+from shelflife.config import MCP_BOOK_VIEW
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.tools.compact import BookView, fields_param, shape_books
+from shelflife.mcp.tools.types import BookRef, label_results
 
-
-EXCLUSIVE_SHELF_NAMES = {"read", "currently-reading", "to-read"}
+ShelfSort = Literal["date_added", "date_read", "title"]
 
 
 async def shelve_book(
@@ -12,21 +17,37 @@ async def shelve_book(
     shelf: str,
 ) -> dict:
     book_id = make_id(title, author)
-    shelf_id = make_id(shelf)
+    # Creates the shelf if it doesn't exist; a no-op if the book is already there.
+    # Quoted so names with "/", "?", "#" or "%" stay one path segment
+    return await client.put(f"/api/shelves/by-name/{quote(shelf, safe='')}/books/{book_id}")
 
-    # Create shelf if it doesn't exist
-    shelf_resp = await client.get(f"/api/shelves/{shelf_id}")
-    if isinstance(shelf_resp, dict) and shelf_resp.get("error"):
-        is_exclusive = shelf.lower() in EXCLUSIVE_SHELF_NAMES
-        await client.post("/api/shelves", json={"name": shelf, "is_exclusive": is_exclusive})
 
-    return await client.post(f"/api/shelves/{shelf_id}/books/{book_id}")
+async def shelve_books(
+    client: ShelflifeClient,
+    shelf: str,
+    books: list[BookRef],
+) -> dict:
+    items = [{"shelf": shelf, "book_id": make_id(b.title, b.author)} for b in books]
+    result = await client.post("/api/shelves/books/batch", json={"items": items})
+    return label_results(result, books)
 
 
 async def browse_shelf(
     client: ShelflifeClient,
     shelf_name: str | None = None,
+    sort: ShelfSort = "date_added",
+    cursor: str | None = None,
+    view: BookView = MCP_BOOK_VIEW,
+    fields: list[str] | None = None,
+    table: bool = False,
 ) -> dict | list:
-    if shelf_name:
-        return await client.get(f"/api/shelves/by-name/{shelf_name}")
-    return await client.get("/api/shelves")
+    if not shelf_name:
+        return await client.get("/api/shelves")
+    # Titles read A-Z; dates newest first
+    params = {"sort": sort, "order": "asc" if sort == "title" else "desc", "fields": fields_param(view, fields)}
+    if cursor:
+        params["cursor"] = cursor
+    result = await client.get(f"/api/shelves/{make_id(shelf_name)}", params=params)
+    if "books" in result:
+        result["books"] = shape_books(result["books"], view, fields, table)
+    return result
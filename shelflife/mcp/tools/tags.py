@@ -1,5 +1,9 @@
+from typing import Literal
+
 from shelflife.id import make_id
+from shelflife.config import MCP_BOOK_VIEW
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.tools.compact import BookView, fields_param, shape_books, with_cursor
 from shelflife.mcp.tools.types import BookRef
 
 
@@ -25,13 +29,31 @@ async def tag_books(
 async def browse_tag(
     client: ShelflifeClient,
     tag_name: str | None = None,
-) -> list[dict]:
+    prefix: str | None = None,
+    min_count: int = 0,
+    sort: Literal["name", "count"] = "count",
+    cursor: str | None = None,
+    view: BookView = MCP_BOOK_VIEW,
+    fields: list[str] | None = None,
+    table: bool = False,
+) -> dict:
     if tag_name:
-        result = await client.get(f"/api/tags/by-name/{tag_name}/books")
+        params = {"fields": fields_param(view, fields)}
+        if cursor:
+            params["cursor"] = cursor
+        result, next_cursor = await client.get_page(f"/api/tags/{make_id(tag_name)}/books", params=params)
         if isinstance(result, dict) and result.get("error"):
-            return []
-        return result
-    result = await client.get("/api/tags")
+            result, next_cursor = [], None
+        return with_cursor(shape_books(result, view, fields, table), next_cursor, "books")
+    # Most-used tags first; names A-Z
+    params = {"sort": sort, "order": "desc" if sort == "count" else "asc"}
+    if prefix:
+        params["prefix"] = prefix
+    if min_count:
+        params["min_count"] = min_count
+    if cursor:
+        params["cursor"] = cursor
+    result, next_cursor = await client.get_page("/api/tags", params=params)
     if isinstance(result, dict) and result.get("error"):
-        return []
-    return result
+        result, next_cursor = [], None
+    return with_cursor(result, next_cursor, "tags")
@@ -1,8 +1,41 @@
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import BaseModel, Field
 
 
 class BookRef(BaseModel):
     """Identifies a book by title and author."""
 
     title: str
-    author: str
\ No newline at end of file
+    author: str
+
+
+class BookToAdd(BookRef):
+    """A book to add, optionally placed on a shelf."""
+
+    shelf: str | None = None
+
+
+class BookReview(BookRef):
+    """A rating and/or review for a book."""
+
+    rating: Annotated[float | None, Field(ge=0.0, le=5.0, description="Star rating from 0.0 (worst) to 5.0 (best)")] = None
+    review_text: str | None = None
+
+
+class ProgressEntry(BookRef):
+    """Reading progress on a book: page, pages_read, or start_page+end_page."""
+
+    page: int | None = None
+    pages_read: int | None = None
+    start_page: int | None = None
+    end_page: int | None = None
+    progress_date: Annotated[str | None, Field(description="YYYY-MM-DD; defaults to today")] = None
+
+
+def label_results(result: dict, books: list[BookRef]) -> dict:
+    """Tag each per-item result of a batch endpoint with the book it refers to."""
+    for item in result.get("results", []):
+        book = books[item["index"]]
+        item["book"] = f"{book.title} by {book.author}"
+    return result
@@ -0,0 +1,80 @@
+"""Bring the database schema up to date, skipping Alembic when it already is.
+
+Starting Alembic means importing it plus the models and running env.py,
+which costs more than the rest of a cold start. The common case, a database
+already at head, only needs the revision stored in `alembic_version`
+compared with the newest migration file, which this module reads with the
+stdlib. Anything else (new database, pending migrations, branched history)
+falls through to `alembic upgrade head` in a subprocess, as before.
+
+    python -m shelflife.migrations
+"""
+
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+from shelflife.config import DB_PATH
+
+# Relative to the working directory, like `alembic upgrade head` itself
+ALEMBIC_INI = Path("alembic.ini")
+VERSIONS_DIR = Path("alembic/versions")
+
+_REVISION = re.compile(r"^revision\b[^=]*=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\b[^=]*=(.*)$", re.MULTILINE)
+_QUOTED = re.compile(r"['\"](\w+)['\"]")
+
+
+def head_revision(versions_dir: Path = VERSIONS_DIR) -> str | None:
+    """The single head revision among the migration files, or None if there isn't exactly one."""
+    revisions = set()
+    parents = set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text()
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down is not None:
+            parents.update(_QUOTED.findall(down.group(1)))
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+def current_revision(db_path: str | Path = DB_PATH) -> str | None:
+    """The revision recorded in the database, or None if it has none (or doesn't exist)."""
+    if not Path(db_path).exists():
+        return None
+    try:
+        with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+            rows = conn.execute("SELECT version_num FROM alembic_version").fetchall()
+    except sqlite3.Error:
+        return None
+    return rows[0][0] if len(rows) == 1 else None
+
+
+def is_at_head(db_path: str | Path = DB_PATH, versions_dir: Path = VERSIONS_DIR) -> bool:
+    head = head_revision(versions_dir)
+    return head is not None and current_revision(db_path) == head
+
+
+def upgrade(db_path: str | Path = DB_PATH) -> bool:
+    """Migrate the database to head if needed. Returns whether Alembic ran."""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    if is_at_head(db_path):
+        return False
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic", "-c", str(ALEMBIC_INI), "upgrade", "head"],
+        env={**os.environ, "SHELFLIFE_DB_PATH": str(db_path)},
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.returncode)
+    return True
+
+
+if __name__ == "__main__":
+    upgrade()
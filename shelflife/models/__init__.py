@@ -1,7 +1,8 @@
 from shelflife.models.book import Book, BookTag
+from shelflife.models.data_version import DataVersion
 from shelflife.models.reading import Reading, ReadingProgress
 from shelflife.models.review import Review
 from shelflife.models.shelf import Shelf, ShelfBook
 from shelflife.models.tag import Tag
 
-__all__ = ["Book", "BookTag", "Reading", "ReadingProgress", "Review", "Shelf", "ShelfBook", "Tag"]
+__all__ = ["Book", "BookTag", "DataVersion", "Reading", "ReadingProgress", "Review", "Shelf", "ShelfBook", "Tag"]
@@ -1,6 +1,6 @@
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, func, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from shelflife.database import Base
@@ -17,8 +17,8 @@ class Book(Base):
     __tablename__ = "books"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
-    title: Mapped[str] = mapped_column(String(500), nullable=False)
-    author: Mapped[str] = mapped_column(String(300), nullable=False)
+    title: Mapped[str] = mapped_column(String(500), nullable=False, index=True)
+    author: Mapped[str] = mapped_column(String(300), nullable=False, index=True)
     additional_authors: Mapped[str | None] = mapped_column(String(500))
     isbn: Mapped[str | None] = mapped_column(String(13), unique=True)
     isbn13: Mapped[str | None] = mapped_column(String(17), unique=True)
@@ -29,10 +29,34 @@ class Book(Base):
     cover_url: Mapped[str | None] = mapped_column(String(500))
     goodreads_id: Mapped[str | None] = mapped_column(String(20), unique=True)
     open_library_key: Mapped[str | None] = mapped_column(String(50))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC), index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
+    # Copies of the review's rating and the latest finished reading, kept up to date by the
+    # triggers in models.review and models.reading so lists can sort and filter on them by index
+    rating: Mapped[float | None] = mapped_column(Float)
+    last_finished_at: Mapped[date | None] = mapped_column(Date)
 
     review: Mapped["Review | None"] = relationship(back_populates="book", cascade="all, delete-orphan", uselist=False)
     shelf_links: Mapped[list["ShelfBook"]] = relationship(back_populates="book", cascade="all, delete-orphan")
     tags: Mapped[list["Tag"]] = relationship(secondary="book_tags", back_populates="books")
     readings: Mapped[list["Reading"]] = relationship(back_populates="book", cascade="all, delete-orphan")
+
+
+def _missing_lowest(column, lowest: str):
+    # A literal rather than a bound parameter, so queries spell it exactly as the index does
+    return func.coalesce(column, literal_column(lowest))
+
+
+# Sort keys for nullable columns, where a missing value sorts as the lowest. Each is indexed
+# below, and the rowid after it in every entry makes the index a (key, id) keyset index.
+RATING_KEY = _missing_lowest(Book.rating, "-1")
+YEAR_KEY = _missing_lowest(Book.year_published, "-1")
+PAGES_KEY = _missing_lowest(Book.page_count, "-1")
+FINISHED_KEY = _missing_lowest(Book.last_finished_at, "'0001-01-01'")
+
+Index("ix_books_rating", RATING_KEY)
+Index("ix_books_year_published", YEAR_KEY)
+Index("ix_books_page_count", PAGES_KEY)
+Index("ix_books_last_finished_at", FINISHED_KEY)
+# Case-insensitive exact and prefix author matches seek into this
+Index("ix_books_author_nocase", Book.author.collate("NOCASE"))
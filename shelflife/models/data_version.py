@@ -0,0 +1,37 @@
+from sqlalchemy import DDL, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shelflife.database import Base
+
+
+class DataVersion(Base):
+    """A table's change counter, bumped by a trigger on every row written, so every process sharing the file sees it."""
+
+    __tablename__ = "data_versions"
+
+    table_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+
+# Tables with a counter; the same rows and triggers are created by the add_data_versions migration
+VERSIONED_TABLES = ("books", "book_tags", "tags", "shelves", "shelf_books", "reviews", "readings", "reading_progress")
+
+
+def version_triggers(table: str) -> list[str]:
+    return [
+        f"""CREATE TRIGGER {table}_version_{op.lower()} AFTER {op} ON {table} BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}';
+END"""
+        for op in ("INSERT", "UPDATE", "DELETE")
+    ]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_versioning(metadata, connection, tables=(), **kw) -> None:
+    created = {table.name for table in tables}
+    if DataVersion.__tablename__ in created:
+        connection.execute(DataVersion.__table__.insert(), [{"table_name": t, "version": 0} for t in VERSIONED_TABLES])
+    for table in VERSIONED_TABLES:
+        if table in created:
+            for trigger in version_triggers(table):
+                connection.execute(DDL(trigger))
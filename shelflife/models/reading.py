@@ -1,6 +1,6 @@
 from datetime import UTC, date, datetime
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import DDL, Date, DateTime, ForeignKey, Integer, UniqueConstraint, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from shelflife.database import Base
@@ -10,7 +10,7 @@ class Reading(Base):
     __tablename__ = "readings"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
-    book_id: Mapped[int] = mapped_column(ForeignKey("books.id", ondelete="CASCADE"))
+    book_id: Mapped[int] = mapped_column(ForeignKey("books.id", ondelete="CASCADE"), index=True)
     started_at: Mapped[date | None] = mapped_column(Date)
     finished_at: Mapped[date | None] = mapped_column(Date)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
@@ -27,9 +27,29 @@ class ReadingProgress(Base):
     __table_args__ = (UniqueConstraint("reading_id", "date"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
-    reading_id: Mapped[int] = mapped_column(ForeignKey("readings.id", ondelete="CASCADE"))
+    reading_id: Mapped[int] = mapped_column(ForeignKey("readings.id", ondelete="CASCADE"), index=True)
     page: Mapped[int] = mapped_column(Integer)
     date: Mapped[date] = mapped_column(Date)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
 
     reading: Mapped["Reading"] = relationship(back_populates="progress_entries")
+
+
+# Keep books.last_finished_at at the book's latest finished reading; the same triggers are
+# created by the add_book_sort_keys migration
+FINISHED_TRIGGERS = (
+    """CREATE TRIGGER readings_finished_insert AFTER INSERT ON readings WHEN NEW.finished_at IS NOT NULL BEGIN
+    UPDATE books SET last_finished_at = (SELECT max(finished_at) FROM readings WHERE book_id = NEW.book_id)
+    WHERE id = NEW.book_id;
+END""",
+    """CREATE TRIGGER readings_finished_update AFTER UPDATE OF finished_at ON readings BEGIN
+    UPDATE books SET last_finished_at = (SELECT max(finished_at) FROM readings WHERE book_id = NEW.book_id)
+    WHERE id = NEW.book_id;
+END""",
+    """CREATE TRIGGER readings_finished_delete AFTER DELETE ON readings WHEN OLD.finished_at IS NOT NULL BEGIN
+    UPDATE books SET last_finished_at = (SELECT max(finished_at) FROM readings WHERE book_id = OLD.book_id)
+    WHERE id = OLD.book_id;
+END""",
+)
+for _trigger in FINISHED_TRIGGERS:
+    event.listen(Reading.__table__, "after_create", DDL(_trigger))
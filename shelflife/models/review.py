@@ -1,6 +1,6 @@
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Text
+from sqlalchemy import DDL, DateTime, Float, ForeignKey, Text, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from shelflife.database import Base
@@ -14,6 +14,24 @@ class Review(Base):
     rating: Mapped[float | None] = mapped_column(Float)
     review_text: Mapped[str | None] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC), index=True
+    )
 
     book: Mapped["Book"] = relationship(back_populates="review")
+
+
+# Copy the rating onto books.rating; the same triggers are created by the add_book_sort_keys migration
+RATING_TRIGGERS = (
+    """CREATE TRIGGER reviews_rating_insert AFTER INSERT ON reviews BEGIN
+    UPDATE books SET rating = NEW.rating WHERE id = NEW.book_id;
+END""",
+    """CREATE TRIGGER reviews_rating_update AFTER UPDATE OF rating ON reviews BEGIN
+    UPDATE books SET rating = NEW.rating WHERE id = NEW.book_id;
+END""",
+    """CREATE TRIGGER reviews_rating_delete AFTER DELETE ON reviews BEGIN
+    UPDATE books SET rating = NULL WHERE id = OLD.book_id;
+END""",
+)
+for _trigger in RATING_TRIGGERS:
+    event.listen(Review.__table__, "after_create", DDL(_trigger))
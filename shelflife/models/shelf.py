@@ -1,6 +1,6 @@
 from datetime import UTC, date, datetime
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import DDL, Boolean, Date, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from shelflife.database import Base
@@ -8,7 +8,10 @@ from shelflife.database import Base
 
 class ShelfBook(Base):
     __tablename__ = "shelf_books"
-    __table_args__ = (UniqueConstraint("shelf_id", "book_id"),)
+    __table_args__ = (
+        UniqueConstraint("shelf_id", "book_id"),
+        Index("ix_shelf_books_shelf_id_date_added", "shelf_id", "date_added"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
     shelf_id: Mapped[int] = mapped_column(ForeignKey("shelves.id", ondelete="CASCADE"))
@@ -28,5 +31,24 @@ class Shelf(Base):
     description: Mapped[str | None] = mapped_column(String(500))
     is_exclusive: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+    # Books on the shelf, kept up to date by the triggers below rather than counted per request
+    book_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     book_links: Mapped[list["ShelfBook"]] = relationship(back_populates="shelf", cascade="all, delete-orphan")
+
+
+# The same triggers are created by the add_shelf_counts migration
+SHELF_COUNT_TRIGGERS = (
+    """CREATE TRIGGER shelf_books_count_insert AFTER INSERT ON shelf_books BEGIN
+    UPDATE shelves SET book_count = book_count + 1 WHERE id = NEW.shelf_id;
+END""",
+    """CREATE TRIGGER shelf_books_count_delete AFTER DELETE ON shelf_books BEGIN
+    UPDATE shelves SET book_count = book_count - 1 WHERE id = OLD.shelf_id;
+END""",
+    """CREATE TRIGGER shelf_books_count_update AFTER UPDATE OF shelf_id ON shelf_books BEGIN
+    UPDATE shelves SET book_count = book_count - 1 WHERE id = OLD.shelf_id;
+    UPDATE shelves SET book_count = book_count + 1 WHERE id = NEW.shelf_id;
+END""",
+)
+for _trigger in SHELF_COUNT_TRIGGERS:
+    event.listen(ShelfBook.__table__, "after_create", DDL(_trigger))
@@ -1,7 +1,8 @@
-from sqlalchemy import String
+from sqlalchemy import DDL, Index, Integer, String, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from shelflife.database import Base
+from shelflife.models.book import BookTag
 
 
 class Tag(Base):
@@ -9,5 +10,27 @@ class Tag(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    # Books with the tag, kept up to date by the triggers below rather than counted per request
+    book_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0", index=True)
 
     books: Mapped[list["Book"]] = relationship(secondary="book_tags", back_populates="tags")
+
+
+# Case-insensitive prefix search seeks into this
+Index("ix_tags_name_lower", func.lower(Tag.name))
+
+# The same triggers are created by the add_tag_counts migration
+TAG_COUNT_TRIGGERS = (
+    """CREATE TRIGGER book_tags_count_insert AFTER INSERT ON book_tags BEGIN
+    UPDATE tags SET book_count = book_count + 1 WHERE id = NEW.tag_id;
+END""",
+    """CREATE TRIGGER book_tags_count_delete AFTER DELETE ON book_tags BEGIN
+    UPDATE tags SET book_count = book_count - 1 WHERE id = OLD.tag_id;
+END""",
+    """CREATE TRIGGER book_tags_count_update AFTER UPDATE OF tag_id ON book_tags BEGIN
+    UPDATE tags SET book_count = book_count - 1 WHERE id = OLD.tag_id;
+    UPDATE tags SET book_count = book_count + 1 WHERE id = NEW.tag_id;
+END""",
+)
+for _trigger in TAG_COUNT_TRIGGERS:
+    event.listen(BookTag.__table__, "after_create", DDL(_trigger))
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.database import get_session
+from shelflife.schemas.autocomplete import AutocompleteStats, Suggestion, SuggestionKind
+from shelflife.services.autocomplete import autocomplete, autocomplete_stats
+
+router = APIRouter(prefix="/api/autocomplete", tags=["autocomplete"])
+
+
+@router.get("", response_model=list[Suggestion])
+async def suggest(
+    prefix: str = Query(..., min_length=1, description="What has been typed so far; case and accents are ignored"),
+    kinds: list[SuggestionKind] | None = Query(None, description="Only these kinds of name (repeat the parameter)"),
+    limit: int = Query(10, ge=1, le=50),
+    session: AsyncSession = Depends(get_session),
+):
+    """Titles, authors, tags and shelves whose name, or a later word of it, starts with `prefix`."""
+    return await autocomplete(session, prefix, kinds=kinds, limit=limit)
+
+
+@router.get("/stats", response_model=AutocompleteStats)
+async def stats(session: AsyncSession = Depends(get_session)):
+    """Names and keys per kind, and the index's memory use against its budget."""
+    return await autocomplete_stats(session)
@@ -1,164 +1,177 @@
 from datetime import date
-from typing import Literal
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from shelflife.database import get_session
 from shelflife.id import make_id
-from shelflife.models import Book, BookTag, Reading, ShelfBook, Tag
+from shelflife.schemas.batch import BatchResponse, BookBatchRequest
 from shelflife.schemas.book import (
     BookCreate,
     BookDetail,
+    BookListItem,
     BookLookupResult,
     BookResponse,
     BookUpdate,
     BulkBookRequest,
     EnrichResponse,
+    ResolveRequest,
+    ResolveResponse,
 )
-from shelflife.services.enrich_service import enrich_book
-from shelflife.services.openlibrary import search_candidates
+from shelflife.schemas.facets import FacetsResponse
+from shelflife.schemas.params import LookupLimit, NonNegative, Offset, PageLimit, Rating, SearchLimit, TopLimit
+from shelflife.routers.pagination import cursor_query
+from shelflife.routers.projection import fields_query, include_query, projected
+from shelflife.services import books as book_service
+from shelflife.services.facets import get_facets
 
 router = APIRouter(prefix="/api/books", tags=["books"])
 
 
+def book_filters_query(
+    author: str | None = None,
+    author_match: Literal["contains", "exact", "prefix"] = Query(
+        "contains", description="How `author` matches: anywhere in the name, or the whole name or its start, ignoring case"
+    ),
+    tag: str | None = None,
+    tags_all: list[str] | None = Query(None, description="Only books with every one of these tags (repeat the parameter)"),
+    tags_any: list[str] | None = Query(None, description="Only books with at least one of these tags"),
+    tags_none: list[str] | None = Query(None, description="Only books with none of these tags"),
+    shelf: str | None = Query(None, description="Only books on this shelf, by name"),
+    min_rating: Rating | None = Query(None, description="Only books rated at least this"),
+    max_rating: Rating | None = Query(None, description="Only books rated at most this"),
+    min_year: NonNegative | None = Query(None, description="Only books published in or after this year"),
+    max_year: NonNegative | None = Query(None, description="Only books published in or before this year"),
+    min_pages: NonNegative | None = Query(None, description="Only books with at least this many pages"),
+    max_pages: NonNegative | None = Query(None, description="Only books with at most this many pages"),
+    unread: bool | None = Query(None, description="true: books with no finished reading; false: books with one"),
+    q: str | None = None,
+    started_after: date | None = Query(None, description="Filter books with a reading started on or after this date (YYYY-MM-DD)"),
+    started_before: date | None = Query(None, description="Filter books with a reading started on or before this date (YYYY-MM-DD)"),
+    finished_after: date | None = Query(None, description="Filter books with a reading finished on or after this date (YYYY-MM-DD)"),
+    finished_before: date | None = Query(None, description="Filter books with a reading finished on or before this date (YYYY-MM-DD)"),
+) -> dict[str, Any]:
+    """The book list filters, shared by the list and its facets."""
+    return {
+        "author": author,
+        "author_match": author_match,
+        "tag": tag,
+        "tags_all": tags_all,
+        "tags_any": tags_any,
+        "tags_none": tags_none,
+        "shelf": shelf,
+        "min_rating": min_rating,
+        "max_rating": max_rating,
+        "min_year": min_year,
+        "max_year": max_year,
+        "min_pages": min_pages,
+        "max_pages": max_pages,
+        "unread": unread,
+        "q": q,
+        "started_after": started_after,
+        "started_before": started_before,
+        "finished_after": finished_after,
+        "finished_before": finished_before,
+    }
+
+
 @router.get("/stats")
 async def book_stats(session: AsyncSession = Depends(get_session)):
-    total = (await session.execute(select(func.count(Book.id)))).scalar()
-    return {"total_books": total}
+    return await book_service.book_stats(session)
 
 
-@router.get("/search", response_model=list[BookResponse])
+@router.get("/facets", response_model=FacetsResponse)
+async def book_facets(
+    filters: dict[str, Any] = Depends(book_filters_query),
+    limit: Annotated[TopLimit, Query(description="Values per facet, most common first")] = 10,
+    session: AsyncSession = Depends(get_session),
+):
+    """Book counts by tag, author, decade, rating and shelf for the books the same filters list."""
+    return await get_facets(session, limit=limit, **filters)
+
+
+@router.get("/search", response_model=list[BookListItem])
 async def search_books(
     title: str = Query(..., description="Title to search for (case-insensitive partial match)"),
-    limit: int = Query(20, ge=1, le=100),
+    limit: SearchLimit = 20,
+    fields: str | None = fields_query(),
+    include: str | None = include_query(),
     session: AsyncSession = Depends(get_session),
 ):
-    stmt = (
-        select(Book)
-        .where(Book.title.ilike(f"%{title}%"))
-        .order_by(Book.title)
-        .limit(limit)
-    )
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    books = await book_service.search_books(session, title, limit=limit, fields=fields, include=include)
+    return projected(books, fields, include)
 
 
-@router.get("", response_model=list[BookResponse])
+@router.get("", response_model=list[BookListItem])
 async def list_books(
-    author: str | None = None,
-    tag: str | None = None,
-    q: str | None = None,
-    started_after: date | None = Query(None, description="Filter books with a reading started on or after this date (YYYY-MM-DD)"),
-    started_before: date | None = Query(None, description="Filter books with a reading started on or before this date (YYYY-MM-DD)"),
-    finished_after: date | None = Query(None, description="Filter books with a reading finished on or after this date (YYYY-MM-DD)"),
-    finished_before: date | None = Query(None, description="Filter books with a reading finished on or before this date (YYYY-MM-DD)"),
-    sort: Literal["title", "author", "created_at"] = "title",
+    filters: dict[str, Any] = Depends(book_filters_query),
+    sort: Literal["title", "author", "created_at", "rating", "year_published", "page_count", "finished_at"] = Query(
+        "title", description="rating, year_published, page_count and finished_at (the latest finished reading) "
+        "sort books without one as the lowest",
+    ),
     order: Literal["asc", "desc"] = "asc",
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    limit: PageLimit = 50,
+    offset: Offset = 0,
+    cursor: str | None = cursor_query(),
+    fields: str | None = fields_query(),
+    include: str | None = include_query(),
     session: AsyncSession = Depends(get_session),
 ):
-    stmt = select(Book).distinct()
-    if author:
-        stmt = stmt.where(Book.author.ilike(f"%{author}%"))
-    if q:
-        stmt = stmt.where(Book.title.ilike(f"%{q}%"))
-    if tag:
-        stmt = stmt.join(BookTag).join(Tag).where(Tag.name == tag)
-    if started_after or started_before or finished_after or finished_before:
-        stmt = stmt.join(Reading, Reading.book_id == Book.id)
-        if started_after:
-            stmt = stmt.where(Reading.started_at >= started_after)
-        if started_before:
-            stmt = stmt.where(Reading.started_at <= started_before)
-        if finished_after:
-            stmt = stmt.where(Reading.finished_at >= finished_after)
-        if finished_before:
-            stmt = stmt.where(Reading.finished_at <= finished_before)
-    col = getattr(Book, sort)
-    stmt = stmt.order_by(col.desc() if order == "desc" else col.asc())
-    stmt = stmt.offset(offset).limit(limit)
-    result = await session.execute(stmt)
-    return result.scalars().all()
+    books = await book_service.list_books(
+        session,
+        **filters,
+        sort=sort,
+        order=order,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        fields=fields,
+        include=include,
+    )
+    return projected(books, fields, include)
 
 
 @router.get("/lookup", response_model=list[BookLookupResult])
 async def lookup_book(
     title: str = Query(..., description="Book title to search for"),
     author: str | None = Query(None, description="Author name (optional but recommended)"),
-    limit: int = Query(5, ge=1, le=10),
+    limit: LookupLimit = 5,
 ):
-    candidates = await search_candidates(title, author, limit=limit)
-    return [
-        BookLookupResult(
-            title=c.title,
-            author=c.author,
-            open_library_key=c.open_library_key,
-            cover_url=c.cover_url,
-            isbn=c.isbn,
-            isbn13=c.isbn13,
-            publisher=c.publisher,
-            year_published=c.year_published,
-            page_count=c.page_count,
-        )
-        for c in candidates
-    ]
+    return await book_service.lookup_book(title, author, limit=limit)
 
 
 @router.post("/bulk", response_model=list[BookDetail])
 async def get_books_bulk(data: BulkBookRequest, session: AsyncSession = Depends(get_session)):
-    ids = [make_id(b.title, b.author) for b in data.books]
-    stmt = (
-        select(Book)
-        .where(Book.id.in_(ids))
-        .options(
-            selectinload(Book.tags),
-            selectinload(Book.review),
-            selectinload(Book.shelf_links).selectinload(ShelfBook.shelf),
-        )
-    )
-    result = await session.execute(stmt)
-    books = result.scalars().all()
-    out = []
-    for book in books:
-        book_dict = BookDetail.model_validate(book).model_dump()
-        book_dict["shelves"] = [link.shelf for link in book.shelf_links]
-        book_dict["review"] = book.review
-        out.append(BookDetail(**book_dict))
-    return out
+    return await book_service.get_books_bulk(session, data.books)
+
+
+@router.post("/resolve", response_model=ResolveResponse)
+async def resolve_books(data: ResolveRequest, session: AsyncSession = Depends(get_session)):
+    """Map many title/author, ISBN or Goodreads id references to existing book ids in one query."""
+    return await book_service.resolve_books(session, data.books)
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def create_books(
+    data: BookBatchRequest,
+    enrich: bool = Query(False, description="Fetch metadata from Open Library after creating"),
+    resolve: bool = Query(False, description="Resolve canonical title/author from Open Library before creating"),
+    session: AsyncSession = Depends(get_session),
+):
+    return await book_service.create_books(session, data.books, enrich=enrich, resolve=resolve)
 
 
 @router.get("/by-name/{title}/{author}", response_model=BookDetail)
 async def get_book_by_name(
     title: str, author: str, session: AsyncSession = Depends(get_session)
 ):
-    book_id = make_id(title, author)
-    return await get_book(book_id, session)
+    return await book_service.get_book(session, make_id(title, author))
 
 
 @router.get("/{book_id}", response_model=BookDetail)
 async def get_book(book_id: int, session: AsyncSession = Depends(get_session)):
-    stmt = (
-        select(Book)
-        .where(Book.id == book_id)
-        .options(
-            selectinload(Book.tags),
-            selectinload(Book.review),
-            selectinload(Book.shelf_links).selectinload(ShelfBook.shelf),
-        )
-    )
-    result = await session.execute(stmt)
-    book = result.scalar_one_or_none()
-    if book is None:
-        raise HTTPException(status_code=404, detail="Book not found")
-    book_dict = BookDetail.model_validate(book).model_dump()
-    book_dict["shelves"] = [link.shelf for link in book.shelf_links]
-    book_dict["review"] = book.review
-    return BookDetail(**book_dict)
+    return await book_service.get_book(session, book_id)
 
 
 @router.post("", response_model=BookResponse, status_code=201)
@@ -166,33 +179,10 @@ async def create_book(
     data: BookCreate,
     enrich: bool = Query(False, description="Fetch metadata from Open Library after creating"),
     resolve: bool = Query(False, description="Resolve canonical title/author from Open Library before creating"),
+    shelf: str | None = Query(None, description="Also put the book on this shelf, creating the shelf if needed"),
     session: AsyncSession = Depends(get_session),
 ):
-    if resolve:
-        candidates = await search_candidates(data.title, data.author, limit=1)
-        if candidates:
-            best = candidates[0]
-            data = data.model_copy(update={"title": best.title, "author": best.author})
-            # Fill in metadata from the candidate if not already provided
-            for field_name in ("isbn", "isbn13", "publisher", "page_count", "year_published", "cover_url"):
-                if getattr(data, field_name) is None and getattr(best, field_name) is not None:
-                    data = data.model_copy(update={field_name: getattr(best, field_name)})
-
-    book_id = make_id(data.title, data.author)
-    existing = await session.get(Book, book_id)
-    if existing is not None:
-        raise HTTPException(status_code=409, detail="Book already exists")
-
-    book = Book(id=book_id, **data.model_dump())
-    session.add(book)
-    await session.flush()
-
-    if enrich:
-        await enrich_book(session, book)
-
-    await session.commit()
-    await session.refresh(book)
-    return book
+    return await book_service.create_book(session, data, enrich=enrich, resolve=resolve, shelf=shelf)
 
 
 @router.post("/{book_id}/enrich", response_model=EnrichResponse)
@@ -201,43 +191,16 @@ async def enrich_book_endpoint(
     overwrite: bool = Query(False, description="Overwrite existing fields"),
     session: AsyncSession = Depends(get_session),
 ):
-    result = await session.execute(select(Book).where(Book.id == book_id))
-    book = result.scalar_one_or_none()
-    if book is None:
-        raise HTTPException(status_code=404, detail="Book not found")
-
-    enrich_result = await enrich_book(session, book, overwrite=overwrite)
-    await session.commit()
-
-    return EnrichResponse(
-        book_id=enrich_result.book_id,
-        enriched=enrich_result.enriched,
-        fields_updated=enrich_result.fields_updated,
-        tags_added=enrich_result.tags_added,
-        error=enrich_result.error,
-    )
+    return await book_service.enrich_book(session, book_id, overwrite=overwrite)
 
 
 @router.put("/{book_id}", response_model=BookResponse)
 async def update_book(
     book_id: int, data: BookUpdate, session: AsyncSession = Depends(get_session)
 ):
-    result = await session.execute(select(Book).where(Book.id == book_id))
-    book = result.scalar_one_or_none()
-    if book is None:
-        raise HTTPException(status_code=404, detail="Book not found")
-    for key, value in data.model_dump(exclude_unset=True).items():
-        setattr(book, key, value)
-    await session.commit()
-    await session.refresh(book)
-    return book
+    return await book_service.update_book(session, book_id, data)
 
 
 @router.delete("/{book_id}", status_code=204)
 async def delete_book(book_id: int, session: AsyncSession = Depends(get_session)):
-    result = await session.execute(select(Book).where(Book.id == book_id))
-    book = result.scalar_one_or_none()
-    if book is None:
-        raise HTTPException(status_code=404, detail="Book not found")
-    await session.delete(book)
-    await session.commit()
+    await book_service.delete_book(session, book_id)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.changes import data_versions
+from shelflife.database import get_session
+
+router = APIRouter(prefix="/api/changes", tags=["changes"])
+
+
+@router.get("", response_model=dict[str, int])
+async def versions(session: AsyncSession = Depends(get_session)):
+    """Each table's change counter. Any write to a table, from any process, raises its counter."""
+    return await data_versions(session)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.database import get_session
+from shelflife.schemas.counts import CountCheckResponse
+from shelflife.services.counts import check_counts
+
+router = APIRouter(prefix="/api/counts", tags=["counts"])
+
+
+@router.get("/check", response_model=CountCheckResponse)
+async def check(session: AsyncSession = Depends(get_session)):
+    """Shelves and tags whose stored book_count disagrees with their books; changes nothing."""
+    return await check_counts(session)
+
+
+@router.post("/rebuild", response_model=CountCheckResponse)
+async def rebuild(session: AsyncSession = Depends(get_session)):
+    """Recount and fix any shelf or tag book_count that disagrees with its books."""
+    return await check_counts(session, repair=True)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Query
 
-from shelflife.id import make_id
-from shelflife.schemas.hash import HashResponse
+from shelflife.id import make_id, make_ids
+from shelflife.schemas.hash import HashBatchRequest, HashBatchResponse, HashResponse
 
 router = APIRouter(prefix="/api", tags=["hash"])
 
@@ -11,3 +11,9 @@ async def compute_hash(
     parts: list[str] = Query(..., description="One or more string parts to hash"),
 ):
     return HashResponse(id=make_id(*parts), parts=parts)
+
+
+@router.post("/hash/batch", response_model=HashBatchResponse)
+async def compute_hashes(data: HashBatchRequest):
+    """The id for each part tuple, in order; one call instead of one per reference."""
+    return HashBatchResponse(ids=make_ids(data.keys))
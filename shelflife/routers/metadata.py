@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from shelflife.schemas.metadata import ProvidersResponse
+from shelflife.services.providers import get_fetcher
+
+router = APIRouter(prefix="/api/metadata", tags=["metadata"])
+
+
+@router.get("/providers", response_model=ProvidersResponse)
+async def provider_stats():
+    return get_fetcher().stats()
@@ -0,0 +1,23 @@
+"""The `cursor=` query parameter and next-page header shared by paginated list routes."""
+
+from fastapi import Query, Response
+
+from shelflife.services.pagination import NEXT_CURSOR_HEADER, Page
+
+
+def cursor_query():
+    return Query(
+        None,
+        description=f"Continue after the previous page: pass its `{NEXT_CURSOR_HEADER}` response header. "
+        "Unlike `offset`, deep pages cost the same as the first.",
+    )
+
+
+def next_cursor_headers(page: Page) -> dict[str, str]:
+    return {NEXT_CURSOR_HEADER: page.next_cursor} if getattr(page, "next_cursor", None) else {}
+
+
+def paged(response: Response, page: Page) -> Page:
+    """Return `page` with its next cursor, if any, in the response headers."""
+    response.headers.update(next_cursor_headers(page))
+    return page
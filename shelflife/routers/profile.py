@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.database import get_session
+from shelflife.schemas.profile import ProfileResponse
+from shelflife.schemas.params import RecentLimit, TopLimit
+from shelflife.services.profile import get_profile
+
+router = APIRouter(prefix="/api/profile", tags=["profile"])
+
+
+@router.get("", response_model=ProfileResponse)
+async def reading_profile(
+    top_tags: TopLimit = 10,
+    recent: RecentLimit = 5,
+    session: AsyncSession = Depends(get_session),
+):
+    return await get_profile(session, top_tags=top_tags, recent=recent)
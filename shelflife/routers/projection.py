@@ -0,0 +1,49 @@
+"""The `fields=` and `include=` query parameters shared by routes that list books."""
+
+from functools import cache
+
+from fastapi import Query, Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from shelflife.routers.pagination import next_cursor_headers
+from shelflife.schemas.book import book_fields_model
+from shelflife.schemas.shelf import ShelfWithBooks
+from shelflife.services.includes import INCLUDES, parse_include
+from shelflife.services.projection import parse_fields
+
+
+def fields_query():
+    return Query(
+        None,
+        description="Comma-separated book fields to return, e.g. `title,author`. Only those columns are "
+        "loaded; `id` is always included. Defaults to every field but `description`.",
+    )
+
+
+def include_query():
+    return Query(
+        None,
+        description=f"Comma-separated relationships to embed in each book: {', '.join(INCLUDES)}. "
+        "Each is loaded for the whole list in one query.",
+    )
+
+
+@cache
+def _adapter(names: tuple[str, ...], include: tuple[str, ...], shelf: bool) -> TypeAdapter:
+    books = list[book_fields_model(names, include)]
+    if not shelf:
+        return TypeAdapter(books)
+    annotations = {name: field.annotation for name, field in ShelfWithBooks.model_fields.items()}
+    return TypeAdapter(TypedDict("ShelfFields", {**annotations, "books": books}))
+
+
+def projected(result: list[dict] | dict, fields: str | None, include: str | None = None) -> Response:
+    """Serialize projected book rows (or a shelf of them) with a model of just the requested fields.
+
+    The rows are already exactly the response, so this skips building and validating a model per book.
+    """
+    shelf = isinstance(result, dict)
+    adapter = _adapter(tuple(parse_fields(fields)), parse_include(include), shelf)
+    headers = next_cursor_headers(result["books"] if shelf else result)
+    return Response(adapter.dump_json(result), media_type="application/json", headers=headers)
@@ -0,0 +1,25 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+SuggestionKind = Literal["title", "author", "tag", "shelf"]
+
+
+class Suggestion(BaseModel):
+    kind: SuggestionKind
+    value: str
+    id: int | None  # the book, tag or shelf; None for authors
+
+
+class KindStats(BaseModel):
+    names: int
+    keys: int  # whole-name keys plus later-word keys
+
+
+class AutocompleteStats(BaseModel):
+    kinds: dict[str, KindStats]
+    bytes: int  # approximate, from sys.getsizeof
+    budget_bytes: int
+    within_budget: bool
+    words_indexed: bool  # False if later-word keys were dropped to fit the budget
+    build_ms: float  # the last (re)load
@@ -0,0 +1,64 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from shelflife.schemas.book import BookCreate
+from shelflife.schemas.reading import ReadingProgressCreate
+from shelflife.schemas.review import ReviewUpdate
+
+BatchStatus = Literal["created", "updated", "unchanged", "not_found", "conflict"]
+
+# Items per batch request: bounds the lookups one request can start and the size of its IN lists
+MAX_BATCH_ITEMS = 200
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    book_id: int | None = None
+    status: BatchStatus
+    detail: str | None = None
+
+
+class BatchResponse(BaseModel):
+    results: list[BatchItemResult]
+    counts: dict[str, int]
+
+    @classmethod
+    def from_results(cls, results: list[BatchItemResult]) -> "BatchResponse":
+        counts: dict[str, int] = {}
+        for r in results:
+            counts[r.status] = counts.get(r.status, 0) + 1
+        return cls(results=results, counts=counts)
+
+
+class BookBatchItem(BookCreate):
+    shelf: str | None = None
+
+
+class BookBatchRequest(BaseModel):
+    books: list[BookBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class ShelveBatchItem(BaseModel):
+    shelf: str
+    book_id: int
+
+
+class ShelveBatchRequest(BaseModel):
+    items: list[ShelveBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class ReviewBatchItem(ReviewUpdate):
+    book_id: int
+
+
+class ReviewBatchRequest(BaseModel):
+    items: list[ReviewBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class ProgressBatchItem(ReadingProgressCreate):
+    book_id: int
+
+
+class ProgressBatchRequest(BaseModel):
+    items: list[ProgressBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
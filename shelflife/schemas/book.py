@@ -1,6 +1,9 @@
 from datetime import datetime
+from functools import cache
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing_extensions import TypedDict
 
 
 class BookCreate(BaseModel):
@@ -49,6 +52,21 @@ class BookResponse(BaseModel):
     updated_at: datetime
 
 
+# Book list endpoints leave out the description, often several KB, unless `fields=` asks for it
+LIST_FIELDS = tuple(name for name in BookResponse.model_fields if name != "description")
+
+
+@cache
+def book_fields_model(names: tuple[str, ...], include: tuple[str, ...] = (), name: str = "BookFields") -> type:
+    """A TypedDict of these BookResponse fields, plus `include=` relationships, to serialize
+    column projections without validating them."""
+    annotations = {field: BookResponse.model_fields[field].annotation for field in names}
+    return TypedDict(name, {**annotations, **{relation: INCLUDE_TYPES[relation] for relation in include}})
+
+
+BookListItem = book_fields_model(LIST_FIELDS, name="BookListItem")
+
+
 class BookDetail(BookResponse):
     tags: list["TagResponse"] = []
     shelves: list["ShelfResponse"] = []
@@ -58,6 +76,15 @@ class BookDetail(BookResponse):
 from shelflife.schemas.tag import TagResponse  # noqa: E402
 from shelflife.schemas.shelf import ShelfResponse  # noqa: E402
 from shelflife.schemas.review import ReviewResponse  # noqa: E402
+from shelflife.schemas.reading import ReadingResponse  # noqa: E402
+
+# Relationships a book list can embed with `include=`
+INCLUDE_TYPES = {
+    "tags": list[TagResponse],
+    "review": ReviewResponse | None,
+    "shelves": list[ShelfResponse],
+    "readings": list[ReadingResponse],
+}
 
 BookDetail.model_rebuild()
 
@@ -96,6 +123,36 @@ class BulkBookRequest(BaseModel):
     books: list[BookIdentifier]
 
 
+class BookReference(BaseModel):
+    """A book as a client knows it: by title and author, ISBN-10/13 or Goodreads id."""
+
+    title: str | None = None
+    author: str | None = None
+    isbn: str | None = Field(None, description="ISBN-10 or ISBN-13; hyphens and spaces are ignored")
+    goodreads_id: str | None = None
+
+    @model_validator(mode="after")
+    def require_identifier(self):
+        if not (self.isbn or self.goodreads_id or (self.title and self.author)):
+            raise ValueError("Provide title and author, isbn or goodreads_id")
+        return self
+
+
+class ResolveRequest(BaseModel):
+    books: list[BookReference] = Field(..., min_length=1)
+
+
+class BookResolution(BaseModel):
+    index: int
+    book_id: int | None = None
+    matched_by: Literal["goodreads_id", "isbn", "title_author"] | None = None
+
+
+class ResolveResponse(BaseModel):
+    results: list[BookResolution]
+    not_found: list[int]  # indexes of references with no matching book
+
+
 class BookLookupResult(BaseModel):
     title: str
     author: str
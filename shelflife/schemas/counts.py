@@ -0,0 +1,17 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class CountMismatch(BaseModel):
+    table: Literal["shelves", "tags"]
+    id: int
+    name: str
+    stored: int
+    actual: int
+
+
+class CountCheckResponse(BaseModel):
+    checked: int  # shelves plus tags
+    mismatches: list[CountMismatch]
+    repaired: bool
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class FacetCount(BaseModel):
+    value: str | int | float  # a tag, author or shelf name, a decade (1990) or a rating
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    total: int  # books matching the filters
+    tags: list[FacetCount]
+    authors: list[FacetCount]
+    decades: list[FacetCount]
+    ratings: list[FacetCount]
+    shelves: list[FacetCount]
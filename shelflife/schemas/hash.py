@@ -1,6 +1,18 @@
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import BaseModel, Field
 
 
 class HashResponse(BaseModel):
     id: int
     parts: list[str]
+
+
+class HashBatchRequest(BaseModel):
+    keys: list[Annotated[list[str], Field(min_length=1)]] = Field(
+        ..., min_length=1, description="Part tuples to hash, e.g. [[title, author], [tag name]]"
+    )
+
+
+class HashBatchResponse(BaseModel):
+    ids: list[int]  # in the order of `keys`
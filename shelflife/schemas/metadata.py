@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+
+class LatencySnapshot(BaseModel):
+    count: int
+    mean_ms: float | None
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+    buckets: dict[str, int]
+
+
+class ProviderStats(BaseModel):
+    name: str
+    wins: int
+    errors: int
+    cancelled: int
+    hedge_delay_ms: float
+    latency: LatencySnapshot
+
+
+class ProvidersResponse(BaseModel):
+    hedges_fired: int
+    providers: list[ProviderStats]
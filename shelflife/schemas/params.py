@@ -0,0 +1,23 @@
+"""Bounded query parameter types, shared by the routes and the services they call.
+
+Services annotate their parameters with these, so the in-process MCP
+dispatcher, which validates a call against the service signature, applies
+the same limits FastAPI applies to the query string.
+"""
+
+from typing import Annotated
+
+from pydantic import Field
+
+Offset = Annotated[int, Field(ge=0)]
+NonNegative = Annotated[int, Field(ge=0)]
+Rating = Annotated[float, Field(ge=0.0, le=5.0)]
+
+# Page sizes
+PageLimit = Annotated[int, Field(ge=1, le=200)]
+TagPageLimit = Annotated[int, Field(ge=1, le=1000)]
+SearchLimit = Annotated[int, Field(ge=1, le=100)]
+LookupLimit = Annotated[int, Field(ge=1, le=10)]
+# Top-N lists: facet values, profile tags
+TopLimit = Annotated[int, Field(ge=1, le=100)]
+RecentLimit = Annotated[int, Field(ge=1, le=50)]
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+
+
+class ShelfSummary(BaseModel):
+    id: int
+    name: str
+    book_count: int
+
+
+class TagCount(BaseModel):
+    name: str
+    count: int
+
+
+class RecentBook(BaseModel):
+    title: str
+    author: str
+
+
+class ProfileResponse(BaseModel):
+    total_books: int
+    total_reviews: int
+    shelves: list[ShelfSummary]
+    top_tags: list[TagCount]
+    rating_distribution: dict[str, int]
+    recent_books: list[RecentBook]
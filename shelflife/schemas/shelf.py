@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict
 
@@ -22,12 +22,31 @@ class ShelfResponse(BaseModel):
     description: str | None
     is_exclusive: bool
     created_at: datetime
+    book_count: int
+
+
+class ShelveResponse(BaseModel):
+    shelf_id: int
+    book_id: int
+    shelf_created: bool
+    added: bool
+    detail: str
 
 
 class ShelfWithBooks(ShelfResponse):
-    books: list["BookResponse"] = []
+    books: list["BookListItem"] = []
+    next_cursor: str | None = None  # also sent as the X-Next-Cursor header
+
+
+class ShelfMembership(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    shelf_id: int
+    book_id: int
+    date_added: datetime
+    date_read: date | None
 
 
-from shelflife.schemas.book import BookResponse  # noqa: E402
+from shelflife.schemas.book import BookListItem  # noqa: E402
 
 ShelfWithBooks.model_rebuild()
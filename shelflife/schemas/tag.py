@@ -10,6 +10,7 @@ class TagResponse(BaseModel):
 
     id: int
     name: str
+    book_count: int
 
 
 class BulkTagCreate(BaseModel):
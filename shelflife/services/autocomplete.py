@@ -0,0 +1,414 @@
+"""In-process prefix index for search-box autocomplete over titles, authors, tags and shelves.
+
+Each kind of name is kept as sorted arrays of (normalized key, id), one of
+whole names and one of names from each later word on, so "herb" finds "Frank
+Herbert". A lookup is a bisect into each array and a short walk, with no
+database query. Keys are cut to KEY_CHARS; longer prefixes are checked
+against the name itself.
+
+The index is loaded by the first lookup, through that request's session, so
+app startup doesn't wait for it. After that, commits in this process that
+add, rename or delete books, tags or shelves through the ORM are applied to
+it row by row. Each lookup compares the database's per-table change
+counters (`shelflife.changes`) with the ones the index is synced to, so any
+other change to those tables, such as a bulk statement or a write by another
+process, gets that table reloaded.
+
+Past the memory budget, later-word keys are dropped and names only match
+from their start. Each reload checks again, and indexes later words once
+they would fit.
+"""
+
+import asyncio
+import re
+import sys
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Iterator
+from itertools import chain
+from operator import itemgetter
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from shelflife import changes
+from shelflife.config import AUTOCOMPLETE_MEMORY_MB
+from shelflife.id import make_id
+from shelflife.models import Book, Shelf, Tag
+from shelflife.schemas.autocomplete import AutocompleteStats, KindStats, Suggestion, SuggestionKind
+
+KINDS: tuple[SuggestionKind, ...] = ("title", "author", "tag", "shelf")
+KEY_CHARS = 40
+# Later words are indexed again once they would fit in this share of the budget, so a library
+# near the limit isn't rebuilt with them and dropped again on every reload
+_REINDEX_SHARE = 0.9
+
+# The kinds each table's names feed
+_TABLE_KINDS = {"books": ("title", "author"), "tags": ("tag",), "shelves": ("shelf",)}
+_MODELS = {Book: "books", Tag: "tags", Shelf: "shelves"}
+_DELTAS = "autocomplete_deltas"
+
+_words = re.compile(r"[^\W_]+").findall
+
+
+def normalize(text: str) -> str:
+    """Casefolded, accents dropped, and words separated by single spaces."""
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return " ".join(_words(text.casefold()))
+
+
+def _key_bytes(key: str) -> int:
+    """A word key's share of the index: the string, its slot in the key list and its id."""
+    return sys.getsizeof(key) + 16
+
+
+def _keys(name: str) -> tuple[str, list[str]]:
+    """The whole-name key, and a key from each later word on."""
+    key = normalize(name)
+    later, start = [], 0
+    for word in key.split(" ")[:-1]:
+        start += len(word) + 1
+        later.append(key[start:start + KEY_CHARS])
+    return key[:KEY_CHARS], later
+
+
+class _Sorted:
+    """Keys in order, with each key's id at the same position in a parallel array.
+
+    Two flat columns rather than a list of (key, id) tuples: a tuple and a
+    boxed int per entry would about double the memory.
+    """
+
+    def __init__(self, pairs: list[tuple[str, int]] = ()) -> None:
+        # By key alone, which is much faster than comparing tuples; equal keys keep their load order
+        pairs = sorted(pairs, key=itemgetter(0))
+        self.keys: list[str] = [key for key, _ in pairs]
+        self.ids = array("q", [id_ for _, id_ in pairs])
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def insert(self, key: str, id_: int) -> None:
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.ids.insert(i, id_)
+
+    def delete(self, key: str, id_: int) -> None:
+        for i in range(bisect_left(self.keys, key), bisect_right(self.keys, key)):
+            if self.ids[i] == id_:
+                del self.keys[i]
+                del self.ids[i]
+                return
+
+    def starting(self, prefix: str) -> Iterator[tuple[str, int]]:
+        keys, ids = self.keys, self.ids
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                return
+            yield keys[i], ids[i]
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.keys) + sum(map(sys.getsizeof, self.keys)) + sys.getsizeof(self.ids)
+
+
+class _Names:
+    """One kind's names by id, with their keys in two sorted arrays."""
+
+    def __init__(self) -> None:
+        self.names: dict[int, str] = {}
+        self.starts = _Sorted()
+        self.words = _Sorted()
+        self.word_bytes = 0  # what the later-word keys take, or would if they were indexed
+
+    def load(self, names: dict[int, str], words: bool) -> None:
+        starts, later, word_bytes = [], [], 0
+        for id_, name in names.items():
+            key, word_keys = _keys(name)
+            starts.append((key, id_))
+            word_bytes += sum(map(_key_bytes, word_keys))
+            if words:
+                later.extend((k, id_) for k in word_keys)
+        self.names, self.starts, self.words = names, _Sorted(starts), _Sorted(later)
+        self.word_bytes = word_bytes
+
+    def add(self, id_: int, name: str, words: bool) -> None:
+        if self.names.get(id_) == name:
+            return
+        self.remove(id_)
+        self.names[id_] = name
+        key, word_keys = _keys(name)
+        self.starts.insert(key, id_)
+        self.word_bytes += sum(map(_key_bytes, word_keys))
+        if words:
+            for k in word_keys:
+                self.words.insert(k, id_)
+
+    def remove(self, id_: int) -> None:
+        name = self.names.pop(id_, None)
+        if name is None:
+            return
+        key, word_keys = _keys(name)
+        self.starts.delete(key, id_)
+        self.word_bytes -= sum(map(_key_bytes, word_keys))
+        for k in word_keys:
+            self.words.delete(k, id_)
+
+    def search(self, prefix: str, limit: int) -> list[tuple[int, str, int]]:
+        """Up to `limit` (rank, key, id) matches: whole-name matches (rank 0) before later-word ones."""
+        cut = prefix[:KEY_CHARS]
+        found: list[tuple[int, str, int]] = []
+        seen: set[int] = set()
+        for rank, keys in enumerate((self.starts, self.words)):
+            for key, id_ in keys.starting(cut):
+                if len(found) == limit:
+                    return found
+                if id_ in seen or (len(prefix) > KEY_CHARS and not self._matches(id_, prefix)):
+                    continue
+                seen.add(id_)
+                found.append((rank, key, id_))
+        return found
+
+    def _matches(self, id_: int, prefix: str) -> bool:
+        key = normalize(self.names[id_])
+        return key.startswith(prefix) or f" {prefix}" in key
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the name map, its names, and both key arrays."""
+        names = sys.getsizeof(self.names) + sum(map(sys.getsizeof, self.names.values()))
+        return names + self.starts.nbytes() + self.words.nbytes()
+
+
+class AutocompleteIndex:
+    """Prefix lookups over every kind, kept in step with the database."""
+
+    def __init__(self, memory_budget: int = AUTOCOMPLETE_MEMORY_MB * 1024 * 1024) -> None:
+        self.memory_budget = memory_budget
+        self.words = True  # False once later-word keys were dropped to stay within the budget
+        self.build_ms = 0.0
+        self._names = {kind: _Names() for kind in KINDS}
+        self._book_authors: dict[int, int] = {}  # book id -> author id, to undo a book's author
+        self._authors: Counter[int] = Counter()  # books per author id
+        self._synced: dict[str, int | None] = dict.fromkeys(_TABLE_KINDS)
+        self._lock = asyncio.Lock()
+
+    async def stale(self, session: AsyncSession) -> list[str]:
+        """Tables changed in ways the index hasn't applied."""
+        return self._stale(await changes.data_versions(session))
+
+    def _stale(self, versions: dict[str, int]) -> list[str]:
+        return [table for table, synced in self._synced.items() if synced is None or synced != versions.get(table)]
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Reload every stale table."""
+        async with self._lock:  # concurrent first lookups load once
+            # Read in the same transaction as the reload, so the rows match these versions
+            versions = await changes.data_versions(session)
+            stale = self._stale(versions)
+            if not stale:
+                return
+            start = time.perf_counter()
+            await self._reload_tables(session, stale, versions)
+            if self.words and self.nbytes() > self.memory_budget:
+                self.words = False
+                for names in self._names.values():
+                    names.words = _Sorted()
+            elif not self.words and self.nbytes() + self._word_bytes() <= self.memory_budget * _REINDEX_SHARE:
+                # Back within budget, after deletes or a larger budget: every kind gets its later words again
+                self.words = True
+                await self._reload_tables(session, list(_TABLE_KINDS), versions)
+            self.build_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    async def _reload_tables(self, session: AsyncSession, tables: list[str], versions: dict[str, int]) -> None:
+        for table in tables:
+            await self._reload(session, table)
+            self._synced[table] = versions.get(table)
+
+    def _word_bytes(self) -> int:
+        return sum(names.word_bytes for names in self._names.values())
+
+    async def _reload(self, session: AsyncSession, table: str) -> None:
+        if table == "books":
+            rows = (await session.execute(select(Book.id, Book.title, Book.author).order_by(Book.id))).all()
+            self._book_authors = {id_: make_id(author) for id_, _, author in rows}
+            self._authors = Counter(self._book_authors.values())
+            authors = {self._book_authors[id_]: author for id_, _, author in rows}
+            self._names["title"].load({id_: title for id_, title, _ in rows}, self.words)
+            self._names["author"].load(authors, self.words)
+        else:
+            model, kind = (Tag, "tag") if table == "tags" else (Shelf, "shelf")
+            rows = await session.execute(select(model.id, model.name).order_by(model.id))
+            self._names[kind].load(dict(rows.all()), self.words)
+
+    def apply(self, books: dict, tags: dict, shelves: dict, before: dict, after: dict, stale: set[str]) -> None:
+        """Apply one commit's rows (id -> name, or None if deleted), if it is the only change since the last sync.
+
+        `before` and `after` are the change counters read in the committing
+        transaction before its first write and after its last. A table is
+        applied when the index was synced to it just before, and is then
+        synced to it just after; otherwise, or if the commit changed it in a
+        way its rows don't show (`stale`), it is reloaded on the next lookup.
+        Tables the commit only touched through triggers, such as a tag's book
+        count, have no rows and just move on to `after`.
+        """
+        for table in _TABLE_KINDS:
+            if table in stale or self._synced[table] is None or self._synced[table] != before.get(table):
+                continue
+            self._synced[table] = after.get(table)
+            if table == "books":
+                for id_, book in books.items():
+                    self._apply_book(id_, book)
+            else:
+                kind, rows = ("tag", tags) if table == "tags" else ("shelf", shelves)
+                for id_, name in rows.items():
+                    if name is None:
+                        self._names[kind].remove(id_)
+                    else:
+                        self._names[kind].add(id_, name, self.words)
+
+    def _apply_book(self, id_: int, book: tuple[str, str] | None) -> None:
+        old_author = self._book_authors.pop(id_, None)
+        if old_author is not None:
+            self._authors[old_author] -= 1
+            if not self._authors[old_author]:
+                del self._authors[old_author]
+                self._names["author"].remove(old_author)
+        if book is None:
+            self._names["title"].remove(id_)
+            return
+        title, author = book
+        self._names["title"].add(id_, title, self.words)
+        author_id = self._book_authors[id_] = make_id(author)
+        self._authors[author_id] += 1
+        if author_id not in self._names["author"].names:
+            self._names["author"].add(author_id, author, self.words)
+
+    def search(self, prefix: str, kinds: list[SuggestionKind] | None = None, limit: int = 10) -> list[Suggestion]:
+        """Names starting with `prefix`, or with a later word that does: whole-name matches first, then by key."""
+        key = normalize(prefix)
+        if not key:
+            return []
+        if prefix[-1].isspace():
+            key += " "  # a finished word: "dune " doesn't match "dunes"
+        found = []
+        for kind in kinds or KINDS:
+            names = self._names[kind]
+            found += [(rank, k, kind, id_, names.names[id_]) for rank, k, id_ in names.search(key, limit)]
+        found.sort(key=lambda match: match[:2])
+        return [
+            Suggestion(kind=kind, value=name, id=None if kind == "author" else id_)
+            for _, _, kind, id_, name in found[:limit]
+        ]
+
+    def nbytes(self) -> int:
+        counts = sys.getsizeof(self._book_authors) + sys.getsizeof(self._authors)
+        return counts + sum(names.nbytes() for names in self._names.values())
+
+    def stats(self) -> AutocompleteStats:
+        used = self.nbytes()
+        return AutocompleteStats(
+            kinds={
+                kind: KindStats(names=len(names.names), keys=len(names.starts) + len(names.words))
+                for kind, names in self._names.items()
+            },
+            bytes=used,
+            budget_bytes=self.memory_budget,
+            within_budget=used <= self.memory_budget,
+            words_indexed=self.words,
+            build_ms=self.build_ms,
+        )
+
+
+index = AutocompleteIndex()
+
+
+async def autocomplete(
+    session: AsyncSession, prefix: str, kinds: list[SuggestionKind] | None = None, limit: int = 10
+) -> list[Suggestion]:
+    await index.sync(session)
+    return index.search(prefix, kinds, limit)
+
+
+async def autocomplete_stats(session: AsyncSession) -> AutocompleteStats:
+    await index.sync(session)
+    return index.stats()
+
+
+def _deltas(session: Session) -> dict:
+    return session.info.setdefault(_DELTAS, {"stale": set(), "books": {}, "tags": {}, "shelves": {}})
+
+
+def _read_before(session: Session) -> None:
+    # The counters before this transaction's first write. A write by another process can't land
+    # after them: SQLite refuses to upgrade a read snapshot that is out of date.
+    deltas = _deltas(session)
+    if "before" not in deltas:
+        deltas["before"] = changes.read_versions(session.connection())
+
+
+@event.listens_for(Session, "before_flush")
+def _track_before_flush(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        _read_before(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = _MODELS.get(type(obj))
+        if table is None:
+            continue
+        deltas = _deltas(session)
+        loaded = inspect(obj).dict
+        if obj in session.deleted:
+            deltas[table][obj.id] = None
+        elif table == "books" and "title" in loaded and "author" in loaded:
+            deltas[table][obj.id] = (loaded["title"], loaded["author"])
+        elif table != "books" and "name" in loaded:
+            deltas[table][obj.id] = loaded["name"]
+        else:
+            deltas["stale"].add(table)  # expired, and loading it here would block
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    session = orm_execute_state.session
+    _read_before(session)
+    table = orm_execute_state.statement.table.name
+    if table not in _TABLE_KINDS:
+        return None
+    # Rows changed by a statement aren't known here. If it changed any, such as an INSERT that
+    # didn't hit its ON CONFLICT, its table is reloaded on the next lookup.
+    counted = changes.read_versions(session.connection()).get(table)
+    result = orm_execute_state.invoke_statement()
+    if changes.read_versions(session.connection()).get(table) != counted:
+        _deltas(session)["stale"].add(table)
+    return result
+
+
+@event.listens_for(Session, "before_commit")
+def _read_after(session):
+    # Flushed here rather than by the commit, so the counters read after it include every write
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    deltas = session.info.get(_DELTAS)
+    if deltas is not None and "before" in deltas:
+        deltas["after"] = changes.read_versions(session.connection())
+
+
+@event.listens_for(Session, "after_commit")
+def _publish(session):
+    deltas = session.info.pop(_DELTAS, None)
+    if deltas is not None and "after" in deltas:
+        index.apply(deltas["books"], deltas["tags"], deltas["shelves"], deltas["before"], deltas["after"], deltas["stale"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_DELTAS, None)
@@ -0,0 +1,465 @@
+"""Book queries and mutations shared by the API routers and the MCP server."""
+
+import asyncio
+import operator
+import string
+import sys
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date
+from typing import Any, Literal
+
+from sqlalchemy import ColumnElement, Exists, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from shelflife.config import ENRICH_CONCURRENCY
+from shelflife.id import make_id, make_ids
+from shelflife.models import Book, BookTag, Reading, ShelfBook
+from shelflife.models.book import FINISHED_KEY, PAGES_KEY, RATING_KEY, YEAR_KEY
+from shelflife.schemas.batch import BatchItemResult, BatchResponse, BookBatchItem, ShelveBatchItem
+from shelflife.schemas.book import (
+    BookCreate,
+    BookDetail,
+    BookIdentifier,
+    BookLookupResult,
+    BookReference,
+    BookResolution,
+    BookUpdate,
+    EnrichResponse,
+    ResolveResponse,
+)
+from shelflife.schemas.params import LookupLimit, NonNegative, Offset, PageLimit, Rating, SearchLimit
+from shelflife.schemas.shelf import ShelfResponse
+from shelflife.services import enrich_service
+from shelflife.services.errors import ConflictError, NotFoundError
+from shelflife.services.includes import expand
+from shelflife.services.openlibrary import search_candidates
+from shelflife.services.pagination import Keyset, Page, as_dict
+from shelflife.services.projection import fetch_rows, select_books
+
+_DETAIL_OPTIONS = (
+    selectinload(Book.tags),
+    selectinload(Book.review),
+    selectinload(Book.shelf_links).selectinload(ShelfBook.shelf),
+)
+
+
+def to_detail(book: Book) -> BookDetail:
+    # Validate once from attributes; Book has no `shelves`, so fill it from the links
+    detail = BookDetail.model_validate(book)
+    detail.shelves = [ShelfResponse.model_validate(link.shelf) for link in book.shelf_links]
+    return detail
+
+
+async def get_book_or_404(session: AsyncSession, book_id: int) -> Book:
+    book = (await session.execute(select(Book).where(Book.id == book_id))).scalar_one_or_none()
+    if book is None:
+        raise NotFoundError("Book not found")
+    return book
+
+
+async def require_book(session: AsyncSession, book_id: int) -> None:
+    """404 unless the book exists. Checks the primary key only, without loading the row."""
+    found = (await session.execute(select(Book.id).where(Book.id == book_id))).scalar_one_or_none()
+    if found is None:
+        raise NotFoundError("Book not found")
+
+
+async def book_stats(session: AsyncSession) -> dict:
+    total = (await session.execute(select(func.count(Book.id)))).scalar()
+    return {"total_books": total}
+
+
+async def search_books(
+    session: AsyncSession, title: str, limit: SearchLimit = 20, fields: str | None = None, include: str | None = None
+) -> list[dict]:
+    stmt = (
+        select_books(fields)
+        .where(Book.title.ilike(f"%{title}%"))
+        .order_by(Book.title)
+        .limit(limit)
+    )
+    return await expand(session, await fetch_rows(session, stmt), include)
+
+
+def _tagged(names: Iterable[str]) -> Exists:
+    """The book has any of the tags: a seek on book_tags' (book_id, tag_id) primary key.
+
+    Tags are matched by id, as by-name lookups are, so no join to tags is needed.
+    """
+    tag_ids = make_ids((name,) for name in names)
+    return select(BookTag.tag_id).where(BookTag.book_id == Book.id, BookTag.tag_id.in_(tag_ids)).exists()
+
+
+BOOK_SORTS = {
+    "title": Book.title,
+    "author": Book.author,
+    "created_at": Book.created_at,
+    # Books without the value sort as the lowest
+    "rating": RATING_KEY,
+    "year_published": YEAR_KEY,
+    "page_count": PAGES_KEY,
+    "finished_at": FINISHED_KEY,
+}
+
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def ascii_lower(text: str) -> str:
+    """Lower-case A-Z only, as SQLite's lower() and NOCASE do, so a folded filter matches the folded column."""
+    return text.translate(_ASCII_LOWER)
+
+
+def after_prefix(prefix: str) -> str | None:
+    """The smallest string greater than every string starting with `prefix`, or None if there is none."""
+    # Trailing U+10FFFF can't be incremented, so the bound moves to the character before it
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    following = ord(prefix[-1]) + 1
+    # Surrogates can't be encoded; the next character that can also sorts after them in UTF-8
+    return prefix[:-1] + chr(0xE000 if 0xD800 <= following <= 0xDFFF else following)
+
+
+def prefix_range(column: ColumnElement, prefix: str) -> ColumnElement[bool]:
+    """`column` starts with `prefix`, as a range its index can seek."""
+    upper = after_prefix(prefix)
+    return column >= prefix if upper is None else and_(column >= prefix, column < upper)
+
+
+def _author_matches(author: str, match: Literal["contains", "exact", "prefix"]) -> ColumnElement[bool]:
+    if match == "contains":
+        return Book.author.ilike(f"%{author}%")
+    # Exact and prefix matches compare NOCASE, so they seek into the NOCASE author index
+    nocase = Book.author.collate("NOCASE")
+    if match == "exact":
+        return nocase == author
+    return prefix_range(nocase, ascii_lower(author))
+
+
+def _in_range(key: ColumnElement, low: float | None, high: float | None) -> list[ColumnElement[bool]]:
+    """`key` within the bounds, as a range on its index. Either bound leaves out books without a value."""
+    if high is not None:
+        return [key.between(low if low is not None else 0, high)]
+    return [key >= low] if low is not None else []
+
+
+def book_filters(
+    author: str | None = None,
+    author_match: Literal["contains", "exact", "prefix"] = "contains",
+    tag: str | None = None,
+    tags_all: list[str] | None = None,
+    tags_any: list[str] | None = None,
+    tags_none: list[str] | None = None,
+    shelf: str | None = None,
+    min_rating: float | None = None,
+    max_rating: float | None = None,
+    min_year: int | None = None,
+    max_year: int | None = None,
+    min_pages: int | None = None,
+    max_pages: int | None = None,
+    unread: bool | None = None,
+    q: str | None = None,
+    started_after: date | None = None,
+    started_before: date | None = None,
+    finished_after: date | None = None,
+    finished_before: date | None = None,
+) -> list[ColumnElement[bool]]:
+    """WHERE clauses for `list_books`.
+
+    Related-table filters are EXISTS subqueries correlated on the book id, each
+    answered from an index on the link table's book_id. Unlike joins they can't
+    repeat a book, so the list needs no DISTINCT and keeps its sort index. The
+    rating and read status are copied onto books, so they need no subquery.
+    """
+    clauses = []
+    if author:
+        clauses.append(_author_matches(author, author_match))
+    if q:
+        clauses.append(Book.title.ilike(f"%{q}%"))
+    for name in [tag, *(tags_all or ())]:
+        if name:
+            clauses.append(_tagged([name]))
+    if tags_any:
+        clauses.append(_tagged(tags_any))
+    if tags_none:
+        clauses.append(~_tagged(tags_none))
+    if shelf:
+        clauses.append(
+            select(ShelfBook.id).where(ShelfBook.book_id == Book.id, ShelfBook.shelf_id == make_id(shelf)).exists()
+        )
+    clauses += _in_range(RATING_KEY, min_rating, max_rating)
+    clauses += _in_range(YEAR_KEY, min_year, max_year)
+    clauses += _in_range(PAGES_KEY, min_pages, max_pages)
+    if unread is not None:
+        clauses.append(Book.last_finished_at.is_(None) if unread else Book.last_finished_at.is_not(None))
+    reading_dates = [
+        compare(column, value)
+        for column, compare, value in [
+            (Reading.started_at, operator.ge, started_after),
+            (Reading.started_at, operator.le, started_before),
+            (Reading.finished_at, operator.ge, finished_after),
+            (Reading.finished_at, operator.le, finished_before),
+        ]
+        if value
+    ]
+    if reading_dates:
+        # One reading has to match every date bound
+        clauses.append(select(Reading.id).where(Reading.book_id == Book.id, *reading_dates).exists())
+    return clauses
+
+
+async def list_books(
+    session: AsyncSession,
+    author: str | None = None,
+    author_match: Literal["contains", "exact", "prefix"] = "contains",
+    tag: str | None = None,
+    tags_all: list[str] | None = None,
+    tags_any: list[str] | None = None,
+    tags_none: list[str] | None = None,
+    shelf: str | None = None,
+    min_rating: Rating | None = None,
+    max_rating: Rating | None = None,
+    min_year: NonNegative | None = None,
+    max_year: NonNegative | None = None,
+    min_pages: NonNegative | None = None,
+    max_pages: NonNegative | None = None,
+    unread: bool | None = None,
+    q: str | None = None,
+    started_after: date | None = None,
+    started_before: date | None = None,
+    finished_after: date | None = None,
+    finished_before: date | None = None,
+    sort: Literal["title", "author", "created_at", "rating", "year_published", "page_count", "finished_at"] = "title",
+    order: Literal["asc", "desc"] = "asc",
+    limit: PageLimit = 50,
+    offset: Offset = 0,
+    cursor: str | None = None,
+    fields: str | None = None,
+    include: str | None = None,
+) -> Page:
+    """Filtered, sorted page of books, as dicts of the `fields` columns (by default all but the description)
+    and any `include=` relationships.
+
+    Pass the previous page's `next_cursor` as `cursor` to continue after it; `offset` is ignored then.
+    Tags and the shelf are matched by name the way by-name lookups are (see `shelflife.id`).
+    """
+    stmt = select_books(fields).where(*book_filters(
+        author=author, author_match=author_match, tag=tag, tags_all=tags_all, tags_any=tags_any,
+        tags_none=tags_none, shelf=shelf, min_rating=min_rating, max_rating=max_rating, min_year=min_year,
+        max_year=max_year, min_pages=min_pages, max_pages=max_pages, unread=unread, q=q,
+        started_after=started_after, started_before=started_before, finished_after=finished_after,
+        finished_before=finished_before,
+    ))
+    keyset = Keyset(sort, BOOK_SORTS[sort], Book.id, order)
+    rows = (await session.execute(keyset.apply(stmt, limit, offset, cursor))).all()
+    return await expand(session, keyset.page(rows, limit, as_dict), include)
+
+
+async def lookup_book(title: str, author: str | None = None, limit: LookupLimit = 5) -> list[BookLookupResult]:
+    candidates = await search_candidates(title, author, limit=limit)
+    return [
+        BookLookupResult(
+            title=c.title,
+            author=c.author,
+            open_library_key=c.open_library_key,
+            cover_url=c.cover_url,
+            isbn=c.isbn,
+            isbn13=c.isbn13,
+            publisher=c.publisher,
+            year_published=c.year_published,
+            page_count=c.page_count,
+        )
+        for c in candidates
+    ]
+
+
+async def get_books_bulk(session: AsyncSession, refs: list[BookIdentifier]) -> list[BookDetail]:
+    ids = make_ids((b.title, b.author) for b in refs)
+    stmt = select(Book).where(Book.id.in_(ids)).options(*_DETAIL_OPTIONS)
+    result = await session.execute(stmt)
+    return [to_detail(book) for book in result.scalars().all()]
+
+
+def _clean_isbn(isbn: str | None) -> str | None:
+    if not isbn:
+        return None
+    return isbn.replace("-", "").replace(" ", "") or None
+
+
+async def resolve_books(session: AsyncSession, refs: list[BookReference]) -> ResolveResponse:
+    """Map references to existing book ids in one query over the indexed id, ISBN and Goodreads columns.
+
+    A Goodreads id wins over an ISBN, which wins over title and author.
+    """
+    ref_ids = [make_id(r.title, r.author) if r.title and r.author else None for r in refs]
+    isbns = {isbn for r in refs if (isbn := _clean_isbn(r.isbn))}
+    goodreads_ids = {r.goodreads_id for r in refs if r.goodreads_id}
+    conditions = [Book.id.in_({i for i in ref_ids if i is not None})]
+    if isbns:
+        conditions += [Book.isbn.in_(isbns), Book.isbn13.in_(isbns)]
+    if goodreads_ids:
+        conditions.append(Book.goodreads_id.in_(goodreads_ids))
+    rows = (
+        await session.execute(select(Book.id, Book.isbn, Book.isbn13, Book.goodreads_id).where(or_(*conditions)))
+    ).all()
+
+    ids = {row.id for row in rows}
+    by_isbn = {isbn: row.id for row in rows for isbn in (row.isbn, row.isbn13) if isbn}
+    by_goodreads_id = {row.goodreads_id: row.id for row in rows if row.goodreads_id}
+    results = []
+    for index, (ref, ref_id) in enumerate(zip(refs, ref_ids)):
+        if ref.goodreads_id in by_goodreads_id:
+            result = BookResolution(index=index, book_id=by_goodreads_id[ref.goodreads_id], matched_by="goodreads_id")
+        elif (isbn := _clean_isbn(ref.isbn)) in by_isbn:
+            result = BookResolution(index=index, book_id=by_isbn[isbn], matched_by="isbn")
+        elif ref_id in ids:
+            result = BookResolution(index=index, book_id=ref_id, matched_by="title_author")
+        else:
+            result = BookResolution(index=index)
+        results.append(result)
+    return ResolveResponse(results=results, not_found=[r.index for r in results if r.book_id is None])
+
+
+async def get_book(session: AsyncSession, book_id: int) -> BookDetail:
+    stmt = select(Book).where(Book.id == book_id).options(*_DETAIL_OPTIONS)
+    result = await session.execute(stmt)
+    book = result.scalar_one_or_none()
+    if book is None:
+        raise NotFoundError("Book not found")
+    return to_detail(book)
+
+
+async def _resolve(data: BookCreate) -> BookCreate:
+    """Swap in the best Open Library match's title and author, filling blank metadata from it."""
+    candidates = await search_candidates(data.title, data.author, limit=1)
+    if not candidates:
+        return data
+    best = candidates[0]
+    data = data.model_copy(update={"title": best.title, "author": best.author})
+    # Fill in metadata from the candidate if not already provided
+    for field_name in ("isbn", "isbn13", "publisher", "page_count", "year_published", "cover_url"):
+        if getattr(data, field_name) is None and getattr(best, field_name) is not None:
+            data = data.model_copy(update={field_name: getattr(best, field_name)})
+    return data
+
+
+async def _gather_bounded(fn: Callable[[Any], Awaitable[Any]], args: Iterable[Any]) -> list:
+    semaphore = asyncio.Semaphore(ENRICH_CONCURRENCY)
+
+    async def run(arg):
+        async with semaphore:
+            return await fn(arg)
+
+    return await asyncio.gather(*(run(arg) for arg in args))
+
+
+async def create_book(
+    session: AsyncSession,
+    data: BookCreate,
+    enrich: bool = False,
+    resolve: bool = False,
+    shelf: str | None = None,
+) -> Book:
+    """Create a book, optionally resolving, enriching and shelving it, with one commit."""
+    if resolve:
+        data = await _resolve(data)
+
+    book_id = make_id(data.title, data.author)
+    existing = await session.get(Book, book_id)
+    if existing is not None:
+        raise ConflictError("Book already exists")
+
+    book = Book(id=book_id, **data.model_dump())
+    # Looked up before anything is written, so the write lock isn't held over the network
+    metadata = await enrich_service.fetch_book_metadata(book) if enrich else None
+    session.add(book)
+    await session.flush()
+
+    if enrich:
+        await enrich_service.apply_metadata(session, book, metadata)
+    if shelf:
+        from shelflife.services.shelves import place_book  # shelves imports this module
+
+        await place_book(session, shelf, book_id)
+
+    await session.commit()
+    await session.refresh(book)
+    return book
+
+
+async def create_books(
+    session: AsyncSession,
+    items: list[BookBatchItem],
+    enrich: bool = False,
+    resolve: bool = False,
+) -> BatchResponse:
+    """Create many books with one existence query and a single commit.
+
+    Open Library lookups for `resolve` and `enrich` run concurrently, bounded
+    like the import pipeline, before anything is written: SQLite has one
+    writer, which shouldn't wait on the network. A book that already exists,
+    or repeats an earlier item, is reported as a conflict and not looked up.
+    """
+    if resolve:
+        items = await _gather_bounded(_resolve, items)
+
+    ids = make_ids((item.title, item.author) for item in items)
+    existing = set((await session.execute(select(Book.id).where(Book.id.in_(set(ids))))).scalars())
+
+    results = []
+    books = []
+    shelved = []
+    for index, (item, book_id) in enumerate(zip(items, ids)):
+        if book_id in existing:
+            results.append(BatchItemResult(index=index, book_id=book_id, status="conflict", detail="Book already exists"))
+            continue
+        existing.add(book_id)
+        books.append(Book(id=book_id, **item.model_dump(exclude={"shelf"})))
+        if item.shelf:
+            shelved.append(ShelveBatchItem(shelf=item.shelf, book_id=book_id))
+        results.append(BatchItemResult(index=index, book_id=book_id, status="created"))
+    metadata = await _gather_bounded(enrich_service.fetch_book_metadata, books) if enrich else []
+
+    session.add_all(books)
+    await session.flush()
+
+    for book, meta in zip(books, metadata):
+        await enrich_service.apply_metadata(session, book, meta)
+    if shelved:
+        from shelflife.services.shelves import place_books  # shelves imports this module
+
+        await place_books(session, shelved)
+
+    await session.commit()
+    return BatchResponse.from_results(results)
+
+
+async def enrich_book(session: AsyncSession, book_id: int, overwrite: bool = False) -> EnrichResponse:
+    book = await get_book_or_404(session, book_id)
+    enrich_result = await enrich_service.enrich_book(session, book, overwrite=overwrite)
+    await session.commit()
+
+    return EnrichResponse(
+        book_id=enrich_result.book_id,
+        enriched=enrich_result.enriched,
+        fields_updated=enrich_result.fields_updated,
+        tags_added=enrich_result.tags_added,
+        error=enrich_result.error,
+    )
+
+
+async def update_book(session: AsyncSession, book_id: int, data: BookUpdate) -> Book:
+    book = await get_book_or_404(session, book_id)
+    for key, value in data.model_dump(exclude_unset=True).items():
+        setattr(book, key, value)
+    await session.commit()
+    await session.refresh(book)
+    return book
+
+
+async def delete_book(session: AsyncSession, book_id: int) -> None:
+    book = await get_book_or_404(session, book_id)
+    await session.delete(book)
+    await session.commit()
@@ -0,0 +1,45 @@
+"""Check, and rebuild, the book counts stored on shelves and tags.
+
+Triggers on shelf_books and book_tags keep `book_count` current for every
+write through SQLite, but a database edited with the triggers dropped, or
+restored from a copy made mid-migration, can drift. The check recounts the
+link tables with one GROUP BY each and reports the rows that disagree.
+"""
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.models import BookTag, Shelf, ShelfBook, Tag
+from shelflife.schemas.counts import CountCheckResponse, CountMismatch
+
+# Table name -> (model with a book_count, the link column that counts towards it)
+COUNTERS = {
+    "shelves": (Shelf, ShelfBook.shelf_id),
+    "tags": (Tag, BookTag.tag_id),
+}
+
+
+async def check_counts(session: AsyncSession, repair: bool = False) -> CountCheckResponse:
+    """Compare every stored count with a recount; with `repair`, overwrite the wrong ones and commit."""
+    checked = 0
+    mismatches = []
+    for table, (model, link) in COUNTERS.items():
+        counted = select(link.label("id"), func.count().label("n")).group_by(link).subquery()
+        actual = func.coalesce(counted.c.n, 0)
+        rows = await session.execute(
+            select(model.id, model.name, model.book_count, actual)
+            .outerjoin(counted, counted.c.id == model.id)
+            .where(model.book_count != actual)
+            .order_by(model.name)
+        )
+        found = [
+            CountMismatch(table=table, id=id_, name=name, stored=stored, actual=n)
+            for id_, name, stored, n in rows
+        ]
+        if repair and found:
+            await session.execute(update(model), [{"id": m.id, "book_count": m.actual} for m in found])
+        checked += (await session.execute(select(func.count()).select_from(model))).scalar_one()
+        mismatches += found
+    if repair and mismatches:
+        await session.commit()
+    return CountCheckResponse(checked=checked, mismatches=mismatches, repaired=repair and bool(mismatches))
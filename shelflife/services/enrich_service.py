@@ -8,7 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from shelflife.id import make_id
 from shelflife.models import Book, BookTag, Tag
-from shelflife.services.openlibrary import fetch_metadata
+from shelflife.services.openlibrary import OpenLibraryMetadata
+from shelflife.services.providers import fetch_metadata
 
 logger = logging.getLogger(__name__)
 
@@ -30,25 +31,44 @@ class BatchEnrichResult:
     results: list[EnrichResult] = field(default_factory=list)
 
 
-async def enrich_book(
+@dataclass
+class BookLookup:
+    """The fields needed to look a book up, detached from the ORM session."""
+
+    id: int
+    isbn: str | None
+    isbn13: str | None
+    title: str
+    author: str
+
+    @classmethod
+    def from_book(cls, book: Book) -> "BookLookup":
+        return cls(id=book.id, isbn=book.isbn, isbn13=book.isbn13, title=book.title, author=book.author)
+
+
+async def fetch_book_metadata(book: Book | BookLookup) -> OpenLibraryMetadata | None:
+    """Fetch metadata for a book from the configured providers."""
+    return await fetch_metadata(
+        isbn=book.isbn,
+        isbn13=book.isbn13,
+        title=book.title,
+        author=book.author,
+    )
+
+
+async def apply_metadata(
     session: AsyncSession,
     book: Book,
+    metadata: OpenLibraryMetadata | None,
     overwrite: bool = False,
 ) -> EnrichResult:
-    """Fetch Open Library metadata and apply it to a Book.
+    """Apply fetched metadata to a Book.
 
     Only fills blank fields unless overwrite=True.
-    Auto-creates tags from Open Library subjects.
+    Auto-creates tags from the metadata subjects.
     """
     result = EnrichResult(book_id=book.id, enriched=False)
 
-    metadata = await fetch_metadata(
-        isbn=book.isbn,
-        isbn13=book.isbn13,
-        title=book.title,
-        author=book.author,
-    )
-
     if metadata is None:
         result.error = "No metadata found"
         return result
@@ -93,6 +113,16 @@ async def enrich_book(
     return result
 
 
+async def enrich_book(
+    session: AsyncSession,
+    book: Book,
+    overwrite: bool = False,
+) -> EnrichResult:
+    """Fetch metadata from the configured providers and apply it to a Book."""
+    metadata = await fetch_book_metadata(book)
+    return await apply_metadata(session, book, metadata, overwrite=overwrite)
+
+
 async def enrich_books_batch(
     session: AsyncSession,
     book_ids: list[int] | None = None,
@@ -0,0 +1,26 @@
+"""Errors raised by the service layer.
+
+Routers don't catch these; the app maps them to HTTP responses with the
+matching status code, and the in-process MCP client maps them to the same
+error dicts ShelflifeClient produces.
+"""
+
+
+class ServiceError(Exception):
+    status_code = 400
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(detail)
+        self.detail = detail
+
+
+class NotFoundError(ServiceError):
+    status_code = 404
+
+
+class ConflictError(ServiceError):
+    status_code = 409
+
+
+class InvalidRequestError(ServiceError):
+    status_code = 422
@@ -0,0 +1,119 @@
+"""Facet counts for a filtered book list, for a search UI to show beside the results.
+
+Every facet comes from one statement: a grouped count per facet, limited to
+its top values, joined with UNION ALL. With filters, the matching books are a
+CTE the facets count over. Without them, each facet reads an index on books,
+and tag and shelf counts are their stored book_count. Results are cached per
+filter set until one of the tables they read changes, in this process or any
+other sharing the database.
+"""
+
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import Select, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife import changes
+from shelflife.models import Book, BookTag, Shelf, ShelfBook, Tag
+from shelflife.models.book import RATING_KEY, YEAR_KEY
+from shelflife.schemas.facets import FacetCount, FacetsResponse
+from shelflife.services.books import book_filters
+
+FACETS = ("tags", "authors", "decades", "ratings", "shelves")
+# What the facets and filters read. Ratings and finish dates are copied onto books by triggers,
+# so a review or reading that changes them bumps books too.
+TABLES = ("books", "book_tags", "tags", "shelves", "shelf_books", "readings")
+
+# Filter sets kept; the oldest is dropped past this
+_CACHE_SIZE = 256
+_cache: dict[tuple, tuple[int, FacetsResponse]] = {}
+
+
+def _facet(name: str, value, count, grouped: bool = True) -> Select:
+    """One facet's values and counts, as (facet, value, count) rows."""
+    stmt = select(literal(name).label("facet"), value.label("value"), count.label("count"))
+    return stmt.group_by(value) if grouped else stmt
+
+
+def _top(stmt: Select, limit: int) -> Select:
+    """The `limit` most common values of a facet; ties go to the lowest value."""
+    # SQLite rejects ORDER BY and LIMIT on the members of a compound select, so each is wrapped
+    top = stmt.order_by(stmt.selected_columns.count.desc(), stmt.selected_columns.value).limit(limit).subquery()
+    return select(top.c.facet, top.c.value, top.c.count)
+
+
+def _statement(clauses: list, limit: int) -> Select:
+    """Every facet, plus the matching book count, as one statement of (facet, value, count) rows."""
+    count = func.count()
+    if clauses:
+        # Referenced by every facet, so SQLite materializes it and evaluates the filters once
+        matched = select(Book.id, Book.author, YEAR_KEY.label("year"), RATING_KEY.label("rating")) \
+            .where(*clauses).cte("matched")
+        author, year, rating = matched.c.author, matched.c.year, matched.c.rating
+        # Links are counted by id and only the top ids are joined for their names, so ties
+        # at the cutoff go to the lowest tag id rather than name
+        tag_counts = select(BookTag.tag_id, count.label("count")).join(matched, matched.c.id == BookTag.book_id) \
+            .group_by(BookTag.tag_id).order_by(count.desc(), BookTag.tag_id).limit(limit).subquery()
+        tags = _facet("tags", Tag.name, tag_counts.c.count, grouped=False).join(Tag, Tag.id == tag_counts.c.tag_id)
+        shelf_counts = select(ShelfBook.shelf_id, count.label("count")) \
+            .where(ShelfBook.book_id.in_(select(matched.c.id))).group_by(ShelfBook.shelf_id).subquery()
+        shelves = _facet("shelves", Shelf.name, shelf_counts.c.count, grouped=False) \
+            .join(Shelf, Shelf.id == shelf_counts.c.shelf_id)
+    else:
+        # The whole library: each facet scans a covering index on books, or reads the stored counts
+        matched = Book.__table__
+        author, year, rating = Book.author, YEAR_KEY, RATING_KEY
+        tags = _facet("tags", Tag.name, Tag.book_count, grouped=False).where(Tag.book_count > 0)
+        shelves = _facet("shelves", Shelf.name, Shelf.book_count, grouped=False).where(Shelf.book_count > 0)
+    return union_all(
+        select(literal("total"), literal(None), count).select_from(matched),
+        _top(tags, limit),
+        _top(_facet("authors", author, count).select_from(matched), limit),
+        # Grouped by year, which the index is ordered by; _fold adds the years up into decades
+        _facet("years", year, count).select_from(matched).where(year >= 0),
+        _top(_facet("ratings", rating, count).select_from(matched).where(rating >= 0), limit),
+        _top(shelves, limit),
+    )
+
+
+def _fold(years: list[tuple[int, int]], limit: int) -> list[FacetCount]:
+    decades = defaultdict(int)
+    for year, n in years:
+        decades[year - year % 10] += n
+    top = sorted(decades.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [FacetCount(value=decade, count=n) for decade, n in top]
+
+
+async def compute_facets(session: AsyncSession, limit: int = 10, **filters: Any) -> FacetsResponse:
+    """Top-`limit` values and book counts per facet for the books `list_books(**filters)` would return."""
+    counts: dict[str, list[FacetCount]] = {name: [] for name in FACETS}
+    total, years = 0, []
+    for facet, value, n in await session.execute(_statement(book_filters(**filters), limit)):
+        if facet == "total":
+            total = n
+        elif facet == "years":
+            years.append((value, n))
+        else:
+            counts[facet].append(FacetCount(value=value, count=n))
+    counts["decades"] = _fold(years, limit)
+    return FacetsResponse(total=total, **counts)
+
+
+def _key(limit: int, filters: dict[str, Any]) -> tuple:
+    return limit, *sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in filters.items() if v is not None)
+
+
+async def get_facets(session: AsyncSession, limit: int = 10, **filters: Any) -> FacetsResponse:
+    """Return the facets, recomputing only when the data has changed since they were cached."""
+    key = _key(limit, filters)
+    current = await changes.data_version(session, *TABLES)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == current:
+        return cached[1]
+    facets = await compute_facets(session, limit=limit, **filters)
+    _cache.pop(key, None)
+    _cache[key] = (current, facets)
+    if len(_cache) > _CACHE_SIZE:
+        del _cache[next(iter(_cache))]
+    return facets
@@ -42,51 +42,78 @@ def _parse_int(raw: str | None) -> int | None:
         return None
 
 
-def _parse_date(raw: str | None) -> date | None:
-    if not raw or not raw.strip():
-        return None
+def _parse_ymd(raw: str) -> datetime | None:
+    """Parse Goodreads' "YYYY/MM/DD" dates, skipping strptime for the usual well-formed case."""
+    parts = raw.split("/")
+    if len(parts) == 3 and len(parts[0]) == 4 and all(p.isdigit() and len(p) <= 4 for p in parts):
+        try:
+            return datetime(int(parts[0]), int(parts[1]), int(parts[2]))
+        except ValueError:
+            return None
     try:
-        return datetime.strptime(raw.strip(), "%Y/%m/%d").date()
+        return datetime.strptime(raw, "%Y/%m/%d")
     except ValueError:
         return None
 
 
-def _parse_datetime(raw: str | None) -> datetime | None:
+def _parse_date(raw: str | None) -> date | None:
     if not raw or not raw.strip():
         return None
-    try:
-        return datetime.strptime(raw.strip(), "%Y/%m/%d")
-    except ValueError:
+    parsed = _parse_ymd(raw.strip())
+    return parsed.date() if parsed else None
+
+
+def _parse_datetime(raw: str | None) -> datetime | None:
+    if not raw or not raw.strip():
         return None
+    return _parse_ymd(raw.strip())
+
+
+_COLUMNS = [
+    "Book Id", "Title", "Author", "Additional Authors", "ISBN", "ISBN13", "Publisher", "Number of Pages",
+    "Year Published", "Original Publication Year", "My Rating", "My Review", "Exclusive Shelf", "Bookshelves",
+    "Date Added", "Date Read",
+]
 
 
 def parse_goodreads_csv(content: str) -> list[GoodreadsRow]:
     """Parse a Goodreads CSV export string into a list of GoodreadsRow objects."""
-    reader = csv.DictReader(io.StringIO(content))
+    reader = csv.reader(io.StringIO(content))
+    header = next(reader, None)
+    if header is None:
+        return []
+    # Positions of the columns we read; missing columns read as ""
+    index = {name: i for i, name in enumerate(header)}
+    positions = [index.get(name, -1) for name in _COLUMNS]
     rows = []
-    for row in reader:
-        rating_val = _parse_int(row.get("My Rating"))
-        bookshelves_raw = row.get("Bookshelves", "")
+    for record in reader:
+        if not record:
+            continue
+        n = len(record)
+        (
+            book_id, title, author, additional_authors, isbn, isbn13, publisher, pages, year, original_year,
+            my_rating, review, exclusive_shelf, bookshelves_raw, date_added, date_read,
+        ) = [record[i] if 0 <= i < n else "" for i in positions]
+        rating_val = _parse_int(my_rating)
         bookshelves = [s.strip() for s in bookshelves_raw.split(",") if s.strip()]
 
         rows.append(
             GoodreadsRow(
-                goodreads_id=row.get("Book Id", "").strip(),
-                title=row.get("Title", "").strip(),
-                author=row.get("Author", "").strip(),
-                additional_authors=row.get("Additional Authors", "").strip() or None,
-                isbn=_clean_isbn(row.get("ISBN")),
-                isbn13=_clean_isbn(row.get("ISBN13")),
-                publisher=row.get("Publisher", "").strip() or None,
-                page_count=_parse_int(row.get("Number of Pages")),
-                year_published=_parse_int(row.get("Year Published"))
-                or _parse_int(row.get("Original Publication Year")),
+                goodreads_id=book_id.strip(),
+                title=title.strip(),
+                author=author.strip(),
+                additional_authors=additional_authors.strip() or None,
+                isbn=_clean_isbn(isbn),
+                isbn13=_clean_isbn(isbn13),
+                publisher=publisher.strip() or None,
+                page_count=_parse_int(pages),
+                year_published=_parse_int(year) or _parse_int(original_year),
                 rating=rating_val if rating_val and rating_val > 0 else None,
-                review_text=row.get("My Review", "").strip() or None,
-                exclusive_shelf=row.get("Exclusive Shelf", "").strip() or None,
+                review_text=review.strip() or None,
+                exclusive_shelf=exclusive_shelf.strip() or None,
                 bookshelves=bookshelves,
-                date_added=_parse_datetime(row.get("Date Added")),
-                date_read=_parse_date(row.get("Date Read")),
+                date_added=_parse_datetime(date_added),
+                date_read=_parse_date(date_read),
             )
         )
     return rows
@@ -1,14 +1,17 @@
 """Import parsed Goodreads data into the database."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from shelflife.id import make_id
+from shelflife.config import IMPORT_CHUNK_SIZE
+from shelflife.id import make_id, make_ids
 from shelflife.models import Book, Reading, Review, Shelf, ShelfBook
 from shelflife.services.goodreads import GoodreadsRow
 
+EXCLUSIVE_SHELF_NAMES = {"read", "currently-reading", "to-read"}
+
 
 @dataclass
 class ImportResult:
@@ -19,45 +22,77 @@ class ImportResult:
     readings_created: int = 0
 
 
+@dataclass
+class ImportState:
+    """Lookups carried across chunks of a single import."""
+
+    shelves: dict[str, Shelf] = field(default_factory=dict)
+
+
 async def _get_or_create_shelf(
-    session: AsyncSession, name: str, is_exclusive: bool = False
+    session: AsyncSession, name: str, is_exclusive: bool = False, state: ImportState | None = None
 ) -> Shelf:
+    if state is not None and name in state.shelves:
+        return state.shelves[name]
     result = await session.execute(select(Shelf).where(Shelf.name == name))
     shelf = result.scalar_one_or_none()
     if shelf is None:
         shelf = Shelf(id=make_id(name), name=name, is_exclusive=is_exclusive)
         session.add(shelf)
         await session.flush()
+    if state is not None:
+        state.shelves[name] = shelf
     return shelf
 
 
-async def import_goodreads_rows(
-    session: AsyncSession, rows: list[GoodreadsRow]
-) -> ImportResult:
-    result = ImportResult()
-    exclusive_shelf_names = {"read", "currently-reading", "to-read"}
-
-    for row in rows:
-        if not row.goodreads_id or not row.title:
-            continue
-
+def chunked(rows: list[GoodreadsRow], size: int = IMPORT_CHUNK_SIZE):
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+async def import_goodreads_chunk(
+    session: AsyncSession,
+    rows: list[GoodreadsRow],
+    result: ImportResult,
+    state: ImportState,
+) -> list[Book]:
+    """Upsert one chunk of rows, flushing but not committing.
+
+    Existing books, shelf links, readings and reviews for the whole chunk are
+    loaded up front in a handful of IN queries. Returns the books touched by
+    this chunk that still lack Open Library metadata.
+    """
+    rows = [row for row in rows if row.goodreads_id and row.title]
+    if not rows:
+        return []
+    row_ids = make_ids((r.title, r.author) for r in rows)
+
+    by_goodreads_id = {
+        b.goodreads_id: b
+        for b in (
+            await session.execute(select(Book).where(Book.goodreads_id.in_({r.goodreads_id for r in rows})))
+        ).scalars()
+    }
+    by_id = {
+        b.id: b
+        for b in (
+            await session.execute(select(Book).where(Book.id.in_(set(row_ids))))
+        ).scalars()
+    }
+
+    touched: dict[int, Book] = {}
+    plans: list[tuple[GoodreadsRow, Book]] = []
+
+    for row, row_id in zip(rows, row_ids):
         # Upsert book: check by goodreads_id first, then by deterministic id
-        existing = await session.execute(
-            select(Book).where(Book.goodreads_id == row.goodreads_id)
-        )
-        book = existing.scalar_one_or_none()
-
+        book = by_goodreads_id.get(row.goodreads_id)
         if book is None:
             # Book may exist without a goodreads_id (e.g. added via add_book)
-            book_id = make_id(row.title, row.author)
-            existing_by_id = await session.execute(
-                select(Book).where(Book.id == book_id)
-            )
-            book = existing_by_id.scalar_one_or_none()
+            book = by_id.get(row_id)
 
         if book is None:
             book = Book(
-                id=make_id(row.title, row.author),
+                id=row_id,
                 title=row.title,
                 author=row.author,
                 additional_authors=row.additional_authors,
@@ -69,7 +104,8 @@ async def import_goodreads_rows(
                 goodreads_id=row.goodreads_id,
             )
             session.add(book)
-            await session.flush()
+            by_id[book.id] = book
+            by_goodreads_id[row.goodreads_id] = book
             result.books_created += 1
         else:
             book.title = row.title
@@ -84,23 +120,36 @@ async def import_goodreads_rows(
                 book.goodreads_id = row.goodreads_id
             result.books_updated += 1
 
+        touched[book.id] = book
+        plans.append((row, book))
+
+    await session.flush()
+
+    book_ids = list(touched)
+    existing_links = set(
+        (await session.execute(
+            select(ShelfBook.shelf_id, ShelfBook.book_id).where(ShelfBook.book_id.in_(book_ids))
+        )).tuples()
+    )
+    reading_ids = {make_id(book.id, str(row.date_read)) for row, book in plans if row.date_read}
+    existing_readings = set(
+        (await session.execute(select(Reading.id).where(Reading.id.in_(reading_ids)))).scalars()
+    ) if reading_ids else set()
+    reviewed = set(
+        (await session.execute(select(Review.book_id).where(Review.book_id.in_(book_ids)))).scalars()
+    )
+
+    for row, book in plans:
         # Create shelves and associations
         all_shelf_names = set(row.bookshelves)
         if row.exclusive_shelf:
             all_shelf_names.add(row.exclusive_shelf)
 
         for shelf_name in all_shelf_names:
-            is_excl = shelf_name in exclusive_shelf_names
-            shelf = await _get_or_create_shelf(session, shelf_name, is_excl)
-
-            # Check if association already exists
-            existing_link = await session.execute(
-                select(ShelfBook).where(
-                    ShelfBook.shelf_id == shelf.id,
-                    ShelfBook.book_id == book.id,
-                )
-            )
-            if existing_link.scalar_one_or_none() is None:
+            is_excl = shelf_name in EXCLUSIVE_SHELF_NAMES
+            shelf = await _get_or_create_shelf(session, shelf_name, is_excl, state)
+
+            if (shelf.id, book.id) not in existing_links:
                 link = ShelfBook(
                     id=make_id(shelf.id, book.id),
                     shelf_id=shelf.id,
@@ -109,16 +158,14 @@ async def import_goodreads_rows(
                     date_read=row.date_read,
                 )
                 session.add(link)
+                existing_links.add((shelf.id, book.id))
                 result.shelves_created += 1
 
         # Create reading if date_read is present
         if row.date_read:
             started_at = row.date_added.date() if row.date_added and row.exclusive_shelf == "read" else None
             reading_id = make_id(book.id, str(row.date_read))
-            existing_reading = await session.execute(
-                select(Reading).where(Reading.id == reading_id)
-            )
-            if existing_reading.scalar_one_or_none() is None:
+            if reading_id not in existing_readings:
                 reading = Reading(
                     id=reading_id,
                     book_id=book.id,
@@ -126,14 +173,12 @@ async def import_goodreads_rows(
                     finished_at=row.date_read,
                 )
                 session.add(reading)
+                existing_readings.add(reading_id)
                 result.readings_created += 1
 
         # Create review if rated or reviewed
         if row.rating or row.review_text:
-            existing_review = await session.execute(
-                select(Review).where(Review.book_id == book.id)
-            )
-            if existing_review.scalar_one_or_none() is None:
+            if book.id not in reviewed:
                 review = Review(
                     id=make_id(book.id),
                     book_id=book.id,
@@ -141,7 +186,19 @@ async def import_goodreads_rows(
                     review_text=row.review_text,
                 )
                 session.add(review)
+                reviewed.add(book.id)
                 result.reviews_created += 1
 
+    await session.flush()
+    return [book for book in touched.values() if book.open_library_key is None]
+
+
+async def import_goodreads_rows(
+    session: AsyncSession, rows: list[GoodreadsRow]
+) -> ImportResult:
+    result = ImportResult()
+    state = ImportState()
+    for chunk in chunked(rows):
+        await import_goodreads_chunk(session, chunk, result, state)
     await session.commit()
     return result
@@ -0,0 +1,50 @@
+"""Goodreads import and batch enrichment entry points for the routers and the MCP server."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.schemas.book import BatchEnrichRequest, BatchEnrichResponse
+from shelflife.services.enrich_service import enrich_books_batch
+from shelflife.services.goodreads import parse_goodreads_csv
+from shelflife.services.import_service import import_goodreads_rows
+from shelflife.services.pipeline import import_and_enrich
+
+
+async def import_goodreads_csv(session: AsyncSession, content: str, enrich: bool = False) -> dict:
+    rows = parse_goodreads_csv(content)
+    if enrich:
+        pipeline_result = await import_and_enrich(session, rows)
+        result = pipeline_result.imported
+    else:
+        result = await import_goodreads_rows(session, rows)
+
+    response = {
+        "books_created": result.books_created,
+        "books_updated": result.books_updated,
+        "shelves_created": result.shelves_created,
+        "reviews_created": result.reviews_created,
+        "readings_created": result.readings_created,
+    }
+
+    if enrich:
+        enrich_result = pipeline_result.enrichment
+        response["enrichment"] = {
+            "total": enrich_result.total,
+            "enriched": enrich_result.enriched,
+            "failed": enrich_result.failed,
+        }
+
+    return response
+
+
+async def batch_enrich(session: AsyncSession, data: BatchEnrichRequest) -> BatchEnrichResponse:
+    result = await enrich_books_batch(
+        session,
+        book_ids=data.book_ids,
+        only_unenriched=data.only_unenriched,
+        overwrite=data.overwrite,
+    )
+    return BatchEnrichResponse(
+        total=result.total,
+        enriched=result.enriched,
+        failed=result.failed,
+    )
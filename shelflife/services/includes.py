@@ -0,0 +1,91 @@
+"""`include=` expansions: embed a book list's relationships in one query each.
+
+Without them, showing a list with its tags or ratings takes a request per
+book. Each requested relationship is loaded for the whole list with a
+single `WHERE book_id IN (...)` query, the way `selectinload` batches it,
+so a page costs the same number of queries however many books it has.
+"""
+
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.models import BookTag, Reading, Review, Shelf, ShelfBook, Tag
+from shelflife.schemas.book import INCLUDE_TYPES
+from shelflife.schemas.reading import ReadingResponse
+from shelflife.schemas.review import ReviewResponse
+from shelflife.schemas.shelf import ShelfResponse
+from shelflife.schemas.tag import TagResponse
+from shelflife.services.errors import InvalidRequestError
+
+INCLUDES = tuple(INCLUDE_TYPES)
+
+# Ids per IN list, as selectinload does, so a whole shelf stays under SQLite's parameter limit
+_CHUNK = 500
+
+
+def parse_include(include: str | None) -> tuple[str, ...]:
+    """Comma-separated relationship names, validated and de-duplicated."""
+    if not include:
+        return ()
+    names = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = [name for name in names if name not in INCLUDES]
+    if unknown:
+        raise InvalidRequestError(f"Unknown include: {', '.join(unknown)}. Valid: {', '.join(INCLUDES)}")
+    return tuple(dict.fromkeys(names))
+
+
+async def _by_book(
+    session: AsyncSession, book_ids: list[int], stmt: Callable[[list[int]], Select], model: type[BaseModel]
+) -> dict[int, list[BaseModel]]:
+    """Rows of (book_id, entity) from `stmt(ids)`, validated as `model` and grouped by book."""
+    grouped = defaultdict(list)
+    for start in range(0, len(book_ids), _CHUNK):
+        for book_id, entity in await session.execute(stmt(book_ids[start:start + _CHUNK])):
+            grouped[book_id].append(model.model_validate(entity))
+    return grouped
+
+
+def _tags(session: AsyncSession, book_ids: list[int]) -> Awaitable[dict]:
+    return _by_book(session, book_ids, lambda ids: (
+        select(BookTag.book_id, Tag).join(Tag, Tag.id == BookTag.tag_id)
+        .where(BookTag.book_id.in_(ids)).order_by(Tag.name)
+    ), TagResponse)
+
+
+def _shelves(session: AsyncSession, book_ids: list[int]) -> Awaitable[dict]:
+    return _by_book(session, book_ids, lambda ids: (
+        select(ShelfBook.book_id, Shelf).join(Shelf, Shelf.id == ShelfBook.shelf_id)
+        .where(ShelfBook.book_id.in_(ids)).order_by(Shelf.name)
+    ), ShelfResponse)
+
+
+def _readings(session: AsyncSession, book_ids: list[int]) -> Awaitable[dict]:
+    return _by_book(session, book_ids, lambda ids: (
+        select(Reading.book_id, Reading).where(Reading.book_id.in_(ids)).order_by(Reading.started_at, Reading.id)
+    ), ReadingResponse)
+
+
+async def _review(session: AsyncSession, book_ids: list[int]) -> dict:
+    grouped = await _by_book(session, book_ids, lambda ids: (
+        select(Review.book_id, Review).where(Review.book_id.in_(ids))
+    ), ReviewResponse)
+    return {book_id: reviews[0] for book_id, reviews in grouped.items()}
+
+
+_LOADERS = {"tags": _tags, "review": _review, "shelves": _shelves, "readings": _readings}
+
+
+async def expand(session: AsyncSession, books: list[dict], include: str | None) -> list[dict]:
+    """Add each `include=` relationship to the projected `books` in place: one query per relationship.
+
+    Books without a review get `None`, and empty lists for the others.
+    """
+    for name in parse_include(include):
+        related = await _LOADERS[name](session, [book["id"] for book in books]) if books else {}
+        for book in books:
+            book[name] = related.get(book["id"], None if name == "review" else [])
+    return books
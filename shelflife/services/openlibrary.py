@@ -4,16 +4,19 @@ import logging
 import re
 from dataclasses import dataclass, field
 
-import httpx
-
 from shelflife.config import (
     OPENLIBRARY_BASE_URL,
     OPENLIBRARY_COVERS_URL,
     OPENLIBRARY_TIMEOUT,
 )
+from shelflife.lazy import lazy_import
+
+httpx = lazy_import("httpx")  # only needed once a lookup actually runs
 
 logger = logging.getLogger(__name__)
 
+_YEAR = re.compile(r"\b(1[0-9]{3}|20[0-9]{2})\b")
+
 
 @dataclass
 class OpenLibraryCandidate:
@@ -47,7 +50,7 @@ def _extract_year(publish_date: str | None) -> int | None:
     """Extract a 4-digit year from Open Library's freeform publish_date field."""
     if not publish_date:
         return None
-    match = re.search(r"\b(1[0-9]{3}|20[0-9]{2})\b", publish_date)
+    match = _YEAR.search(publish_date)
     return int(match.group(1)) if match else None
 
 
@@ -62,36 +65,34 @@ def _extract_description(data: dict) -> str | None:
 
 
 def _pick_best_match(docs: list[dict], title: str, author: str) -> dict | None:
-    """Score search results and return the best match."""
+    """Score search results and return the best match (the first of any tied)."""
     title_lower = title.lower().strip()
     author_lower = author.lower().strip()
 
-    scored = []
+    best, best_score = None, 0
     for doc in docs:
         score = 0
         doc_title = (doc.get("title") or "").lower().strip()
-        doc_authors = [a.lower() for a in (doc.get("author_name") or [])]
 
         if doc_title == title_lower:
             score += 10
         elif title_lower in doc_title or doc_title in title_lower:
             score += 5
 
-        if any(author_lower in a or a in author_lower for a in doc_authors):
-            score += 5
+        for a in doc.get("author_name") or ():
+            a = a.lower()
+            if author_lower in a or a in author_lower:
+                score += 5
+                break
 
         if doc.get("cover_i"):
             score += 1
         if doc.get("number_of_pages_median"):
             score += 1
 
-        if score > 0:
-            scored.append((score, doc))
-
-    if not scored:
-        return None
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return scored[0][1]
+        if score > best_score:
+            best, best_score = doc, score
+    return best
 
 
 async def fetch_metadata_by_isbn(isbn: str) -> OpenLibraryMetadata | None:
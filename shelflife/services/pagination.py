@@ -0,0 +1,105 @@
+"""Keyset (cursor) pagination for list queries.
+
+A cursor is an opaque token for the position just after the last row of a
+page: the sort name and direction, plus that row's sort value and id. The
+next page is the rows after that (value, id) pair in the same order, which
+an index on the sort column finds directly, so every page costs the same
+however deep it is. OFFSET still works, but it reads and discards every
+row before the page.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Literal
+
+from sqlalchemy import ColumnElement, Row, Select, tuple_
+
+from shelflife.services.errors import InvalidRequestError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+_VALUE = "_cursor_value"
+_ID = "_cursor_id"
+
+
+class Page(list):
+    """One page of results: a plain list, plus the cursor for the next page (None on the last page)."""
+
+    def __init__(self, items=(), next_cursor: str | None = None) -> None:
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+def _encode(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _decode(value: Any, python_type: type) -> Any:
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Order a query by `column` then `id`, and page through it with cursors or an offset."""
+
+    name: str  # the sort option, recorded in cursors so they can't be reused with another sort
+    column: ColumnElement
+    id: ColumnElement
+    order: Literal["asc", "desc"] = "asc"
+
+    def encode(self, value: Any, id_: int) -> str:
+        raw = json.dumps([self.name, self.order, _encode(value), id_], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> tuple[Any, int]:
+        try:
+            name, order, value, id_ = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if (name, order) != (self.name, self.order):
+                raise InvalidRequestError(f"Cursor is for sort={name}&order={order}, not sort={self.name}&order={self.order}")
+            return _decode(value, self.column.type.python_type), int(id_)
+        except (ValueError, TypeError, binascii.Error) as e:
+            raise InvalidRequestError("Invalid cursor") from e
+
+    def apply(self, stmt: Select, limit: int, offset: int = 0, cursor: str | None = None) -> Select:
+        """Order, position and limit `stmt`, selecting the sort key as extra columns for `page`.
+
+        One row more than `limit` is fetched to tell whether there is a next page.
+        """
+        key = tuple_(self.column, self.id)
+        if cursor:
+            value, id_ = self.decode(cursor)
+            after = tuple_(value, id_)
+            # The bound on the column alone lets SQLite seek an expression index, which it won't for a row value
+            if self.order == "asc":
+                stmt = stmt.where(self.column >= value, key > after)
+            else:
+                stmt = stmt.where(self.column <= value, key < after)
+        elif offset:
+            stmt = stmt.offset(offset)
+        if self.order == "desc":
+            stmt = stmt.order_by(self.column.desc(), self.id.desc())
+        else:
+            stmt = stmt.order_by(self.column.asc(), self.id.asc())
+        return stmt.add_columns(self.column.label(_VALUE), self.id.label(_ID)).limit(limit + 1)
+
+    def page(self, rows: Sequence[Row], limit: int, item: Callable[[Row], Any]) -> Page:
+        """Rows of an `apply`ed query as a Page of `item(row)`, with the next cursor if there are more."""
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]._mapping
+            next_cursor = self.encode(last[_VALUE], last[_ID])
+        return Page((item(row) for row in rows), next_cursor)
+
+
+def as_dict(row: Row) -> dict:
+    """A projected row as a dict, without the sort key columns."""
+    return {k: v for k, v in row._mapping.items() if k not in (_VALUE, _ID)}
@@ -0,0 +1,148 @@
+"""Streaming Goodreads import with concurrent enrichment.
+
+Three stages connected by bounded asyncio queues:
+
+1. import: rows are upserted in chunks, all in one transaction that is
+   committed once the last chunk is in, so a failed import leaves nothing
+   behind. Books that still need metadata are queued as soon as their chunk
+   is flushed.
+2. fetch: a pool of workers pulls books off the queue and fetches metadata
+   from the configured providers. No database access happens here.
+3. apply: fetched metadata is applied in batches. Batches applied before the
+   import is committed go into its transaction; later ones are committed
+   on their own.
+
+The import and apply stages share one session, guarded by a lock, so only
+one of them touches the database at a time (SQLite has a single writer
+anyway). Because enrichment is network-bound, import and enrichment overlap
+and the total time approaches max(import, enrich) rather than their sum.
+Full queues block the upstream stage, which keeps memory bounded.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.config import (
+    ENRICH_APPLY_BATCH_SIZE,
+    ENRICH_CONCURRENCY,
+    ENRICH_QUEUE_SIZE,
+    IMPORT_CHUNK_SIZE,
+)
+from shelflife.models import Book
+from shelflife.services.enrich_service import (
+    BatchEnrichResult,
+    BookLookup,
+    apply_metadata,
+    fetch_book_metadata,
+)
+from shelflife.services.goodreads import GoodreadsRow
+from shelflife.services.import_service import (
+    ImportResult,
+    ImportState,
+    chunked,
+    import_goodreads_chunk,
+)
+
+_DONE = object()
+
+
+@dataclass
+class PipelineResult:
+    imported: ImportResult = field(default_factory=ImportResult)
+    enrichment: BatchEnrichResult = field(
+        default_factory=lambda: BatchEnrichResult(total=0, enriched=0, failed=0)
+    )
+    peak_queue_depth: int = 0
+
+
+async def import_and_enrich(
+    session: AsyncSession,
+    rows: list[GoodreadsRow],
+    overwrite: bool = False,
+    concurrency: int = ENRICH_CONCURRENCY,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    queue_size: int = ENRICH_QUEUE_SIZE,
+    apply_batch_size: int = ENRICH_APPLY_BATCH_SIZE,
+) -> PipelineResult:
+    """Import rows and enrich the books that need it, with the stages overlapped."""
+    result = PipelineResult()
+    db_lock = asyncio.Lock()
+    lookups: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    fetched: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    imported = False
+
+    async def import_stage() -> None:
+        nonlocal imported
+        state = ImportState()
+        for chunk in chunked(rows, chunk_size):
+            async with db_lock:
+                pending = await import_goodreads_chunk(session, chunk, result.imported, state)
+            for book in pending:
+                await lookups.put(BookLookup.from_book(book))
+                result.peak_queue_depth = max(result.peak_queue_depth, lookups.qsize())
+        async with db_lock:
+            await session.commit()
+            imported = True
+        for _ in range(concurrency):
+            await lookups.put(_DONE)
+
+    async def fetch_worker() -> None:
+        while (lookup := await lookups.get()) is not _DONE:
+            await fetched.put((lookup.id, await fetch_book_metadata(lookup)))
+        await fetched.put(_DONE)
+
+    async def apply_batch(batch: list[tuple[int, object]]) -> None:
+        async with db_lock:
+            books = {
+                b.id: b
+                for b in (await session.execute(select(Book).where(Book.id.in_([i for i, _ in batch])))).scalars()
+            }
+            for book_id, metadata in batch:
+                book = books.get(book_id)
+                if book is None:
+                    continue
+                enrich_result = await apply_metadata(session, book, metadata, overwrite=overwrite)
+                result.enrichment.total += 1
+                result.enrichment.results.append(enrich_result)
+                if enrich_result.enriched:
+                    result.enrichment.enriched += 1
+                elif enrich_result.error:
+                    result.enrichment.failed += 1
+            if imported:
+                await session.commit()
+            else:
+                await session.flush()  # committed with the import
+
+    async def apply_stage() -> None:
+        workers_left = concurrency
+        batch: list[tuple[int, object]] = []
+        while workers_left:
+            item = await fetched.get()
+            if item is _DONE:
+                workers_left -= 1
+            else:
+                batch.append(item)
+            # Drain whatever else is ready so commits are batched under load
+            while len(batch) < apply_batch_size and not fetched.empty():
+                item = fetched.get_nowait()
+                if item is _DONE:
+                    workers_left -= 1
+                else:
+                    batch.append(item)
+            if batch and (len(batch) >= apply_batch_size or fetched.empty()):
+                await apply_batch(batch)
+                batch = []
+        if batch:
+            await apply_batch(batch)
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(import_stage())
+        for _ in range(concurrency):
+            tg.create_task(fetch_worker())
+        tg.create_task(apply_stage())
+
+    return result
@@ -0,0 +1,58 @@
+"""Reading profile aggregates, computed with a handful of small queries."""
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife import changes
+from shelflife.models import Book, Review, Shelf, Tag
+from shelflife.schemas.params import RecentLimit, TopLimit
+from shelflife.schemas.profile import ProfileResponse
+
+_cache: dict[tuple[int, int], tuple[int, ProfileResponse]] = {}
+
+
+async def compute_profile(session: AsyncSession, top_tags: int = 10, recent: int = 5) -> ProfileResponse:
+    total_books = (await session.execute(select(func.count(Book.id)))).scalar()
+    total_reviews = (await session.execute(select(func.count(Review.id)))).scalar()
+
+    ratings = await session.execute(
+        select(Review.rating, func.count(Review.id))
+        .where(Review.rating > 0)
+        .group_by(Review.rating)
+        .order_by(Review.rating.desc())
+    )
+
+    # Tag and shelf counts are stored on the rows, so neither query reads the link tables
+    tags = await session.execute(
+        select(Tag.name, Tag.book_count)
+        .where(Tag.book_count > 0)
+        .order_by(Tag.book_count.desc(), Tag.name)
+        .limit(top_tags)
+    )
+
+    shelves = await session.execute(select(Shelf.id, Shelf.name, Shelf.book_count).order_by(Shelf.name))
+
+    recent_books = await session.execute(
+        select(Book.title, Book.author).order_by(Book.created_at.desc()).limit(recent)
+    )
+
+    return ProfileResponse(
+        total_books=total_books,
+        total_reviews=total_reviews,
+        shelves=[{"id": i, "name": n, "book_count": c} for i, n, c in shelves],
+        top_tags=[{"name": n, "count": c} for n, c in tags],
+        rating_distribution={str(float(r)): c for r, c in ratings},
+        recent_books=[{"title": t, "author": a} for t, a in recent_books],
+    )
+
+
+async def get_profile(session: AsyncSession, top_tags: TopLimit = 10, recent: RecentLimit = 5) -> ProfileResponse:
+    """Return the profile, recomputing only when the data has changed since the last call."""
+    key = (top_tags, recent)
+    current = await changes.data_version(session)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == current:
+        return cached[1]
+    profile = await compute_profile(session, top_tags=top_tags, recent=recent)
+    _cache[key] = (current, profile)
+    return profile
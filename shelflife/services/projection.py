@@ -0,0 +1,39 @@
+"""`fields=` projections: select only the requested book columns.
+
+Book lists always go through a projection: the requested columns, or by
+default every column but the description. A projected query returns plain
+dicts instead of ORM objects, so nothing outside the selected columns is
+read from the database or serialized.
+"""
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.models import Book
+from shelflife.schemas.book import LIST_FIELDS, BookResponse
+from shelflife.services.errors import InvalidRequestError
+
+BOOK_FIELDS = tuple(BookResponse.model_fields)
+
+
+def parse_fields(fields: str | None) -> list[str]:
+    """Comma-separated field names, validated and de-duplicated. `id` always comes first.
+
+    No `fields` means the list default, LIST_FIELDS.
+    """
+    if not fields:
+        return list(LIST_FIELDS)
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BOOK_FIELDS]
+    if unknown:
+        raise InvalidRequestError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(BOOK_FIELDS)}")
+    return ["id", *(name for name in dict.fromkeys(names) if name != "id")]
+
+
+def select_books(fields: str | None = None) -> Select:
+    """`select(Book)` narrowed to the requested columns, for use in place of it."""
+    return select(*(getattr(Book, name) for name in parse_fields(fields))).select_from(Book)
+
+
+async def fetch_rows(session: AsyncSession, stmt: Select) -> list[dict]:
+    return [dict(row) for row in (await session.execute(stmt)).mappings()]
@@ -0,0 +1,299 @@
+"""Pluggable metadata providers with hedged fetching.
+
+Open Library is the primary provider. Additional providers (e.g. Google
+Books, enabled with SHELFLIFE_METADATA_PROVIDERS) are hedged behind it: if
+the current provider hasn't answered within its observed latency quantile,
+the next one is fired, the first good answer wins and the losers are
+cancelled.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+from shelflife import config
+from shelflife.services import openlibrary
+from shelflife.lazy import lazy_import
+from shelflife.services.openlibrary import OpenLibraryMetadata, _extract_year, _pick_best_match
+
+httpx = lazy_import("httpx")
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram plus a window of recent samples.
+
+    Buckets are exposed for monitoring; quantiles are computed from the
+    recent-sample window so the hedge delay tracks current conditions.
+    """
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, window: int = 500) -> None:
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_seconds = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.sum_seconds += seconds
+        self._recent.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        idx = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[idx]
+
+    @property
+    def samples(self) -> int:
+        return len(self._recent)
+
+    def snapshot(self) -> dict:
+        buckets = {f"le_{b}ms": c for b, c in zip(self.BUCKETS_MS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_seconds / self.count * 1000, 2) if self.count else None,
+            "p50_ms": _ms(self.quantile(0.50)),
+            "p95_ms": _ms(self.quantile(0.95)),
+            "p99_ms": _ms(self.quantile(0.99)),
+            "buckets": buckets,
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+class MetadataProvider(ABC):
+    """A source of book metadata. Implementations must not raise on lookup failure."""
+
+    name: str
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.wins = 0
+        self.cancelled = 0
+
+    @abstractmethod
+    async def fetch(
+        self,
+        isbn: str | None = None,
+        isbn13: str | None = None,
+        title: str | None = None,
+        author: str | None = None,
+    ) -> OpenLibraryMetadata | None: ...
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "wins": self.wins,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class OpenLibraryProvider(MetadataProvider):
+    name = "openlibrary"
+
+    async def fetch(self, isbn=None, isbn13=None, title=None, author=None):
+        return await openlibrary.fetch_metadata(isbn=isbn, isbn13=isbn13, title=title, author=author)
+
+
+class GoogleBooksProvider(MetadataProvider):
+    """Google Books-compatible `/books/v1/volumes` JSON API."""
+
+    name = "googlebooks"
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        timeout: float | None = None,
+        transport: "httpx.AsyncBaseTransport | None" = None,
+    ) -> None:
+        super().__init__()
+        self.base_url = base_url or config.GOOGLE_BOOKS_BASE_URL
+        self.api_key = api_key if api_key is not None else config.GOOGLE_BOOKS_API_KEY
+        self.timeout = timeout or config.GOOGLE_BOOKS_TIMEOUT
+        self.transport = transport
+
+    async def _search(self, client: "httpx.AsyncClient", query: str) -> list[dict]:
+        params = {"q": query, "maxResults": 5}
+        if self.api_key:
+            params["key"] = self.api_key
+        resp = await client.get(f"{self.base_url}/books/v1/volumes", params=params)
+        if resp.status_code != 200:
+            logger.warning("Google Books lookup failed: %s -> %d", query, resp.status_code)
+            return []
+        return resp.json().get("items") or []
+
+    async def fetch(self, isbn=None, isbn13=None, title=None, author=None):
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as client:
+                for candidate_isbn in [isbn13, isbn]:
+                    if candidate_isbn:
+                        items = await self._search(client, f"isbn:{candidate_isbn}")
+                        if items:
+                            return _volume_to_metadata(items[0]["volumeInfo"])
+
+                if title and author:
+                    items = await self._search(client, f"intitle:{title} inauthor:{author}")
+                    docs = [
+                        {"title": i["volumeInfo"].get("title"), "author_name": i["volumeInfo"].get("authors"), "info": i["volumeInfo"]}
+                        for i in items
+                        if "volumeInfo" in i
+                    ]
+                    best = _pick_best_match(docs, title, author)
+                    if best is not None:
+                        return _volume_to_metadata(best["info"])
+                return None
+        except httpx.HTTPError as e:
+            logger.error("Google Books API error for '%s' by '%s': %s", title, author, e)
+            return None
+
+
+def _volume_to_metadata(info: dict) -> OpenLibraryMetadata:
+    cover = (info.get("imageLinks") or {}).get("thumbnail")
+    return OpenLibraryMetadata(
+        description=info.get("description"),
+        cover_url=cover.replace("http://", "https://", 1) if cover else None,
+        page_count=info.get("pageCount"),
+        publisher=info.get("publisher"),
+        publish_year=_extract_year(info.get("publishedDate")),
+        subjects=[s for s in (info.get("categories") or [])[:20]],
+    )
+
+
+class HedgedFetcher:
+    """Query providers in priority order, hedging slow ones with the next provider.
+
+    The hedge delay for a provider is its observed latency quantile (p95 by
+    default), falling back to a fixed default until enough samples exist.
+    Every call is sampled, including ones that fail or are cancelled.
+    A provider that answers with nothing triggers the next one immediately.
+    """
+
+    def __init__(
+        self,
+        providers: list[MetadataProvider],
+        quantile: float | None = None,
+        default_delay: float | None = None,
+        min_delay: float | None = None,
+        min_samples: int | None = None,
+    ) -> None:
+        if not providers:
+            raise ValueError("At least one metadata provider is required")
+        self.providers = providers
+        self.quantile = quantile if quantile is not None else config.HEDGE_QUANTILE
+        self.default_delay = default_delay if default_delay is not None else config.HEDGE_DEFAULT_DELAY
+        self.min_delay = min_delay if min_delay is not None else config.HEDGE_MIN_DELAY
+        self.min_samples = min_samples if min_samples is not None else config.HEDGE_MIN_SAMPLES
+        self.hedges_fired = 0
+
+    def hedge_delay(self, provider: MetadataProvider) -> float:
+        if provider.latency.samples < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, provider.latency.quantile(self.quantile))
+
+    async def _timed(self, provider: MetadataProvider, lookup: dict) -> OpenLibraryMetadata | None:
+        start = time.perf_counter()
+        try:
+            return await provider.fetch(**lookup)
+        except asyncio.CancelledError:
+            provider.cancelled += 1
+            raise
+        except Exception:
+            provider.errors += 1
+            logger.exception("Metadata provider %s failed", provider.name)
+            return None
+        finally:
+            # Failed and cancelled calls count too: a cancelled call took at least this long,
+            # and leaving it out would pull the quantile, and so the hedge delay, down
+            provider.latency.observe(time.perf_counter() - start)
+
+    async def fetch(
+        self,
+        isbn: str | None = None,
+        isbn13: str | None = None,
+        title: str | None = None,
+        author: str | None = None,
+    ) -> OpenLibraryMetadata | None:
+        lookup = {"isbn": isbn, "isbn13": isbn13, "title": title, "author": author}
+        queue = list(self.providers)
+        running: dict[asyncio.Task, MetadataProvider] = {}
+
+        def launch() -> MetadataProvider:
+            provider = queue.pop(0)
+            running[asyncio.create_task(self._timed(provider, lookup))] = provider
+            return provider
+
+        last = launch()
+        try:
+            while running:
+                timeout = self.hedge_delay(last) if queue else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.hedges_fired += 1
+                    last = launch()
+                    continue
+                for task in done:
+                    provider = running.pop(task)
+                    result = task.result()
+                    if result is not None:
+                        provider.wins += 1
+                        return result
+                if queue and not running:
+                    last = launch()
+            return None
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "hedges_fired": self.hedges_fired,
+            "providers": [{**p.stats(), "hedge_delay_ms": _ms(self.hedge_delay(p))} for p in self.providers],
+        }
+
+
+_PROVIDER_TYPES: dict[str, type[MetadataProvider]] = {
+    OpenLibraryProvider.name: OpenLibraryProvider,
+    GoogleBooksProvider.name: GoogleBooksProvider,
+}
+
+_fetcher: HedgedFetcher | None = None
+
+
+def get_fetcher() -> HedgedFetcher:
+    """Return the process-wide fetcher built from SHELFLIFE_METADATA_PROVIDERS."""
+    global _fetcher
+    if _fetcher is None:
+        names = [n for n in config.METADATA_PROVIDERS if n in _PROVIDER_TYPES]
+        unknown = set(config.METADATA_PROVIDERS) - set(names)
+        if unknown:
+            logger.warning("Ignoring unknown metadata providers: %s", ", ".join(sorted(unknown)))
+        _fetcher = HedgedFetcher([_PROVIDER_TYPES[n]() for n in names or [OpenLibraryProvider.name]])
+    return _fetcher
+
+
+async def fetch_metadata(
+    isbn: str | None = None,
+    isbn13: str | None = None,
+    title: str | None = None,
+    author: str | None = None,
+) -> OpenLibraryMetadata | None:
+    """Fetch metadata from the configured providers with hedging."""
+    return await get_fetcher().fetch(isbn=isbn, isbn13=isbn13, title=title, author=author)
@@ -0,0 +1,250 @@
+"""Readings and reading progress, shared by the API routers and the MCP server."""
+
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from shelflife.id import make_id, make_ids
+from shelflife.models import Book, Reading, ReadingProgress
+from shelflife.schemas.batch import BatchItemResult, BatchResponse, ProgressBatchItem
+from shelflife.schemas.book import BookIdentifier
+from shelflife.schemas.reading import (
+    BookReadingsResponse,
+    FinishReadingRequest,
+    ReadingProgressCreate,
+    ReadingResponse,
+    ReadingUpdate,
+    StartReadingRequest,
+)
+from shelflife.services.books import get_book_or_404
+from shelflife.services.errors import ConflictError, NotFoundError
+
+
+async def _get_active_reading(session: AsyncSession, book_id: int) -> Reading:
+    result = await session.execute(
+        select(Reading)
+        .where(Reading.book_id == book_id, Reading.finished_at.is_(None))
+        .order_by(Reading.created_at.desc())
+    )
+    reading = result.scalar_one_or_none()
+    if reading is None:
+        raise NotFoundError("No active reading for this book")
+    return reading
+
+
+async def _get_reading_or_404(session: AsyncSession, book_id: int, reading_id: int, *options) -> Reading:
+    result = await session.execute(
+        select(Reading)
+        .where(Reading.id == reading_id, Reading.book_id == book_id)
+        .options(*options)
+    )
+    reading = result.scalar_one_or_none()
+    if reading is None:
+        raise NotFoundError("Reading not found")
+    return reading
+
+
+async def _get_last_page(session: AsyncSession, reading_id: int) -> int:
+    result = await session.execute(
+        select(ReadingProgress.page)
+        .where(ReadingProgress.reading_id == reading_id)
+        .order_by(ReadingProgress.date.desc())
+        .limit(1)
+    )
+    row = result.scalar_one_or_none()
+    return row if row is not None else 0
+
+
+def _resolve_page(data: ReadingProgressCreate, last_page: int) -> int:
+    if data.page is not None:
+        return data.page
+    if data.pages_read is not None:
+        return last_page + data.pages_read
+    # start_page + end_page range
+    return data.end_page
+
+
+async def get_bulk_readings(session: AsyncSession, refs: list[BookIdentifier]) -> list[BookReadingsResponse]:
+    id_to_ref = dict(zip(make_ids((b.title, b.author) for b in refs), refs))
+    result = await session.execute(
+        select(Reading)
+        .where(Reading.book_id.in_(id_to_ref.keys()))
+        .order_by(Reading.book_id, Reading.created_at.desc())
+    )
+    readings = result.scalars().all()
+
+    grouped: dict[int, list] = defaultdict(list)
+    for r in readings:
+        grouped[r.book_id].append(ReadingResponse.model_validate(r).model_dump())
+
+    return [
+        BookReadingsResponse(
+            title=ref.title,
+            author=ref.author,
+            readings=grouped[book_id],
+        )
+        for book_id, ref in id_to_ref.items()
+    ]
+
+
+async def start_reading(session: AsyncSession, book_id: int, data: StartReadingRequest | None = None) -> Reading:
+    await get_book_or_404(session, book_id)
+    started = (data.started_at if data and data.started_at else date.today())
+    reading_id = make_id(book_id, str(started))
+
+    # Check for duplicate
+    existing = (await session.execute(select(Reading).where(Reading.id == reading_id))).scalar_one_or_none()
+    if existing is not None:
+        raise ConflictError("A reading with this start date already exists")
+
+    reading = Reading(id=reading_id, book_id=book_id, started_at=started)
+    session.add(reading)
+    await session.commit()
+    await session.refresh(reading)
+    return reading
+
+
+async def finish_reading(session: AsyncSession, book_id: int, data: FinishReadingRequest | None = None) -> Reading:
+    await get_book_or_404(session, book_id)
+    reading = await _get_active_reading(session, book_id)
+    reading.finished_at = data.finished_at if data and data.finished_at else date.today()
+    await session.commit()
+    await session.refresh(reading)
+    return reading
+
+
+async def list_readings(session: AsyncSession, book_id: int) -> list[Reading]:
+    await get_book_or_404(session, book_id)
+    result = await session.execute(
+        select(Reading).where(Reading.book_id == book_id).order_by(Reading.created_at.desc())
+    )
+    return result.scalars().all()
+
+
+async def get_reading(session: AsyncSession, book_id: int, reading_id: int) -> Reading:
+    await get_book_or_404(session, book_id)
+    return await _get_reading_or_404(session, book_id, reading_id, selectinload(Reading.progress_entries))
+
+
+async def update_reading(session: AsyncSession, book_id: int, reading_id: int, data: ReadingUpdate) -> Reading:
+    await get_book_or_404(session, book_id)
+    reading = await _get_reading_or_404(session, book_id, reading_id)
+    for key, value in data.model_dump(exclude_unset=True).items():
+        setattr(reading, key, value)
+    await session.commit()
+    await session.refresh(reading)
+    return reading
+
+
+async def delete_reading(session: AsyncSession, book_id: int, reading_id: int) -> None:
+    await get_book_or_404(session, book_id)
+    reading = await _get_reading_or_404(session, book_id, reading_id)
+    await session.delete(reading)
+    await session.commit()
+
+
+async def log_progress(session: AsyncSession, book_id: int, data: ReadingProgressCreate) -> ReadingProgress:
+    await get_book_or_404(session, book_id)
+    reading = await _get_active_reading(session, book_id)
+
+    progress_date = data.date if data.date else date.today()
+    last_page = await _get_last_page(session, reading.id)
+    page = _resolve_page(data, last_page)
+
+    progress_id = make_id(reading.id, str(progress_date))
+
+    # Check for duplicate date
+    existing = (
+        await session.execute(select(ReadingProgress).where(ReadingProgress.id == progress_id))
+    ).scalar_one_or_none()
+    if existing is not None:
+        raise ConflictError("Progress already logged for this date")
+
+    progress = ReadingProgress(
+        id=progress_id, reading_id=reading.id, page=page, date=progress_date
+    )
+    session.add(progress)
+    await session.commit()
+    await session.refresh(progress)
+    return progress
+
+
+async def log_progress_batch(session: AsyncSession, items: list[ProgressBatchItem]) -> BatchResponse:
+    """Log progress for many books with a fixed number of queries and a single commit.
+
+    Items are applied in order, so `pages_read` builds on an earlier item for
+    the same book.
+    """
+    book_ids = {item.book_id for item in items}
+    found = set((await session.execute(select(Book.id).where(Book.id.in_(book_ids)))).scalars())
+    active: dict[int, int] = {}
+    for book_id, reading_id in (await session.execute(
+        select(Reading.book_id, Reading.id)
+        .where(Reading.book_id.in_(found), Reading.finished_at.is_(None))
+        .order_by(Reading.created_at)
+    )).tuples():
+        active[book_id] = reading_id  # newest wins
+
+    taken: set[int] = set()
+    last_page: dict[int, int] = {}
+    for progress_id, reading_id, page in (await session.execute(
+        select(ReadingProgress.id, ReadingProgress.reading_id, ReadingProgress.page)
+        .where(ReadingProgress.reading_id.in_(active.values()))
+        .order_by(ReadingProgress.date)
+    )).tuples():
+        taken.add(progress_id)
+        last_page[reading_id] = page
+
+    results = []
+    entries = []
+    for index, item in enumerate(items):
+        if item.book_id not in found:
+            results.append(BatchItemResult(index=index, book_id=item.book_id, status="not_found", detail="Book not found"))
+            continue
+        reading_id = active.get(item.book_id)
+        if reading_id is None:
+            results.append(BatchItemResult(
+                index=index, book_id=item.book_id, status="not_found", detail="No active reading for this book"
+            ))
+            continue
+        progress_date = item.date if item.date else date.today()
+        progress_id = make_id(reading_id, str(progress_date))
+        if progress_id in taken:
+            results.append(BatchItemResult(
+                index=index, book_id=item.book_id, status="conflict", detail="Progress already logged for this date"
+            ))
+            continue
+        page = _resolve_page(item, last_page.get(reading_id, 0))
+        taken.add(progress_id)
+        last_page[reading_id] = page
+        entries.append(ReadingProgress(id=progress_id, reading_id=reading_id, page=page, date=progress_date))
+        results.append(BatchItemResult(index=index, book_id=item.book_id, status="created"))
+
+    session.add_all(entries)
+    await session.commit()
+    return BatchResponse.from_results(results)
+
+
+async def get_active_progress(session: AsyncSession, book_id: int) -> list[ReadingProgress]:
+    await get_book_or_404(session, book_id)
+    reading = await _get_active_reading(session, book_id)
+    result = await session.execute(
+        select(ReadingProgress)
+        .where(ReadingProgress.reading_id == reading.id)
+        .order_by(ReadingProgress.date)
+    )
+    return result.scalars().all()
+
+
+async def delete_progress(session: AsyncSession, progress_id: int) -> None:
+    result = await session.execute(
+        select(ReadingProgress).where(ReadingProgress.id == progress_id)
+    )
+    progress = result.scalar_one_or_none()
+    if progress is None:
+        raise NotFoundError("Progress entry not found")
+    await session.delete(progress)
+    await session.commit()
@@ -0,0 +1,164 @@
+"""Review queries and mutations shared by the API routers and the MCP server."""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.id import make_id
+from shelflife.models import Book, Review
+from shelflife.schemas.batch import BatchItemResult, BatchResponse, ReviewBatchItem
+from shelflife.schemas.params import Offset, PageLimit, Rating
+from shelflife.schemas.review import RatingUpdate, ReviewCreate, ReviewUpdate, ReviewWithBook
+from shelflife.services.books import get_book_or_404, require_book
+from shelflife.services.errors import ConflictError, NotFoundError
+from shelflife.services.pagination import Keyset, Page
+
+
+async def _get_review_or_404(session: AsyncSession, review_id: int) -> Review:
+    result = await session.execute(select(Review).where(Review.id == review_id))
+    review = result.scalar_one_or_none()
+    if review is None:
+        raise NotFoundError("Review not found")
+    return review
+
+
+async def list_all_reviews(
+    session: AsyncSession,
+    rating: Rating | None = None,
+    min_rating: Rating | None = None,
+    limit: PageLimit = 50,
+    offset: Offset = 0,
+    cursor: str | None = None,
+) -> Page:
+    """Most recently updated reviews first. Pass the previous page's `next_cursor` as `cursor` to continue."""
+    stmt = select(Review, Book.title, Book.author).join(Book)
+    if rating is not None:
+        stmt = stmt.where(Review.rating == rating)
+    if min_rating is not None:
+        stmt = stmt.where(Review.rating >= min_rating)
+    keyset = Keyset("updated_at", Review.updated_at, Review.id, "desc")
+    rows = (await session.execute(keyset.apply(stmt, limit, offset, cursor))).all()
+    return keyset.page(rows, limit, _with_book)
+
+
+def _with_book(row) -> ReviewWithBook:
+    review, title, author = row[:3]
+    return ReviewWithBook(
+        id=review.id,
+        book_id=review.book_id,
+        rating=review.rating,
+        review_text=review.review_text,
+        created_at=review.created_at,
+        updated_at=review.updated_at,
+        book_title=title,
+        book_author=author,
+    )
+
+
+async def get_review(session: AsyncSession, book_id: int) -> Review:
+    await get_book_or_404(session, book_id)
+    result = await session.execute(select(Review).where(Review.book_id == book_id))
+    review = result.scalar_one_or_none()
+    if review is None:
+        raise NotFoundError("Review not found")
+    return review
+
+
+async def create_review(session: AsyncSession, book_id: int, data: ReviewCreate) -> Review:
+    await get_book_or_404(session, book_id)
+
+    existing = (await session.execute(select(Review).where(Review.book_id == book_id))).scalar_one_or_none()
+    if existing is not None:
+        raise ConflictError("Review already exists for this book")
+
+    review = Review(id=make_id(book_id), book_id=book_id, **data.model_dump())
+    session.add(review)
+    await session.commit()
+    await session.refresh(review)
+    return review
+
+
+async def quick_rate(session: AsyncSession, book_id: int, data: RatingUpdate) -> Review:
+    await get_book_or_404(session, book_id)
+
+    result = await session.execute(select(Review).where(Review.book_id == book_id))
+    review = result.scalar_one_or_none()
+
+    if review is None:
+        review = Review(id=make_id(book_id), book_id=book_id, rating=data.rating)
+        session.add(review)
+    else:
+        review.rating = data.rating
+
+    await session.commit()
+    await session.refresh(review)
+    return review
+
+
+async def update_review(session: AsyncSession, review_id: int, data: ReviewUpdate) -> Review:
+    review = await _get_review_or_404(session, review_id)
+    for key, value in data.model_dump(exclude_unset=True).items():
+        setattr(review, key, value)
+    await session.commit()
+    await session.refresh(review)
+    return review
+
+
+async def delete_review(session: AsyncSession, review_id: int) -> None:
+    review = await _get_review_or_404(session, review_id)
+    await session.delete(review)
+    await session.commit()
+
+
+async def upsert_review(session: AsyncSession, book_id: int, data: ReviewUpdate) -> Review:
+    """Create the book's review or update the fields that were set, in one statement."""
+    await require_book(session, book_id)
+    values = data.model_dump(exclude_unset=True)
+    now = datetime.now(UTC)
+    stmt = (
+        insert(Review)
+        .values(id=make_id(book_id), book_id=book_id, created_at=now, updated_at=now, **values)
+        # Review ids are derived from the book id; migrated databases have no unique index on book_id
+        .on_conflict_do_update(index_elements=[Review.id], set_={**values, "updated_at": now})
+        .returning(Review)
+        .execution_options(populate_existing=True)
+    )
+    review = (await session.execute(stmt)).scalar_one()
+    await session.commit()
+    return review
+
+
+async def review_books(session: AsyncSession, items: list[ReviewBatchItem]) -> BatchResponse:
+    """Upsert many reviews with one lookup query and a single commit.
+
+    Like `upsert_review`, only the fields set on each item are written; if a
+    book appears more than once, its items are applied in order.
+    """
+    book_ids = {item.book_id for item in items}
+    found = set((await session.execute(select(Book.id).where(Book.id.in_(book_ids)))).scalars())
+    existing = {
+        review.book_id: review
+        for review in (await session.execute(select(Review).where(Review.book_id.in_(found)))).scalars()
+    }
+
+    results = []
+    for index, item in enumerate(items):
+        if item.book_id not in found:
+            results.append(BatchItemResult(index=index, book_id=item.book_id, status="not_found", detail="Book not found"))
+            continue
+        values = item.model_dump(exclude_unset=True, exclude={"book_id"})
+        review = existing.get(item.book_id)
+        if review is None:
+            review = Review(id=make_id(item.book_id), book_id=item.book_id, **values)
+            session.add(review)
+            existing[item.book_id] = review
+            results.append(BatchItemResult(index=index, book_id=item.book_id, status="created"))
+        else:
+            for key, value in values.items():
+                setattr(review, key, value)
+            results.append(BatchItemResult(index=index, book_id=item.book_id, status="updated"))
+
+    await session.commit()
+    return BatchResponse.from_results(results)
@@ -0,0 +1,307 @@
+"""Shelf queries and mutations shared by the API routers and the MCP server."""
+
+from collections import defaultdict
+from datetime import date
+from typing import Literal
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.id import make_id
+from shelflife.models import Book, Shelf, ShelfBook
+from shelflife.schemas.batch import BatchItemResult, BatchResponse, ShelveBatchItem
+from shelflife.schemas.book import MoveBookRequest
+from shelflife.schemas.params import Offset, PageLimit
+from shelflife.schemas.shelf import ShelfCreate, ShelfResponse, ShelfUpdate, ShelveResponse
+from shelflife.services.books import require_book
+from shelflife.services.errors import ConflictError, NotFoundError
+from shelflife.services.includes import expand
+from shelflife.services.pagination import Keyset, as_dict
+from shelflife.services.import_service import EXCLUSIVE_SHELF_NAMES
+from shelflife.services.projection import fetch_rows, select_books
+
+
+async def get_shelf_or_404(session: AsyncSession, shelf_id: int, detail: str = "Shelf not found") -> Shelf:
+    shelf = (await session.execute(select(Shelf).where(Shelf.id == shelf_id))).scalar_one_or_none()
+    if shelf is None:
+        raise NotFoundError(detail)
+    return shelf
+
+
+async def _get_link(session: AsyncSession, shelf_id: int, book_id: int) -> ShelfBook | None:
+    result = await session.execute(
+        select(ShelfBook).where(ShelfBook.shelf_id == shelf_id, ShelfBook.book_id == book_id)
+    )
+    return result.scalar_one_or_none()
+
+
+# Shelf metadata, including the trigger-maintained book count
+_SUMMARY_COLUMNS = tuple(getattr(Shelf, name) for name in ShelfResponse.model_fields)
+
+SHELF_SORTS = {
+    "date_added": ShelfBook.date_added,
+    # Books with no read date sort as the oldest
+    "date_read": func.coalesce(ShelfBook.date_read, date.min),
+    "title": Book.title,
+}
+
+
+async def list_shelves(session: AsyncSession) -> list[dict]:
+    """Every shelf with its book count."""
+    return await fetch_rows(session, select(*_SUMMARY_COLUMNS).order_by(Shelf.name))
+
+
+async def get_membership(session: AsyncSession, shelf_id: int, book_id: int) -> ShelfBook:
+    """The book's place on the shelf, by primary key; 404 if it isn't on it."""
+    link = await session.get(ShelfBook, make_id(shelf_id, book_id))
+    if link is None:
+        raise NotFoundError("Book not on this shelf")
+    return link
+
+
+async def get_shelf(
+    session: AsyncSession,
+    shelf_id: int,
+    fields: str | None = None,
+    include: str | None = None,
+    sort: Literal["date_added", "date_read", "title"] = "date_added",
+    order: Literal["asc", "desc"] = "desc",
+    limit: PageLimit = 50,
+    offset: Offset = 0,
+    cursor: str | None = None,
+) -> dict:
+    """The shelf with its book count and a page of its books, as dicts of the `fields` columns
+    (by default all but the description) and any `include=` relationships.
+
+    Pass the previous page's `next_cursor` as `cursor` to continue after it; `offset` is ignored then.
+    """
+    shelf = (await session.execute(select(*_SUMMARY_COLUMNS).where(Shelf.id == shelf_id))).mappings().one_or_none()
+    if shelf is None:
+        raise NotFoundError("Shelf not found")
+    stmt = select_books(fields).join(ShelfBook, ShelfBook.book_id == Book.id).where(ShelfBook.shelf_id == shelf_id)
+    keyset = Keyset(sort, SHELF_SORTS[sort], Book.id, order)
+    rows = (await session.execute(keyset.apply(stmt, limit, offset, cursor))).all()
+    books = await expand(session, keyset.page(rows, limit, as_dict), include)
+    return {**shelf, "books": books, "next_cursor": books.next_cursor}
+
+
+async def create_shelf(session: AsyncSession, data: ShelfCreate) -> Shelf:
+    shelf = Shelf(id=make_id(data.name), **data.model_dump())
+    session.add(shelf)
+    await session.commit()
+    await session.refresh(shelf)
+    return shelf
+
+
+async def update_shelf(session: AsyncSession, shelf_id: int, data: ShelfUpdate) -> Shelf:
+    shelf = await get_shelf_or_404(session, shelf_id)
+    for key, value in data.model_dump(exclude_unset=True).items():
+        setattr(shelf, key, value)
+    await session.commit()
+    await session.refresh(shelf)
+    return shelf
+
+
+async def delete_shelf(session: AsyncSession, shelf_id: int) -> None:
+    shelf = await get_shelf_or_404(session, shelf_id)
+    await session.delete(shelf)
+    await session.commit()
+
+
+async def move_book(session: AsyncSession, book_id: int, data: MoveBookRequest) -> dict:
+    await require_book(session, book_id)
+    from_shelf = await get_shelf_or_404(session, data.from_shelf_id, "Source shelf not found")
+    to_shelf = await get_shelf_or_404(session, data.to_shelf_id, "Destination shelf not found")
+
+    source_link = await _get_link(session, data.from_shelf_id, book_id)
+    if source_link is None:
+        raise NotFoundError("Book not on source shelf")
+    if await _get_link(session, data.to_shelf_id, book_id) is not None:
+        raise ConflictError("Book already on destination shelf")
+
+    date_added = source_link.date_added
+    date_read = source_link.date_read
+    await session.delete(source_link)
+    new_link = ShelfBook(
+        id=make_id(data.to_shelf_id, book_id),
+        shelf_id=data.to_shelf_id,
+        book_id=book_id,
+        date_added=date_added,
+        date_read=date_read,
+    )
+    session.add(new_link)
+    await session.commit()
+    return {"detail": f"Book moved from '{from_shelf.name}' to '{to_shelf.name}'"}
+
+
+async def add_book_to_shelf(session: AsyncSession, shelf_id: int, book_id: int) -> dict:
+    shelf = await get_shelf_or_404(session, shelf_id)
+    await require_book(session, book_id)
+
+    if await _get_link(session, shelf_id, book_id) is not None:
+        raise ConflictError("Book already on this shelf")
+
+    # Enforce exclusive shelf: remove book from other exclusive shelves
+    if shelf.is_exclusive:
+        exclusive_links = (await session.execute(
+            select(ShelfBook)
+            .join(Shelf, ShelfBook.shelf_id == Shelf.id)
+            .where(ShelfBook.book_id == book_id, Shelf.is_exclusive.is_(True))
+        )).scalars().all()
+        for link in exclusive_links:
+            await session.delete(link)
+
+    link = ShelfBook(id=make_id(shelf_id, book_id), shelf_id=shelf_id, book_id=book_id)
+    session.add(link)
+    await session.commit()
+    return {"detail": "Book added to shelf"}
+
+
+async def remove_book_from_shelf(session: AsyncSession, shelf_id: int, book_id: int) -> None:
+    link = await _get_link(session, shelf_id, book_id)
+    if link is None:
+        raise NotFoundError("Book not on this shelf")
+    await session.delete(link)
+    await session.commit()
+
+
+async def ensure_shelf(session: AsyncSession, name: str) -> tuple[int, bool, bool]:
+    """Create the shelf if it doesn't exist. Returns (shelf_id, is_exclusive, created).
+
+    Shelves named like the Goodreads exclusive shelves are created exclusive.
+    """
+    shelf_id = make_id(name)
+    inserted = (await session.execute(
+        insert(Shelf)
+        .values(id=shelf_id, name=name, is_exclusive=name.lower() in EXCLUSIVE_SHELF_NAMES)
+        .on_conflict_do_nothing()
+        .returning(Shelf.is_exclusive)
+    )).scalar_one_or_none()
+    if inserted is not None:
+        return shelf_id, inserted, True
+    is_exclusive = (await session.execute(
+        select(Shelf.is_exclusive).where(Shelf.id == shelf_id)
+    )).scalar_one()
+    return shelf_id, is_exclusive, False
+
+
+async def place_book(session: AsyncSession, shelf_name: str, book_id: int) -> ShelveResponse:
+    """Ensure the shelf exists and the book is on it, without committing.
+
+    Placing a book on an exclusive shelf takes it off any other exclusive
+    shelf. Placing it on a shelf it's already on changes nothing.
+    """
+    shelf_id, is_exclusive, shelf_created = await ensure_shelf(session, shelf_name)
+    if is_exclusive:
+        await session.execute(
+            delete(ShelfBook)
+            .where(
+                ShelfBook.book_id == book_id,
+                ShelfBook.shelf_id != shelf_id,
+                ShelfBook.shelf_id.in_(select(Shelf.id).where(Shelf.is_exclusive.is_(True))),
+            )
+            .execution_options(synchronize_session=False)
+        )
+    added = (await session.execute(
+        insert(ShelfBook)
+        .values(id=make_id(shelf_id, book_id), shelf_id=shelf_id, book_id=book_id)
+        .on_conflict_do_nothing()
+        .returning(ShelfBook.id)
+    )).scalar_one_or_none() is not None
+    return ShelveResponse(
+        shelf_id=shelf_id,
+        book_id=book_id,
+        shelf_created=shelf_created,
+        added=added,
+        detail="Book added to shelf" if added else "Book already on this shelf",
+    )
+
+
+async def shelve_book(session: AsyncSession, shelf_name: str, book_id: int) -> ShelveResponse:
+    """Create the shelf if needed and put the book on it, in one transaction."""
+    await require_book(session, book_id)
+    result = await place_book(session, shelf_name, book_id)
+    await session.commit()
+    return result
+
+
+async def ensure_shelves(session: AsyncSession, names: set[str]) -> dict[int, bool]:
+    """Create any missing shelves in one statement. Returns {shelf_id: is_exclusive} for all of them."""
+    if not names:
+        return {}
+    by_id = {make_id(name): name for name in names}
+    await session.execute(
+        insert(Shelf)
+        .values([
+            {"id": shelf_id, "name": name, "is_exclusive": name.lower() in EXCLUSIVE_SHELF_NAMES}
+            for shelf_id, name in by_id.items()
+        ])
+        .on_conflict_do_nothing()
+    )
+    rows = await session.execute(select(Shelf.id, Shelf.is_exclusive).where(Shelf.id.in_(by_id)))
+    return dict(rows.all())
+
+
+async def place_books(session: AsyncSession, items: list[ShelveBatchItem]) -> list[BatchItemResult]:
+    """Apply many shelf placements with a fixed number of queries, without committing.
+
+    Items are applied in order with the same rules as `place_book`, so a
+    later item moving a book to another exclusive shelf wins.
+    """
+    book_ids = {item.book_id for item in items}
+    found = set((await session.execute(select(Book.id).where(Book.id.in_(book_ids)))).scalars())
+    exclusive = await ensure_shelves(session, {item.shelf for item in items if item.book_id in found})
+
+    existing = set((await session.execute(
+        select(ShelfBook.shelf_id, ShelfBook.book_id).where(ShelfBook.book_id.in_(found))
+    )).tuples())
+    shelves_of: dict[int, set[int]] = defaultdict(set)
+    for shelf_id, book_id in existing:
+        shelves_of[book_id].add(shelf_id)
+    exclusive_ids = {shelf_id for shelf_id, is_exclusive in exclusive.items() if is_exclusive}
+    if exclusive_ids:
+        # Exclusive shelves the books are on already, beyond the ones named in this batch
+        exclusive_ids |= set((await session.execute(
+            select(Shelf.id).where(Shelf.id.in_({s for s, _ in existing}), Shelf.is_exclusive.is_(True))
+        )).scalars())
+
+    results = []
+    for index, item in enumerate(items):
+        if item.book_id not in found:
+            results.append(BatchItemResult(index=index, book_id=item.book_id, status="not_found", detail="Book not found"))
+            continue
+        shelf_id = make_id(item.shelf)
+        current = shelves_of[item.book_id]
+        if shelf_id in current:
+            results.append(BatchItemResult(
+                index=index, book_id=item.book_id, status="unchanged", detail="Book already on this shelf"
+            ))
+            continue
+        if shelf_id in exclusive_ids:
+            current -= exclusive_ids
+        current.add(shelf_id)
+        results.append(BatchItemResult(index=index, book_id=item.book_id, status="created", detail="Book added to shelf"))
+
+    links = {(shelf_id, book_id) for book_id, shelf_ids in shelves_of.items() for shelf_id in shelf_ids}
+    removed = existing - links
+    if removed:
+        await session.execute(
+            delete(ShelfBook)
+            .where(ShelfBook.id.in_([make_id(s, b) for s, b in removed]))
+            .execution_options(synchronize_session=False)
+        )
+    added = links - existing
+    if added:
+        await session.execute(
+            insert(ShelfBook)
+            .values([{"id": make_id(s, b), "shelf_id": s, "book_id": b} for s, b in added])
+            .on_conflict_do_nothing()
+        )
+    return results
+
+
+async def shelve_books(session: AsyncSession, items: list[ShelveBatchItem]) -> BatchResponse:
+    results = await place_books(session, items)
+    await session.commit()
+    return BatchResponse.from_results(results)
@@ -0,0 +1,165 @@
+"""Tag queries and mutations shared by the API routers and the MCP server."""
+
+from typing import Literal
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shelflife.id import make_id
+from shelflife.models import Book, BookTag, Tag
+from shelflife.schemas.params import NonNegative, Offset, PageLimit, TagPageLimit
+from shelflife.schemas.tag import (
+    BulkBookTagCreate,
+    BulkBookTagResponse,
+    BulkTagCreate,
+    BulkTagResponse,
+    TagCreate,
+)
+from shelflife.services.books import ascii_lower, get_book_or_404, prefix_range
+from shelflife.services.errors import ConflictError, NotFoundError
+from shelflife.services.includes import expand
+from shelflife.services.pagination import Keyset, Page, as_dict
+from shelflife.services.projection import select_books
+
+
+async def get_or_create_tag(session: AsyncSession, name: str) -> Tag:
+    result = await session.execute(select(Tag).where(Tag.name == name))
+    tag = result.scalar_one_or_none()
+    if tag is None:
+        tag = Tag(id=make_id(name), name=name)
+        session.add(tag)
+        await session.flush()
+    return tag
+
+
+async def _reload_counts(session: AsyncSession, tags: list[Tag]) -> None:
+    """Re-read the tags' book counts, which the book_tags triggers change without the session knowing."""
+    ids = [tag.id for tag in tags]
+    await session.execute(select(Tag).where(Tag.id.in_(ids)).execution_options(populate_existing=True))
+
+
+async def _is_tagged(session: AsyncSession, book_id: int, tag_id: int) -> bool:
+    existing = await session.execute(
+        select(BookTag).where(BookTag.book_id == book_id, BookTag.tag_id == tag_id)
+    )
+    return existing.scalar_one_or_none() is not None
+
+
+TAG_SORTS = {"name": Tag.name, "count": Tag.book_count}
+
+
+async def list_tags(
+    session: AsyncSession,
+    prefix: str | None = None,
+    contains: str | None = None,
+    min_count: NonNegative = 0,
+    sort: Literal["name", "count"] = "name",
+    order: Literal["asc", "desc"] = "asc",
+    limit: TagPageLimit = 100,
+    offset: Offset = 0,
+    cursor: str | None = None,
+) -> Page:
+    """A page of tags with their book counts, optionally matched case-insensitively by name.
+
+    A prefix is a range seek on the lower(name) index; `contains` checks every
+    name. SQLite only folds the case of A-Z, so "é" and "É" are different
+    letters to both. Counts are stored on the tag, so neither filtering nor
+    sorting by them reads book_tags.
+    """
+    lower_name = func.lower(Tag.name)
+    stmt = select(Tag.id, Tag.name, Tag.book_count)
+    if prefix:
+        stmt = stmt.where(prefix_range(lower_name, ascii_lower(prefix)))
+    if contains:
+        stmt = stmt.where(lower_name.contains(ascii_lower(contains), autoescape=True))
+    if min_count:
+        stmt = stmt.where(Tag.book_count >= min_count)
+    keyset = Keyset(sort, TAG_SORTS[sort], Tag.id, order)
+    rows = (await session.execute(keyset.apply(stmt, limit, offset, cursor))).all()
+    return keyset.page(rows, limit, as_dict)
+
+
+async def get_books_by_tag(
+    session: AsyncSession,
+    tag_id: int,
+    limit: PageLimit = 50,
+    offset: Offset = 0,
+    cursor: str | None = None,
+    fields: str | None = None,
+    include: str | None = None,
+) -> Page:
+    """Books with the tag by title, as dicts of the `fields` columns (by default all but the description)
+    and any `include=` relationships.
+
+    Pass the previous page's `next_cursor` as `cursor` to continue.
+    """
+    tag = (await session.execute(select(Tag).where(Tag.id == tag_id))).scalar_one_or_none()
+    if tag is None:
+        raise NotFoundError("Tag not found")
+
+    stmt = select_books(fields).join(BookTag).where(BookTag.tag_id == tag_id)
+    keyset = Keyset("title", Book.title, Book.id)
+    rows = (await session.execute(keyset.apply(stmt, limit, offset, cursor))).all()
+    return await expand(session, keyset.page(rows, limit, as_dict), include)
+
+
+async def tag_book(session: AsyncSession, book_id: int, data: TagCreate) -> Tag:
+    await get_book_or_404(session, book_id)
+    tag = await get_or_create_tag(session, data.name)
+    if await _is_tagged(session, book_id, tag.id):
+        raise ConflictError("Book already has this tag")
+
+    session.add(BookTag(book_id=book_id, tag_id=tag.id))
+    await session.commit()
+    await _reload_counts(session, [tag])
+    return tag
+
+
+async def bulk_tag_book(session: AsyncSession, book_id: int, data: BulkTagCreate) -> BulkTagResponse:
+    await get_book_or_404(session, book_id)
+
+    tags = []
+    created = 0
+    skipped = 0
+
+    for tag_name in data.tags:
+        tag = await get_or_create_tag(session, tag_name)
+        if await _is_tagged(session, book_id, tag.id):
+            skipped += 1
+        else:
+            session.add(BookTag(book_id=book_id, tag_id=tag.id))
+            created += 1
+        tags.append(tag)
+
+    await session.commit()
+    await _reload_counts(session, tags)
+    return BulkTagResponse(tags=tags, created=created, skipped=skipped)
+
+
+async def bulk_tag_books(session: AsyncSession, data: BulkBookTagCreate) -> BulkBookTagResponse:
+    tag = await get_or_create_tag(session, data.tag)
+
+    # The requested books, and the ones among them already tagged, in one query each
+    found = set((await session.execute(select(Book.id).where(Book.id.in_(data.book_ids)))).scalars())
+    not_found = [bid for bid in data.book_ids if bid not in found]
+    tagged_already = set((await session.execute(
+        select(BookTag.book_id).where(BookTag.tag_id == tag.id, BookTag.book_id.in_(found))
+    )).scalars())
+
+    new = found - tagged_already
+    session.add_all([BookTag(book_id=book_id, tag_id=tag.id) for book_id in new])
+
+    await session.commit()
+    await _reload_counts(session, [tag])
+    return BulkBookTagResponse(tag=tag, tagged=len(new), skipped=len(tagged_already), not_found=not_found)
+
+
+async def untag_book(session: AsyncSession, book_id: int, tag_id: int) -> None:
+    result = await session.execute(
+        select(BookTag).where(BookTag.book_id == book_id, BookTag.tag_id == tag_id)
+    )
+    link = result.scalar_one_or_none()
+    if link is None:
+        raise NotFoundError("Tag not found on this book")
+    await session.delete(link)
+    await session.commit()
@@ -1,14 +1,17 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from shelflife.database import Base, get_session
 from shelflife.app import create_app
-import shelflife.models  # noqa: F401
+from shelflife.models import DataVersion
 
 TEST_DB_URL = "sqlite+aiosqlite://"  # in-memory
 
 engine = create_async_engine(TEST_DB_URL, echo=False)
+# Every table but the change counters, which carry over so each test's fresh schema counts as a change
+DATA_TABLES = [t for t in Base.metadata.sorted_tables if t is not DataVersion.__table__]
 TestSession = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -16,9 +19,10 @@ TestSession = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=F
 async def setup_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(update(DataVersion).values(version=DataVersion.version + 1))
     yield
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.drop_all, tables=DATA_TABLES)
 
 
 @pytest.fixture
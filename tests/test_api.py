@@ -1,7 +1,10 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from sqlalchemy import update
 
+from shelflife.id import make_id
+from shelflife.models import Book, Tag
 from shelflife.services.openlibrary import OpenLibraryCandidate
 
 
@@ -359,6 +362,37 @@ async def test_bulk_tag_books(client):
     assert body["not_found"] == [9999]
 
 
+@pytest.mark.asyncio
+async def test_bulk_tag_books_query_count_does_not_grow_with_books(client):
+    from sqlalchemy import event
+
+    from tests.conftest import engine
+
+    books = [{"title": f"Book {i}", "author": "Author"} for i in range(8)]
+    ids = [r["book_id"] for r in (await client.post("/api/books/batch", json={"books": books})).json()["results"]]
+
+    async def count_queries(tag: str, book_ids: list[int]) -> tuple[int, dict]:
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            resp = await client.post("/api/tags/books/batch", json={"tag": tag, "book_ids": book_ids})
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        return len(statements), resp.json()
+
+    await client.post("/api/tags/books/batch", json={"tag": "pile", "book_ids": ids[:3]})
+    await client.post("/api/tags/books/batch", json={"tag": "stack", "book_ids": ids[:1]})
+    one, _ = await count_queries("stack", ids[1:2])
+    many, body = await count_queries("pile", ids + [9999])
+    assert many == one
+    assert (body["tagged"], body["skipped"], body["not_found"]) == (5, 3, [9999])
+    assert body["tag"]["book_count"] == 8
+
+
 # --- Hash endpoint ---
 
 
@@ -394,6 +428,23 @@ async def test_hash_matches_created_ids(client):
     assert tag_resp.json()["id"] == expected_tag_id
 
 
+
+@pytest.mark.asyncio
+async def test_hash_batch_matches_single(client):
+    keys = [["Dune", "Frank Herbert"], ["sci-fi"], ["Dune", "Frank Herbert"], ["Les Misérables", "Victor Hugo"]]
+    resp = await client.post("/api/hash/batch", json={"keys": keys})
+    assert resp.status_code == 200
+    ids = resp.json()["ids"]
+    assert len(ids) == 4
+    for key, id_ in zip(keys, ids):
+        assert (await client.get("/api/hash", params={"parts": key})).json()["id"] == id_
+
+
+@pytest.mark.asyncio
+async def test_hash_batch_rejects_empty(client):
+    assert (await client.post("/api/hash/batch", json={"keys": []})).status_code == 422
+    assert (await client.post("/api/hash/batch", json={"keys": [[]]})).status_code == 422
+
 # --- By-name endpoints ---
 
 
@@ -486,7 +537,7 @@ MOCK_CANDIDATES = [
 @pytest.mark.asyncio
 async def test_lookup_book(client):
     with patch(
-        "shelflife.routers.books.search_candidates",
+        "shelflife.services.books.search_candidates",
         new_callable=AsyncMock,
         return_value=MOCK_CANDIDATES,
     ):
@@ -502,7 +553,7 @@ async def test_lookup_book(client):
 @pytest.mark.asyncio
 async def test_lookup_book_no_results(client):
     with patch(
-        "shelflife.routers.books.search_candidates",
+        "shelflife.services.books.search_candidates",
         new_callable=AsyncMock,
         return_value=[],
     ):
@@ -514,7 +565,7 @@ async def test_lookup_book_no_results(client):
 @pytest.mark.asyncio
 async def test_create_book_with_resolve(client):
     with patch(
-        "shelflife.routers.books.search_candidates",
+        "shelflife.services.books.search_candidates",
         new_callable=AsyncMock,
         return_value=[MOCK_CANDIDATES[0]],
     ):
@@ -538,7 +589,7 @@ async def test_create_book_with_resolve(client):
 @pytest.mark.asyncio
 async def test_create_book_with_resolve_no_match(client):
     with patch(
-        "shelflife.routers.books.search_candidates",
+        "shelflife.services.books.search_candidates",
         new_callable=AsyncMock,
         return_value=[],
     ):
@@ -650,10 +701,48 @@ async def test_bulk_readings(client):
         assert len(item["readings"]) == 1
 
 
+
+@pytest.mark.asyncio
+async def test_resolve_books(client, session):
+    dune = (await client.post("/api/books", json={
+        "title": "Dune", "author": "Frank Herbert", "isbn13": "9780441172719",
+    })).json()
+    gatsby = (await client.post("/api/books", json={
+        "title": "The Great Gatsby", "author": "F. Scott Fitzgerald", "isbn": "0743273567",
+    })).json()
+    await session.execute(update(Book).where(Book.id == gatsby["id"]).values(goodreads_id="4671"))
+    await session.commit()
+
+    resp = await client.post("/api/books/resolve", json={"books": [
+        {"title": "dune", "author": "frank herbert"},
+        {"isbn": "978-0-441-17271-9"},
+        {"isbn": "0743273567"},
+        {"goodreads_id": "4671", "title": "Dune", "author": "Frank Herbert"},
+        {"title": "1984", "author": "George Orwell"},
+        {"isbn": "0000000000", "title": "Dune", "author": "Frank Herbert"},
+    ]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [(r["book_id"], r["matched_by"]) for r in body["results"]] == [
+        (dune["id"], "title_author"),
+        (dune["id"], "isbn"),
+        (gatsby["id"], "isbn"),
+        (gatsby["id"], "goodreads_id"),
+        (None, None),
+        (dune["id"], "title_author"),
+    ]
+    assert body["not_found"] == [4]
+
+
+@pytest.mark.asyncio
+async def test_resolve_books_requires_identifier(client):
+    resp = await client.post("/api/books/resolve", json={"books": [{"title": "Dune"}]})
+    assert resp.status_code == 422
+
 @pytest.mark.asyncio
 async def test_create_book_resolve_preserves_provided_fields(client):
     with patch(
-        "shelflife.routers.books.search_candidates",
+        "shelflife.services.books.search_candidates",
         new_callable=AsyncMock,
         return_value=[MOCK_CANDIDATES[0]],
     ):
@@ -670,3 +759,841 @@ async def test_create_book_resolve_preserves_provided_fields(client):
     assert book["publisher"] == "My Edition"
     # But missing fields should be filled
     assert book["isbn"] == "0441172717"
+
+
+# --- Upsert endpoints ---
+
+
+@pytest.mark.asyncio
+async def test_shelve_book_by_name_creates_shelf_and_is_idempotent(client):
+    book_id = (await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})).json()["id"]
+
+    resp = await client.put(f"/api/shelves/by-name/favorites/books/{book_id}")
+    assert resp.status_code == 200
+    first = resp.json()
+    assert first["shelf_created"] is True
+    assert first["added"] is True
+
+    again = (await client.put(f"/api/shelves/by-name/favorites/books/{book_id}")).json()
+    assert again["shelf_created"] is False
+    assert again["added"] is False
+
+    shelf = (await client.get("/api/shelves/by-name/favorites")).json()
+    assert [b["id"] for b in shelf["books"]] == [book_id]
+    assert shelf["is_exclusive"] is False
+
+
+@pytest.mark.asyncio
+async def test_shelve_book_by_name_moves_between_exclusive_shelves(client):
+    book_id = (await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})).json()["id"]
+    await client.put(f"/api/shelves/by-name/to-read/books/{book_id}")
+    await client.put(f"/api/shelves/by-name/read/books/{book_id}")
+
+    assert (await client.get("/api/shelves/by-name/to-read")).json()["books"] == []
+    read = (await client.get("/api/shelves/by-name/read")).json()
+    assert read["is_exclusive"] is True
+    assert len(read["books"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_shelve_missing_book_creates_nothing(client):
+    resp = await client.put("/api/shelves/by-name/favorites/books/999")
+    assert resp.status_code == 404
+    assert (await client.get("/api/shelves")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_review(client):
+    book_id = (await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})).json()["id"]
+
+    resp = await client.put(f"/api/books/{book_id}/review", json={"rating": 4, "review_text": "Great"})
+    assert resp.status_code == 200
+    created = resp.json()
+    assert created["rating"] == 4
+
+    updated = (await client.put(f"/api/books/{book_id}/review", json={"rating": 5})).json()
+    assert updated["id"] == created["id"]
+    assert updated["rating"] == 5
+    assert updated["review_text"] == "Great"
+
+    assert (await client.put("/api/books/999/review", json={"rating": 1})).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_book_with_shelf(client):
+    resp = await client.post("/api/books?shelf=to-read", json={"title": "Dune", "author": "Frank Herbert"})
+    assert resp.status_code == 201
+    shelf = (await client.get("/api/shelves/by-name/to-read")).json()
+    assert [b["title"] for b in shelf["books"]] == ["Dune"]
+
+
+# --- Batch endpoints ---
+
+
+@pytest.mark.asyncio
+async def test_create_books_batch(client):
+    await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    resp = await client.post("/api/books/batch", json={"books": [
+        {"title": "Neuromancer", "author": "William Gibson", "shelf": "to-read"},
+        {"title": "Dune", "author": "Frank Herbert"},
+        {"title": "Neuromancer", "author": "William Gibson"},
+        {"title": "1984", "author": "George Orwell", "shelf": "to-read"},
+    ]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [r["status"] for r in data["results"]] == ["created", "conflict", "conflict", "created"]
+    assert data["counts"] == {"created": 2, "conflict": 2}
+    assert data["results"][0]["book_id"] == make_id("Neuromancer", "William Gibson")
+
+    shelf = (await client.get("/api/shelves/by-name/to-read")).json()
+    assert sorted(b["title"] for b in shelf["books"]) == ["1984", "Neuromancer"]
+    assert (await client.get("/api/books/stats")).json()["total_books"] == 3
+
+
+@pytest.mark.asyncio
+async def test_create_books_batch_rejects_empty(client):
+    assert (await client.post("/api/books/batch", json={"books": []})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_shelve_books_batch(client):
+    dune = (await client.post("/api/books?shelf=to-read", json={"title": "Dune", "author": "Frank Herbert"})).json()["id"]
+    gibson = (await client.post("/api/books", json={"title": "Neuromancer", "author": "William Gibson"})).json()["id"]
+
+    resp = await client.post("/api/shelves/books/batch", json={"items": [
+        {"shelf": "read", "book_id": dune},
+        {"shelf": "favorites", "book_id": dune},
+        {"shelf": "favorites", "book_id": gibson},
+        {"shelf": "favorites", "book_id": gibson},
+        {"shelf": "favorites", "book_id": 999},
+    ]})
+    assert resp.status_code == 200
+    statuses = [r["status"] for r in resp.json()["results"]]
+    assert statuses == ["created", "created", "created", "unchanged", "not_found"]
+
+    # Moving onto "read" took Dune off the other exclusive shelf
+    assert (await client.get("/api/shelves/by-name/to-read")).json()["books"] == []
+    assert [b["id"] for b in (await client.get("/api/shelves/by-name/read")).json()["books"]] == [dune]
+    favorites = (await client.get("/api/shelves/by-name/favorites")).json()
+    assert sorted(b["id"] for b in favorites["books"]) == sorted([dune, gibson])
+    assert favorites["is_exclusive"] is False
+
+
+@pytest.mark.asyncio
+async def test_review_books_batch(client):
+    dune = (await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})).json()["id"]
+    gibson = (await client.post("/api/books", json={"title": "Neuromancer", "author": "William Gibson"})).json()["id"]
+    await client.put(f"/api/books/{dune}/review", json={"rating": 3, "review_text": "Long"})
+
+    resp = await client.post("/api/reviews/batch", json={"items": [
+        {"book_id": dune, "rating": 5},
+        {"book_id": gibson, "review_text": "Sharp"},
+        {"book_id": 999, "rating": 1},
+    ]})
+    assert resp.status_code == 200
+    assert [r["status"] for r in resp.json()["results"]] == ["updated", "created", "not_found"]
+
+    dune_review = (await client.get(f"/api/books/{dune}/review")).json()
+    assert dune_review["rating"] == 5
+    assert dune_review["review_text"] == "Long"
+    assert (await client.get(f"/api/books/{gibson}/review")).json()["review_text"] == "Sharp"
+
+
+# --- Field projections ---
+
+
+@pytest.mark.asyncio
+async def test_list_books_fields_projection(client):
+    await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert", "description": "Spice."})
+    resp = await client.get("/api/books?fields=title,description")
+    assert resp.status_code == 200
+    assert resp.json() == [{"id": make_id("Dune", "Frank Herbert"), "title": "Dune", "description": "Spice."}]
+
+
+@pytest.mark.asyncio
+async def test_fields_projection_selects_only_those_columns(client):
+    from sqlalchemy import event
+
+    from tests.conftest import engine
+
+    await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert", "description": "Spice."})
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await client.get("/api/books?fields=title&tag=")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    select = next(s for s in statements if "FROM books" in s)
+    assert "books.title" in select
+    assert "books.description" not in select
+
+
+@pytest.mark.asyncio
+async def test_fields_projection_rejects_unknown_field(client):
+    resp = await client.get("/api/books?fields=title,secret")
+    assert resp.status_code == 422
+    assert "secret" in resp.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_shelf_and_tag_fields_projection(client):
+    resp = await client.post("/api/books?shelf=to-read", json={"title": "Dune", "author": "Frank Herbert"})
+    book_id = resp.json()["id"]
+    await client.post(f"/api/books/{book_id}/tags", json={"name": "sci-fi"})
+
+    shelf = (await client.get("/api/shelves/by-name/to-read?fields=author")).json()
+    assert shelf["name"] == "to-read"
+    assert shelf["books"] == [{"id": book_id, "author": "Frank Herbert"}]
+
+    tagged = (await client.get("/api/tags/by-name/sci-fi/books?fields=title,year_published")).json()
+    assert tagged == [{"id": book_id, "title": "Dune", "year_published": None}]
+
+
+@pytest.mark.asyncio
+async def test_book_lists_leave_out_description_by_default(client):
+    resp = await client.post(
+        "/api/books?shelf=to-read", json={"title": "Dune", "author": "Frank Herbert", "description": "Spice."}
+    )
+    book_id = resp.json()["id"]
+    await client.post(f"/api/books/{book_id}/tags", json={"name": "sci-fi"})
+
+    listings = [
+        (await client.get("/api/books")).json(),
+        (await client.get("/api/books/search?title=dune")).json(),
+        (await client.get("/api/tags/by-name/sci-fi/books")).json(),
+        (await client.get("/api/shelves/by-name/to-read")).json()["books"],
+    ]
+    for books in listings:
+        assert len(books) == 1
+        assert "description" not in books[0]
+        assert books[0]["title"] == "Dune"
+        assert books[0]["created_at"]
+    assert (await client.get(f"/api/books/{book_id}")).json()["description"] == "Spice."
+
+
+@pytest.mark.asyncio
+async def test_search_books_fields_projection(client):
+    await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert", "description": "Spice."})
+    resp = await client.get("/api/books/search?title=dune&fields=description")
+    assert resp.status_code == 200
+    assert resp.json() == [{"id": make_id("Dune", "Frank Herbert"), "description": "Spice."}]
+
+
+# --- Cursor pagination ---
+
+
+async def _walk(client, path, params, limit=3):
+    """Follow X-Next-Cursor to the end, returning every item and the number of pages."""
+    items, pages, cursor = [], 0, None
+    while True:
+        resp = await client.get(path, params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert resp.status_code == 200, resp.text
+        items += resp.json()
+        pages += 1
+        cursor = resp.headers.get("x-next-cursor")
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort,order", [
+    ("title", "asc"), ("title", "desc"), ("author", "asc"), ("created_at", "desc"),
+])
+async def test_list_books_cursor_matches_offset(client, sort, order):
+    # Repeated titles and authors exercise the id tiebreaker
+    books = [{"title": f"Book {i % 3}", "author": f"Author {i % 4}"} for i in range(10)]
+    await client.post("/api/books/batch", json={"books": books})
+
+    everything = (await client.get("/api/books", params={"sort": sort, "order": order, "limit": 100})).json()
+    walked, pages = await _walk(client, "/api/books", {"sort": sort, "order": order})
+    assert [b["id"] for b in walked] == [b["id"] for b in everything]
+    assert len(everything) == 10
+    assert pages == 4
+
+    # Offsets page through the same order
+    resp = await client.get("/api/books", params={"sort": sort, "order": order, "limit": 3, "offset": 3})
+    assert [b["id"] for b in resp.json()] == [b["id"] for b in everything[3:6]]
+    assert "x-next-cursor" in resp.headers
+
+
+@pytest.mark.asyncio
+async def test_cursor_with_filters_and_fields(client):
+    books = [{"title": f"Dune {i}", "author": "Frank Herbert"} for i in range(5)]
+    await client.post("/api/books/batch", json={"books": [*books, {"title": "Emma", "author": "Jane Austen"}]})
+    walked, _ = await _walk(client, "/api/books", {"q": "dune", "fields": "author"}, limit=2)
+    assert len(walked) == 5
+    assert set(walked[0]) == {"id", "author"}  # the sort key isn't leaked into projections
+
+
+@pytest.mark.asyncio
+async def test_cursor_rejects_bad_or_mismatched_tokens(client):
+    await client.post("/api/books/batch", json={"books": [{"title": f"B{i}", "author": "A"} for i in range(3)]})
+    resp = await client.get("/api/books", params={"limit": 1})
+    cursor = resp.headers["x-next-cursor"]
+    assert (await client.get("/api/books", params={"cursor": "garbage!"})).status_code == 422
+    assert (await client.get("/api/books", params={"cursor": cursor, "sort": "author"})).status_code == 422
+    assert (await client.get("/api/books", params={"cursor": cursor, "order": "desc"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_reviews_and_tag_books_cursor(client):
+    books = [{"title": f"Book {i}", "author": "Author"} for i in range(7)]
+    ids = [r["book_id"] for r in (await client.post("/api/books/batch", json={"books": books})).json()["results"]]
+    for i, book_id in enumerate(ids):
+        await client.put(f"/api/books/{book_id}/review", json={"rating": i % 5 + 1})
+        await client.post(f"/api/books/{book_id}/tags", json={"name": "pile"})
+
+    reviews, pages = await _walk(client, "/api/reviews", {})
+    assert pages == 3
+    assert [r["book_id"] for r in reviews] == [r["book_id"] for r in (await client.get("/api/reviews")).json()]
+    assert len({r["book_id"] for r in reviews}) == 7
+
+    tagged, pages = await _walk(client, "/api/tags/by-name/pile/books", {})
+    assert pages == 3
+    assert [b["title"] for b in tagged] == [f"Book {i}" for i in range(7)]
+
+
+# --- Include expansion ---
+
+
+async def _library_with_relations(client, n: int) -> list[int]:
+    books = [{"title": f"Book {i}", "author": "Author"} for i in range(n)]
+    ids = [r["book_id"] for r in (await client.post("/api/books/batch", json={"books": books})).json()["results"]]
+    for i, book_id in enumerate(ids):
+        await client.put(f"/api/shelves/by-name/to-read/books/{book_id}")
+        await client.post(f"/api/books/{book_id}/tags", json={"name": "pile"})
+        await client.post(f"/api/books/{book_id}/tags", json={"name": f"tag-{i}"})
+        await client.put(f"/api/books/{book_id}/review", json={"rating": 4})
+        await client.post(f"/api/books/{book_id}/start-reading", json={"started_at": "2026-01-02"})
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_list_books_include_relations(client):
+    await _library_with_relations(client, 2)
+    await client.post("/api/books", json={"title": "Bare", "author": "Nobody"})
+
+    books = (await client.get("/api/books?include=tags,review,shelves,readings&fields=title")).json()
+    assert [b["title"] for b in books] == ["Bare", "Book 0", "Book 1"]
+    bare, first = books[0], books[1]
+    assert bare["tags"] == [] and bare["shelves"] == [] and bare["readings"] == [] and bare["review"] is None
+    assert [t["name"] for t in first["tags"]] == ["pile", "tag-0"]
+    assert [s["name"] for s in first["shelves"]] == ["to-read"]
+    assert first["review"]["rating"] == 4
+    assert first["readings"][0]["started_at"] == "2026-01-02"
+    assert "tags" not in (await client.get("/api/books")).json()[0]
+
+
+@pytest.mark.asyncio
+async def test_include_on_search_tag_and_shelf(client):
+    ids = await _library_with_relations(client, 2)
+
+    searched = (await client.get("/api/books/search?title=book&include=review")).json()
+    assert [b["review"]["book_id"] for b in searched] == ids
+    tagged = (await client.get("/api/tags/by-name/pile/books?include=tags")).json()
+    assert [len(b["tags"]) for b in tagged] == [2, 2]
+    shelf = (await client.get("/api/shelves/by-name/to-read?include=shelves")).json()
+    assert [[s["name"] for s in b["shelves"]] for b in shelf["books"]] == [["to-read"], ["to-read"]]
+
+
+@pytest.mark.asyncio
+async def test_include_rejects_unknown_relation(client):
+    resp = await client.get("/api/books?include=tags,friends")
+    assert resp.status_code == 422
+    assert "friends" in resp.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_include_query_count_does_not_grow_with_page_size(client):
+    from sqlalchemy import event
+
+    from tests.conftest import engine
+
+    await _library_with_relations(client, 6)
+
+    async def count_queries(params: dict) -> int:
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            assert (await client.get("/api/books", params=params)).status_code == 200
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        return len(statements)
+
+    include = {"include": "tags,review,shelves,readings"}
+    bare = await count_queries({"limit": 1})
+    assert await count_queries({"limit": 1, **include}) == bare + 4
+    assert await count_queries({"limit": 6, **include}) == bare + 4
+
+
+# --- List filters ---
+
+
+async def _filter_library(client) -> dict[str, int]:
+    """Four books: tags, shelves, ratings and finished readings spread across them."""
+    books = [{"title": title, "author": "Author"} for title in ["Alpha", "Beta", "Gamma", "Delta"]]
+    ids = dict(zip(["a", "b", "g", "d"], [
+        r["book_id"] for r in (await client.post("/api/books/batch", json={"books": books})).json()["results"]
+    ]))
+    for tag, keys in [("sci-fi", "abg"), ("classic", "ag"), ("space", "bd")]:
+        await client.post("/api/tags/books/batch", json={"tag": tag, "book_ids": [ids[k] for k in keys]})
+    for shelf, keys in [("read", "ab"), ("to-read", "gd")]:
+        for k in keys:
+            await client.put(f"/api/shelves/by-name/{shelf}/books/{ids[k]}")
+    for k, rating in [("a", 5), ("b", 3), ("g", 4)]:
+        await client.put(f"/api/books/{ids[k]}/rating", json={"rating": rating})
+    # Alpha was read twice; Beta once
+    for k, started, finished in [("a", "2024-01-01", "2024-02-01"), ("a", "2025-01-01", "2025-02-01"),
+                                 ("b", "2025-03-01", "2025-04-01")]:
+        await client.post(f"/api/books/{ids[k]}/start-reading", json={"started_at": started})
+        await client.put(f"/api/books/{ids[k]}/finish-reading", json={"finished_at": finished})
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_list_books_relationship_filters(client):
+    await _filter_library(client)
+
+    async def titles(**params) -> list[str]:
+        resp = await client.get("/api/books", params={"fields": "title", **params})
+        assert resp.status_code == 200, resp.text
+        return [b["title"] for b in resp.json()]
+
+    assert await titles(tags_all=["sci-fi", "classic"]) == ["Alpha", "Gamma"]
+    assert await titles(tags_any=["classic", "space"]) == ["Alpha", "Beta", "Delta", "Gamma"]
+    assert await titles(tags_none=["classic", "space"]) == []
+    assert await titles(tags_all=["sci-fi"], tags_none=["classic"]) == ["Beta"]
+    assert await titles(tag="Sci-Fi") == ["Alpha", "Beta", "Gamma"]  # names match as by-name lookups do
+    assert await titles(shelf="to-read") == ["Delta", "Gamma"]
+    assert await titles(min_rating=4) == ["Alpha", "Gamma"]
+    assert await titles(unread=True) == ["Delta", "Gamma"]
+    assert await titles(unread=False) == ["Alpha", "Beta"]
+    assert await titles(shelf="read", min_rating=4, tags_any=["sci-fi"]) == ["Alpha"]
+    # Two of Alpha's readings match, but it is listed once
+    assert await titles(finished_after="2024-01-01") == ["Alpha", "Beta"]
+    assert await titles(started_after="2024-06-01", finished_before="2025-03-01") == ["Alpha"]
+    assert await titles(shelf="nowhere") == []
+
+    walked, pages = await _walk(client, "/api/books", {"tags_any": ["sci-fi", "space"], "sort": "title"}, limit=1)
+    assert (len(walked), pages) == (4, 4)
+
+
+async def _plan(statement_filter, request) -> list[str]:
+    """The query plan of the first statement `request()` runs that `statement_filter` accepts."""
+    from sqlalchemy import event
+
+    from tests.conftest import engine
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, *args):
+        if statement_filter(statement):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await request()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    assert captured, "no statement matched"
+    statement, parameters = captured[0]
+    async with engine.connect() as conn:
+        return [row[-1] for row in (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))]
+
+
+def _listing(statement: str) -> bool:
+    return statement.lstrip().startswith("SELECT") and "FROM books" in statement and "LIMIT" in statement
+
+
+@pytest.mark.asyncio
+async def test_list_books_filters_query_plan(client):
+    """Every filter is an index seek per book, and the list is read in title-index order with no DISTINCT."""
+    await _filter_library(client)
+    params = {
+        "tags_all": ["sci-fi", "classic"], "tags_any": ["space", "classic"], "tags_none": ["horror"],
+        "shelf": "read", "min_rating": 4, "unread": "false", "finished_after": "2024-01-01",
+    }
+    assert [b["title"] for b in (await client.get("/api/books", params=params)).json()] == ["Alpha"]
+
+    # A listing with DISTINCT wouldn't match
+    plan = await _plan(lambda s: _listing(s) and "DISTINCT" not in s, lambda: client.get("/api/books", params=params))
+    assert not any(step.startswith("USE TEMP B-TREE") for step in plan), plan
+    scans = [step for step in plan if step.startswith("SCAN")]
+    assert scans == ["SCAN books USING INDEX ix_books_title"], plan
+    for table in ("book_tags", "shelf_books", "readings"):
+        assert any(step.startswith(f"SEARCH {table} USING") for step in plan), (table, plan)
+
+
+@pytest.mark.asyncio
+async def test_list_books_sorts_and_ranges(client):
+    ids = await _filter_library(client)
+    for k, year, pages in [("a", 1965, 412), ("b", 1989, 482), ("g", 2001, None), ("d", None, 150)]:
+        await client.put(f"/api/books/{ids[k]}", json={"year_published": year, "page_count": pages})
+
+    async def titles(**params) -> list[str]:
+        resp = await client.get("/api/books", params={"fields": "title", **params})
+        assert resp.status_code == 200, resp.text
+        return [b["title"] for b in resp.json()]
+
+    # Missing values sort as the lowest
+    assert await titles(sort="rating", order="desc") == ["Alpha", "Gamma", "Beta", "Delta"]
+    assert await titles(sort="year_published") == ["Delta", "Alpha", "Beta", "Gamma"]
+    assert await titles(sort="page_count", order="desc") == ["Beta", "Alpha", "Delta", "Gamma"]
+    assert (await titles(sort="finished_at", order="desc"))[:2] == ["Beta", "Alpha"]
+    walked, pages = await _walk(client, "/api/books", {"sort": "rating", "order": "desc", "fields": "title"}, limit=1)
+    assert ([b["title"] for b in walked], pages) == (["Alpha", "Gamma", "Beta", "Delta"], 4)
+
+    assert await titles(min_rating=3, max_rating=4) == ["Beta", "Gamma"]
+    assert await titles(max_rating=3) == ["Beta"]  # unrated books are left out
+    assert await titles(min_year=1980, max_year=2001) == ["Beta", "Gamma"]
+    assert await titles(max_pages=450) == ["Alpha", "Delta"]
+
+    # The copies on books follow review and reading changes
+    review = await client.put(f"/api/books/{ids['a']}/rating", json={"rating": 2})
+    await client.delete(f"/api/reviews/{review.json()['id']}")
+    await client.post(f"/api/books/{ids['d']}/start-reading", json={"started_at": "2026-01-01"})
+    await client.put(f"/api/books/{ids['d']}/finish-reading", json={"finished_at": "2026-02-01"})
+    assert await titles(sort="rating", order="desc") == ["Gamma", "Beta", "Alpha", "Delta"]
+    assert await titles(sort="finished_at", order="desc") == ["Delta", "Beta", "Alpha", "Gamma"]
+    assert await titles(unread=True) == ["Gamma"]
+
+
+@pytest.mark.asyncio
+async def test_list_books_author_match(client):
+    books = [{"title": "Emma", "author": "Jane Austen"}, {"title": "Dune", "author": "Frank Herbert"},
+             {"title": "Odd", "author": "Jan_e Doe"}]
+    await client.post("/api/books/batch", json={"books": books})
+
+    async def titles(author: str, match: str) -> list[str]:
+        resp = await client.get("/api/books", params={"author": author, "author_match": match, "fields": "title"})
+        return [b["title"] for b in resp.json()]
+
+    assert await titles("austen", "contains") == ["Emma"]
+    assert await titles("JANE AUSTEN", "exact") == ["Emma"]
+    assert await titles("jane", "exact") == []
+    assert await titles("jAn", "prefix") == ["Emma", "Odd"]
+    assert await titles("jan_", "prefix") == ["Odd"]
+    assert await titles("frank herbert", "prefix") == ["Dune"]
+
+
+@pytest.mark.asyncio
+async def test_list_books_author_prefix_outside_ascii(client):
+    books = [{"title": "Germinal", "author": "Émile Zola"}, {"title": "Nadja", "author": "André Breton"}]
+    await client.post("/api/books/batch", json={"books": books})
+
+    async def titles(author: str) -> list[str]:
+        resp = await client.get("/api/books", params={"author": author, "author_match": "prefix", "fields": "title"})
+        assert resp.status_code == 200, resp.text
+        return [b["title"] for b in resp.json()]
+
+    # NOCASE only folds A-Z, so the filter is folded the same way
+    assert await titles("Émile") == ["Germinal"]
+    assert await titles("ÉMILE") == ["Germinal"]
+    assert await titles("émile") == []
+    assert await titles("ANDRÉ") == []
+    assert await titles("andré b") == ["Nadja"]
+    assert await titles("André\U0010ffff") == []
+    assert await titles("\U0010ffff") == []
+    assert (await client.get("/api/tags", params={"prefix": "a\U0010ffff"})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_books_sort_and_author_query_plans(client):
+    await _filter_library(client)
+
+    for sort, index in [("rating", "ix_books_rating"), ("year_published", "ix_books_year_published"),
+                        ("page_count", "ix_books_page_count"), ("finished_at", "ix_books_last_finished_at")]:
+        plan = await _plan(_listing, lambda: client.get("/api/books", params={"sort": sort, "order": "desc"}))
+        assert plan == [f"SCAN books USING INDEX {index}"], plan
+        cursor = (await client.get("/api/books", params={"sort": sort, "limit": 1})).headers["X-Next-Cursor"]
+        plan = await _plan(_listing, lambda: client.get("/api/books", params={"sort": sort, "cursor": cursor}))
+        assert plan[0].startswith(f"SEARCH books USING INDEX {index} (<expr>>?)"), plan
+
+    plan = await _plan(_listing, lambda: client.get("/api/books", params={"min_rating": 4, "sort": "rating"}))
+    assert plan == ["SEARCH books USING INDEX ix_books_rating (<expr>>?)"], plan
+    for match in ("exact", "prefix"):
+        params = {"author": "auth", "author_match": match}
+        plan = await _plan(_listing, lambda: client.get("/api/books", params=params))
+        assert plan[0].startswith("SEARCH books USING INDEX ix_books_author_nocase (author"), plan
+
+
+# --- Facets ---
+
+
+@pytest.mark.asyncio
+async def test_book_facets(client):
+    ids = await _filter_library(client)
+    for k, year in [("a", 1965), ("b", 1968), ("g", 2001)]:
+        await client.put(f"/api/books/{ids[k]}", json={"year_published": year})
+
+    resp = await client.get("/api/books/facets")
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == {
+        "total": 4,
+        "tags": [{"value": "sci-fi", "count": 3}, {"value": "classic", "count": 2}, {"value": "space", "count": 2}],
+        "authors": [{"value": "Author", "count": 4}],
+        "decades": [{"value": 1960, "count": 2}, {"value": 2000, "count": 1}],
+        "ratings": [{"value": 3.0, "count": 1}, {"value": 4.0, "count": 1}, {"value": 5.0, "count": 1}],
+        "shelves": [{"value": "read", "count": 2}, {"value": "to-read", "count": 2}],
+    }
+
+    # The same filters as the list, and the same books
+    params = {"tags_any": ["classic", "space"], "unread": "true"}
+    listed = (await client.get("/api/books", params=params)).json()
+    facets = (await client.get("/api/books/facets", params=params)).json()
+    assert facets["total"] == len(listed) == 2
+    assert facets["tags"] == [{"value": name, "count": 1} for name in ["classic", "sci-fi", "space"]]
+    assert facets["shelves"] == [{"value": "to-read", "count": 2}]
+    assert facets["ratings"] == [{"value": 4.0, "count": 1}]
+    facets = (await client.get("/api/books/facets", params={"limit": 1})).json()
+    assert [len(facets[name]) for name in ["tags", "authors", "decades", "ratings", "shelves"]] == [1] * 5
+    assert facets["ratings"] == [{"value": 3.0, "count": 1}]  # ties go to the lowest value
+
+    # Cached until the data changes
+    await client.put(f"/api/books/{ids['d']}/rating", json={"rating": 4})
+    facets = (await client.get("/api/books/facets", params=params)).json()
+    assert facets["ratings"] == [{"value": 4.0, "count": 2}]
+
+    resp = await client.get("/api/books/facets", params={"shelf": "nonexistent"})
+    assert resp.json() == {"total": 0, "tags": [], "authors": [], "decades": [], "ratings": [], "shelves": []}
+
+
+@pytest.mark.asyncio
+async def test_book_facets_cache_follows_the_database(client, session):
+    from sqlalchemy import text
+
+    from shelflife.services import facets
+
+    book = (await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})).json()
+    await client.post(f"/api/books/{book['id']}/reviews", json={"rating": 4})
+    with patch.object(facets, "compute_facets", wraps=facets.compute_facets) as compute:
+        assert (await client.get("/api/books/facets")).json()["total"] == 1
+        # A review's text isn't read by any facet
+        await client.put(f"/api/books/{book['id']}/review", json={"review_text": "Spice."})
+        await client.get("/api/books/facets")
+        assert compute.call_count == 1
+
+        # Plain SQL, as another process sharing the database would commit it
+        await session.execute(text("DELETE FROM books"))
+        await session.commit()
+        assert (await client.get("/api/books/facets")).json()["total"] == 0
+        assert compute.call_count == 2
+
+
+# --- Shelf pages ---
+
+
+async def _shelve_all(client, shelf: str, titles: list[str]) -> list[int]:
+    books = [{"title": title, "author": "Author"} for title in titles]
+    ids = [r["book_id"] for r in (await client.post("/api/books/batch", json={"books": books})).json()["results"]]
+    for book_id in ids:
+        await client.put(f"/api/shelves/by-name/{shelf}/books/{book_id}")
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_shelf_pages_with_book_count(client):
+    ids = await _shelve_all(client, "read", [f"Book {i}" for i in range(7)])
+    await _shelve_all(client, "to-read", ["Other"])
+
+    shelf = (await client.get("/api/shelves/by-name/read?limit=3&sort=title&order=asc")).json()
+    assert shelf["name"] == "read"
+    assert shelf["book_count"] == 7
+    assert [b["title"] for b in shelf["books"]] == ["Book 0", "Book 1", "Book 2"]
+    assert shelf["next_cursor"]
+
+    walked, pages = [], 0
+    cursor = None
+    while True:
+        params = {"limit": 3, "sort": "title", "order": "asc", **({"cursor": cursor} if cursor else {})}
+        resp = await client.get(f"/api/shelves/{make_id('read')}", params=params)
+        assert resp.headers.get("x-next-cursor") == resp.json()["next_cursor"]
+        walked += resp.json()["books"]
+        pages += 1
+        cursor = resp.json()["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 3
+    assert sorted(b["id"] for b in walked) == sorted(ids)
+
+    counts = {s["name"]: s["book_count"] for s in (await client.get("/api/shelves")).json()}
+    assert counts == {"read": 7, "to-read": 1}
+
+
+@pytest.mark.asyncio
+async def test_shelf_sorts_by_date_added_and_date_read(client, session):
+    from datetime import date, datetime
+
+    from shelflife.models import ShelfBook
+
+    first, second, third = await _shelve_all(client, "read", ["A", "B", "C"])
+    shelf_id = make_id("read")
+    for book_id, added, read in [
+        (first, datetime(2024, 1, 1), date(2024, 3, 1)),
+        (second, datetime(2024, 2, 1), None),
+        (third, datetime(2024, 3, 1), date(2024, 2, 1)),
+    ]:
+        await session.execute(
+            update(ShelfBook)
+            .where(ShelfBook.shelf_id == shelf_id, ShelfBook.book_id == book_id)
+            .values(date_added=added, date_read=read)
+        )
+    await session.commit()
+
+    async def order(**params) -> list[int]:
+        return [b["id"] for b in (await client.get("/api/shelves/by-name/read", params=params)).json()["books"]]
+
+    assert await order() == [third, second, first]  # newest added first by default
+    assert await order(sort="date_added", order="asc") == [first, second, third]
+    assert await order(sort="date_read") == [first, third, second]  # unread last
+    cursor = (await client.get("/api/shelves/by-name/read", params={"sort": "date_read", "limit": 1})).json()["next_cursor"]
+    assert await order(sort="date_read", cursor=cursor) == [third, second]
+
+
+@pytest.mark.asyncio
+async def test_shelf_membership(client):
+    (book_id,) = await _shelve_all(client, "read", ["Dune"])
+
+    resp = await client.get(f"/api/shelves/by-name/read/books/{book_id}")
+    assert resp.status_code == 200
+    assert resp.json()["shelf_id"] == make_id("read")
+    assert resp.json()["date_added"]
+    assert (await client.get(f"/api/shelves/{make_id('read')}/books/{book_id}")).status_code == 200
+    assert (await client.get(f"/api/shelves/by-name/to-read/books/{book_id}")).status_code == 404
+    assert (await client.get("/api/shelves/by-name/read/books/123")).status_code == 404
+
+
+# --- Tag listing ---
+
+
+async def _tag_library(client) -> dict[str, int]:
+    """Tags on 3, 2 and 1 books."""
+    books = [{"title": f"Book {i}", "author": "Author"} for i in range(3)]
+    ids = [r["book_id"] for r in (await client.post("/api/books/batch", json={"books": books})).json()["results"]]
+    for name, n in [("Science Fiction", 3), ("science", 2), ("Fantasy", 1)]:
+        await client.post("/api/tags/books/batch", json={"tag": name, "book_ids": ids[:n]})
+    return dict(zip(["a", "b", "c"], ids))
+
+
+@pytest.mark.asyncio
+async def test_list_tags_counts_and_sorts(client):
+    await _tag_library(client)
+
+    tags = (await client.get("/api/tags")).json()
+    assert [(t["name"], t["book_count"]) for t in tags] == [("Fantasy", 1), ("Science Fiction", 3), ("science", 2)]
+    by_count = (await client.get("/api/tags", params={"sort": "count", "order": "desc"})).json()
+    assert [t["name"] for t in by_count] == ["Science Fiction", "science", "Fantasy"]
+    popular = (await client.get("/api/tags", params={"min_count": 2})).json()
+    assert [t["name"] for t in popular] == ["Science Fiction", "science"]
+
+    walked, pages = await _walk(client, "/api/tags", {"sort": "count"}, limit=2)
+    assert pages == 2
+    assert [t["name"] for t in walked] == ["Fantasy", "science", "Science Fiction"]
+
+
+@pytest.mark.asyncio
+async def test_list_tags_prefix_and_contains(client):
+    await _tag_library(client)
+    book_id = (await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})).json()["id"]
+    await client.post(f"/api/books/{book_id}/tags", json={"name": "100%_done"})
+
+    async def names(**params) -> list[str]:
+        return [t["name"] for t in (await client.get("/api/tags", params=params)).json()]
+
+    assert await names(prefix="SCI") == ["Science Fiction", "science"]
+    assert await names(prefix="science f") == ["Science Fiction"]
+    assert await names(prefix="z") == []
+    assert await names(contains="fic") == ["Science Fiction"]
+    assert await names(contains="%_") == ["100%_done"]
+    assert await names(contains="0_") == []
+
+
+@pytest.mark.asyncio
+async def test_list_tags_prefix_with_non_ascii_names(client):
+    book_id = (await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})).json()["id"]
+    for name in ["Éducation", "école", "Straße"]:
+        await client.post(f"/api/books/{book_id}/tags", json={"name": name})
+
+    async def names(**params) -> list[str]:
+        return [t["name"] for t in (await client.get("/api/tags", params=params)).json()]
+
+    # Only A-Z fold, in SQL and in Python alike
+    assert await names(prefix="É") == ["Éducation"]
+    assert await names(prefix="éDUC") == []
+    assert await names(prefix="ÉDUC") == ["Éducation"]
+    assert await names(prefix="é") == ["école"]
+    assert await names(prefix="STRASSE") == []
+    assert await names(prefix="STRAß") == ["Straße"]
+    assert await names(contains="COLE") == ["école"]
+
+
+@pytest.mark.asyncio
+async def test_tag_counts_follow_tagging_and_deletes(client):
+    ids = await _tag_library(client)
+
+    async def count(name: str) -> int:
+        (tag,) = [t for t in (await client.get("/api/tags", params={"prefix": name})).json() if t["name"] == name]
+        return tag["book_count"]
+
+    await client.delete(f"/api/books/{ids['a']}/tags/{make_id('science')}")
+    assert await count("science") == 1
+    await client.post(f"/api/books/{ids['c']}/tags", json={"name": "Fantasy"})
+    assert await count("Fantasy") == 2
+    await client.delete(f"/api/books/{ids['a']}")
+    assert await count("Science Fiction") == 2
+    assert await count("Fantasy") == 1
+
+
+# --- Stored book counts ---
+
+
+@pytest.mark.asyncio
+async def test_tag_and_shelf_responses_carry_current_counts(client):
+    ids = await _tag_library(client)
+
+    tagged = (await client.post(f"/api/books/{ids['c']}/tags", json={"name": "science"})).json()
+    assert tagged["book_count"] == 3
+    bulk = (await client.post("/api/tags/books/batch", json={"tag": "Fantasy", "book_ids": list(ids.values())})).json()
+    assert bulk["tag"]["book_count"] == 3
+
+    await client.put(f"/api/shelves/by-name/read/books/{ids['a']}")
+    await client.put(f"/api/shelves/by-name/read/books/{ids['b']}")
+    book = (await client.get(f"/api/books/{ids['a']}")).json()
+    assert {t["name"]: t["book_count"] for t in book["tags"]} == {"Fantasy": 3, "Science Fiction": 3, "science": 3}
+    assert [(s["name"], s["book_count"]) for s in book["shelves"]] == [("read", 2)]
+
+    # Moving to another exclusive shelf takes the book off the first
+    await client.put(f"/api/shelves/by-name/to-read/books/{ids['a']}")
+    shelves = (await client.get("/api/shelves")).json()
+    assert [(s["name"], s["book_count"]) for s in shelves] == [("read", 1), ("to-read", 1)]
+    await client.delete(f"/api/books/{ids['b']}")
+    assert (await client.get(f"/api/shelves/{make_id('read')}")).json()["book_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_count_check_and_rebuild(client, session):
+    await _tag_library(client)
+    clean = (await client.get("/api/counts/check")).json()
+    assert clean == {"checked": 3, "mismatches": [], "repaired": False}
+
+    await session.execute(update(Tag).where(Tag.name == "science").values(book_count=9))
+    await session.commit()
+    checked = (await client.get("/api/counts/check")).json()
+    assert checked["mismatches"] == [
+        {"table": "tags", "id": make_id("science"), "name": "science", "stored": 9, "actual": 2},
+    ]
+    assert checked["repaired"] is False
+
+    rebuilt = (await client.post("/api/counts/rebuild")).json()
+    assert rebuilt["repaired"] is True
+    assert (await client.get("/api/counts/check")).json()["mismatches"] == []
+    counts = {t["name"]: t["book_count"] for t in (await client.get("/api/tags")).json()}
+    assert counts["science"] == 2
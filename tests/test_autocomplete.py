@@ -0,0 +1,160 @@
+"""Tests for the in-process autocomplete prefix index."""
+
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from shelflife.id import make_id
+from shelflife.services import autocomplete
+from shelflife.services.autocomplete import KEY_CHARS, AutocompleteIndex, normalize
+
+
+async def _seed(client):
+    books = [
+        {"title": "Dune", "author": "Frank Herbert"},
+        {"title": "Dune Messiah", "author": "Frank Herbert"},
+        {"title": "Cien años de soledad", "author": "Gabriel García Márquez"},
+        {"title": "The Left Hand of Darkness", "author": "Ursula K. Le Guin"},
+    ]
+    await client.post("/api/books/batch", json={"books": books})
+    await client.post("/api/tags/books/batch", json={"tag": "sci-fi", "book_ids": [make_id("Dune", "Frank Herbert")]})
+    await client.put(f"/api/shelves/by-name/to-read/books/{make_id('Dune', 'Frank Herbert')}")
+
+
+async def _suggest(client, prefix, **params) -> list[tuple[str, str]]:
+    resp = await client.get("/api/autocomplete", params={"prefix": prefix, **params})
+    assert resp.status_code == 200, resp.text
+    return [(s["kind"], s["value"]) for s in resp.json()]
+
+
+def test_normalize():
+    assert normalize("  García-Márquez, Gabriel ") == "garcia marquez gabriel"
+    assert normalize("The Left Hand of DARKNESS") == "the left hand of darkness"
+    assert normalize("--") == ""
+
+
+async def test_autocomplete_names_and_later_words(client):
+    await _seed(client)
+
+    assert await _suggest(client, "dune") == [("title", "Dune"), ("title", "Dune Messiah")]
+    # Whole-name matches come before later-word ones
+    assert await _suggest(client, "d") == [("title", "Dune"), ("title", "Dune Messiah"),
+                                           ("title", "The Left Hand of Darkness"), ("title", "Cien años de soledad")]
+    assert await _suggest(client, "herb") == [("author", "Frank Herbert")]
+    assert await _suggest(client, "MARQ") == [("author", "Gabriel García Márquez")]
+    assert await _suggest(client, "anos de") == [("title", "Cien años de soledad")]
+    assert await _suggest(client, "sci") == [("tag", "sci-fi")]
+    assert await _suggest(client, "read") == [("shelf", "to-read")]
+    assert await _suggest(client, "dune ") == [("title", "Dune Messiah")]  # a finished word
+    assert await _suggest(client, "f", kinds=["author"]) == [("author", "Frank Herbert")]
+    assert await _suggest(client, "d", limit=1) == [("title", "Dune")]
+    assert await _suggest(client, "xyz") == []
+
+    resp = await client.get("/api/autocomplete", params={"prefix": "dune"})
+    assert resp.json()[0] == {"kind": "title", "value": "Dune", "id": make_id("Dune", "Frank Herbert")}
+    resp = await client.get("/api/autocomplete", params={"prefix": "frank"})
+    assert resp.json() == [{"kind": "author", "value": "Frank Herbert", "id": None}]
+
+
+async def test_autocomplete_prefix_longer_than_keys(client):
+    title = "A Very Long Title That Keeps Going Well Past The Key Length Limit"
+    await client.post("/api/books", json={"title": title, "author": "Someone"})
+    await client.post("/api/books", json={"title": title[:KEY_CHARS + 5] + " but then differs", "author": "Someone"})
+
+    assert len(normalize(title)) > KEY_CHARS + 10
+    assert await _suggest(client, title[:KEY_CHARS + 10]) == [("title", title)]
+    assert await _suggest(client, title[2:KEY_CHARS + 10]) == [("title", title)]  # from its second word
+
+
+async def test_autocomplete_applies_writes_without_reloading(client):
+    await _seed(client)
+    assert await _suggest(client, "dune") == [("title", "Dune"), ("title", "Dune Messiah")]
+
+    messiah = make_id("Dune Messiah", "Frank Herbert")
+    with patch.object(autocomplete.index, "_reload", side_effect=AssertionError("reloaded")):
+        await client.put(f"/api/books/{messiah}", json={"title": "Children of Dune"})
+        await client.delete(f"/api/books/{make_id('Dune', 'Frank Herbert')}")
+        await client.post("/api/books", json={"title": "Dunes of Mars", "author": "Frank Herbert Jr"})
+
+        assert await _suggest(client, "dune") == [("title", "Dunes of Mars"), ("title", "Children of Dune")]
+        assert await _suggest(client, "frank") == [("author", "Frank Herbert"), ("author", "Frank Herbert Jr")]
+        await client.delete(f"/api/books/{messiah}")
+        # Frank Herbert has no books left
+        assert await _suggest(client, "frank") == [("author", "Frank Herbert Jr")]
+
+
+async def test_autocomplete_ignores_counts_kept_by_triggers(client):
+    await _seed(client)
+    assert await _suggest(client, "sci") == [("tag", "sci-fi")]
+
+    # These bump the books, tags and shelves counters through triggers, without changing a name
+    book = make_id("Dunes of Mars", "Frank Herbert Jr")
+    with patch.object(autocomplete.index, "_reload", side_effect=AssertionError("reloaded")):
+        await client.post("/api/books", json={"title": "Dunes of Mars", "author": "Frank Herbert Jr"})
+        assert (await client.post(f"/api/books/{book}/tags", json={"name": "sci-fi"})).status_code == 201
+        assert (await client.put(f"/api/books/{book}/rating", json={"rating": 4})).status_code == 200
+        await client.put(f"/api/shelves/by-name/to-read/books/{book}")
+
+        assert await _suggest(client, "sci") == [("tag", "sci-fi")]
+        assert await _suggest(client, "to") == [("shelf", "to-read")]
+
+
+async def test_autocomplete_reloads_after_bulk_statements(client):
+    await _seed(client)
+    assert await _suggest(client, "fav") == []
+
+    # Shelves are created with an INSERT statement, whose rows the index doesn't see
+    book = make_id("Dune", "Frank Herbert")
+    await client.put(f"/api/shelves/by-name/favorites/books/{book}")
+    reload = autocomplete.index._reload
+    with patch.object(autocomplete.index, "_reload", side_effect=reload) as reloaded:
+        assert await _suggest(client, "fav") == [("shelf", "favorites")]
+    assert [call.args[1] for call in reloaded.call_args_list] == ["shelves"]
+
+
+async def test_autocomplete_reloads_after_writes_from_other_processes(client, session):
+    await _seed(client)
+    assert await _suggest(client, "sci") == [("tag", "sci-fi")]
+
+    # Plain SQL, as another process sharing the database would write it
+    await session.execute(text("UPDATE tags SET name = 'science fiction' WHERE name = 'sci-fi'"))
+    await session.commit()
+    reload = autocomplete.index._reload
+    with patch.object(autocomplete.index, "_reload", side_effect=reload) as reloaded:
+        assert await _suggest(client, "sci") == [("tag", "science fiction")]
+        assert await _suggest(client, "fic") == [("tag", "science fiction")]
+    assert [call.args[1] for call in reloaded.call_args_list] == ["tags"]
+
+
+async def test_autocomplete_stats_and_memory_budget(client, session):
+    await _seed(client)
+    stats = (await client.get("/api/autocomplete/stats")).json()
+    assert stats["kinds"]["title"] == {"names": 4, "keys": 4 + 1 + 3 + 4}
+    assert stats["kinds"]["author"]["names"] == 3
+    assert stats["kinds"]["tag"] == {"names": 1, "keys": 2}
+    assert stats["bytes"] > 0
+    assert stats["within_budget"] and stats["words_indexed"]
+
+    # Over budget, names are only found from their start
+    index = AutocompleteIndex(memory_budget=1)
+    await index.sync(session)
+    assert not index.stats().words_indexed
+    assert [s.value for s in index.search("dune")] == ["Dune", "Dune Messiah"]
+    assert index.search("herb") == []
+
+    # Once they fit again, the next reload indexes later words
+    index.memory_budget = 1024 * 1024
+    await client.post("/api/books", json={"title": "Children of Dune", "author": "Frank Herbert"})
+    await index.sync(session)
+    assert index.stats().words_indexed
+    assert [s.value for s in index.search("herb")] == ["Frank Herbert"]
+    assert "Children of Dune" in [s.value for s in index.search("dune")]
+
+
+async def test_autocomplete_loads_on_first_lookup(client, session):
+    await _seed(client)
+    # Nothing loads at startup: a fresh index is filled by the first lookup, through the request's session
+    with patch.object(autocomplete, "index", AutocompleteIndex()) as index:
+        assert await index.stale(session)
+        assert await _suggest(client, "herb", kinds="author") == [("author", "Frank Herbert")]
+        assert not await index.stale(session)
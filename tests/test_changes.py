@@ -0,0 +1,54 @@
+"""Tests for the data change counters."""
+
+from sqlalchemy import text
+
+from shelflife import changes
+from shelflife.models import Book, Tag
+
+
+async def test_commit_bumps_table_versions(session):
+    before_books = await changes.data_version(session, "books")
+    before_tags = await changes.data_version(session, "tags")
+    before = await changes.data_version(session)
+    session.add_all([Book(id=1, title="Dune", author="Frank Herbert"), Book(id=2, title="Emma", author="Jane Austen")])
+    await session.commit()
+    # One per row written
+    assert await changes.data_version(session, "books") == before_books + 2
+    assert await changes.data_version(session, "tags") == before_tags
+    assert await changes.data_version(session) == before + 2
+
+
+async def test_rollback_does_not_bump(session):
+    before = await changes.data_version(session)
+    session.add(Tag(id=1, name="sci-fi"))
+    await session.flush()
+    await session.rollback()
+    assert await changes.data_version(session) == before
+
+
+async def test_read_only_commit_does_not_bump(session):
+    before = await changes.data_version(session)
+    await session.get(Book, 1)
+    await session.commit()
+    assert await changes.data_version(session) == before
+
+
+async def test_writes_outside_the_orm_bump(session):
+    # As another process would write: plain SQL, which no session event reports
+    before = await changes.data_versions(session)
+    await session.execute(text("INSERT INTO tags (id, name, book_count) VALUES (1, 'sci-fi', 0)"))
+    await session.execute(text("DELETE FROM tags"))
+    await session.commit()
+    after = await changes.data_versions(session)
+    assert after["tags"] == before["tags"] + 2
+    assert {table: after[table] for table in after if table != "tags"} == {
+        table: before[table] for table in before if table != "tags"
+    }
+
+
+async def test_changes_endpoint(client):
+    before = (await client.get("/api/changes")).json()
+    await client.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    after = (await client.get("/api/changes")).json()
+    assert after["books"] == before["books"] + 1
+    assert after["reviews"] == before["reviews"]
@@ -1,9 +1,15 @@
 """Tests for enrichment API endpoints."""
 
+import sqlite3
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from shelflife.database import Base
+from shelflife.schemas.batch import BookBatchItem
+from shelflife.schemas.book import BookCreate
+from shelflife.services import books as book_service
 from shelflife.services.openlibrary import OpenLibraryMetadata
 
 
@@ -112,6 +118,43 @@ async def test_create_book_with_enrich(client, mock_metadata):
     assert book["open_library_key"] == "/works/OL893415W"
 
 
+async def test_create_books_looks_up_without_holding_the_write_lock(tmp_path, mock_metadata):
+    """Lookups run before anything is written, so other writers aren't kept waiting on the network."""
+    db = tmp_path / "shelflife.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def fetch(**lookup):
+        # Fails with "database is locked" if the request holds the write lock
+        other = sqlite3.connect(db, timeout=0)
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+        other.close()
+        return mock_metadata
+
+    try:
+        with patch("shelflife.services.enrich_service.fetch_metadata", side_effect=fetch) as fetched:
+            async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+                result = await book_service.create_books(session, [
+                    BookBatchItem(title="Dune", author="Frank Herbert"),
+                    BookBatchItem(title="Neuromancer", author="William Gibson"),
+                ], enrich=True)
+                book = await book_service.create_book(session, BookCreate(title="1984", author="George Orwell"), enrich=True)
+        assert result.counts == {"created": 2}
+        assert book.open_library_key == "/works/OL893415W"
+        assert fetched.call_count == 3
+    finally:
+        await engine.dispose()
+
+
+async def test_create_books_batch_size_is_bounded(client):
+    books = [{"title": f"Book {i}", "author": "Author"} for i in range(201)]
+    assert (await client.post("/api/books/batch", json={"books": books})).status_code == 422
+    items = [{"shelf": "read", "book_id": i} for i in range(201)]
+    assert (await client.post("/api/shelves/books/batch", json={"items": items})).status_code == 422
+
+
 async def test_batch_enrich(client, mock_metadata):
     # Create two books
     await client.post("/api/books", json={"title": "Book A", "author": "Author A"})
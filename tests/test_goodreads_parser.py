@@ -1,3 +1,5 @@
+from datetime import date
+
 from shelflife.services.goodreads import parse_goodreads_csv
 
 SAMPLE_CSV = '''\
@@ -48,3 +50,25 @@ def test_parse_csv_dates():
     assert gatsby.date_read.month == 1
     dune = rows[1]
     assert dune.date_read is None
+
+
+def test_parse_csv_date_formats():
+    csv = (
+        "Book Id,Title,Author,Date Read,Date Added\n"
+        "1,A,X,2024/1/5,2024/02/30\n"
+        "2,B,Y,not a date,2024-03-01\n"
+    )
+    padded, bad = parse_goodreads_csv(csv)
+    assert padded.date_read == date(2024, 1, 5)
+    assert padded.date_added is None  # no such day
+    assert bad.date_read is None
+    assert bad.date_added is None
+
+
+def test_parse_csv_missing_columns():
+    rows = parse_goodreads_csv("Title,Book Id\nDune,1\n\n")
+    assert len(rows) == 1
+    assert rows[0].goodreads_id == "1"
+    assert rows[0].author == ""
+    assert rows[0].bookshelves == []
+    assert rows[0].date_read is None
@@ -0,0 +1,53 @@
+"""make_id must keep producing the ids already stored in databases."""
+
+import hashlib
+import random
+import re
+
+from shelflife.id import _normalize, make_id, make_ids
+
+
+def _reference_normalize(value):
+    s = str(value).lower()
+    s = re.sub(r"[^a-z0-9]", "", s)
+    if len(s) > 50:
+        s = s[:50]
+    return s
+
+
+def _reference_make_id(*parts):
+    key = ":".join(_reference_normalize(p) for p in parts)
+    return int(hashlib.sha256(key.encode()).hexdigest()[:15], 16)
+
+
+SAMPLES = [
+    "Dune", "Frank Herbert", "The Hitchhiker's Guide to the Galaxy", "  spaced  OUT  ", "", "1984",
+    "Cien años de soledad", "Les Misérables", "Война и мир", "ノルウェイの森", "Kelvin", "İstanbul",
+    "x" * 80, "tab\tand\nnewline", "emoji 📚 shelf", 0, 42, -7, 2**60,
+]
+
+
+def test_matches_reference_implementation():
+    rng = random.Random(0)
+    alphabet = "abcXYZ019 -_:'.,!éßİKЖ📚"
+    samples = SAMPLES + ["".join(rng.choice(alphabet) for _ in range(rng.randrange(60))) for _ in range(500)]
+    for value in samples:
+        assert _normalize(value) == _reference_normalize(value), value
+    for a, b in zip(samples, reversed(samples)):
+        assert make_id(a, b) == _reference_make_id(a, b)
+        assert make_id(a) == _reference_make_id(a)
+
+
+def test_known_ids_are_stable():
+    assert make_id("Dune", "Frank Herbert") == _reference_make_id("Dune", "Frank Herbert")
+    assert make_id("to-read") == make_id("To Read") == make_id("toread")
+
+
+def test_memoized_ids_distinguish_types():
+    assert make_id(1) != make_id(True)
+    assert make_id(True) == _reference_make_id(True)
+
+
+def test_make_ids_matches_make_id():
+    keys = [("Dune", "Frank Herbert"), ("read",), (123, "2024-01-01"), ("Война и мир", "Лев Толстой")]
+    assert make_ids(keys) == [make_id(*key) for key in keys]
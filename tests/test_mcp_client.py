@@ -1,5 +1,7 @@
 import pytest
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.direct import DirectClient
+from tests.conftest import TestSession
 
 
 @pytest.mark.asyncio
@@ -40,3 +42,61 @@ async def test_client_post_409(client):
     result = await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
     assert result["error"] is True
     assert result["status"] == 409
+
+
+@pytest.mark.asyncio
+async def test_direct_client_matches_http(client):
+    """DirectClient returns the same JSON the HTTP API does."""
+    sl = ShelflifeClient(client)
+    direct = DirectClient(TestSession)
+    created = await direct.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    assert created["title"] == "Dune"
+    assert await direct.get(f"/api/books/{created['id']}") == await sl.get(f"/api/books/{created['id']}")
+    assert await direct.get("/api/books", params={"limit": "10"}) == await sl.get("/api/books", params={"limit": 10})
+    included = {"include": "tags,review,shelves,readings"}
+    assert await direct.get("/api/books", params=included) == await sl.get("/api/books", params=included)
+    refs = {"books": [{"title": "Dune", "author": "Frank Herbert"}, {"isbn": "123"}]}
+    assert await direct.post("/api/books/resolve", json=refs) == await sl.post("/api/books/resolve", json=refs)
+    keys = {"keys": [["Dune", "Frank Herbert"], ["sci-fi"]]}
+    assert await direct.post("/api/hash/batch", json=keys) == await sl.post("/api/hash/batch", json=keys)
+
+
+@pytest.mark.asyncio
+async def test_direct_client_errors():
+    """DirectClient maps service errors, validation errors and unknown paths to error dicts."""
+    direct = DirectClient(TestSession)
+    await direct.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+
+    conflict = await direct.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    assert conflict == {"error": True, "status": 409, "detail": "Book already exists"}
+    assert (await direct.get("/api/books/999"))["status"] == 404
+    assert (await direct.post("/api/books", json={"title": "No author"}))["status"] == 422
+    assert (await direct.get("/api/nope"))["status"] == 404
+    assert (await direct.put("/api/tags"))["status"] == 405
+
+
+@pytest.mark.asyncio
+async def test_direct_client_applies_route_bounds(client):
+    """Query bounds and unknown parameters are handled in-process as they are over HTTP."""
+    direct = DirectClient(TestSession)
+    sl = ShelflifeClient(client)
+    for params in ({"limit": 100000}, {"offset": -1}, {"min_rating": 6}, {"limit": 0}):
+        assert (await direct.get("/api/books", params=params))["status"] == 422
+        assert (await sl.get("/api/books", params=params))["status"] == 422
+    assert (await direct.get("/api/tags", params={"limit": 1001}))["status"] == 422
+    assert (await direct.get("/api/profile", params={"recent": 51}))["status"] == 422
+
+    for mode in (direct, sl):
+        # Unknown parameters are ignored
+        assert (await mode.get("/api/books", params={"limit": 10, "bogus": 1})) == []
+        invalid = await mode.get("/api/books", params={"limit": 0, "bogus": 1})
+        assert [(e["type"], e["loc"]) for e in invalid["detail"]] == [("greater_than_equal", ["query", "limit"])]
+        missing = await mode.post("/api/books", json={"title": "No author"})
+        assert [(e["type"], e["loc"]) for e in missing["detail"]] == [("missing", ["body", "author"])]
+
+
+@pytest.mark.asyncio
+async def test_direct_client_delete_returns_ok():
+    direct = DirectClient(TestSession)
+    book = await direct.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    assert await direct.delete(f"/api/books/{book['id']}") == {"ok": True}
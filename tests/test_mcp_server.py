@@ -1,9 +1,207 @@
+import asyncio
+import json
+import sqlite3
+
 import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.client.messages import MessageHandler
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from shelflife.app import create_app
+from shelflife.database import Base, get_session
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp import resources
+from shelflife.mcp.direct import DirectClient
+from shelflife.mcp.limits import SessionConcurrencyLimit
 from shelflife.mcp.server import create_mcp_server
+from tests.conftest import TestSession
 
 
 def test_mcp_server_has_all_tools(client):
     sl = ShelflifeClient(client)
     mcp = create_mcp_server(sl)
     assert mcp.name == "shelflife"
+
+
+# --- HTTP transport: per-session limits and co-hosting ---
+
+
+def _slow_server(limit: int) -> tuple[FastMCP, dict]:
+    mcp = FastMCP("limits")
+    mcp.add_middleware(SessionConcurrencyLimit(limit))
+    stats = {"running": 0, "peak": 0}
+
+    @mcp.tool()
+    async def slow() -> int:
+        stats["running"] += 1
+        stats["peak"] = max(stats["peak"], stats["running"])
+        await asyncio.sleep(0.02)
+        stats["running"] -= 1
+        return stats["peak"]
+
+    return mcp, stats
+
+
+@pytest.mark.asyncio
+async def test_session_concurrency_limit_queues_extra_calls():
+    mcp, stats = _slow_server(limit=2)
+    async with Client(mcp) as c:
+        results = await asyncio.gather(*(c.call_tool("slow", {}) for _ in range(6)))
+    assert all(not r.is_error for r in results)
+    assert stats["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_session_concurrency_limit_is_per_session():
+    mcp, stats = _slow_server(limit=1)
+    async with Client(mcp) as a, Client(mcp) as b:
+        await asyncio.gather(*(c.call_tool("slow", {}) for c in (a, b, a, b)))
+    assert stats["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_mcp_server_tool_call_through_client():
+    await DirectClient(TestSession).post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    mcp = create_mcp_server(DirectClient(TestSession))
+    async with Client(mcp) as c:
+        result = await c.call_tool("search_books", {"query": "dune"})
+    assert [b["title"] for b in result.structured_content["books"]] == ["Dune"]
+
+
+@pytest.mark.asyncio
+async def test_create_app_can_mount_mcp():
+    app = create_app(mount_mcp=True)
+
+    async def override_session():
+        async with TestSession() as s:
+            yield s
+
+    app.dependency_overrides[get_session] = override_session
+    assert any(getattr(r, "path", None) == "" for r in app.routes)  # the MCP mount
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        assert (await c.get("/api/books/stats")).json() == {"total_books": 0}
+
+
+# --- Resources and change notifications ---
+
+
+class _Notifications(MessageHandler):
+    def __init__(self):
+        super().__init__()
+        self.updated: list[str] = []
+        self.list_changed = 0
+
+    async def on_resource_updated(self, message):
+        self.updated.append(str(message.params.uri))
+
+    async def on_resource_list_changed(self, message):
+        self.list_changed += 1
+
+
+@pytest.fixture
+async def library(tmp_path, monkeypatch):
+    """A database file of its own, so the server's polling and each write use separate connections,
+    as separate processes would, and the change counters are checked every 10 ms."""
+    monkeypatch.setattr(resources, "MCP_RESOURCE_POLL_SECONDS", 0.01)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'shelflife.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield DirectClient(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    await engine.dispose()
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_resources_serve_library_state(client):
+    book = (await client.post("/api/books?shelf=to-read", json={"title": "Dune", "author": "Frank Herbert"})).json()
+    await client.post(f"/api/books/{book['id']}/tags", json={"name": "sci fi"})
+    mcp = create_mcp_server(DirectClient(TestSession))
+
+    async with Client(mcp) as mc:
+        assert mc.initialize_result.capabilities.resources.subscribe
+        uris = {str(r.uri) for r in await mc.list_resources()}
+        assert {"shelflife://profile", "shelflife://shelves", "shelflife://tags"} <= uris
+        assert {"shelflife://shelves/to-read", "shelflife://tags/sci%20fi"} <= uris
+        templates = {t.uriTemplate for t in await mc.list_resource_templates()}
+        assert "shelflife://books/{book_id}" in templates
+
+        [shelf] = await mc.read_resource("shelflife://shelves/to-read")
+        assert json.loads(shelf.text)["books"][0]["title"] == "Dune"
+        [tagged] = await mc.read_resource("shelflife://tags/sci%20fi")
+        assert json.loads(tagged.text)["books"][0]["title"] == "Dune"
+        [detail] = await mc.read_resource(f"shelflife://books/{book['id']}")
+        assert json.loads(detail.text)["tags"][0]["name"] == "sci fi"
+        [profile] = await mc.read_resource("shelflife://profile")
+        assert json.loads(profile.text)["total_books"] == 1
+
+
+@pytest.mark.asyncio
+async def test_resource_updates_only_when_content_changes(library):
+    await library.post("/api/books", params={"shelf": "to-read"}, json={"title": "Dune", "author": "Frank Herbert"})
+    await library.post("/api/books", json={"title": "1984", "author": "George Orwell"})
+    notifications = _Notifications()
+    mcp = create_mcp_server(library)
+
+    async with Client(mcp, message_handler=notifications) as mc:
+        await mc.list_resources()
+        await mc.read_resource("shelflife://shelves/to-read")
+
+        # Already there: rows are written but the shelf reads the same
+        await mc.call_tool("shelve_book", {"title": "Dune", "author": "Frank Herbert", "shelf": "to-read"})
+        await _settle()
+        assert notifications.updated == []
+        assert notifications.list_changed == 0
+
+        await mc.call_tool("shelve_book", {"title": "1984", "author": "George Orwell", "shelf": "to-read"})
+        await _settle()
+        assert notifications.updated == ["shelflife://shelves/to-read"]
+        assert notifications.list_changed == 0
+
+        await mc.call_tool("shelve_book", {"title": "1984", "author": "George Orwell", "shelf": "favorites"})
+        await _settle()
+        assert notifications.list_changed == 1
+
+
+@pytest.mark.asyncio
+async def test_explicit_subscription_is_notified(library):
+    book = await library.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    notifications = _Notifications()
+    mcp = create_mcp_server(library)
+
+    async with Client(mcp, message_handler=notifications) as mc:
+        uri = f"shelflife://books/{book['id']}"
+        await mc.session.subscribe_resource(uri)
+        await mc.call_tool("review_book", {"title": "Dune", "author": "Frank Herbert", "rating": 5})
+        await _settle()
+        assert notifications.updated == [uri]
+
+        await mc.session.unsubscribe_resource(uri)
+        await mc.call_tool("review_book", {"title": "Dune", "author": "Frank Herbert", "rating": 4})
+        await _settle()
+        assert notifications.updated == [uri]
+
+
+@pytest.mark.asyncio
+async def test_writes_from_other_processes_are_notified(library, tmp_path):
+    await library.post("/api/books", params={"shelf": "to-read"}, json={"title": "Dune", "author": "Frank Herbert"})
+    notifications = _Notifications()
+    mcp = create_mcp_server(library)
+
+    async with Client(mcp, message_handler=notifications) as mc:
+        await mc.list_resources()
+        await mc.read_resource("shelflife://shelves/to-read")
+        await _settle()
+        assert notifications.updated == []
+
+        # Plain SQL on a connection of its own, as the API or another MCP process would commit it
+        with sqlite3.connect(tmp_path / "shelflife.db") as other:
+            other.execute("DELETE FROM shelf_books")
+            other.execute("DELETE FROM shelves WHERE name = 'to-read'")
+        await _settle()
+        assert notifications.updated == ["shelflife://shelves/to-read"]
+        assert notifications.list_changed == 1
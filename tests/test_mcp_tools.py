@@ -1,25 +1,32 @@
-"""Tests for MCP tools. Each test gets a ShelflifeClient backed by the
-test httpx client fixture, seeds data via the API, then calls the tool
-function directly."""
+"""Tests for MCP tools. Each test runs twice: once with a ShelflifeClient
+backed by the test httpx client fixture, and once with a DirectClient that
+calls the service layer in-process. Tests seed data via the API, then call
+the tool function directly."""
+
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from shelflife.id import make_id
 from shelflife.mcp.client import ShelflifeClient
+from shelflife.mcp.direct import DirectClient
 from shelflife.mcp.tools.discovery import search_books, get_books
-from shelflife.mcp.tools.types import BookRef
-from shelflife.mcp.tools.library import add_book, resolve_book
-from shelflife.mcp.tools.shelves import shelve_book, browse_shelf
-from shelflife.mcp.tools.reviews import review_book, get_reviews
+from shelflife.mcp.tools.types import BookRef, BookReview, BookToAdd, ProgressEntry
+from shelflife.mcp.tools.library import add_book, add_books, resolve_book
+from shelflife.mcp.tools.shelves import shelve_book, shelve_books, browse_shelf
+from shelflife.mcp.tools.reviews import review_book, review_books, get_reviews
 from shelflife.mcp.tools.tags import tag_books, browse_tag
 from shelflife.mcp.tools.reading import (
-    start_reading, finish_reading, log_reading_progress, get_reading_history
+    start_reading, finish_reading, log_reading_progress, log_progress_batch, get_reading_history
 )
 from shelflife.mcp.tools.profile import reading_profile
 from shelflife.mcp.tools.importing import import_goodreads, import_goodreads_csv
+from tests.conftest import TestSession
 
 
-@pytest.fixture
-def sl(client):
+@pytest.fixture(params=["http", "direct"])
+def sl(request, client):
+    if request.param == "direct":
+        return DirectClient(TestSession)
     return ShelflifeClient(client)
 
 
@@ -30,8 +37,8 @@ async def test_search_books_by_query(sl):
     await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
     await sl.post("/api/books", json={"title": "Neuromancer", "author": "William Gibson"})
     result = await search_books(sl, query="dune")
-    assert len(result) == 1
-    assert result[0]["title"] == "Dune"
+    assert len(result["books"]) == 1
+    assert result["books"][0]["title"] == "Dune"
 
 
 @pytest.mark.asyncio
@@ -39,14 +46,52 @@ async def test_search_books_by_author(sl):
     await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
     await sl.post("/api/books", json={"title": "1984", "author": "George Orwell"})
     result = await search_books(sl, author="orwell")
-    assert len(result) == 1
-    assert result[0]["author"] == "George Orwell"
+    assert len(result["books"]) == 1
+    assert result["books"][0]["author"] == "George Orwell"
 
 
 @pytest.mark.asyncio
 async def test_search_books_empty(sl):
     result = await search_books(sl)
-    assert result == []
+    assert result == {"books": [], "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_search_books_follows_cursor(sl):
+    await sl.post("/api/books/batch", json={"books": [{"title": f"Book {i}", "author": "Author"} for i in range(5)]})
+    first = await search_books(sl, limit=2, view="minimal")
+    assert [b["title"] for b in first["books"]] == ["Book 0", "Book 1"]
+    second = await search_books(sl, limit=2, view="minimal", cursor=first["next_cursor"])
+    last = await search_books(sl, limit=2, view="minimal", cursor=second["next_cursor"])
+    assert [b["title"] for b in second["books"] + last["books"]] == ["Book 2", "Book 3", "Book 4"]
+    assert last["next_cursor"] is None
+
+    table = await search_books(sl, limit=2, view="minimal", table=True)
+    assert table["rows"] == [["Book 0", "Author"], ["Book 1", "Author"]]
+    assert table["next_cursor"] == first["next_cursor"]
+
+
+@pytest.mark.asyncio
+async def test_search_books_combines_tag_shelf_and_reading_filters(sl):
+    ids = [
+        r["book_id"] for r in (await sl.post("/api/books/batch", json={"books": [
+            {"title": "Dune", "author": "Frank Herbert"},
+            {"title": "Hyperion", "author": "Dan Simmons"},
+            {"title": "Emma", "author": "Jane Austen"},
+        ]}))["results"]
+    ]
+    await sl.post("/api/tags/books/batch", json={"tag": "sci-fi", "book_ids": ids[:2]})
+    await sl.post("/api/tags/books/batch", json={"tag": "classic", "book_ids": [ids[0], ids[2]]})
+    await sl.put(f"/api/shelves/by-name/to-read/books/{ids[1]}")
+    await sl.put(f"/api/books/{ids[0]}/rating", json={"rating": 5})
+
+    async def titles(**filters) -> list[str]:
+        return [b["title"] for b in (await search_books(sl, view="minimal", **filters))["books"]]
+
+    assert await titles(tags_all=["sci-fi", "classic"]) == ["Dune"]
+    assert await titles(tags_any=["sci-fi"], tags_none=["classic"]) == ["Hyperion"]
+    assert await titles(shelf="to-read", unread=True) == ["Hyperion"]
+    assert await titles(min_rating=4) == ["Dune"]
 
 
 # --- get_books ---
@@ -110,6 +155,23 @@ async def test_add_book_duplicate(sl):
     assert result["error"] is True
 
 
+@pytest.mark.asyncio
+async def test_add_books(sl):
+    await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    with patch("shelflife.services.books.search_candidates", AsyncMock(return_value=[])), \
+            patch("shelflife.services.enrich_service.fetch_metadata", AsyncMock(return_value=None)):
+        result = await add_books(sl, books=[
+            BookToAdd(title="Dune", author="Frank Herbert"),
+            BookToAdd(title="Neuromancer", author="William Gibson", shelf="to-read"),
+        ])
+    assert [(r["book"], r["status"]) for r in result["results"]] == [
+        ("Dune by Frank Herbert", "conflict"),
+        ("Neuromancer by William Gibson", "created"),
+    ]
+    shelf = await sl.get("/api/shelves/by-name/to-read")
+    assert [b["title"] for b in shelf["books"]] == ["Neuromancer"]
+
+
 # --- resolve_book ---
 
 @pytest.mark.asyncio
@@ -137,6 +199,58 @@ async def test_shelve_book_creates_shelf(sl):
     assert any(b["title"] == "Dune" for b in shelf["books"])
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["sci-fi/fantasy", "what? #1", "100% fiction"])
+async def test_shelve_and_browse_shelf_with_url_characters(sl, name):
+    await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    result = await shelve_book(sl, title="Dune", author="Frank Herbert", shelf=name)
+    assert (result["shelf_id"], result["added"]) == (make_id(name), True)
+
+    shelf = await browse_shelf(sl, shelf_name=name)
+    assert shelf["name"] == name
+    assert [b["title"] for b in shelf["books"]] == ["Dune"]
+
+
+@pytest.mark.asyncio
+async def test_shelve_books(sl):
+    await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    result = await shelve_books(sl, shelf="favorites", books=[
+        BookRef(title="Dune", author="Frank Herbert"),
+        BookRef(title="Unknown", author="Nobody"),
+    ])
+    assert [(r["book"], r["status"]) for r in result["results"]] == [
+        ("Dune by Frank Herbert", "created"),
+        ("Unknown by Nobody", "not_found"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_books_compact_by_default(sl):
+    await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert", "description": "x" * 500})
+    [book] = (await search_books(sl, query="dune"))["books"]
+    assert set(book) == {"title", "author", "year_published", "page_count", "description"}
+    assert len(book["description"]) == 201
+    assert book["description"].endswith("…")
+
+
+@pytest.mark.asyncio
+async def test_search_books_views_and_table(sl):
+    await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert", "description": "x" * 500})
+    await sl.post("/api/books", json={"title": "1984", "author": "George Orwell"})
+
+    [_, full] = (await search_books(sl, view="full"))["books"]
+    assert len(full["description"]) == 500
+    assert "created_at" in full
+
+    table = await search_books(sl, view="minimal", table=True)
+    assert table == {
+        "columns": ["title", "author"], "rows": [["1984", "George Orwell"], ["Dune", "Frank Herbert"]], "next_cursor": None,
+    }
+
+    picked = await search_books(sl, fields=["isbn13", "title"])
+    assert picked["books"][0] == {"isbn13": None, "title": "1984"}
+
+
 # --- browse_shelf ---
 
 @pytest.mark.asyncio
@@ -157,9 +271,24 @@ async def test_browse_shelf_by_name(sl):
 
     result = await browse_shelf(sl, shelf_name="to-read")
     assert result["name"] == "to-read"
+    assert result["book_count"] == 1
     assert len(result["books"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_browse_shelf_follows_cursor(sl):
+    books = [{"title": f"Book {i:02}", "author": "Author"} for i in range(52)]
+    ids = [r["book_id"] for r in (await sl.post("/api/books/batch", json={"books": books}))["results"]]
+    await sl.post("/api/shelves/books/batch", json={"items": [{"shelf": "read", "book_id": i} for i in ids]})
+
+    first = await browse_shelf(sl, shelf_name="read", sort="title", view="minimal")
+    assert first["book_count"] == 52
+    assert [b["title"] for b in first["books"]][:2] == ["Book 00", "Book 01"]
+    rest = await browse_shelf(sl, shelf_name="read", sort="title", view="minimal", cursor=first["next_cursor"])
+    assert [b["title"] for b in rest["books"]] == ["Book 50", "Book 51"]
+    assert rest["next_cursor"] is None
+
+
 # --- review_book ---
 
 @pytest.mark.asyncio
@@ -191,8 +320,29 @@ async def test_get_reviews(sl):
     await sl.post(f"/api/books/{book_id_2}/reviews", json={"rating": 3})
 
     result = await get_reviews(sl, min_rating=4)
-    assert len(result) == 1
-    assert result[0]["book_title"] == "Dune"
+    assert len(result["reviews"]) == 1
+    assert result["reviews"][0]["book_title"] == "Dune"
+    assert result["next_cursor"] is None
+
+
+
+@pytest.mark.asyncio
+async def test_get_reviews_and_browse_tag_follow_cursor(sl):
+    await sl.post("/api/books/batch", json={"books": [{"title": f"Book {i}", "author": "Author"} for i in range(3)]})
+    for i in range(3):
+        book_id = make_id(f"Book {i}", "Author")
+        await sl.put(f"/api/books/{book_id}/review", json={"rating": 4})
+        await sl.post(f"/api/books/{book_id}/tags", json={"name": "pile"})
+
+    page = await get_reviews(sl, limit=2)
+    rest = await get_reviews(sl, limit=2, cursor=page["next_cursor"])
+    assert len(page["reviews"]) == 2
+    assert len(rest["reviews"]) == 1
+    assert rest["next_cursor"] is None
+
+    books = await browse_tag(sl, tag_name="pile", view="minimal")
+    assert [b["title"] for b in books["books"]] == ["Book 0", "Book 1", "Book 2"]  # one page of the default 50
+    assert books["next_cursor"] is None
 
 
 # --- tag_books ---
@@ -224,8 +374,24 @@ async def test_browse_tag_list_all(sl):
     book_id = make_id("Dune", "Frank Herbert")
     await sl.post(f"/api/books/{book_id}/tags", json={"name": "sci-fi"})
     result = await browse_tag(sl)
-    assert len(result) == 1
-    assert result[0]["name"] == "sci-fi"
+    assert len(result["tags"]) == 1
+    assert result["tags"][0]["name"] == "sci-fi"
+    assert result["tags"][0]["book_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_browse_tag_list_most_used_with_prefix(sl):
+    books = [{"title": f"Book {i}", "author": "Author"} for i in range(3)]
+    ids = [r["book_id"] for r in (await sl.post("/api/books/batch", json={"books": books}))["results"]]
+    for name, n in [("sci-fi", 1), ("science", 3), ("fantasy", 2)]:
+        await sl.post("/api/tags/books/batch", json={"tag": name, "book_ids": ids[:n]})
+
+    async def names(**params) -> list[str]:
+        return [t["name"] for t in (await browse_tag(sl, **params))["tags"]]
+
+    assert await names() == ["science", "fantasy", "sci-fi"]
+    assert await names(prefix="SCI") == ["science", "sci-fi"]
+    assert await names(min_count=2, sort="name") == ["fantasy", "science"]
 
 
 @pytest.mark.asyncio
@@ -234,8 +400,61 @@ async def test_browse_tag_by_name(sl):
     book_id = make_id("Dune", "Frank Herbert")
     await sl.post(f"/api/books/{book_id}/tags", json={"name": "sci-fi"})
     result = await browse_tag(sl, tag_name="sci-fi")
-    assert len(result) == 1
-    assert result[0]["title"] == "Dune"
+    assert len(result["books"]) == 1
+    assert result["books"][0]["title"] == "Dune"
+
+    await sl.post(f"/api/books/{book_id}/tags", json={"name": "Fiction / Science Fiction"})
+    assert [b["title"] for b in (await browse_tag(sl, tag_name="Fiction / Science Fiction"))["books"]] == ["Dune"]
+
+
+@pytest.mark.asyncio
+async def test_review_books(sl):
+    await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    await sl.post("/api/books", json={"title": "1984", "author": "George Orwell"})
+    await review_book(sl, title="Dune", author="Frank Herbert", rating=3)
+    result = await review_books(sl, reviews=[
+        BookReview(title="Dune", author="Frank Herbert", review_text="Epic"),
+        BookReview(title="1984", author="George Orwell", rating=5),
+    ])
+    assert [r["status"] for r in result["results"]] == ["updated", "created"]
+    reviews = {r["book_title"]: r for r in (await get_reviews(sl))["reviews"]}
+    assert reviews["Dune"]["rating"] == 3
+    assert reviews["Dune"]["review_text"] == "Epic"
+    assert reviews["1984"]["rating"] == 5
+
+
+# --- log_progress_batch ---
+
+@pytest.mark.asyncio
+async def test_log_progress_batch(sl):
+    await sl.post("/api/books", json={"title": "Dune", "author": "Frank Herbert"})
+    await sl.post("/api/books", json={"title": "1984", "author": "George Orwell"})
+    await sl.post(f"/api/books/{make_id('Dune', 'Frank Herbert')}/start-reading", json={})
+    result = await log_progress_batch(sl, entries=[
+        ProgressEntry(title="Dune", author="Frank Herbert", page=10, progress_date="2025-01-01"),
+        ProgressEntry(title="Dune", author="Frank Herbert", pages_read=15, progress_date="2025-01-02"),
+        ProgressEntry(title="1984", author="George Orwell", page=5),
+    ])
+    assert [(r["book"], r["status"]) for r in result["results"]] == [
+        ("Dune by Frank Herbert", "created"),
+        ("Dune by Frank Herbert", "created"),
+        ("1984 by George Orwell", "not_found"),
+    ]
+    progress = await sl.get(f"/api/books/{make_id('Dune', 'Frank Herbert')}/reading/progress")
+    assert [p["page"] for p in progress] == [10, 25]
+
+
+@pytest.mark.asyncio
+async def test_browse_shelf_and_tag_compact(sl):
+    book = await sl.post("/api/books", params={"shelf": "to-read"}, json={"title": "Dune", "author": "Frank Herbert"})
+    await sl.post(f"/api/books/{book['id']}/tags", json={"name": "sci-fi"})
+
+    shelf = await browse_shelf(sl, shelf_name="to-read", view="minimal", table=True)
+    assert shelf["name"] == "to-read"
+    assert shelf["books"] == {"columns": ["title", "author"], "rows": [["Dune", "Frank Herbert"]]}
+
+    assert await browse_tag(sl, tag_name="sci-fi", fields=["title"]) == {"books": [{"title": "Dune"}], "next_cursor": None}
+    assert await browse_tag(sl, tag_name="nope") == {"books": [], "next_cursor": None}
 
 
 # --- get_reading_history ---
@@ -0,0 +1,159 @@
+"""Tests for the schema-version fast path and deferred imports."""
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from shelflife import migrations
+from shelflife.lazy import lazy_import
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def in_repo_root(monkeypatch):
+    monkeypatch.chdir(ROOT)
+
+
+def test_head_revision_matches_alembic():
+    script = ScriptDirectory.from_config(Config(str(ROOT / "alembic.ini")))
+    assert migrations.head_revision() == script.get_current_head()
+
+
+def test_head_revision_none_when_branched(tmp_path):
+    (tmp_path / "a.py").write_text("revision = 'aaa'\ndown_revision = None\n")
+    (tmp_path / "b.py").write_text("revision = 'bbb'\ndown_revision = 'aaa'\n")
+    (tmp_path / "c.py").write_text("revision = 'ccc'\ndown_revision = 'aaa'\n")
+    assert migrations.head_revision(tmp_path) is None
+    (tmp_path / "d.py").write_text("revision = 'ddd'\ndown_revision = ('bbb', 'ccc')\n")
+    assert migrations.head_revision(tmp_path) == "ddd"
+
+
+def test_current_revision_without_database_or_table(tmp_path):
+    db = tmp_path / "shelflife.db"
+    assert migrations.current_revision(db) is None
+    sqlite3.connect(db).close()
+    assert migrations.current_revision(db) is None
+
+
+def test_upgrade_runs_alembic_once(tmp_path):
+    db = tmp_path / "data" / "shelflife.db"
+    assert migrations.upgrade(db) is True
+    assert migrations.current_revision(db) == migrations.head_revision()
+    assert migrations.is_at_head(db)
+    assert migrations.upgrade(db) is False
+
+
+def test_app_import_defers_httpx():
+    code = "import sys, shelflife.app; print('httpx._client' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_lazy_import_loads_on_attribute_access():
+    module = lazy_import("shelflife.id")
+    assert module.make_id("a") == module.make_id("a")
+
+
+@pytest.mark.asyncio
+async def test_review_upsert_on_migrated_schema(tmp_path):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from shelflife.models import Book
+    from shelflife.schemas.review import ReviewUpdate
+    from shelflife.services.reviews import upsert_review
+
+    db = tmp_path / "shelflife.db"
+    migrations.upgrade(db)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db}")
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            session.add(Book(id=1, title="Dune", author="Frank Herbert"))
+            await session.commit()
+            await upsert_review(session, 1, ReviewUpdate(rating=4))
+            review = await upsert_review(session, 1, ReviewUpdate(review_text="Spice."))
+        assert (review.rating, review.review_text) == (4, "Spice.")
+    finally:
+        await engine.dispose()
+
+
+def test_tag_counts_on_migrated_schema(tmp_path):
+    db = tmp_path / "shelflife.db"
+    migrations.upgrade(db)
+    conn = sqlite3.connect(db)
+    try:
+        conn.execute("INSERT INTO tags (id, name) VALUES (10, 'classic')")
+        # No books needed: foreign keys aren't enforced
+        conn.execute("INSERT INTO book_tags (book_id, tag_id) VALUES (1, 10), (2, 10)")
+        conn.execute("DELETE FROM book_tags WHERE book_id = 1")
+        assert conn.execute("SELECT book_count FROM tags WHERE id = 10").fetchone() == (1,)
+    finally:
+        conn.close()
+
+
+def test_shelf_counts_on_migrated_schema(tmp_path):
+    db = tmp_path / "shelflife.db"
+    migrations.upgrade(db)
+    conn = sqlite3.connect(db)
+    try:
+        conn.executemany(
+            "INSERT INTO shelves (id, name, is_exclusive, created_at) VALUES (?, ?, 0, '2026-01-01')",
+            [(10, "read"), (11, "favorites")],
+        )
+        conn.executemany(
+            "INSERT INTO shelf_books (id, shelf_id, book_id, date_added) VALUES (?, 10, ?, '2026-01-01')",
+            [(1, 1), (2, 2), (3, 3)],
+        )
+        conn.execute("DELETE FROM shelf_books WHERE id = 1")
+        conn.execute("UPDATE shelf_books SET shelf_id = 11 WHERE id = 2")
+        assert conn.execute("SELECT id, book_count FROM shelves ORDER BY id").fetchall() == [(10, 1), (11, 1)]
+    finally:
+        conn.close()
+
+
+def test_book_sort_keys_on_migrated_schema(tmp_path):
+    db = tmp_path / "shelflife.db"
+    migrations.upgrade(db)
+    conn = sqlite3.connect(db)
+    try:
+        conn.execute(
+            "INSERT INTO books (id, title, author, created_at, updated_at) VALUES (1, 'Dune', 'Frank Herbert', "
+            "'2026-01-01', '2026-01-01')"
+        )
+        conn.execute(
+            "INSERT INTO reviews (id, book_id, rating, created_at, updated_at) VALUES (1, 1, 4.5, '2026-01-01', '2026-01-01')"
+        )
+        conn.executemany(
+            "INSERT INTO readings (id, book_id, finished_at, created_at, updated_at) "
+            "VALUES (?, 1, ?, '2026-01-01', '2026-01-01')",
+            [(1, "2024-05-01"), (2, "2025-05-01"), (3, None)],
+        )
+        assert conn.execute("SELECT rating, last_finished_at FROM books").fetchone() == (4.5, "2025-05-01")
+        conn.execute("UPDATE reviews SET rating = 3 WHERE id = 1")
+        conn.execute("DELETE FROM readings WHERE id = 2")
+        assert conn.execute("SELECT rating, last_finished_at FROM books").fetchone() == (3, "2024-05-01")
+        conn.execute("DELETE FROM reviews")
+        conn.execute("DELETE FROM readings")
+        assert conn.execute("SELECT rating, last_finished_at FROM books").fetchone() == (None, None)
+    finally:
+        conn.close()
+
+
+def test_data_versions_on_migrated_schema(tmp_path):
+    db = tmp_path / "shelflife.db"
+    migrations.upgrade(db)
+    conn = sqlite3.connect(db)
+    try:
+        conn.execute("INSERT INTO tags (id, name) VALUES (10, 'classic')")
+        conn.execute("INSERT INTO book_tags (book_id, tag_id) VALUES (1, 10)")
+        conn.execute("DELETE FROM book_tags")
+        versions = dict(conn.execute("SELECT table_name, version FROM data_versions"))
+        # The tag's count was kept by triggers too: an insert and two updates
+        assert (versions["tags"], versions["book_tags"], versions["books"]) == (3, 2, 0)
+    finally:
+        conn.close()
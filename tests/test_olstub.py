@@ -0,0 +1,65 @@
+"""Tests for the Open Library record/replay stub used by the benchmarks."""
+
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.olstub import StubConfig, StubServer, create_stub_app
+from shelflife.services import openlibrary
+
+
+@pytest.fixture
+async def stub():
+    app = create_stub_app(StubConfig())
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://stub") as c:
+        c.app = app
+        yield c
+
+
+async def test_replays_recorded_edition(stub):
+    resp = await stub.get("/isbn/9780441172719.json")
+    assert resp.status_code == 200
+    assert resp.json()["works"] == [{"key": "/works/OL893415W"}]
+    assert stub.app.state.stats.replayed == 1
+
+
+async def test_replays_recorded_search(stub):
+    resp = await stub.get("/search.json", params={"title": "Dune", "author": "Frank Herbert", "limit": 5})
+    assert resp.json()["docs"][0]["key"] == "OL893415W"
+
+
+async def test_synthesizes_deterministically(stub):
+    first = (await stub.get("/isbn/9781111111111.json")).json()
+    second = (await stub.get("/isbn/9781111111111.json")).json()
+    assert first == second
+    assert first["works"][0]["key"].startswith("/works/OL")
+    assert stub.app.state.stats.synthesized == 2
+
+
+async def test_no_synthesize_returns_404():
+    app = create_stub_app(StubConfig(synthesize=False))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://stub") as c:
+        resp = await c.get("/works/OL1W.json")
+    assert resp.status_code == 404
+
+
+async def test_error_injection():
+    app = create_stub_app(StubConfig(error_rate=1.0))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://stub") as c:
+        resp = await c.get("/isbn/9780441172719.json")
+    assert resp.status_code == 503
+    assert app.state.stats.errors_injected == 1
+
+
+async def test_fetch_metadata_against_running_stub():
+    with StubServer(StubConfig()) as server:
+        with patch.object(openlibrary, "OPENLIBRARY_BASE_URL", server.url):
+            result = await openlibrary.fetch_metadata(isbn13="9780441172719", title="Dune", author="Frank Herbert")
+            candidates = await openlibrary.search_candidates("Neuromancer", "William Gibson")
+
+    assert result.open_library_key == "/works/OL893415W"
+    assert result.page_count == 688
+    assert "Science Fiction" in result.subjects
+    assert candidates[0].isbn13 == "9780441569595"
+    assert server.stats.by_endpoint == {"isbn": 1, "works": 1, "search": 1}
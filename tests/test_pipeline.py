@@ -0,0 +1,149 @@
+"""Tests for the streaming import -> enrich pipeline."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from shelflife.database import Base
+from shelflife.models import Book, Tag
+from shelflife.services.goodreads import parse_goodreads_csv
+from shelflife.services.openlibrary import OpenLibraryMetadata
+from shelflife.services.import_service import import_goodreads_chunk
+from shelflife.services.pipeline import import_and_enrich
+
+HEADER = "Book Id,Title,Author,ISBN,ISBN13,My Rating,Publisher,Number of Pages,Year Published,Date Read,Date Added,Bookshelves,Exclusive Shelf,My Review"
+
+
+def _csv(n: int) -> str:
+    lines = [HEADER]
+    for i in range(n):
+        lines.append(f"{i + 1},Book {i},Author {i % 7},,,{i % 6},,,,2023/01/{i % 28 + 1:02d},2022/12/01,,read,")
+    return "\n".join(lines)
+
+
+def _slow_fetch(delay: float, calls: list):
+    async def fetch(isbn=None, isbn13=None, title=None, author=None):
+        calls.append(title)
+        await asyncio.sleep(delay)
+        return OpenLibraryMetadata(
+            open_library_key=f"/works/{title}",
+            description=f"About {title}",
+            subjects=["Fiction"],
+        )
+    return fetch
+
+
+async def test_pipeline_imports_and_enriches(session):
+    calls = []
+    rows = parse_goodreads_csv(_csv(12))
+    with patch("shelflife.services.enrich_service.fetch_metadata", _slow_fetch(0, calls)):
+        result = await import_and_enrich(session, rows, chunk_size=5, apply_batch_size=4)
+
+    assert result.imported.books_created == 12
+    assert result.imported.readings_created == 12
+    assert result.enrichment.total == 12
+    assert result.enrichment.enriched == 12
+    assert sorted(calls) == sorted(f"Book {i}" for i in range(12))
+
+    unenriched = (await session.execute(
+        select(func.count(Book.id)).where(Book.open_library_key.is_(None))
+    )).scalar()
+    assert unenriched == 0
+    assert (await session.execute(select(Tag.name))).scalars().all() == ["fiction"]
+
+
+async def test_pipeline_skips_already_enriched_books(session):
+    calls = []
+    rows = parse_goodreads_csv(_csv(3))
+    with patch("shelflife.services.enrich_service.fetch_metadata", _slow_fetch(0, calls)):
+        await import_and_enrich(session, rows)
+        calls.clear()
+        result = await import_and_enrich(session, rows)
+
+    assert result.imported.books_updated == 3
+    assert result.enrichment.total == 0
+    assert calls == []
+
+
+async def test_pipeline_failed_import_leaves_nothing_behind(tmp_path):
+    """Chunks and the enrichment applied alongside them are committed only once every chunk is in."""
+    # A database file, since the failure cancels the other stages mid-query, which drops an in-memory database
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'shelflife.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    calls = []
+    chunks = 0
+
+    async def failing_third_chunk(*args):
+        nonlocal chunks
+        chunks += 1
+        if chunks == 3:
+            raise RuntimeError("bad row")
+        return await import_goodreads_chunk(*args)
+
+    rows = parse_goodreads_csv(_csv(12))
+    async with AsyncSession(engine) as session:
+        with (
+            patch("shelflife.services.enrich_service.fetch_metadata", _slow_fetch(0, calls)),
+            patch("shelflife.services.pipeline.import_goodreads_chunk", failing_third_chunk),
+            pytest.raises(ExceptionGroup),
+        ):
+            await import_and_enrich(session, rows, chunk_size=4, apply_batch_size=1)
+
+    async with AsyncSession(engine) as session:
+        assert calls
+        assert (await session.execute(select(func.count(Book.id)))).scalar() == 0
+        assert (await session.execute(select(func.count(Tag.id)))).scalar() == 0
+    await engine.dispose()
+
+
+async def test_pipeline_overlaps_import_and_enrichment(session):
+    """With concurrent workers, wall time is far below the sequential sum."""
+    calls = []
+    rows = parse_goodreads_csv(_csv(16))
+    with patch("shelflife.services.enrich_service.fetch_metadata", _slow_fetch(0.05, calls)):
+        start = time.perf_counter()
+        result = await import_and_enrich(session, rows, concurrency=8, chunk_size=4)
+        elapsed = time.perf_counter() - start
+
+    assert result.enrichment.enriched == 16
+    assert elapsed < 16 * 0.05 / 2
+
+
+async def test_pipeline_queue_is_bounded(session):
+    calls = []
+    rows = parse_goodreads_csv(_csv(20))
+    with patch("shelflife.services.enrich_service.fetch_metadata", _slow_fetch(0.01, calls)):
+        result = await import_and_enrich(session, rows, concurrency=1, queue_size=2, chunk_size=10)
+
+    assert result.peak_queue_depth <= 2
+    assert result.enrichment.total == 20
+
+
+async def test_pipeline_counts_failures(session):
+    async def no_metadata(**kwargs):
+        return None
+
+    rows = parse_goodreads_csv(_csv(3))
+    with patch("shelflife.services.enrich_service.fetch_metadata", no_metadata):
+        result = await import_and_enrich(session, rows)
+
+    assert result.imported.books_created == 3
+    assert result.enrichment.failed == 3
+    assert result.enrichment.enriched == 0
+
+
+async def test_import_endpoint_with_enrich(client):
+    calls = []
+    files = {"file": ("goodreads.csv", _csv(4).encode(), "text/csv")}
+    with patch("shelflife.services.enrich_service.fetch_metadata", _slow_fetch(0, calls)):
+        resp = await client.post("/api/import/goodreads?enrich=true", files=files)
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["books_created"] == 4
+    assert data["enrichment"] == {"total": 4, "enriched": 4, "failed": 0}
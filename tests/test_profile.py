@@ -0,0 +1,83 @@
+"""Tests for the reading profile aggregate endpoint."""
+
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from shelflife.id import make_id
+from shelflife.services import profile
+
+
+async def _seed(client, n_books=3):
+    for i in range(n_books):
+        await client.post("/api/books", json={"title": f"Book {i}", "author": "Author"})
+    return [make_id(f"Book {i}", "Author") for i in range(n_books)]
+
+
+async def test_profile_empty(client):
+    resp = await client.get("/api/profile")
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "total_books": 0,
+        "total_reviews": 0,
+        "shelves": [],
+        "top_tags": [],
+        "rating_distribution": {},
+        "recent_books": [],
+    }
+
+
+async def test_profile_aggregates(client):
+    ids = await _seed(client)
+    await client.post("/api/shelves", json={"name": "read"})
+    await client.post("/api/shelves", json={"name": "to-read"})
+    await client.post(f"/api/shelves/{make_id('read')}/books/{ids[0]}")
+    await client.post(f"/api/shelves/{make_id('read')}/books/{ids[1]}")
+    await client.post("/api/tags/books/batch", json={"tag": "sci-fi", "book_ids": ids})
+    await client.post("/api/tags/books/batch", json={"tag": "classic", "book_ids": ids[:1]})
+    await client.post(f"/api/books/{ids[0]}/reviews", json={"rating": 5})
+    await client.post(f"/api/books/{ids[1]}/reviews", json={"rating": 5})
+    await client.post(f"/api/books/{ids[2]}/reviews", json={"review_text": "No rating"})
+
+    data = (await client.get("/api/profile")).json()
+
+    assert data["total_books"] == 3
+    assert data["total_reviews"] == 3
+    assert data["rating_distribution"] == {"5.0": 2}
+    assert data["top_tags"] == [{"name": "sci-fi", "count": 3}, {"name": "classic", "count": 1}]
+    assert data["shelves"] == [
+        {"id": make_id("read"), "name": "read", "book_count": 2},
+        {"id": make_id("to-read"), "name": "to-read", "book_count": 0},
+    ]
+    assert len(data["recent_books"]) == 3
+
+
+async def test_profile_tag_counts_not_capped(client):
+    """Counts come from GROUP BY, not from a paginated book listing."""
+    ids = await _seed(client, n_books=60)
+    await client.post("/api/tags/books/batch", json={"tag": "big", "book_ids": ids})
+    data = (await client.get("/api/profile", params={"top_tags": 1})).json()
+    assert data["top_tags"] == [{"name": "big", "count": 60}]
+
+
+async def test_profile_cached_until_data_changes(client):
+    await _seed(client, n_books=1)
+    with patch.object(profile, "compute_profile", wraps=profile.compute_profile) as compute:
+        first = (await client.get("/api/profile")).json()
+        second = (await client.get("/api/profile")).json()
+        assert compute.call_count == 1
+        assert first == second
+
+        await client.post("/api/books", json={"title": "Another", "author": "Author"})
+        third = (await client.get("/api/profile")).json()
+        assert compute.call_count == 2
+        assert third["total_books"] == 2
+
+
+async def test_profile_sees_writes_from_other_processes(client, session):
+    await _seed(client, n_books=1)
+    assert (await client.get("/api/profile")).json()["total_books"] == 1
+    # Plain SQL, as the MCP process or any other writer sharing the file would commit it
+    await session.execute(text("DELETE FROM books"))
+    await session.commit()
+    assert (await client.get("/api/profile")).json()["total_books"] == 0
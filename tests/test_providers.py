@@ -0,0 +1,185 @@
+"""Tests for metadata providers and hedged fetching."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from shelflife.services.openlibrary import OpenLibraryMetadata
+from shelflife.services.providers import (
+    GoogleBooksProvider,
+    HedgedFetcher,
+    LatencyHistogram,
+    MetadataProvider,
+)
+
+
+class FakeProvider(MetadataProvider):
+    def __init__(self, name, delay=0.0, result=None):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.result = result
+        self.calls = 0
+        self.finished = False
+
+    async def fetch(self, isbn=None, isbn13=None, title=None, author=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        self.finished = True
+        return self.result
+
+
+def test_histogram_buckets_and_quantiles():
+    h = LatencyHistogram()
+    for ms in range(1, 101):
+        h.observe(ms / 1000)
+    snap = h.snapshot()
+    assert snap["count"] == 100
+    assert snap["buckets"]["le_5ms"] == 5
+    assert snap["buckets"]["le_100ms"] == 50
+    assert snap["p50_ms"] == 51.0
+    assert snap["p95_ms"] == 96.0
+
+
+def test_histogram_empty():
+    h = LatencyHistogram()
+    assert h.quantile(0.95) is None
+    assert h.snapshot()["mean_ms"] is None
+
+
+def test_hedge_delay_uses_default_until_enough_samples():
+    primary = FakeProvider("primary")
+    fetcher = HedgedFetcher([primary], default_delay=1.5, min_samples=3, min_delay=0.0)
+    assert fetcher.hedge_delay(primary) == 1.5
+    for _ in range(3):
+        primary.latency.observe(0.2)
+    assert fetcher.hedge_delay(primary) == pytest.approx(0.2)
+
+
+async def test_fast_primary_never_hedges():
+    primary = FakeProvider("primary", result=OpenLibraryMetadata(description="primary"))
+    secondary = FakeProvider("secondary", result=OpenLibraryMetadata(description="secondary"))
+    fetcher = HedgedFetcher([primary, secondary], default_delay=0.5)
+
+    result = await fetcher.fetch(title="Dune", author="Frank Herbert")
+
+    assert result.description == "primary"
+    assert secondary.calls == 0
+    assert fetcher.hedges_fired == 0
+    assert primary.wins == 1
+    assert primary.latency.count == 1
+
+
+async def test_slow_primary_is_hedged_and_cancelled():
+    primary = FakeProvider("primary", delay=5.0, result=OpenLibraryMetadata(description="primary"))
+    secondary = FakeProvider("secondary", delay=0.01, result=OpenLibraryMetadata(description="secondary"))
+    fetcher = HedgedFetcher([primary, secondary], default_delay=0.05)
+
+    result = await fetcher.fetch(title="Dune", author="Frank Herbert")
+
+    assert result.description == "secondary"
+    assert fetcher.hedges_fired == 1
+    assert secondary.wins == 1
+    assert primary.cancelled == 1
+    assert primary.finished is False
+    # The cancelled call is still sampled, for at least the time it ran
+    assert primary.latency.count == 1
+    assert primary.latency.quantile(0.5) >= 0.05
+
+
+async def test_empty_primary_falls_through_immediately():
+    primary = FakeProvider("primary", result=None)
+    secondary = FakeProvider("secondary", result=OpenLibraryMetadata(description="secondary"))
+    fetcher = HedgedFetcher([primary, secondary], default_delay=10.0)
+
+    result = await asyncio.wait_for(fetcher.fetch(title="Dune", author="Frank Herbert"), timeout=1.0)
+
+    assert result.description == "secondary"
+    assert fetcher.hedges_fired == 0
+
+
+async def test_hedged_primary_can_still_win():
+    primary = FakeProvider("primary", delay=0.1, result=OpenLibraryMetadata(description="primary"))
+    secondary = FakeProvider("secondary", delay=5.0, result=OpenLibraryMetadata(description="secondary"))
+    fetcher = HedgedFetcher([primary, secondary], default_delay=0.02)
+
+    result = await fetcher.fetch(title="Dune", author="Frank Herbert")
+
+    assert result.description == "primary"
+    assert fetcher.hedges_fired == 1
+    assert secondary.cancelled == 1
+
+
+async def test_all_providers_empty():
+    fetcher = HedgedFetcher([FakeProvider("a"), FakeProvider("b")], default_delay=0.01)
+    assert await fetcher.fetch(title="Nothing", author="Nobody") is None
+
+
+async def test_failed_call_is_sampled():
+    class Failing(FakeProvider):
+        async def fetch(self, **lookup):
+            await asyncio.sleep(0.02)
+            raise RuntimeError("boom")
+
+    failing = Failing("failing")
+    fetcher = HedgedFetcher([failing, FakeProvider("b")], default_delay=1.0)
+    assert await fetcher.fetch(title="Nothing", author="Nobody") is None
+    assert failing.errors == 1
+    assert failing.latency.count == 1
+    assert failing.latency.quantile(0.5) >= 0.02
+
+
+def _google_stub(request: httpx.Request) -> httpx.Response:
+    query = request.url.params["q"]
+    if query == "isbn:9780441172719":
+        return httpx.Response(200, json={"items": [{"volumeInfo": {
+            "title": "Dune",
+            "authors": ["Frank Herbert"],
+            "publisher": "Ace",
+            "publishedDate": "1990-09-01",
+            "description": "A desert epic.",
+            "pageCount": 535,
+            "categories": ["Fiction"],
+            "imageLinks": {"thumbnail": "http://books.example/dune.jpg"},
+        }}]})
+    if query.startswith("intitle:"):
+        return httpx.Response(200, json={"items": [
+            {"volumeInfo": {"title": "Dune Messiah", "authors": ["Frank Herbert"]}},
+            {"volumeInfo": {"title": "Dune", "authors": ["Frank Herbert"], "pageCount": 412}},
+        ]})
+    return httpx.Response(200, json={"totalItems": 0})
+
+
+async def test_google_books_isbn_lookup():
+    provider = GoogleBooksProvider(base_url="http://stub", transport=httpx.MockTransport(_google_stub))
+    result = await provider.fetch(isbn13="9780441172719", title="Dune", author="Frank Herbert")
+
+    assert result.description == "A desert epic."
+    assert result.page_count == 535
+    assert result.publisher == "Ace"
+    assert result.publish_year == 1990
+    assert result.cover_url == "https://books.example/dune.jpg"
+    assert result.subjects == ["Fiction"]
+    assert result.open_library_key is None
+
+
+async def test_google_books_title_author_search():
+    provider = GoogleBooksProvider(base_url="http://stub", transport=httpx.MockTransport(_google_stub))
+    result = await provider.fetch(isbn="0000000000", title="Dune", author="Frank Herbert")
+    assert result.page_count == 412
+
+
+async def test_google_books_server_error():
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+    provider = GoogleBooksProvider(base_url="http://stub", transport=transport)
+    assert await provider.fetch(title="Dune", author="Frank Herbert") is None
+
+
+async def test_provider_stats_endpoint(client):
+    resp = await client.get("/api/metadata/providers")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["providers"][0]["name"] == "openlibrary"
+    assert "p95_ms" in data["providers"][0]["latency"]
+    assert data["providers"][0]["hedge_delay_ms"] > 0
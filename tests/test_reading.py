@@ -272,3 +272,35 @@ async def test_delete_progress(client):
     progress_id = progress_resp.json()["id"]
     resp = await client.delete(f"/api/reading/progress/{progress_id}")
     assert resp.status_code == 204
+
+
+# --- batch progress ---
+
+@pytest.mark.asyncio
+async def test_log_progress_batch(client):
+    dune = await _create_book(client)
+    gibson = await _create_book(client, "Neuromancer", "William Gibson")
+    idle = await _create_book(client, "1984", "George Orwell")
+    await client.post(f"/api/books/{dune['id']}/start-reading")
+    await client.post(f"/api/books/{gibson['id']}/start-reading")
+    await client.post(
+        f"/api/books/{dune['id']}/reading/progress",
+        json={"page": 40, "date": "2025-01-01"},
+    )
+
+    resp = await client.post("/api/reading/progress/batch", json={"items": [
+        {"book_id": dune["id"], "pages_read": 10, "date": "2025-01-02"},
+        {"book_id": dune["id"], "pages_read": 5, "date": "2025-01-03"},
+        {"book_id": dune["id"], "page": 99, "date": "2025-01-01"},
+        {"book_id": gibson["id"], "start_page": 0, "end_page": 20, "date": "2025-01-02"},
+        {"book_id": idle["id"], "page": 10},
+        {"book_id": 999, "page": 10},
+    ]})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["status"] for r in results] == ["created", "created", "conflict", "created", "not_found", "not_found"]
+    assert results[4]["detail"] == "No active reading for this book"
+
+    progress = (await client.get(f"/api/books/{dune['id']}/reading/progress")).json()
+    assert [p["page"] for p in progress] == [40, 50, 55]
+    assert (await client.get(f"/api/books/{gibson['id']}/reading/progress")).json()[0]["page"] == 20